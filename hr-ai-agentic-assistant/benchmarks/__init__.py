@@ -0,0 +1,4 @@
+"""
+Benchmarks for the AI Resume Scoring Engine.
+Run them from the project directory, e.g. `python -m benchmarks.scoring_memory`.
+"""
@@ -0,0 +1,145 @@
+"""
+Throughput of complete scoring runs against the fake LLM backend.
+
+Seeds a throwaway database with a job and its applicants, queues a scoring run and executes it like
+score_worker does: supervisor graph, analysis cache, incremental persistence and run bookkeeping all
+run for real, only the model server is replaced by the deterministic in-process fake. While the run
+is executing, a second thread polls the run status the way the UI does and records its latency.
+
+With --capacity the fake server slows every call down once more calls than that are outstanding,
+like a saturated model server; --adaptive then lets the adaptive limiter find that point.
+
+Usage: python -m benchmarks.scoring_load [--applicants 200] [--mode structured] [--latency-ms 50]
+                                         [--ms-per-token 0] [--concurrency 8] [--async] [--runs 2]
+                                         [--capacity 0] [--adaptive]
+"""
+import argparse
+import logging
+import os
+import statistics
+import tempfile
+import threading
+import time
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'hr_assistant.settings')
+
+import django
+
+django.setup()
+
+from django.db import connection
+from django.test.utils import override_settings
+
+from hr_assistant.services import ai_analysis, concurrency
+from hr_assistant.services.contracts import VALID_SCORING_MODES
+from hr_assistant.services.resume_scoring import ResumeScoringService
+from hr_assistant.services import scoring_queue
+from jobs.models import Applicant, JobListing
+
+RESUME_TEMPLATE = (
+    "Candidate {index}\nProfessional Experience\nSoftware Engineer at Company {index} | Jan 2018 - Present\n"
+    "Technical Skills\nPython, Django, PostgreSQL, {extra}\n"
+)
+
+
+def seed_job(applicant_count: int) -> JobListing:
+    job = JobListing.objects.create(
+        title="Backend Engineer", detailed_description="## Requirements\n- 3+ years of Python\n- Django REST APIs",
+        required_skills=["Python", "Django", "PostgreSQL"], is_active=True
+    )
+    Applicant.objects.bulk_create([
+        Applicant(
+            applicant_name=f"Candidate {index}", resume_file=f"candidate_{index}.pdf",
+            content_hash=f"load_{index}", file_size=2048, file_format="PDF", job_listing=job,
+            parsed_resume_text=RESUME_TEMPLATE.format(index=index, extra="Kubernetes" if index % 3 else "Go"),
+        )
+        for index in range(applicant_count)
+    ])
+    return job
+
+
+def poll_status(job_id: int, stop: threading.Event, latencies: list):
+    """Poll the run status until stopped, recording each poll's latency in milliseconds"""
+    try:
+        while not stop.is_set():
+            started = time.perf_counter()
+            ResumeScoringService.get_scoring_status(job_id)
+            latencies.append((time.perf_counter() - started) * 1000)
+            stop.wait(0.05)
+    finally:
+        connection.close()
+
+
+def run_once(job: JobListing, scoring_mode: str) -> dict:
+    queued = ResumeScoringService.enqueue_scoring_run(job.id, scoring_mode=scoring_mode)
+    run = scoring_queue.claim_next_run('load-benchmark')
+    assert run is not None and run.id == queued['run_id']
+
+    stop, latencies = threading.Event(), []
+    poller = threading.Thread(target=poll_status, args=(job.id, stop, latencies))
+    poller.start()
+    started = time.perf_counter()
+    try:
+        result = ResumeScoringService.execute_scoring_run(run, 'load-benchmark')
+    finally:
+        elapsed = time.perf_counter() - started
+        stop.set()
+        poller.join()
+
+    status = ResumeScoringService.get_scoring_status(job.id)
+    return {
+        'elapsed': elapsed,
+        'processed': result['processed_count'],
+        'errors': result['error_count'],
+        'status': status['status'],
+        'status_p50_ms': statistics.median(latencies) if latencies else 0.0,
+        'status_max_ms': max(latencies) if latencies else 0.0,
+        'llm_limit': (result['llm_concurrency'] or {}).get('limit', '-'),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--applicants', type=int, default=200)
+    parser.add_argument('--mode', choices=VALID_SCORING_MODES, default='structured')
+    parser.add_argument('--latency-ms', type=float, default=50)
+    parser.add_argument('--ms-per-token', type=float, default=0)
+    parser.add_argument('--concurrency', type=int, default=8, help="concurrent LLM calls per run and per process")
+    parser.add_argument('--async', dest='async_mode', action='store_true', help="run the graph with ainvoke")
+    parser.add_argument('--runs', type=int, default=2, help="later runs are served by the analysis cache")
+    parser.add_argument('--capacity', type=int, default=0, help="concurrent calls the fake server handles at full speed")
+    parser.add_argument('--adaptive', action='store_true', help="tune the process limit from latency, starting at --concurrency")
+    args = parser.parse_args()
+
+    logging.getLogger('ai_processing').setLevel(logging.ERROR)
+    fake_llm = {'latency_ms': args.latency_ms, 'ms_per_token': args.ms_per_token, 'capacity': args.capacity}
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # A file database, so the status poller's connection sees the run's commits
+        connection.settings_dict['TEST']['NAME'] = os.path.join(tmp_dir, 'scoring_load.sqlite3')
+        old_name = connection.creation.create_test_db(verbosity=0, serialize=False)
+        try:
+            with override_settings(AI_SCORING_LLM_BACKEND='fake', AI_SCORING_FAKE_LLM=fake_llm,
+                                   AI_SCORING_ASYNC=args.async_mode,
+                                   AI_SCORING_MAX_CONCURRENT_LLM_CALLS_PER_RUN=args.concurrency,
+                                   AI_SCORING_MAX_CONCURRENT_LLM_CALLS_PER_PROCESS=args.concurrency,
+                                   AI_SCORING_ADAPTIVE_CONCURRENCY=args.adaptive):
+                ai_analysis.llm = None
+                ai_analysis._llm_clients.clear()
+                concurrency._process_limiter = None
+                job = seed_job(args.applicants)
+
+                print(f"{'run':>4} {'seconds':>8} {'applicants/s':>13} {'processed':>10} {'errors':>7} "
+                      f"{'status':>10} {'status p50 ms':>14} {'status max ms':>14} {'LLM limit':>10}")
+                for run_number in range(1, args.runs + 1):
+                    # Later runs rescore the same applicants, so they are served by the analysis cache
+                    stats = run_once(job, args.mode)
+                    print(f"{run_number:>4} {stats['elapsed']:>8.2f} {stats['processed'] / stats['elapsed']:>13.1f} "
+                          f"{stats['processed']:>10} {stats['errors']:>7} {stats['status']:>10} "
+                          f"{stats['status_p50_ms']:>14.1f} {stats['status_max_ms']:>14.1f} {stats['llm_limit']:>10}")
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == '__main__':
+    main()
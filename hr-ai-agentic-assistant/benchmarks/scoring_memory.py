@@ -0,0 +1,121 @@
+"""
+Peak memory of a scoring run as the number of applicants grows.
+
+Runs the supervisor graph in structured mode against a stub LLM, with the analysis cache and
+database persistence disabled, and reports the tracemalloc peak per run. A run whose per-applicant
+peak stays flat scales linearly; a growing per-applicant peak means some state is copied per worker.
+
+Usage: python -m benchmarks.scoring_memory [--sizes 250 500 1000 2000] [--resume-kb 8]
+"""
+import argparse
+import json
+import logging
+import os
+import tracemalloc
+from unittest.mock import MagicMock, patch
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'hr_assistant.settings')
+
+import django
+
+django.setup()
+
+from django.test.utils import override_settings
+
+from hr_assistant.services.ai_analysis import build_run_config, create_supervisor_graph
+from hr_assistant.services.contracts import AIAnalysisResponse, SCORING_MODE_STRUCTURED
+
+STUB_RESPONSE = MagicMock(content=json.dumps({
+    "overall_score": 70,
+    "quality_grade": "C",
+    "categorization": "Mid-Level",
+    "justification_summary": "Benchmark result"
+}))
+
+
+class DiscardingResultWriter:
+    """
+    Stands in for IncrementalResultWriter so the benchmark measures the graph, not the database
+    """
+
+    def __init__(self):
+        self.persisted_count = 0
+        self.error_count = 0
+        self.pending_count = 0
+
+    def has_result(self, applicant_id: int) -> bool:
+        return True
+
+    def add(self, result):
+        self.persisted_count += 1
+
+    def flush(self) -> int:
+        return 0
+
+
+def build_initial_state(applicant_count: int, resume_kb: int):
+    applicant_ids = list(range(1, applicant_count + 1))
+    return {
+        "applicant_id_list": applicant_ids,
+        "job_criteria": ["Python", "Django"],
+        "results": [],
+        "status": "processing",
+        "current_index": 0,
+        "error_count": 0,
+        "total_count": applicant_count,
+        # Distinct strings per applicant, like real parsed resumes
+        "resume_texts": {aid: f"Resume {aid} " + "x" * (resume_kb * 1024) for aid in applicant_ids},
+        "job_requirements": "We need a skilled Python engineer",
+        "current_analysis_response": AIAnalysisResponse(
+            overall_score=0, quality_grade="F", categorization="Mismatched", justification_summary="", applicant_id=0
+        ),
+        "scoring_mode": SCORING_MODE_STRUCTURED,
+        "content_hashes": {aid: f"hash_{aid}" for aid in applicant_ids},
+        "job_requirements_hash": "job_hash",
+        "cache_hit": False,
+    }
+
+
+def measure_run_peak(applicant_count: int, resume_kb: int = 8) -> int:
+    """
+    Peak bytes allocated while running the supervisor graph for applicant_count applicants,
+    excluding the resume texts themselves
+    """
+    ai_logger = logging.getLogger('ai_processing')
+    previous_level = ai_logger.level
+    ai_logger.setLevel(logging.WARNING)
+    try:
+        with override_settings(AI_SCORING_CACHE_ENABLED=False), \
+                patch('hr_assistant.services.ai_analysis.llm') as mock_llm:
+            mock_llm.invoke.return_value = STUB_RESPONSE
+            graph = create_supervisor_graph(async_mode=False)
+            run_config = build_run_config(False, result_writer=DiscardingResultWriter())
+
+            initial_state = build_initial_state(applicant_count, resume_kb)
+            tracemalloc.start()
+            try:
+                baseline, _ = tracemalloc.get_traced_memory()
+                result = graph.invoke(input=initial_state, config=run_config)
+                _, peak = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+            assert len(result["results"]) == applicant_count
+            return peak - baseline
+    finally:
+        ai_logger.setLevel(previous_level)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[250, 500, 1000, 2000])
+    parser.add_argument('--resume-kb', type=int, default=8)
+    args = parser.parse_args()
+
+    print(f"{'applicants':>10} {'peak MB':>10} {'KB/applicant':>13}")
+    for size in args.sizes:
+        peak = measure_run_peak(size, args.resume_kb)
+        print(f"{size:>10} {peak / 1024 / 1024:>10.1f} {peak / 1024 / size:>13.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""
+Cold-start time of Django processes that don't score anything.
+
+Starts fresh interpreters and times `manage.py check` and a process serving its first request
+(the job listing form, which loads the whole URLconf and therefore every view module). Each
+measurement is the wall time of the whole process, so interpreter start-up and imports are included.
+The scoring stack (LangGraph, LangChain, Ollama client) should not be imported by either.
+
+Usage: python -m benchmarks.startup_time [--runs 5]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+FIRST_REQUEST_SCRIPT = """
+import os, sys
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'hr_assistant.settings')
+import django
+django.setup()
+from django.test import Client
+response = Client(HTTP_HOST='localhost').get('/jobs/')
+assert response.status_code == 200, response.status_code
+print(any(name.startswith(('langgraph', 'langchain')) for name in sys.modules))
+"""
+
+CHECK_SCRIPT = """
+import sys
+from django.core.management import execute_from_command_line
+execute_from_command_line(['manage.py', 'check', '-v', '0'])
+print(any(name.startswith(('langgraph', 'langchain')) for name in sys.modules))
+"""
+
+
+def time_process(script: str):
+    """
+    Wall time of a fresh interpreter running script, and whether it imported the scoring stack
+    """
+    env = dict(os.environ, DJANGO_SETTINGS_MODULE='hr_assistant.settings')
+    started = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, '-c', script], cwd=PROJECT_DIR, env=env, capture_output=True, text=True, check=True
+    )
+    elapsed = time.perf_counter() - started
+    return elapsed, completed.stdout.strip().splitlines()[-1] == 'True'
+
+
+def measure(script: str, runs: int):
+    timings = []
+    stack_loaded = False
+    for _ in range(runs):
+        elapsed, stack_loaded = time_process(script)
+        timings.append(elapsed)
+    return statistics.median(timings), min(timings), stack_loaded
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'process':>14} {'median s':>9} {'min s':>7} {'scoring stack':>14}")
+    for name, script in [('manage.py check', CHECK_SCRIPT), ('first request', FIRST_REQUEST_SCRIPT)]:
+        median, fastest, stack_loaded = measure(script, args.runs)
+        print(f"{name:>14} {median:>9.2f} {fastest:>7.2f} {'loaded' if stack_loaded else 'not loaded':>14}")
+
+
+if __name__ == '__main__':
+    main()
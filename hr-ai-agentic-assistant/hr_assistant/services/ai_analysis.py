@@ -3,368 +3,1209 @@ LangGraph implementation for AI Resume Scoring Engine with Map-Reduce pattern
 """
 from langgraph.graph import StateGraph, END, START
 from langgraph.types import Send
-from langchain_ollama import ChatOllama
-from .contracts import GraphState, AIAnalysisResponse
-import os
-import django
+from langchain_core.runnables import RunnableConfig
+from .contracts import (
+    GraphState, WorkerOutputState, AIAnalysisResponse, SCORING_MODE_BATCHED, SCORING_MODE_MULTI_CALL,
+    SCORING_MODE_STRUCTURED, get_batch_analysis_schema, get_categorization_schema,
+    get_structured_analysis_schema
+)
+from .concurrency import create_run_limiter
+from .result_persistence import IncrementalResultWriter
+from typing import Any, Dict, List
+import asyncio
+import json
 import logging
+import re
+import threading
 
-# Setup Django environment once at module level
-os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'hr_assistant.settings')
-django.setup()
-
-# Import Django models after setting up Django
+from django.conf import settings
 from jobs.models import Applicant
+from . import analysis_cache
+from .skill_coverage import format_skill_coverage
+from .lazy_justification import JUSTIFICATION_PENDING_KEY
+from .rule_derivation import derive_categorization, derive_quality_grade
+from .categorization import OUTCOME_EXACT, categorization_stats, normalize_category
+from .generation import acomplete, complete, json_answer_complete
+from .llm_backends import get_backend
+from .resilience import LLMUnavailableError, acall_llm, call_llm
+from .batch_scoring import pack_batches
+from .model_cascade import build_tier_details, get_default_model, in_escalation_band, model_signature
+from jobs.services.resume_parser import format_resume_facts
 
 # Import logger for node-level logging
 ai_logger = logging.getLogger('ai_processing')
 
-# Initialize the Ollama model
-llm = ChatOllama(
-    model="llama2",  # Default model, can be configured
-    temperature=0.1,
-)
+# Chat client for AI_SCORING_MODEL, created on first use by get_llm()
+llm = None
+# Chat clients for the other models selected per node or cascade tier, by model name
+_llm_clients: Dict[str, Any] = {}
+_llm_lock = threading.Lock()
+
+# Recorded for applicants whose analysis failed; the node logs hold the cause
+ANALYSIS_FAILED_MESSAGE = "AI analysis failed, see the ai_processing log"
 
-def data_retrieval_node(state: GraphState) -> GraphState:
+
+def get_llm(model: str = None):
+    """
+    Return the process-wide chat client for a model (AI_SCORING_MODEL by default), creating it with the
+    configured LLM backend on the first LLM call
+    """
+    global llm
+    if model is None or model == get_default_model():
+        if llm is None:
+            with _llm_lock:
+                if llm is None:
+                    llm = get_backend().create_client(get_default_model())  # Default model, configured in settings
+        return llm
+
+    client = _llm_clients.get(model)
+    if client is None:
+        with _llm_lock:
+            client = _llm_clients.get(model)
+            if client is None:
+                client = _llm_clients[model] = get_backend().create_client(model)
+    return client
+
+
+def _configurable(config) -> Dict[str, Any]:
+    if not config:
+        return {}
+    return config.get("configurable", {})
+
+
+def _lazy_justification(config) -> bool:
+    """Whether the run leaves justifications to be generated on demand"""
+    return bool(_configurable(config).get("lazy_justification"))
+
+
+def _rule_derivation(config) -> bool:
+    """Whether the run derives grades and categories by rules instead of asking the LLM"""
+    return bool(_configurable(config).get("rule_derivation"))
+
+
+def _node_model(config, node: str):
+    """
+    Model selected for a worker node by the run config, or None for AI_SCORING_MODEL
+    """
+    return (_configurable(config).get("node_models") or {}).get(node)
+
+
+def data_retrieval_node(state: GraphState):
     """
     Worker node: Retrieves pre-parsed raw resume text from Applicant model
     """
     current_idx = state.get("current_index", 0)
-    error_count = state.get("error_count", 0)
+    update = {"current_index": current_idx + 1}
 
     ai_logger.info(f"[Data Retrieval Node] Starting data retrieval for index {current_idx}")
 
     if current_idx < len(state.get("applicant_id_list", [])):
         applicant_id = state["applicant_id_list"][current_idx]
-        ai_logger.info(f"[Data Retrieval Node] Retrieving data for applicant {applicant_id}")
+        prefetched_text = state.get("resume_texts", {}).get(applicant_id)
 
-        try:
-            # Retrieve applicant and their resume text
-            applicant = Applicant.objects.get(id=applicant_id)
-            resume_text = applicant.parsed_resume_text or str(applicant.resume_file)  # Fallback to file path if parsed text not available
+        if prefetched_text:
+            # The supervisor already loaded this resume, so skip the per-applicant query
+            ai_logger.info(f"[Data Retrieval Node] Using prefetched resume text for applicant {applicant_id}, resume length: {len(prefetched_text)}")
+        else:
+            ai_logger.info(f"[Data Retrieval Node] Retrieving data for applicant {applicant_id}")
 
-            # Update resume_texts in state
-            resume_texts = state.get("resume_texts", {})
-            resume_texts[applicant_id] = resume_text
-            state["resume_texts"] = resume_texts
+            try:
+                # Retrieve applicant and their resume text
+                applicant = Applicant.objects.get(id=applicant_id)
+                resume_text = applicant.parsed_resume_text or str(applicant.resume_file)  # Fallback to file path if parsed text not available
 
-            ai_logger.info(f"[Data Retrieval Node] Successfully retrieved data for applicant {applicant_id}, resume length: {len(resume_text) if resume_text else 0}")
+                # Add this applicant's resume text to the worker state
+                update["resume_texts"] = {applicant_id: resume_text}
 
-        except Exception as e:
-            ai_logger.error(f"[Data Retrieval Node] Error retrieving data for applicant {applicant_id}: {str(e)}")
-            error_count += 1
+                ai_logger.info(f"[Data Retrieval Node] Successfully retrieved data for applicant {applicant_id}, resume length: {len(resume_text) if resume_text else 0}")
 
-    state["current_index"] = current_idx + 1
-    state["error_count"] = error_count
+            except Exception as e:
+                ai_logger.error(f"[Data Retrieval Node] Error retrieving data for applicant {applicant_id}: {str(e)}")
+                update["error_count"] = 1
 
-    ai_logger.info(f"[Data Retrieval Node] Completed, next index: {state['current_index']}, error count: {state['error_count']}")
-    return state
+    ai_logger.info(f"[Data Retrieval Node] Completed, next index: {update['current_index']}, retrieval errors: {update.get('error_count', 0)}")
+    return update
 
 
-def scoring_grading_node(state: GraphState) -> GraphState:
+def _current_applicant_id(state: GraphState):
     """
-    Worker node: Calls Ollama to calculate overall_score and quality_grade
+    Return the applicant processed by this worker, or None if there is nothing to process.
+    data_retrieval_node has already advanced current_index, so step back by one.
     """
-    current_idx = state.get("current_index", 0)
+    current_idx = max(0, state.get("current_index", 0) - 1)
     applicant_id_list = state.get("applicant_id_list", [])
+    if current_idx < len(applicant_id_list):
+        return applicant_id_list[current_idx]
+    return None
+
+
+def _get_analysis_response(state: GraphState, applicant_id: int) -> AIAnalysisResponse:
+    """
+    Return the worker's in-progress AIAnalysisResponse, initializing it if not present
+    """
+    if "current_analysis_response" not in state:
+        state["current_analysis_response"] = AIAnalysisResponse(
+            overall_score=0,
+            quality_grade="F",
+            categorization="Mismatched",
+            justification_summary="",
+            applicant_id=applicant_id
+        )
+    return state["current_analysis_response"]
+
+
+def _skill_coverage_section(state: GraphState, applicant_id: int) -> str:
+    """
+    Prompt lines listing the required skills found and missing in the applicant's resume
+    """
+    return format_skill_coverage(state.get("skill_coverage", {}).get(applicant_id))
 
-    ai_logger.info(f"[Scoring Grading Node] Starting scoring and grading for index {current_idx}")
 
-    if current_idx <= len(applicant_id_list):
-        current_idx = max(0, current_idx - 1)  # Adjust for the increment in previous node
+def _resume_facts_section(state: GraphState, applicant_id: int) -> str:
+    """
+    Prompt lines with the structured facts extracted from the applicant's resume at upload
+    """
+    return format_resume_facts(state.get("resume_facts", {}).get(applicant_id))
 
-        if current_idx < len(applicant_id_list):
-            applicant_id = applicant_id_list[current_idx]
-            state_resume_text = state["resume_texts"].get(applicant_id, "")
-            state_job_requirements = state.get("job_requirements", "")
 
-            ai_logger.info(f"[Scoring Grading Node] Processing applicant {applicant_id}, resume length: {len(state_resume_text)}, job requirements length: {len(state_job_requirements)}")
+def _prepare_scoring_grading(state: GraphState):
+    """
+    Build the scoring and grading prompt for the current applicant
+    """
+    applicant_id = _current_applicant_id(state)
+    if applicant_id is None:
+        return None
 
-            # Prepare the prompt for scoring and grading
-            scoring_prompt = """
-            Analyze the following resume against these job requirements:
+    state_resume_text = state["resume_texts"].get(applicant_id, "")
+    state_job_requirements = state.get("job_requirements", "")
 
-            Job Requirements: {job_requirements}
+    ai_logger.info(f"[Scoring Grading Node] Processing applicant {applicant_id}, resume length: {len(state_resume_text)}, job requirements length: {len(state_job_requirements)}")
 
-            Resume: {resume_text}
+    # Prepare the prompt for scoring and grading
+    scoring_prompt = """
+    Analyze the following resume against these job requirements:
 
-            Based on how well the resume matches the job requirements, provide:
-            1. An overall score from 0-100 (where 100 is perfect match)
-            2. A quality grade (A, B, C, D, or F)
+    Job Requirements: {job_requirements}
 
-            Respond in the following format:
-            Overall Score: [number]
-            Quality Grade: [letter]
-            """
+    Resume: {resume_text}
+    {skill_coverage}{resume_facts}
+    Based on how well the resume matches the job requirements, provide:
+    1. An overall score from 0-100 (where 100 is perfect match)
+    2. A quality grade (A, B, C, D, or F)
 
-            try:
-                prompt = scoring_prompt.format(job_requirements=state_job_requirements, resume_text=state_resume_text)
-                ai_logger.info(f"[Scoring Grading Node] Sending request to LLM for applicant {applicant_id}")
-                response = llm.invoke(prompt)
-                response_text = response.content
+    Respond in the following format:
+    Overall Score: [number]
+    Quality Grade: [letter]
+    """
+    return applicant_id, scoring_prompt.format(job_requirements=state_job_requirements, resume_text=state_resume_text, skill_coverage=_skill_coverage_section(state, applicant_id), resume_facts=_resume_facts_section(state, applicant_id))
+
+
+# Finished lines of the scoring response; a line is finished once the newline after it has arrived
+SCORE_LINE_PATTERN = re.compile(r"Overall Score:[^\n]*\d[^\n]*\n")
+GRADE_LINE_PATTERN = re.compile(r"Quality Grade:[^\n]*\w[^\n]*\n")
+
+
+def _scoring_completion_check(rule_derivation: bool = False):
+    """
+    Early-stop check of the scoring call: the score line, and the grade line unless the grade is derived by rules
+    """
+    def is_complete(text: str) -> bool:
+        if not SCORE_LINE_PATTERN.search(text):
+            return False
+        return rule_derivation or bool(GRADE_LINE_PATTERN.search(text))
+    return is_complete
 
-                ai_logger.info(f"[Scoring Grading Node] LLM response received for applicant {applicant_id}: {response_text[:100]}...")
 
-                # Parse the response to extract score and grade
-                lines = response_text.split("\n")
+def _parse_scoring_grading(state: GraphState, applicant_id: int, response_text: str, rule_derivation: bool = False):
+    """
+    Parse the score and grade out of the LLM response and store them in the analysis response.
+    With rule_derivation the grade follows from the score instead.
+    """
+    ai_logger.info(f"[Scoring Grading Node] LLM response received for applicant {applicant_id}: {response_text[:100]}...")
+
+    # Parse the response to extract score and grade
+    lines = response_text.split("\n")
+    overall_score = 0
+    quality_grade = "F"
+
+    for line in lines:
+        if "Overall Score:" in line:
+            try:
+                overall_score = int(line.split(":")[1].strip())
+            except:
                 overall_score = 0
-                quality_grade = "F"
-
-                for line in lines:
-                    if "Overall Score:" in line:
-                        try:
-                            overall_score = int(line.split(":")[1].strip())
-                        except:
-                            overall_score = 0
-                    elif "Quality Grade:" in line:
-                        quality_grade = line.split(":")[1].strip()
-
-                ai_logger.info(f"[Scoring Grading Node] Parsed score: {overall_score}, grade: {quality_grade} for applicant {applicant_id}")
-
-                # Check if current_analysis_response exists in state before accessing it
-                if "current_analysis_response" not in state:
-                    # Initialize if not present
-                    state["current_analysis_response"] = AIAnalysisResponse(
-                        overall_score=0,
-                        quality_grade="F",
-                        categorization="Mismatched",
-                        justification_summary="",
-                        applicant_id=applicant_id
-                    )
-
-                # Store results in the current analysis response 
-                state["current_analysis_response"].overall_score = overall_score
-                state["current_analysis_response"].quality_grade = quality_grade
-                return state
-            except Exception as e:
-                ai_logger.error(f"[Scoring Grading Node] Error in scoring_grading_node for applicant {applicant_id}: {str(e)}")
+        elif "Quality Grade:" in line:
+            quality_grade = line.split(":")[1].strip()
+
+    if rule_derivation:
+        quality_grade = derive_quality_grade(overall_score)
+
+    ai_logger.info(f"[Scoring Grading Node] Parsed score: {overall_score}, grade: {quality_grade} for applicant {applicant_id}")
+
+    # Store results in a copy of the current analysis response: the categorization branch runs in parallel
+    analysis_response = _get_analysis_response(state, applicant_id).model_copy(
+        update={"overall_score": overall_score, "quality_grade": quality_grade}
+    )
+    return {"current_analysis_response": analysis_response}
+
+
+def _scoring_grading_failed(state: GraphState, applicant_id: int, error: Exception):
+    """
+    Record a failed scoring call: the worker's error count keeps the placeholder score 0 / grade F
+    out of the cache and the database, and the applicant is marked as failed instead
+    """
+    ai_logger.error(f"[Scoring Grading Node] Error in scoring_grading_node for applicant {applicant_id}: {str(error)}")
+
+    analysis_response = _get_analysis_response(state, applicant_id).model_copy(
+        update={"overall_score": 0, "quality_grade": "F"}
+    )
+    return {"current_analysis_response": analysis_response, "error_count": 1}
 
-                # Check if current_analysis_response exists in state before accessing it
-                if "current_analysis_response" not in state:
-                    # Initialize if not present
-                    state["current_analysis_response"] = AIAnalysisResponse(
-                        overall_score=0,
-                        quality_grade="F",
-                        categorization="Mismatched",
-                        justification_summary="",
-                        applicant_id=applicant_id
-                    )
 
-                # Store results in the current analysis response 
-                state["current_analysis_response"].overall_score = 0
-                state["current_analysis_response"].quality_grade = "F"
-                return state
+def scoring_grading_node(state: GraphState, config: RunnableConfig = None):
+    """
+    Worker node: Calls Ollama to calculate overall_score and quality_grade
+    """
+    ai_logger.info(f"[Scoring Grading Node] Starting scoring and grading for index {state.get('current_index', 0)}")
+
+    request = _prepare_scoring_grading(state)
+    if request is None:
+        ai_logger.info(f"[Scoring Grading Node] Completed without processing applicant")
+        return {}
+
+    applicant_id, prompt = request
+    try:
+        ai_logger.info(f"[Scoring Grading Node] Sending request to LLM for applicant {applicant_id}")
+        response_text = call_llm(config, "scoring_grading", lambda: complete(
+            get_llm(_node_model(config, "scoring_grading")), prompt, "scoring_grading",
+            _scoring_completion_check(_rule_derivation(config))
+        ))
+        return _parse_scoring_grading(state, applicant_id, response_text, _rule_derivation(config))
+    except LLMUnavailableError:
+        raise
+    except Exception as e:
+        return _scoring_grading_failed(state, applicant_id, e)
+
+
+async def ascoring_grading_node(state: GraphState, config: RunnableConfig = None):
+    """
+    Async worker node: scoring_grading_node using ainvoke
+    """
+    ai_logger.info(f"[Scoring Grading Node] Starting scoring and grading for index {state.get('current_index', 0)}")
+
+    request = _prepare_scoring_grading(state)
+    if request is None:
+        ai_logger.info(f"[Scoring Grading Node] Completed without processing applicant")
+        return {}
+
+    applicant_id, prompt = request
+    try:
+        ai_logger.info(f"[Scoring Grading Node] Sending request to LLM for applicant {applicant_id}")
+        response_text = await acall_llm(config, "scoring_grading", lambda: acomplete(
+            get_llm(_node_model(config, "scoring_grading")), prompt, "scoring_grading",
+            _scoring_completion_check(_rule_derivation(config))
+        ))
+        return _parse_scoring_grading(state, applicant_id, response_text, _rule_derivation(config))
+    except LLMUnavailableError:
+        raise
+    except Exception as e:
+        return _scoring_grading_failed(state, applicant_id, e)
+
+
+def _prepare_categorization(state: GraphState):
+    """
+    Build the categorization prompt for the current applicant
+    """
+    applicant_id = _current_applicant_id(state)
+    if applicant_id is None:
+        return None
+
+    state_resume_text = state["resume_texts"].get(applicant_id, "")
+    state_job_requirements = state.get("job_requirements", "")
+
+    ai_logger.info(f"[Categorization Node] Processing applicant {applicant_id}, resume length: {len(state_resume_text)}, job requirements length: {len(state_job_requirements)}")
+
+    # Seniority depends on experience, titles and education, so the compact facts stand in for the raw text when available
+    resume_section = _resume_facts_section(state, applicant_id) or f"Resume: {state_resume_text}\n"
+
+    # Prepare the prompt for categorization
+    categorization_prompt = """
+    Based on the following resume and job requirements, categorize the candidate:
+
+    Job Requirements: {job_requirements}
+
+    {resume_section}
+    Categorize as one of: Senior, Mid-Level, Junior, or Mismatched
+
+    Respond in JSON with the category name in the "categorization" field.
+    """
+    return applicant_id, categorization_prompt.format(job_requirements=state_job_requirements, resume_section=resume_section)
+
+
+def _normalize_categorization(state: GraphState, applicant_id: int, response_text: str) -> str:
+    """
+    Read the category out of the answer, tolerating case, punctuation and synonyms. An answer naming
+    no category is replaced by the rule-derived category rather than sent back to the LLM.
+    """
+    categorization, outcome = normalize_category(response_text)
+    categorization_stats.increment(outcome)
+    if outcome == OUTCOME_EXACT:
+        ai_logger.info(f"[Categorization Node] Valid category for applicant {applicant_id}: '{categorization}'")
+    elif categorization is not None:
+        ai_logger.info(f"[Categorization Node] Normalized answer '{response_text.strip()[:50]}' to '{categorization}' for applicant {applicant_id}")
+    else:
+        categorization = derive_categorization(
+            state.get("resume_facts", {}).get(applicant_id), state.get("skill_coverage", {}).get(applicant_id)
+        )
+        ai_logger.warning(f"[Categorization Node] Unrecognized answer '{response_text.strip()[:50]}' for applicant {applicant_id}, using rule-based category '{categorization}'")
+    return categorization
+
+
+def _categorization_complete(state: GraphState, applicant_id: int, categorization: str):
+    """
+    Store the category in a copy of the analysis response: the scoring branch runs in parallel
+    """
+    analysis_response = _get_analysis_response(state, applicant_id).model_copy(update={"categorization": categorization})
+    return {"current_analysis_response": analysis_response}
+
+
+def _categorization_failed(state: GraphState, applicant_id: int, error: Exception):
+    """
+    Record a failed categorization call as Mismatched
+    """
+    ai_logger.error(f"[Categorization Node] Error in categorization_node for applicant {applicant_id}: {str(error)}")
+    return {**_categorization_complete(state, applicant_id, "Mismatched"), "error_count": 1}
+
+
+def _categorization_by_rules(state: GraphState):
+    """
+    Derive the category from the resume facts and skill coverage without calling the LLM
+    """
+    applicant_id = _current_applicant_id(state)
+    if applicant_id is None:
+        ai_logger.info(f"[Categorization Node] Completed without processing applicant")
+        return {}
 
-    ai_logger.info(f"[Scoring Grading Node] Completed without processing applicant")
-    return state
+    categorization = derive_categorization(
+        state.get("resume_facts", {}).get(applicant_id), state.get("skill_coverage", {}).get(applicant_id)
+    )
+    ai_logger.info(f"[Categorization Node] Rule-based category for applicant {applicant_id}: '{categorization}'")
+    return _categorization_complete(state, applicant_id, categorization)
 
 
-def categorization_node(state: GraphState) -> GraphState:
+def categorization_node(state: GraphState, config: RunnableConfig = None):
     """
     Worker node: Calls Ollama to assign categorization
     """
-    current_idx = state.get("current_index", 0)
-    applicant_id_list = state.get("applicant_id_list", [])
+    ai_logger.info(f"[Categorization Node] Starting categorization for index {state.get('current_index', 0)}")
+
+    if _rule_derivation(config):
+        return _categorization_by_rules(state)
+
+    request = _prepare_categorization(state)
+    if request is None:
+        ai_logger.info(f"[Categorization Node] Completed without processing applicant")
+        return {}
+
+    applicant_id, prompt = request
+    try:
+        ai_logger.info(f"[Categorization Node] Sending request to LLM for applicant {applicant_id}")
+        response_text = call_llm(config, "categorization", lambda: complete(
+            get_llm(_node_model(config, "categorization")), prompt, "categorization", json_answer_complete,
+            format=get_categorization_schema()
+        ))
+        categorization = _normalize_categorization(state, applicant_id, response_text)
+        return _categorization_complete(state, applicant_id, categorization)
+    except LLMUnavailableError:
+        raise
+    except Exception as e:
+        return _categorization_failed(state, applicant_id, e)
+
+
+async def acategorization_node(state: GraphState, config: RunnableConfig = None):
+    """
+    Async worker node: categorization_node using ainvoke
+    """
+    ai_logger.info(f"[Categorization Node] Starting categorization for index {state.get('current_index', 0)}")
+
+    if _rule_derivation(config):
+        return _categorization_by_rules(state)
+
+    request = _prepare_categorization(state)
+    if request is None:
+        ai_logger.info(f"[Categorization Node] Completed without processing applicant")
+        return {}
+
+    applicant_id, prompt = request
+    try:
+        ai_logger.info(f"[Categorization Node] Sending request to LLM for applicant {applicant_id}")
+        response_text = await acall_llm(config, "categorization", lambda: acomplete(
+            get_llm(_node_model(config, "categorization")), prompt, "categorization", json_answer_complete,
+            format=get_categorization_schema()
+        ))
+        categorization = _normalize_categorization(state, applicant_id, response_text)
+        return _categorization_complete(state, applicant_id, categorization)
+    except LLMUnavailableError:
+        raise
+    except Exception as e:
+        return _categorization_failed(state, applicant_id, e)
+
+
+def _prepare_justification(state: GraphState):
+    """
+    Build the justification prompt from the scores produced by the previous nodes
+    """
+    applicant_id = _current_applicant_id(state)
+    if applicant_id is None:
+        return None
 
-    ai_logger.info(f"[Categorization Node] Starting categorization for index {current_idx}")
+    state_resume_text = state["resume_texts"].get(applicant_id, "")
+    state_job_requirements = state.get("job_requirements", "")
+    state_overall_score = state["current_analysis_response"].overall_score
+    state_quality_grade = state["current_analysis_response"].quality_grade
+    state_categorization = state["current_analysis_response"].categorization
 
-    if current_idx <= len(applicant_id_list):
-        current_idx = max(0, current_idx - 1)  # Adjust for the increment in previous node
+    ai_logger.info(f"[Justification Node] Processing applicant {applicant_id}, resume length: {len(state_resume_text)}, score: {state_overall_score}, grade: {state_quality_grade}, category: {state_categorization}")
 
-        if current_idx < len(applicant_id_list):
-            applicant_id = applicant_id_list[current_idx]
-            state_resume_text = state["resume_texts"].get(applicant_id, "")
-            state_job_requirements = state.get("job_requirements", "")
+    # Prepare the prompt for justification
+    justification_prompt = """
+    Provide a brief justification for the scores given to this candidate:
 
-            ai_logger.info(f"[Categorization Node] Processing applicant {applicant_id}, resume length: {len(state_resume_text)}, job requirements length: {len(state_job_requirements)}")
+    Job Requirements: {job_requirements}
 
-            # Prepare the prompt for categorization
-            categorization_prompt = """
-            Based on the following resume and job requirements, categorize the candidate:
+    Resume: {resume_text}
+    {skill_coverage}{resume_facts}
+    Overall Score: {overall_score}
+    Quality Grade: {quality_grade}
+    Categorization: {categorization}
 
-            Job Requirements: {job_requirements}
+    Explain in 1-2 sentences why these scores were given, mentioning specific strengths or weaknesses.
+    """
+    return applicant_id, justification_prompt.format(job_requirements=state_job_requirements, resume_text=state_resume_text, overall_score=state_overall_score, quality_grade=state_quality_grade, categorization=state_categorization, skill_coverage=_skill_coverage_section(state, applicant_id), resume_facts=_resume_facts_section(state, applicant_id))
 
-            Resume: {resume_text}
 
-            Categorize as one of: Senior, Mid-Level, Junior, or Mismatched
+def _justification_complete(state: GraphState, applicant_id: int, justification: str):
+    """
+    Store the justification and emit the finished analysis response as this worker's result
+    """
+    # A copy, so the response held by the state, the reducer and the checkpoint is never changed in place
+    analysis_response = _get_analysis_response(state, applicant_id).model_copy(
+        update={"justification_summary": justification}
+    )
 
-            Respond with only the category name.
-            """
+    ai_logger.info(f"Merging Analysis Response For Applicant: {applicant_id}")
+    return {"results": [analysis_response]}
 
-            try:
-                prompt = categorization_prompt.format(job_requirements=state_job_requirements, resume_text=state_resume_text)
-                ai_logger.info(f"[Categorization Node] Sending request to LLM for applicant {applicant_id}")
-                response = llm.invoke(prompt)
-                response_categorization = response.content.strip()
-
-                ai_logger.info(f"[Categorization Node] Initial LLM response for applicant {applicant_id}: '{response_categorization}'")
-
-                # Validate the category
-                valid_categories = ["Senior", "Mid-Level", "Junior", "Mismatched"]
-                if response_categorization not in valid_categories:
-                    # Use Ollama again to get a valid category
-                    validation_prompt = """
-                    The category {categorization} is not valid. Choose one of: Senior, Mid-Level, Junior, or Mismatched
-                    Based on this resume: {resume_text}
-
-                    Respond with only the valid category name.
-                    """
-                    ai_logger.info(f"[Categorization Node] Invalid category '{response_categorization}', requesting validation for applicant {applicant_id}")
-                    prompt = validation_prompt.format(categorization=response_categorization, resume_text=state_resume_text)
-                    response = llm.invoke(prompt)
-                    categorization = response.content.strip()
-                    ai_logger.info(f"[Categorization Node] Validated category for applicant {applicant_id}: '{categorization}'")
-                else:
-                    categorization = response_categorization
-                    ai_logger.info(f"[Categorization Node] Valid category for applicant {applicant_id}: '{categorization}'")
-
-                # Check if current_analysis_response exists in state before accessing it
-                if "current_analysis_response" not in state:
-                    # Initialize if not present
-                    state["current_analysis_response"] = AIAnalysisResponse(
-                        overall_score=0,
-                        quality_grade="F",
-                        categorization="Mismatched",
-                        justification_summary="",
-                        applicant_id=applicant_id
-                    )
-
-                # Store results in the current analysis response 
-                state["current_analysis_response"].categorization = categorization
-
-                return state
-            except Exception as e:
-                ai_logger.error(f"[Categorization Node] Error in categorization_node for applicant {applicant_id}: {str(e)}")
 
-                # Check if current_analysis_response exists in state before accessing it
-                if "current_analysis_response" not in state:
-                    # Initialize if not present
-                    state["current_analysis_response"] = AIAnalysisResponse(
-                        overall_score=0,
-                        quality_grade="F",
-                        categorization="Mismatched",
-                        justification_summary="",
-                        applicant_id=applicant_id
-                    )
+def _justification_without_applicant(state: GraphState):
+    ai_logger.info(f"[Justification Node] Completed without processing applicant")
+    analysis_response = state["current_analysis_response"].model_copy(
+        update={"justification_summary": "[Justification Node] Completed without processing applicant"}
+    )
+    return {"results": [analysis_response]}
 
-                # Store results in the current analysis response 
-                state["current_analysis_response"].categorization = "Mismatched"
 
-                return state
+def _justification_deferred(state: GraphState):
+    """
+    Emit the analysis without a justification; it is generated on demand, see lazy_justification
+    """
+    applicant_id = _current_applicant_id(state)
+    if applicant_id is None:
+        return _justification_without_applicant(state)
+    ai_logger.info(f"[Justification Node] Deferring justification for applicant {applicant_id}")
+    return _justification_complete(state, applicant_id, "")
 
-    ai_logger.info(f"[Categorization Node] Completed without processing applicant")
-    return state
+
+def _justification_after_failure(state: GraphState, applicant_id: int):
+    """
+    Skip the justification of an applicant whose scoring or categorization failed, as it won't be persisted
+    """
+    ai_logger.info(f"[Justification Node] Skipping justification for applicant {applicant_id} because its analysis failed")
+    return _justification_complete(state, applicant_id, "")
 
 
-def justification_node(state: GraphState):
+def generate_justification(state: GraphState) -> str:
+    """
+    Generate one applicant's justification outside a scoring run, from a state built by
+    lazy_justification.build_justification_state
+    """
+    applicant_id, prompt = _prepare_justification(state)
+    model = (getattr(settings, 'AI_SCORING_NODE_MODELS', {}) or {}).get("justification")
+    ai_logger.info(f"[Justification Node] Generating on-demand justification for applicant {applicant_id}")
+    response_text = call_llm(None, "justification", lambda: complete(get_llm(model), prompt, "justification"))
+    return response_text.strip()
+
+
+def justification_node(state: GraphState, config: RunnableConfig = None):
     """
     Worker node: Calls Ollama to generate justification_summary
     """
-    current_idx = state.get("current_index", 0)
-    applicant_id_list = state.get("applicant_id_list", [])
+    ai_logger.info(f"[Justification Node] Starting justification for index {state.get('current_index', 0)}")
 
-    ai_logger.info(f"[Justification Node] Starting justification for index {current_idx}")
+    if _lazy_justification(config):
+        return _justification_deferred(state)
 
-    if current_idx <= len(applicant_id_list):
-        current_idx = max(0, current_idx - 1)  # Adjust for previous increment
+    request = _prepare_justification(state)
+    if request is None:
+        return _justification_without_applicant(state)
 
-        if current_idx < len(applicant_id_list):
-            applicant_id = applicant_id_list[current_idx]
-            state_resume_text = state["resume_texts"].get(applicant_id, "")
-            state_job_requirements = state.get("job_requirements", "")
-            state_overall_score = state["current_analysis_response"].overall_score
-            state_quality_grade = state["current_analysis_response"].quality_grade
-            state_categorization = state["current_analysis_response"].categorization
+    applicant_id, prompt = request
+    if state.get("error_count", 0) > 0:
+        return _justification_after_failure(state, applicant_id)
+    try:
+        ai_logger.info(f"[Justification Node] Sending justification request to LLM for applicant {applicant_id}")
+        response_text = call_llm(config, "justification", lambda: complete(get_llm(_node_model(config, "justification")), prompt, "justification"))
+        justification = response_text.strip()
 
-            ai_logger.info(f"[Justification Node] Processing applicant {applicant_id}, resume length: {len(state_resume_text)}, score: {state_overall_score}, grade: {state_quality_grade}, category: {state_categorization}")
+        ai_logger.info(f"[Justification Node] Received justification for applicant {applicant_id}: '{justification[:100]}...'")
+        return _justification_complete(state, applicant_id, justification)
+    except LLMUnavailableError:
+        raise
+    except Exception as e:
+        ai_logger.error(f"[Justification Node] Error in justification_node for applicant {applicant_id}: {str(e)}")
+        return {**_justification_complete(state, applicant_id, f"Error processing: {str(e)}"), "error_count": 1}
 
-            # Prepare the prompt for justification
-            justification_prompt = """
-            Provide a brief justification for the scores given to this candidate:
 
-            Job Requirements: {job_requirements}
+async def ajustification_node(state: GraphState, config: RunnableConfig = None):
+    """
+    Async worker node: justification_node using ainvoke
+    """
+    ai_logger.info(f"[Justification Node] Starting justification for index {state.get('current_index', 0)}")
 
-            Resume: {resume_text}
+    if _lazy_justification(config):
+        return _justification_deferred(state)
 
-            Overall Score: {overall_score}
-            Quality Grade: {quality_grade}
-            Categorization: {categorization}
+    request = _prepare_justification(state)
+    if request is None:
+        return _justification_without_applicant(state)
 
-            Explain in 1-2 sentences why these scores were given, mentioning specific strengths or weaknesses.
-            """
+    applicant_id, prompt = request
+    if state.get("error_count", 0) > 0:
+        return _justification_after_failure(state, applicant_id)
+    try:
+        ai_logger.info(f"[Justification Node] Sending justification request to LLM for applicant {applicant_id}")
+        response_text = await acall_llm(config, "justification", lambda: acomplete(get_llm(_node_model(config, "justification")), prompt, "justification"))
+        justification = response_text.strip()
 
-            try:
-                prompt = justification_prompt.format(job_requirements=state_job_requirements, resume_text=state_resume_text, overall_score=state_overall_score, quality_grade=state_quality_grade, categorization=state_categorization)
-                ai_logger.info(f"[Justification Node] Sending justification request to LLM for applicant {applicant_id}")
-                response = llm.invoke(prompt)
-                justification = response.content.strip()
-
-                ai_logger.info(f"[Justification Node] Received justification for applicant {applicant_id}: '{justification[:100]}...'")
-
-                # Create the AIAnalysisResponse object if not already created 
-                if "current_analysis_response" not in state:
-                    # Initialize if not present
-                    state["current_analysis_response"] = AIAnalysisResponse(
-                        overall_score=0,
-                        quality_grade="F",
-                        categorization="Mismatched",
-                        justification_summary="",
-                        applicant_id=applicant_id
-                    )
-
-                # Store in the currently available AIAnalysisResponse object in the graph's state
-                state["current_analysis_response"].justification_summary = justification
-
-                ai_logger.info(f"Merging Analysis Response For Applicant: {applicant_id}")
-                return {"results": [state["current_analysis_response"]]}
-            except Exception as e:
-                ai_logger.error(f"[Justification Node] Error in justification_node for applicant {applicant_id}: {str(e)}")
+        ai_logger.info(f"[Justification Node] Received justification for applicant {applicant_id}: '{justification[:100]}...'")
+        return _justification_complete(state, applicant_id, justification)
+    except LLMUnavailableError:
+        raise
+    except Exception as e:
+        ai_logger.error(f"[Justification Node] Error in justification_node for applicant {applicant_id}: {str(e)}")
+        return {**_justification_complete(state, applicant_id, f"Error processing: {str(e)}"), "error_count": 1}
 
-                # Check if current_analysis_response exists in state before accessing it
-                if "current_analysis_response" not in state:
-                    # Initialize if not present
-                    state["current_analysis_response"] = AIAnalysisResponse(
-                        overall_score=0,
-                        quality_grade="F",
-                        categorization="Mismatched",
-                        justification_summary="",
-                        applicant_id=applicant_id
-                    )
 
-                # Store results in the current analysis response 
-                state["current_analysis_response"].justification_summary = f"Error processing: {str(e)}"
+def _prepare_structured_analysis(state: GraphState, lazy_justification: bool = False):
+    """
+    Build the single structured analysis prompt for the current applicant
+    """
+    applicant_id = _current_applicant_id(state)
+    if applicant_id is None:
+        return None
 
-                return {"results": [state["current_analysis_response"]]}
+    state_resume_text = state["resume_texts"].get(applicant_id, "")
+    state_job_requirements = state.get("job_requirements", "")
 
-    ai_logger.info(f"[Justification Node] Completed without processing applicant")
-    state["current_analysis_response"].justification_summary = "[Justification Node] Completed without processing applicant"
-    return {"results": [state["current_analysis_response"]]}
+    ai_logger.info(f"[Structured Analysis Node] Processing applicant {applicant_id}, resume length: {len(state_resume_text)}, job requirements length: {len(state_job_requirements)}")
+
+    # Prepare the prompt for the single structured analysis call
+    structured_prompt = """
+    Analyze the following resume against these job requirements:
+
+    Job Requirements: {job_requirements}
+
+    Resume: {resume_text}
+    {skill_coverage}{resume_facts}
+    Respond with a JSON object containing:
+    - overall_score: an integer from 0-100 (where 100 is perfect match)
+    - quality_grade: one of A, B, C, D, or F
+    - categorization: one of Senior, Mid-Level, Junior, or Mismatched
+    {justification_field}"""
+    # On-demand justifications are generated later, so the batch call doesn't ask for one
+    justification_field = "" if lazy_justification else "- justification_summary: 1-2 sentences explaining the scores, mentioning specific strengths or weaknesses\n    "
+    return applicant_id, structured_prompt.format(job_requirements=state_job_requirements, resume_text=state_resume_text, skill_coverage=_skill_coverage_section(state, applicant_id), resume_facts=_resume_facts_section(state, applicant_id), justification_field=justification_field)
+
+
+def _parse_structured_analysis(applicant_id: int, response_text: str, lazy_justification: bool = False):
+    """
+    Validate the JSON straight into the data contract and emit it as this worker's result
+    """
+    ai_logger.info(f"[Structured Analysis Node] LLM response received for applicant {applicant_id}: {response_text[:100]}...")
+
+    payload = json.loads(response_text)
+    payload["applicant_id"] = applicant_id
+    if lazy_justification:
+        payload["justification_summary"] = ""
+    analysis_response = AIAnalysisResponse.model_validate(payload)
+
+    ai_logger.info(f"[Structured Analysis Node] Parsed score: {analysis_response.overall_score}, grade: {analysis_response.quality_grade}, category: {analysis_response.categorization} for applicant {applicant_id}")
+    return {"results": [analysis_response]}
+
+
+def _structured_analysis_failed(applicant_id: int, error: Exception):
+    """
+    Record a failed or invalid structured call as the default error result
+    """
+    ai_logger.error(f"[Structured Analysis Node] Error in structured_analysis_node for applicant {applicant_id}: {str(error)}")
+
+    analysis_response = AIAnalysisResponse(
+        overall_score=0,
+        quality_grade="F",
+        categorization="Mismatched",
+        justification_summary=f"Error processing: {str(error)}",
+        applicant_id=applicant_id
+    )
+    return {"results": [analysis_response], "error_count": 1}
+
+
+def structured_analysis_node(state: GraphState, config: RunnableConfig = None):
+    """
+    Worker node: Calls Ollama once with a JSON schema constraint to get score, grade,
+    categorization and justification in a single round trip
+    """
+    ai_logger.info(f"[Structured Analysis Node] Starting structured analysis for index {state.get('current_index', 0)}")
+
+    lazy_justification = _lazy_justification(config)
+    request = _prepare_structured_analysis(state, lazy_justification)
+    if request is None:
+        ai_logger.info(f"[Structured Analysis Node] Completed without processing applicant")
+        return {"results": []}
+
+    applicant_id, prompt = request
+    try:
+        ai_logger.info(f"[Structured Analysis Node] Sending structured request to LLM for applicant {applicant_id}")
+        response_text = call_llm(config, "structured_analysis", lambda: complete(
+            get_llm(_node_model(config, "structured_analysis")), prompt, "structured_analysis",
+            format=get_structured_analysis_schema(not lazy_justification)
+        ))
+        return _parse_structured_analysis(applicant_id, response_text, lazy_justification)
+    except LLMUnavailableError:
+        raise
+    except Exception as e:
+        return _structured_analysis_failed(applicant_id, e)
+
+
+async def astructured_analysis_node(state: GraphState, config: RunnableConfig = None):
+    """
+    Async worker node: structured_analysis_node using ainvoke
+    """
+    ai_logger.info(f"[Structured Analysis Node] Starting structured analysis for index {state.get('current_index', 0)}")
+
+    lazy_justification = _lazy_justification(config)
+    request = _prepare_structured_analysis(state, lazy_justification)
+    if request is None:
+        ai_logger.info(f"[Structured Analysis Node] Completed without processing applicant")
+        return {"results": []}
+
+    applicant_id, prompt = request
+    try:
+        ai_logger.info(f"[Structured Analysis Node] Sending structured request to LLM for applicant {applicant_id}")
+        response_text = await acall_llm(config, "structured_analysis", lambda: acomplete(
+            get_llm(_node_model(config, "structured_analysis")), prompt, "structured_analysis",
+            format=get_structured_analysis_schema(not lazy_justification)
+        ))
+        return _parse_structured_analysis(applicant_id, response_text, lazy_justification)
+    except LLMUnavailableError:
+        raise
+    except Exception as e:
+        return _structured_analysis_failed(applicant_id, e)
+
+
+def _prepare_batched_analysis(state: GraphState, applicant_ids: List[int], lazy_justification: bool = False) -> str:
+    """
+    Build one structured analysis prompt for several applicants, sharing the job requirements
+    """
+    state_job_requirements = state.get("job_requirements", "")
+    resume_sections = []
+    for applicant_id in applicant_ids:
+        resume_text = state["resume_texts"].get(applicant_id, "")
+        resume_sections.append(
+            f"    Applicant ID: {applicant_id}\n"
+            f"    Resume: {resume_text}\n"
+            f"    {_skill_coverage_section(state, applicant_id)}{_resume_facts_section(state, applicant_id)}"
+        )
+
+    ai_logger.info(f"[Batched Analysis Node] Processing applicants {applicant_ids}, job requirements length: {len(state_job_requirements)}")
+
+    batched_prompt = """
+    Analyze each of the following {count} resumes separately against these job requirements:
+
+    Job Requirements: {job_requirements}
+
+{resumes}
+    Respond with a JSON object whose "analyses" list holds one object per resume, containing:
+    - applicant_id: the Applicant ID given above the resume
+    - overall_score: an integer from 0-100 (where 100 is perfect match)
+    - quality_grade: one of A, B, C, D, or F
+    - categorization: one of Senior, Mid-Level, Junior, or Mismatched
+    {justification_field}"""
+    justification_field = "" if lazy_justification else "- justification_summary: 1-2 sentences explaining the scores, mentioning specific strengths or weaknesses\n    "
+    return batched_prompt.format(
+        count=len(applicant_ids), job_requirements=state_job_requirements,
+        resumes="\n".join(resume_sections), justification_field=justification_field
+    )
+
+
+def _parse_batched_analysis(applicant_ids: List[int], response_text: str, lazy_justification: bool = False):
+    """
+    Validate the batch's JSON item by item into the data contract.
+    Returns the valid results by applicant ID and the applicants without exactly one valid item.
+    """
+    ai_logger.info(f"[Batched Analysis Node] LLM response received for applicants {applicant_ids}: {response_text[:100]}...")
+
+    items = json.loads(response_text)["analyses"]
+    results, seen = {}, []
+    for item in items:
+        try:
+            if lazy_justification:
+                item["justification_summary"] = ""
+            analysis_response = AIAnalysisResponse.model_validate(item)
+        except Exception as e:
+            ai_logger.warning(f"[Batched Analysis Node] Invalid batch item {str(item)[:100]}: {str(e)}")
+            continue
+        seen.append(analysis_response.applicant_id)
+        results[analysis_response.applicant_id] = analysis_response
+
+    # An item for an applicant outside the batch, or two for the same one, can't be attributed reliably
+    valid = {aid: result for aid, result in results.items() if aid in applicant_ids and seen.count(aid) == 1}
+    invalid = [aid for aid in applicant_ids if aid not in valid]
+    return valid, invalid
 
 
-def create_worker_graph():
+def _pending_batch_ids(state: GraphState) -> List[int]:
+    """Applicants of the batch that weren't served from the analysis cache"""
+    cached_ids = set(state.get("cached_ids", []))
+    return [aid for aid in state.get("applicant_id_list", []) if aid not in cached_ids]
+
+
+def _batched_analysis_update(results: Dict[int, AIAnalysisResponse], fallback_updates) -> Dict[str, Any]:
+    """
+    Combine the valid batch results with the per-applicant fallback calls' updates
+    """
+    update = {"results": list(results.values()), "error_count": 0, "failed_ids": []}
+    for fallback_update in fallback_updates:
+        update["results"].extend(fallback_update.get("results", []))
+        if fallback_update.get("error_count"):
+            update["error_count"] += fallback_update["error_count"]
+            update["failed_ids"].extend(result.applicant_id for result in fallback_update.get("results", []))
+    return update
+
+
+def batched_analysis_node(state: GraphState, config: RunnableConfig = None):
     """
-    Create the Worker Sub-Graph with sequential nodes for single-resume analysis
+    Batch worker node: Calls Ollama once for all of the batch's uncached applicants with a schema
+    constraint, and falls back to one structured call per applicant whose batched result is invalid
     """
-    worker_graph = StateGraph(GraphState)
+    applicant_ids = _pending_batch_ids(state)
+    if not applicant_ids:
+        return {}
+
+    lazy_justification = _lazy_justification(config)
+    results, invalid_ids = {}, applicant_ids
+    if len(applicant_ids) > 1:
+        prompt = _prepare_batched_analysis(state, applicant_ids, lazy_justification)
+        try:
+            ai_logger.info(f"[Batched Analysis Node] Sending batched request to LLM for {len(applicant_ids)} applicants")
+            response_text = call_llm(config, "batched_analysis", lambda: complete(
+                get_llm(_node_model(config, "batched_analysis")), prompt, "batched_analysis",
+                format=get_batch_analysis_schema(not lazy_justification)
+            ))
+            results, invalid_ids = _parse_batched_analysis(applicant_ids, response_text, lazy_justification)
+        except LLMUnavailableError:
+            raise
+        except Exception as e:
+            ai_logger.error(f"[Batched Analysis Node] Error in batched_analysis_node for applicants {applicant_ids}: {str(e)}")
+
+    if invalid_ids:
+        ai_logger.info(f"[Batched Analysis Node] Falling back to per-applicant calls for applicants {invalid_ids}")
+    fallback_updates = [
+        structured_analysis_node(_worker_state(state, [aid], current_index=1), config) for aid in invalid_ids
+    ]
+    return _batched_analysis_update(results, fallback_updates)
+
+
+async def abatched_analysis_node(state: GraphState, config: RunnableConfig = None):
+    """
+    Async batch worker node: batched_analysis_node using ainvoke, with the fallback calls run concurrently
+    """
+    applicant_ids = _pending_batch_ids(state)
+    if not applicant_ids:
+        return {}
+
+    lazy_justification = _lazy_justification(config)
+    results, invalid_ids = {}, applicant_ids
+    if len(applicant_ids) > 1:
+        prompt = _prepare_batched_analysis(state, applicant_ids, lazy_justification)
+        try:
+            ai_logger.info(f"[Batched Analysis Node] Sending batched request to LLM for {len(applicant_ids)} applicants")
+            response_text = await acall_llm(config, "batched_analysis", lambda: acomplete(
+                get_llm(_node_model(config, "batched_analysis")), prompt, "batched_analysis",
+                format=get_batch_analysis_schema(not lazy_justification)
+            ))
+            results, invalid_ids = _parse_batched_analysis(applicant_ids, response_text, lazy_justification)
+        except LLMUnavailableError:
+            raise
+        except Exception as e:
+            ai_logger.error(f"[Batched Analysis Node] Error in batched_analysis_node for applicants {applicant_ids}: {str(e)}")
+
+    if invalid_ids:
+        ai_logger.info(f"[Batched Analysis Node] Falling back to per-applicant calls for applicants {invalid_ids}")
+    fallback_updates = await asyncio.gather(*(
+        astructured_analysis_node(_worker_state(state, [aid], current_index=1), config) for aid in invalid_ids
+    ))
+    return _batched_analysis_update(results, fallback_updates)
+
+
+def _worker_model_name(config) -> str:
+    """Model configuration of the run's LLM nodes, as recorded in the analysis cache"""
+    node_models = _configurable(config).get("node_models")
+    return model_signature(node_models) if node_models else analysis_cache.get_model_name()
+
+
+def _worker_prompt_version(state: GraphState, config) -> str:
+    """
+    Prompt version for the analysis cache; results without a justification, or with rule-based
+    grades and categories, are cached apart
+    """
+    scoring_mode = state.get("scoring_mode", SCORING_MODE_MULTI_CALL)
+    prompt_version = analysis_cache.get_prompt_version(scoring_mode)
+    if _rule_derivation(config) and scoring_mode == SCORING_MODE_MULTI_CALL:
+        prompt_version = f"{prompt_version}:rules"
+    return f"{prompt_version}:lazy" if _lazy_justification(config) else prompt_version
+
+
+def _worker_cache_key(state: GraphState, applicant_id: int, config=None):
+    """
+    Cache key for this worker's applicant, or None if the hashes needed to build it are missing
+    """
+    content_hash = state.get("content_hashes", {}).get(applicant_id)
+    job_requirements_hash = state.get("job_requirements_hash", "")
+    if not content_hash or not job_requirements_hash:
+        return None
+
+    return analysis_cache.build_cache_key(content_hash, job_requirements_hash, _worker_prompt_version(state, config), _worker_model_name(config))
+
+
+def cache_lookup_node(state: GraphState, config: RunnableConfig = None):
+    """
+    Worker node: Serves the analysis from the content-addressed cache when the resume,
+    job requirements, prompt version and model are all unchanged
+    """
+    applicant_id = _current_applicant_id(state)
+    if applicant_id is None or not analysis_cache.is_cache_enabled():
+        return {}
+
+    cached_response = _lookup_in_cache(state, applicant_id, config)
+    if cached_response is None:
+        return {}
+    return {"results": [cached_response], "cache_hit": True}
+
+
+def _lookup_in_cache(state: GraphState, applicant_id: int, config=None):
+    """
+    Cached analysis of an applicant of this worker, or None on a miss
+    """
+    cache_key = _worker_cache_key(state, applicant_id, config)
+    if cache_key is None:
+        ai_logger.info(f"[Cache Lookup Node] No cache key available for applicant {applicant_id}")
+        return None
+
+    try:
+        cached_response = analysis_cache.lookup(cache_key, applicant_id)
+    except Exception as e:
+        ai_logger.error(f"[Cache Lookup Node] Error reading cache for applicant {applicant_id}: {str(e)}")
+        return None
+
+    if cached_response is None:
+        ai_logger.info(f"[Cache Lookup Node] Cache miss for applicant {applicant_id}")
+        return None
+
+    ai_logger.info(f"[Cache Lookup Node] Cache hit for applicant {applicant_id}, score: {cached_response.overall_score}")
+    return cached_response
+
+
+def cache_store_node(state: GraphState, config: RunnableConfig = None):
+    """
+    Worker node: Stores a successfully produced analysis in the content-addressed cache
+    """
+    applicant_id = _current_applicant_id(state)
+    results = state.get("results", [])
+    if applicant_id is None or not results or not analysis_cache.is_cache_enabled():
+        return {}
+
+    if state.get("error_count", 0) > 0:
+        ai_logger.info(f"[Cache Store Node] Not caching result for applicant {applicant_id} because the analysis had errors")
+        return {}
+
+    _store_in_cache(state, applicant_id, results[-1], config)
+    return {}
+
+
+def _store_in_cache(state: GraphState, applicant_id: int, result: AIAnalysisResponse, config=None):
+    """
+    Store the analysis of an applicant of this worker in the cache
+    """
+    cache_key = _worker_cache_key(state, applicant_id, config)
+    if cache_key is None:
+        return
+
+    try:
+        analysis_cache.store(
+            cache_key,
+            content_hash=state["content_hashes"][applicant_id],
+            job_requirements_hash=state["job_requirements_hash"],
+            prompt_version=_worker_prompt_version(state, config),
+            model_name=_worker_model_name(config),
+            analysis_response=result
+        )
+        ai_logger.info(f"[Cache Store Node] Cached analysis for applicant {applicant_id}")
+    except Exception as e:
+        ai_logger.error(f"[Cache Store Node] Error writing cache for applicant {applicant_id}: {str(e)}")
+
+
+def _result_writer_from_config(config):
+    return _configurable(config).get("result_writer")
+
+
+def _hand_to_writer(result_writer: IncrementalResultWriter, result: AIAnalysisResponse, config) -> bool:
+    """
+    Give a result to the run's writer, unless a cascade triage pass leaves it to the large model.
+    Cascade results carry the tier and models that decided them, and results of a run with on-demand
+    justifications are marked as pending one. Returns whether the result was written.
+    """
+    configurable = _configurable(config)
+    if in_escalation_band(result.overall_score, configurable.get("escalation_band")):
+        ai_logger.info(f"[Persist Result Node] Triage score {result.overall_score} of applicant {result.applicant_id} is borderline, leaving it to the escalation tier")
+        return False
+
+    analysis_details = {}
+    model_tier = configurable.get("model_tier")
+    if model_tier:
+        analysis_details.update(build_tier_details(model_tier, configurable.get("node_models") or {}))
+    if configurable.get("lazy_justification"):
+        analysis_details[JUSTIFICATION_PENDING_KEY] = True
+    result_writer.add(result, analysis_details=analysis_details or None)
+    return True
+
+
+def persist_result_node(state: GraphState, config: RunnableConfig = None):
+    """
+    Worker node: Hands this worker's finished analysis to the run's result writer,
+    which commits it to the database with the next batch. A failed analysis is not written;
+    the applicant is marked as failed so it can be scored again.
+    """
+    results = state.get("results", [])
+    if not results:
+        return {}
+
+    result_writer = _result_writer_from_config(config)
+    applicant_id = results[-1].applicant_id
+    if state.get("error_count", 0) > 0:
+        ai_logger.info(f"[Persist Result Node] Marking applicant {applicant_id} as failed instead of persisting its analysis")
+        if result_writer is not None:
+            result_writer.add_failure(applicant_id, ANALYSIS_FAILED_MESSAGE)
+        return {"failed_ids": [applicant_id]}
+    if result_writer is None:
+        return {}
+
+    ai_logger.info(f"[Persist Result Node] Queueing result for applicant {applicant_id} for persistence")
+    _hand_to_writer(result_writer, results[-1], config)
+    return {}
+
+
+def batch_cache_lookup_node(state: GraphState, config: RunnableConfig = None):
+    """
+    Batch worker node: Serves the batch's applicants found in the analysis cache
+    """
+    if not analysis_cache.is_cache_enabled():
+        return {}
+
+    hits = []
+    for applicant_id in state.get("applicant_id_list", []):
+        cached_response = _lookup_in_cache(state, applicant_id, config)
+        if cached_response is not None:
+            hits.append(cached_response)
+    if not hits:
+        return {}
+    return {"results": hits, "cached_ids": [hit.applicant_id for hit in hits]}
+
+
+def batch_persist_node(state: GraphState, config: RunnableConfig = None):
+    """
+    Batch worker node: Caches the batch's new, successful analyses and hands every result to the run's writer
+    """
+    results = state.get("results", [])
+    skip_cache_ids = set(state.get("cached_ids", [])) | set(state.get("failed_ids", []))
+    if analysis_cache.is_cache_enabled():
+        for result in results:
+            if result.applicant_id not in skip_cache_ids:
+                _store_in_cache(state, result.applicant_id, result, config)
+
+    result_writer = _result_writer_from_config(config)
+    if result_writer is not None:
+        ai_logger.info(f"[Persist Result Node] Queueing {len(results)} batch results for persistence")
+        failed_ids = set(state.get("failed_ids", []))
+        for result in results:
+            if result.applicant_id in failed_ids:
+                result_writer.add_failure(result.applicant_id, ANALYSIS_FAILED_MESSAGE)
+            else:
+                _hand_to_writer(result_writer, result, config)
+    return {}
+
+
+def route_after_cache_lookup(state: GraphState) -> str:
+    """
+    Worker routing: persist a cache hit straight away, otherwise continue with the run's scoring mode
+    """
+    if state.get("cache_hit"):
+        return "persist_result"
+    return route_by_scoring_mode(state)
+
+
+def route_by_scoring_mode(state: GraphState):
+    """
+    Worker routing: choose the single structured call, or fan out to the multi-call chain's
+    scoring and categorization branches, which don't depend on each other
+    """
+    if state.get("scoring_mode") == SCORING_MODE_STRUCTURED:
+        return "structured_analysis"
+    return ["scoring_grading", "categorization"]
+
+
+# LLM-calling worker nodes for the blocking (invoke) and async (ainvoke) graphs
+WORKER_LLM_NODES = {
+    False: {
+        "scoring_grading": scoring_grading_node,
+        "categorization": categorization_node,
+        "justification": justification_node,
+        "structured_analysis": structured_analysis_node,
+        "batched_analysis": batched_analysis_node,
+    },
+    True: {
+        "scoring_grading": ascoring_grading_node,
+        "categorization": acategorization_node,
+        "justification": ajustification_node,
+        "structured_analysis": astructured_analysis_node,
+        "batched_analysis": abatched_analysis_node,
+    },
+}
+
+
+def build_run_config(async_mode: bool, run_concurrency: int = None,
+                     result_writer: IncrementalResultWriter = None, thread_id: str = None,
+                     node_models: Dict[str, str] = None, model_tier: str = None,
+                     escalation_band=None, lazy_justification: bool = False,
+                     rule_derivation: bool = False) -> Dict[str, Any]:
+    """
+    Build the LangGraph config for one scoring run.
+    The run's LLM limiter and result writer travel in the configurable section so every worker node shares them.
+    thread_id selects the run's checkpoints when the graph is compiled with a checkpointer.
+    node_models selects the model of each LLM node; model_tier and escalation_band describe a cascade pass,
+    whose results within the band are not written but left to the escalation pass.
+    lazy_justification leaves the justifications to be generated on demand.
+    rule_derivation derives multi-call grades and categories by rules, see rule_derivation.
+    """
+    run_limiter = create_run_limiter(run_concurrency)
+    config = {"configurable": {
+        "llm_run_limiter": run_limiter,
+        "result_writer": result_writer,
+        "node_models": node_models,
+        "model_tier": model_tier,
+        "escalation_band": escalation_band,
+        "lazy_justification": lazy_justification,
+        "rule_derivation": rule_derivation,
+    }}
+    if thread_id is not None:
+        config["configurable"]["thread_id"] = thread_id
+    if not async_mode:
+        # Blocking workers each occupy a thread, so don't start more than can call the LLM
+        config["max_concurrency"] = run_limiter.limit
+    return config
+
+
+def create_worker_graph(async_mode: bool = False):
+    """
+    Create the Worker Sub-Graph for single-resume analysis; in multi-call mode the scoring and
+    categorization calls run in parallel and are joined before justification.
+    With async_mode the LLM nodes use ainvoke so many workers overlap on one event loop.
+    """
+    # Only the result and error count flow back to the supervisor
+    worker_graph = StateGraph(GraphState, output_schema=WorkerOutputState)
+    llm_nodes = WORKER_LLM_NODES[async_mode]
     
     # Add nodes to the worker graph
     worker_graph.add_node("data_retrieval", data_retrieval_node)
-    worker_graph.add_node("scoring_grading", scoring_grading_node)
-    worker_graph.add_node("categorization", categorization_node)
-    worker_graph.add_node("justification", justification_node)
+    worker_graph.add_node("scoring_grading", llm_nodes["scoring_grading"])
+    worker_graph.add_node("categorization", llm_nodes["categorization"])
+    worker_graph.add_node("justification", llm_nodes["justification"])
+    worker_graph.add_node("structured_analysis", llm_nodes["structured_analysis"])
+    worker_graph.add_node("cache_lookup", cache_lookup_node)
+    worker_graph.add_node("cache_store", cache_store_node)
+    worker_graph.add_node("persist_result", persist_result_node)
     
     # Define the flow for a single resume
     worker_graph.add_edge(START, "data_retrieval")
-    worker_graph.add_edge("data_retrieval", "scoring_grading")
-    worker_graph.add_edge("scoring_grading", "categorization")
-    worker_graph.add_edge("categorization", "justification")
-    worker_graph.add_edge("justification", END)
+    worker_graph.add_edge("data_retrieval", "cache_lookup")
+    worker_graph.add_conditional_edges("cache_lookup", route_after_cache_lookup, ["scoring_grading", "categorization", "structured_analysis", "persist_result"])
+    worker_graph.add_edge("structured_analysis", "cache_store")
+    # Scoring and categorization run concurrently; justification waits for both
+    worker_graph.add_edge(["scoring_grading", "categorization"], "justification")
+    worker_graph.add_edge("justification", "cache_store")
+    worker_graph.add_edge("cache_store", "persist_result")
+    worker_graph.add_edge("persist_result", END)
     
     return worker_graph.compile()
 
-def create_supervisor_graph():
+def create_batch_worker_graph(async_mode: bool = False):
+    """
+    Create the Batch Worker Sub-Graph for the batched scoring mode: cache lookup for every
+    applicant of the batch, one LLM call for the rest, then caching and persistence
+    """
+    batch_graph = StateGraph(GraphState, output_schema=WorkerOutputState)
+    batch_graph.add_node("batch_cache_lookup", batch_cache_lookup_node)
+    batch_graph.add_node("batched_analysis", WORKER_LLM_NODES[async_mode]["batched_analysis"])
+    batch_graph.add_node("batch_persist", batch_persist_node)
+
+    batch_graph.add_edge(START, "batch_cache_lookup")
+    batch_graph.add_edge("batch_cache_lookup", "batched_analysis")
+    batch_graph.add_edge("batched_analysis", "batch_persist")
+    batch_graph.add_edge("batch_persist", END)
+
+    return batch_graph.compile()
+
+
+def _worker_state(state: GraphState, applicant_ids: List[int], current_index: int = 0) -> Dict[str, Any]:
+    """
+    State of a worker processing some of the run's applicants, holding only their share of the run's inputs
+    """
+    return {
+        "applicant_id_list": list(applicant_ids),
+        "job_criteria": state.get("job_criteria", {}),
+        "results": [],
+        "status": "processing",
+        "current_index": current_index,
+        "error_count": 0,
+        "total_count": len(applicant_ids),
+        # Only these applicants' resumes: sharing the whole dict made each worker's state O(N)
+        "resume_texts": {aid: state.get("resume_texts", {}).get(aid, "") for aid in applicant_ids},
+        "job_requirements": state.get("job_requirements", ""),
+        "current_analysis_response": AIAnalysisResponse(overall_score=0, quality_grade="F", categorization="Mismatched", justification_summary="", applicant_id=applicant_ids[0]),
+        "scoring_mode": state.get("scoring_mode", SCORING_MODE_MULTI_CALL),
+        "content_hashes": {aid: state.get("content_hashes", {}).get(aid, "") for aid in applicant_ids},
+        "skill_coverage": {aid: state.get("skill_coverage", {}).get(aid, {}) for aid in applicant_ids},
+        "resume_facts": {aid: state.get("resume_facts", {}).get(aid, {}) for aid in applicant_ids},
+        "job_requirements_hash": state.get("job_requirements_hash", ""),
+        "cache_hit": False
+    }
+
+
+def create_supervisor_graph(async_mode: bool = False, checkpointer=None):
     """
-    Create the Supervisor Main Graph with Map-Reduce pattern using Send for parallel execution
+    Create the Supervisor Main Graph with Map-Reduce pattern using Send for parallel execution.
+    With async_mode the graph is meant to be run through ainvoke.
+    With a checkpointer, the supervisor and every worker sub-graph record their progress so an
+    interrupted run can be resumed by invoking the graph again with no input on the same thread.
     """
 
     def continue_to_process(state: GraphState):
@@ -377,22 +1218,18 @@ def create_supervisor_graph():
         if applicant_ids:
             # Create a list of Send objects to dispatch work to multiple worker nodes
             sends = []
+            if state.get("scoring_mode") == SCORING_MODE_BATCHED:
+                # Short resumes are packed into shared prompts, one batch worker per prompt
+                for batch in pack_batches(applicant_ids, state.get("resume_texts", {})):
+                    ai_logger.info(f"[Dispatch Workers Node] Creating batch worker for applicants {batch}")
+                    sends.append(Send("BatchWorkerSubGraph", _worker_state(state, batch)))
+                ai_logger.info(f"[Dispatch Workers Node] Created {len(sends)} batch worker dispatches")
+                return sends
+
             for applicant_id in applicant_ids:
                 ai_logger.info(f"[Dispatch Workers Node] Creating worker for applicant {applicant_id}")
-                current_analysis_response = AIAnalysisResponse(overall_score=0, quality_grade="F", categorization="Mismatched", justification_summary="", applicant_id=applicant_id)
-                # Create a specific state for this applicant to be processed
-                worker_state = {
-                    "applicant_id_list": [applicant_id],
-                    "job_criteria": state.get("job_criteria", {}),
-                    "results": [],
-                    "status": "processing",
-                    "current_index": 0,  # Each individual worker starts at index 0 for its single applicant
-                    "error_count": 0,
-                    "total_count": 1,
-                    "resume_texts": state.get("resume_texts", {}),
-                    "job_requirements": state.get("job_requirements", ""),
-                    "current_analysis_response": current_analysis_response
-                }
+                # Create a specific state for this applicant to be processed; it starts at index 0 for its single applicant
+                worker_state = _worker_state(state, [applicant_id])
 
                 # Use Send to dispatch to the worker_node with specific parameters
                 sends.append(Send("WorkerSubGraph", worker_state))
@@ -403,55 +1240,50 @@ def create_supervisor_graph():
         else: 
             return "bulk_persistence"
 
-    def bulk_persistence_node(state: GraphState):
+    def bulk_persistence_node(state: GraphState, config: RunnableConfig = None):
         """
-        Bulk Persistence Node: Updates Applicant records in SQLite3 database via Django ORM
+        Bulk Persistence Node: Commits the results still buffered by the run's result writer.
+        Workers hand their results to the writer as they finish, so most are already in the database.
         """
         results = state.get("results", [])
-        error_count = 0
+        result_writer = _result_writer_from_config(config)
+        if result_writer is None:
+            result_writer = IncrementalResultWriter()
 
-        ai_logger.info(f"[Bulk Persistence Node] Starting bulk persistence for {len(results)} results")
+        # Results of workers that never reached the writer: no writer was configured, or the
+        # workers finished in an earlier attempt of a resumed run and were skipped by this one
+        failed_ids = set(state.get("failed_ids", []))
+        for result in results:
+            if result_writer.has_result(result.applicant_id):
+                continue
+            if result.applicant_id in failed_ids:
+                result_writer.add_failure(result.applicant_id, ANALYSIS_FAILED_MESSAGE)
+            else:
+                _hand_to_writer(result_writer, result, config)
 
-        # Prepare bulk update data
-        for i, result in enumerate(results):
-            ai_logger.info(f"[Bulk Persistence Node] Processing result {i+1}/{len(results)} for applicant {result.applicant_id}")
-            try:
-                # Update the applicant record with the analysis results
-                applicant = Applicant.objects.get(id=result.applicant_id)
-                ai_logger.info(f"[Bulk Persistence Node] Updating applicant {result.applicant_id} with score: {result.overall_score}, grade: {result.quality_grade}, category: {result.categorization}")
-
-                applicant.overall_score = result.overall_score
-                applicant.quality_grade = result.quality_grade
-                applicant.categorization = result.categorization
-                applicant.justification_summary = result.justification_summary
-                applicant.processing_status = 'completed'
-                applicant.save()
-
-                ai_logger.info(f"[Bulk Persistence Node] Successfully updated applicant {result.applicant_id}")
-            except Exception as e:
-                ai_logger.error(f"[Bulk Persistence Node] Error updating applicant {result.applicant_id}: {str(e)}")
-                error_count += 1
+        ai_logger.info(f"[Bulk Persistence Node] Flushing {result_writer.pending_count} buffered results of {len(results)}")
+        result_writer.flush()
 
-        # Update state with final status
-        state["status"] = "completed"
-        new_state_error_count = state.get("error_count", 0) + error_count
+        new_state_error_count = state.get("error_count", 0) + result_writer.error_count
 
-        ai_logger.info(f"[Bulk Persistence Node] Completed bulk persistence, errors: {error_count}, final status: {state['status']}")
+        ai_logger.info(f"[Bulk Persistence Node] Completed bulk persistence, persisted: {result_writer.persisted_count}, errors: {result_writer.error_count}, final status: completed")
 
         return {"status": "completed", "error_count": new_state_error_count}
         
     # Create the supervisor graph
     supervisor_graph = StateGraph(GraphState)
     # Compiled worker subgraph
-    worker_subgraph = create_worker_graph()
+    worker_subgraph = create_worker_graph(async_mode=async_mode)
     
     # Add Nodes
     supervisor_graph.add_node("WorkerSubGraph", worker_subgraph)
+    supervisor_graph.add_node("BatchWorkerSubGraph", create_batch_worker_graph(async_mode=async_mode))
     supervisor_graph.add_node("bulk_persistence", bulk_persistence_node)
 
     # Add Edges 
     supervisor_graph.add_conditional_edges(START, continue_to_process)
     supervisor_graph.add_edge("WorkerSubGraph", "bulk_persistence")
+    supervisor_graph.add_edge("BatchWorkerSubGraph", "bulk_persistence")
     supervisor_graph.add_edge("bulk_persistence", END)
 
-    return supervisor_graph.compile()
\ No newline at end of file
+    return supervisor_graph.compile(checkpointer=checkpointer)
\ No newline at end of file
@@ -0,0 +1,162 @@
+"""
+Content-addressed cache of AI analysis results.
+
+A result is reused when the resume content, the normalized job requirements, the prompt
+templates and the model are all unchanged, so repeated scoring runs cost no LLM time.
+"""
+import hashlib
+import logging
+import threading
+from typing import Any, Dict, List, Optional
+
+from django.conf import settings
+from django.db.models import F
+from django.utils import timezone
+
+from jobs.models import AnalysisCacheEntry
+from jobs.services.resume_parser import RESUME_FACTS_VERSION
+from .contracts import AIAnalysisResponse, PROMPT_TEMPLATE_VERSIONS
+
+ai_logger = logging.getLogger('ai_processing')
+
+
+class AnalysisCacheStats:
+    """
+    Process-wide hit/miss counters for the analysis cache
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+            self.stores = 0
+            self.evictions = 0
+
+    def increment(self, counter: str, amount: int = 1):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + amount)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'stores': self.stores,
+                'evictions': self.evictions,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+cache_stats = AnalysisCacheStats()
+
+
+def is_cache_enabled() -> bool:
+    return getattr(settings, 'AI_SCORING_CACHE_ENABLED', True)
+
+
+def normalize_job_requirements(job_requirements: str, required_skills: List[str] = None) -> str:
+    """
+    Normalize job requirements so whitespace and skill ordering changes don't invalidate the cache
+    """
+    description = " ".join((job_requirements or "").split())
+    skills = sorted({" ".join(str(skill).split()).lower() for skill in (required_skills or []) if str(skill).strip()})
+    return description + "\n" + "|".join(skills)
+
+
+def compute_job_requirements_hash(job_requirements: str, required_skills: List[str] = None) -> str:
+    """
+    SHA256 hash of the normalized job requirements
+    """
+    normalized = normalize_job_requirements(job_requirements, required_skills)
+    return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+
+
+def get_prompt_version(scoring_mode: str) -> str:
+    """
+    Version identifier of the prompt templates used by a scoring mode. The prompts embed the
+    structured resume facts, so the facts parser version is part of it.
+    """
+    return f"{scoring_mode}:{PROMPT_TEMPLATE_VERSIONS.get(scoring_mode, '1')}:facts{RESUME_FACTS_VERSION}"
+
+
+def get_model_name() -> str:
+    return getattr(settings, 'AI_SCORING_MODEL', 'llama2')
+
+
+def build_cache_key(content_hash: str, job_requirements_hash: str, prompt_version: str, model_name: str) -> str:
+    """
+    Content-addressed key: resume hash + job requirements hash + prompt version + model name
+    """
+    raw_key = "|".join([content_hash, job_requirements_hash, prompt_version, model_name])
+    return hashlib.sha256(raw_key.encode('utf-8')).hexdigest()
+
+
+def lookup(cache_key: str, applicant_id: int) -> Optional[AIAnalysisResponse]:
+    """
+    Return the cached analysis for this applicant, or None on a miss
+    """
+    entry = AnalysisCacheEntry.objects.filter(cache_key=cache_key).values('result').first()
+    if entry is None:
+        cache_stats.increment('misses')
+        return None
+
+    AnalysisCacheEntry.objects.filter(cache_key=cache_key).update(
+        hit_count=F('hit_count') + 1,
+        last_accessed=timezone.now()
+    )
+    cache_stats.increment('hits')
+    return AIAnalysisResponse.model_validate({**entry['result'], 'applicant_id': applicant_id})
+
+
+def store(cache_key: str, content_hash: str, job_requirements_hash: str, prompt_version: str,
+          model_name: str, analysis_response: AIAnalysisResponse):
+    """
+    Store an analysis result and evict the least recently used entries beyond the size bound
+    """
+    AnalysisCacheEntry.objects.update_or_create(
+        cache_key=cache_key,
+        defaults={
+            'content_hash': content_hash,
+            'job_requirements_hash': job_requirements_hash,
+            'prompt_version': prompt_version,
+            'model_name': model_name,
+            'result': analysis_response.model_dump(exclude={'applicant_id'}),
+            'last_accessed': timezone.now(),
+        }
+    )
+    cache_stats.increment('stores')
+    evict_if_needed()
+
+
+def evict_if_needed(max_entries: int = None) -> int:
+    """
+    Delete the least recently accessed entries so at most max_entries remain
+    """
+    if max_entries is None:
+        max_entries = getattr(settings, 'AI_SCORING_CACHE_MAX_ENTRIES', 50000)
+
+    excess = AnalysisCacheEntry.objects.count() - max_entries
+    if excess <= 0:
+        return 0
+
+    stale_ids = list(
+        AnalysisCacheEntry.objects.order_by('last_accessed').values_list('id', flat=True)[:excess]
+    )
+    evicted, _ = AnalysisCacheEntry.objects.filter(id__in=stale_ids).delete()
+    cache_stats.increment('evictions', evicted)
+    ai_logger.info(f"[Analysis Cache] Evicted {evicted} least recently used entries")
+    return evicted
+
+
+def get_cache_stats() -> Dict[str, Any]:
+    """
+    Hit/miss counters for this process plus the persistent entry count
+    """
+    stats = cache_stats.snapshot()
+    stats['entries'] = AnalysisCacheEntry.objects.count()
+    return stats
@@ -0,0 +1,51 @@
+"""
+Packing of short resumes into batched LLM prompts for the batched scoring mode.
+
+Each batch shares one copy of the job requirements and costs one request, so short resumes stop
+paying the per-request overhead and the repeated job prefix. Resumes are packed in order until the
+batch's estimated token budget or size limit is reached; resumes longer than
+AI_SCORING_BATCH_MAX_RESUME_CHARS get a batch of their own and are scored with the structured call.
+"""
+from typing import Dict, Iterable, List
+
+from django.conf import settings
+
+# Rough characters per token of English text, for budgeting prompts without a tokenizer
+CHARS_PER_TOKEN = 4
+# Estimated tokens of a resume's framing in the batch prompt: its applicant header, skill coverage and facts
+PER_RESUME_OVERHEAD_TOKENS = 80
+
+
+def estimate_tokens(text: str) -> int:
+    return len(text or "") // CHARS_PER_TOKEN + 1
+
+
+def pack_batches(applicant_ids: Iterable[int], resume_texts: Dict[int, str],
+                 token_budget: int = None, max_size: int = None, max_resume_chars: int = None) -> List[List[int]]:
+    """
+    Split the applicants into batches whose resumes fit the token budget, keeping their order
+    """
+    if token_budget is None:
+        token_budget = getattr(settings, 'AI_SCORING_BATCH_TOKEN_BUDGET', 3000)
+    if max_size is None:
+        max_size = getattr(settings, 'AI_SCORING_BATCH_MAX_SIZE', 8)
+    if max_resume_chars is None:
+        max_resume_chars = getattr(settings, 'AI_SCORING_BATCH_MAX_RESUME_CHARS', 2048)
+
+    batches, batch, batch_tokens = [], [], 0
+    for applicant_id in applicant_ids:
+        resume_text = resume_texts.get(applicant_id) or ""
+        if len(resume_text) > max_resume_chars:
+            batches.append([applicant_id])
+            continue
+
+        tokens = estimate_tokens(resume_text) + PER_RESUME_OVERHEAD_TOKENS
+        if batch and (batch_tokens + tokens > token_budget or len(batch) >= max_size):
+            batches.append(batch)
+            batch, batch_tokens = [], 0
+        batch.append(applicant_id)
+        batch_tokens += tokens
+
+    if batch:
+        batches.append(batch)
+    return batches
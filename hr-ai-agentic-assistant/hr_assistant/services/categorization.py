@@ -0,0 +1,99 @@
+"""
+Normalization of the categorization call's answer.
+
+The call is constrained to the category enum through a JSON schema, so a valid answer costs no
+extra round trip. Answers that still miss the enum (older models ignoring the format, or plain
+text from clients without structured output) are mapped locally: case, punctuation and common
+synonyms are tolerated. An answer that names no category is left to the caller, which derives
+the category from the resume facts instead of asking the LLM again.
+"""
+import json
+import re
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+from .contracts import VALID_CATEGORIES
+
+# Outcomes counted by CategorizationStats
+OUTCOME_EXACT = "exact"
+OUTCOME_NORMALIZED = "normalized"
+OUTCOME_UNRECOGNIZED = "unrecognized"
+
+# Normalized phrases (lower case, words separated by single spaces) naming a category
+CATEGORY_SYNONYMS = {
+    "Senior": ["senior", "senior level", "sr", "lead", "staff", "principal", "expert", "experienced"],
+    "Mid-Level": ["mid level", "mid", "midlevel", "middle", "intermediate", "mid senior"],
+    "Junior": ["junior", "junior level", "jr", "entry level", "entry", "graduate", "intern", "trainee", "beginner"],
+    "Mismatched": ["mismatched", "mismatch", "not a match", "no match", "not a fit", "unqualified", "not qualified"],
+}
+_SYNONYM_LOOKUP = {phrase: category for category, phrases in CATEGORY_SYNONYMS.items() for phrase in phrases}
+
+
+def _phrase(text: str) -> str:
+    return " ".join(re.sub(r"[^a-z]+", " ", text.lower()).split())
+
+
+def _answer_text(response_text: str) -> str:
+    """The categorization value of a JSON answer, or the first non-blank line of a plain one"""
+    text = (response_text or "").strip()
+    try:
+        answer = json.loads(text)
+    except ValueError:
+        answer = None
+    if isinstance(answer, dict):
+        return str(answer.get("categorization", ""))
+    if isinstance(answer, str):
+        return answer
+    return next((line for line in text.splitlines() if line.strip()), "")
+
+
+def normalize_category(response_text: str) -> Tuple[Optional[str], str]:
+    """
+    Category named by the answer, and whether it was exact, normalized or unrecognized (None)
+    """
+    answer = _answer_text(response_text).strip()
+    if answer in VALID_CATEGORIES:
+        return answer, OUTCOME_EXACT
+
+    phrase = _phrase(answer)
+    if phrase in _SYNONYM_LOOKUP:
+        return _SYNONYM_LOOKUP[phrase], OUTCOME_NORMALIZED
+    # A category or synonym inside a longer answer, e.g. "Category: Senior." or "This is a junior candidate"
+    words = f" {phrase} "
+    found = {category for synonym, category in _SYNONYM_LOOKUP.items() if f" {synonym} " in words}
+    if len(found) == 1:
+        return found.pop(), OUTCOME_NORMALIZED
+    return None, OUTCOME_UNRECOGNIZED
+
+
+class CategorizationStats:
+    """
+    Process-wide counters of how the categorization answers were read
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.counts = {OUTCOME_EXACT: 0, OUTCOME_NORMALIZED: 0, OUTCOME_UNRECOGNIZED: 0}
+
+    def increment(self, outcome: str):
+        with self._lock:
+            self.counts[outcome] += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            total = sum(self.counts.values())
+            return {
+                **self.counts,
+                'normalization_rate': round((total - self.counts[OUTCOME_EXACT]) / total, 4) if total else 0.0,
+            }
+
+
+categorization_stats = CategorizationStats()
+
+
+def get_categorization_stats() -> Dict[str, Any]:
+    return categorization_stats.snapshot()
@@ -0,0 +1,266 @@
+"""
+Durable LangGraph checkpoints for scoring runs, stored in the project's SQLite database.
+
+With the checkpointer attached, the supervisor graph records each worker's writes as soon as
+the worker finishes and each worker sub-graph records a checkpoint after every node. When a
+run is picked up again after its worker died, finished applicants are skipped and unfinished
+ones continue after their last completed node.
+"""
+import logging
+import random
+from typing import Any, AsyncIterator, Dict, Iterator, Optional, Sequence
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import transaction
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    get_checkpoint_id,
+    get_checkpoint_metadata,
+)
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+
+from jobs.models import GraphCheckpoint, GraphCheckpointWrite
+
+ai_logger = logging.getLogger('ai_processing')
+
+
+def is_checkpointing_enabled() -> bool:
+    return getattr(settings, 'AI_SCORING_CHECKPOINTS_ENABLED', True)
+
+
+def get_thread_id(scoring_run_id: int) -> str:
+    """
+    LangGraph thread holding the checkpoints of a scoring run
+    """
+    return f"scoring_run_{scoring_run_id}"
+
+
+class DjangoCheckpointSaver(BaseCheckpointSaver[str]):
+    """
+    LangGraph checkpoint saver backed by the GraphCheckpoint and GraphCheckpointWrite models
+    """
+
+    def __init__(self):
+        # Worker results are AIAnalysisResponse models stored in the results channel
+        super().__init__(serde=JsonPlusSerializer(
+            allowed_msgpack_modules=[('hr_assistant.services.contracts', 'AIAnalysisResponse')]
+        ))
+
+    def _load_writes(self, thread_id: str, checkpoint_ns: str, checkpoint_id: str):
+        writes = GraphCheckpointWrite.objects.filter(
+            thread_id=thread_id,
+            checkpoint_ns=checkpoint_ns,
+            checkpoint_id=checkpoint_id
+        ).order_by('task_path', 'task_id', 'idx')
+        return [
+            (write.task_id, write.channel, self.serde.loads_typed((write.value_type, bytes(write.value))))
+            for write in writes
+        ]
+
+    def _to_tuple(self, row: GraphCheckpoint) -> CheckpointTuple:
+        parent_config = None
+        if row.parent_checkpoint_id:
+            parent_config = {
+                "configurable": {
+                    "thread_id": row.thread_id,
+                    "checkpoint_ns": row.checkpoint_ns,
+                    "checkpoint_id": row.parent_checkpoint_id,
+                }
+            }
+        return CheckpointTuple(
+            config={
+                "configurable": {
+                    "thread_id": row.thread_id,
+                    "checkpoint_ns": row.checkpoint_ns,
+                    "checkpoint_id": row.checkpoint_id,
+                }
+            },
+            checkpoint=self.serde.loads_typed((row.checkpoint_type, bytes(row.checkpoint))),
+            metadata=self.serde.loads_typed((row.metadata_type, bytes(row.metadata))),
+            parent_config=parent_config,
+            pending_writes=self._load_writes(row.thread_id, row.checkpoint_ns, row.checkpoint_id),
+        )
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        """
+        Fetch the requested checkpoint, or the latest checkpoint of the thread and namespace
+        """
+        checkpoints = GraphCheckpoint.objects.filter(
+            thread_id=config["configurable"]["thread_id"],
+            checkpoint_ns=config["configurable"].get("checkpoint_ns", "")
+        )
+        checkpoint_id = get_checkpoint_id(config)
+        if checkpoint_id:
+            row = checkpoints.filter(checkpoint_id=checkpoint_id).first()
+        else:
+            # Checkpoint IDs are time-ordered
+            row = checkpoints.order_by('-checkpoint_id').first()
+        return self._to_tuple(row) if row is not None else None
+
+    def list(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[CheckpointTuple]:
+        """
+        List checkpoints newest first, optionally restricted to a thread, namespace or metadata values
+        """
+        checkpoints = GraphCheckpoint.objects.all()
+        if config:
+            checkpoints = checkpoints.filter(thread_id=config["configurable"]["thread_id"])
+            if config["configurable"].get("checkpoint_ns") is not None:
+                checkpoints = checkpoints.filter(checkpoint_ns=config["configurable"]["checkpoint_ns"])
+            if get_checkpoint_id(config):
+                checkpoints = checkpoints.filter(checkpoint_id=get_checkpoint_id(config))
+        if before and get_checkpoint_id(before):
+            checkpoints = checkpoints.filter(checkpoint_id__lt=get_checkpoint_id(before))
+
+        returned = 0
+        for row in checkpoints.order_by('thread_id', 'checkpoint_ns', '-checkpoint_id'):
+            if limit is not None and returned >= limit:
+                return
+            checkpoint_tuple = self._to_tuple(row)
+            if filter and not all(checkpoint_tuple.metadata.get(key) == value for key, value in filter.items()):
+                continue
+            returned += 1
+            yield checkpoint_tuple
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        """
+        Store a checkpoint together with its channel values
+        """
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_type, checkpoint_data = self.serde.dumps_typed(checkpoint)
+        metadata_type, metadata_data = self.serde.dumps_typed(get_checkpoint_metadata(config, metadata))
+
+        GraphCheckpoint.objects.update_or_create(
+            thread_id=thread_id,
+            checkpoint_ns=checkpoint_ns,
+            checkpoint_id=checkpoint["id"],
+            defaults={
+                'parent_checkpoint_id': config["configurable"].get("checkpoint_id"),
+                'checkpoint_type': checkpoint_type,
+                'checkpoint': checkpoint_data,
+                'metadata_type': metadata_type,
+                'metadata': metadata_data,
+            }
+        )
+        return {
+            "configurable": {
+                "thread_id": thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "checkpoint_id": checkpoint["id"],
+            }
+        }
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        """
+        Store the writes of a finished task so it is not run again when the graph resumes
+        """
+        keys = {
+            'thread_id': config["configurable"]["thread_id"],
+            'checkpoint_ns': config["configurable"].get("checkpoint_ns", ""),
+            'checkpoint_id': config["configurable"]["checkpoint_id"],
+            'task_id': task_id,
+        }
+        with transaction.atomic():
+            for position, (channel, value) in enumerate(writes):
+                idx = WRITES_IDX_MAP.get(channel, position)
+                value_type, value_data = self.serde.dumps_typed(value)
+                fields = {
+                    'task_path': task_path,
+                    'channel': channel,
+                    'value_type': value_type,
+                    'value': value_data,
+                }
+                if idx >= 0:
+                    # Regular writes are recorded once; special writes (errors, interrupts) are replaced
+                    GraphCheckpointWrite.objects.get_or_create(idx=idx, defaults=fields, **keys)
+                else:
+                    GraphCheckpointWrite.objects.update_or_create(idx=idx, defaults=fields, **keys)
+
+    def delete_thread(self, thread_id: str) -> None:
+        """
+        Delete every checkpoint and write of a thread
+        """
+        GraphCheckpoint.objects.filter(thread_id=thread_id).delete()
+        GraphCheckpointWrite.objects.filter(thread_id=thread_id).delete()
+        ai_logger.info(f"[Checkpointing] Deleted checkpoints of {thread_id}")
+
+    def get_next_version(self, current: Optional[str], channel: None = None) -> str:
+        if current is None:
+            current_version = 0
+        elif isinstance(current, int):
+            current_version = current
+        else:
+            current_version = int(current.split(".")[0])
+        return f"{current_version + 1:032}.{random.random():016}"
+
+    # The async graph runs these through Django's sync_to_async: the ORM can't be used on the event loop
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return await sync_to_async(self.get_tuple)(config)
+
+    async def alist(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        checkpoint_tuples = await sync_to_async(
+            lambda: list(self.list(config, filter=filter, before=before, limit=limit))
+        )()
+        for checkpoint_tuple in checkpoint_tuples:
+            yield checkpoint_tuple
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        return await sync_to_async(self.put)(config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        await sync_to_async(self.put_writes)(config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        await sync_to_async(self.delete_thread)(thread_id)
+
+
+def has_checkpoint(checkpointer: BaseCheckpointSaver, thread_id: str) -> bool:
+    """
+    Whether a run has a supervisor checkpoint to resume from
+    """
+    return checkpointer.get_tuple({"configurable": {"thread_id": thread_id, "checkpoint_ns": ""}}) is not None
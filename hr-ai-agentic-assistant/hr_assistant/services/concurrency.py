@@ -0,0 +1,372 @@
+"""
+Concurrency limits for LLM requests issued by the AI Resume Scoring Engine.
+
+With AI_SCORING_ADAPTIVE_CONCURRENCY, the process limit is not fixed but tuned from the latency
+and errors of the calls it admits, see AdaptiveConcurrencyLimiter.
+"""
+import asyncio
+import logging
+import math
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, Dict, Optional
+
+from django.conf import settings
+
+ai_logger = logging.getLogger('ai_processing')
+
+# Recent calls per node whose low latency percentile is the adaptive limiter's baseline
+BASELINE_WINDOW = 100
+# Floor of the baseline, so calls answered instantly don't make every other call look slow
+MIN_BASELINE_SECONDS = 0.01
+# Weight of the newest call in a node's moving average latency
+RECENT_LATENCY_WEIGHT = 0.2
+
+
+class NodeLatency:
+    """
+    Latencies of one node's recent calls: a low percentile of the window as the unloaded baseline,
+    and a moving average as the current latency, so single long answers are not taken for overload
+    """
+
+    def __init__(self):
+        self.samples = deque(maxlen=BASELINE_WINDOW)
+        self.recent = None
+
+    def record(self, seconds: float):
+        self.samples.append(seconds)
+        self.recent = seconds if self.recent is None else self.recent + RECENT_LATENCY_WEIGHT * (seconds - self.recent)
+
+    def baseline(self, percentile: float) -> float:
+        ordered = sorted(self.samples)
+        index = min(len(ordered) - 1, max(0, math.ceil(len(ordered) * percentile / 100) - 1))
+        return max(ordered[index], MIN_BASELINE_SECONDS)
+
+
+class LLMConcurrencyLimiter:
+    """
+    Counting semaphore that caps in-flight LLM requests.
+
+    Usable from worker threads (sync graph) and from any event loop (async graph),
+    so a single instance can bound every run in the process. Slots are handed
+    directly to the oldest waiter on release to keep dispatch fair.
+    """
+
+    def __init__(self, limit: int, name: str = "llm"):
+        if limit < 1:
+            raise ValueError("Concurrency limit must be at least 1")
+        self.name = name
+        self._limit = limit
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self._waiters = deque()
+
+    @property
+    def limit(self) -> int:
+        return self._limit
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._waiters)
+
+    def acquire(self):
+        """Block the calling thread until a slot is available"""
+        with self._lock:
+            if self._in_flight < self._limit and not self._waiters:
+                self._in_flight += 1
+                return
+            event = threading.Event()
+            self._waiters.append(("thread", event))
+        event.wait()
+
+    def try_acquire(self) -> bool:
+        """Take a slot if one is free right now, without waiting"""
+        with self._lock:
+            if self._in_flight < self._limit and not self._waiters:
+                self._in_flight += 1
+                return True
+            return False
+
+    async def acquire_async(self):
+        """Wait on the running event loop until a slot is available"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self._in_flight < self._limit and not self._waiters:
+                self._in_flight += 1
+                return
+            future = loop.create_future()
+            waiter = ("async", (loop, future))
+            self._waiters.append(waiter)
+        try:
+            await future
+        except asyncio.CancelledError:
+            with self._lock:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                    raise
+            # The slot was handed over; if the future was cancelled, _wake_async_waiter returns it
+            if not future.cancelled():
+                self.release()
+            raise
+
+    def release(self):
+        """Release a slot, handing it to the next waiter if there is one"""
+        with self._lock:
+            if self._waiters:
+                self._hand_over(self._waiters.popleft())
+                return
+            self._in_flight -= 1
+
+    def _hand_over(self, waiter):
+        """Give a held slot to a dequeued waiter; called with the lock held"""
+        kind, waiter = waiter
+        if kind == "thread":
+            waiter.set()
+        else:
+            loop, future = waiter
+            loop.call_soon_threadsafe(self._wake_async_waiter, future)
+
+    def _wake_async_waiter(self, future):
+        """Complete an async waiter's future; return the slot if it was cancelled meanwhile"""
+        if future.done():
+            self.release()
+        else:
+            future.set_result(None)
+
+
+class AdaptiveConcurrencyLimiter(LLMConcurrencyLimiter):
+    """
+    Limiter whose limit follows the backend's capacity (AIMD).
+
+    Every finished call reports its latency and whether it failed. The limit grows by one after a
+    full limit's worth of fast calls made while all slots were in use, and is multiplied by the
+    decrease factor when a call fails with an overload error, or when the node's moving average
+    latency exceeds the latency tolerance times its baseline (a low percentile of its recent calls).
+    Only calls started after the last decrease can trigger the next one, so a burst of slow calls
+    lowers the limit once.
+    """
+
+    def __init__(self, limit: int, min_limit: int = 1, max_limit: int = 32, latency_tolerance: float = 2.0,
+                 decrease_factor: float = 0.75, min_samples: int = 5, baseline_percentile: float = 25,
+                 name: str = "adaptive"):
+        if not 1 <= min_limit <= max_limit:
+            raise ValueError("The adaptive limits must satisfy 1 <= min_limit <= max_limit")
+        if not 0 < decrease_factor < 1:
+            raise ValueError("The decrease factor must be between 0 and 1")
+        super().__init__(min(max(limit, min_limit), max_limit), name=name)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_tolerance = latency_tolerance
+        self.decrease_factor = decrease_factor
+        self.min_samples = min_samples
+        self.baseline_percentile = baseline_percentile
+        self.increases = 0
+        self.decreases = 0
+        self._growth = 0.0
+        self._last_decrease_at = 0.0
+        self._latencies: Dict[str, NodeLatency] = {}
+
+    def _slowdown(self, node: str, seconds: float) -> Optional[tuple]:
+        """
+        Record the latency; returns the node's (moving average, baseline) when the average is past
+        the tolerance, once the node has enough samples
+        """
+        latency = self._latencies.setdefault(node, NodeLatency())
+        latency.record(seconds)
+        if len(latency.samples) < self.min_samples:
+            return None
+        baseline = latency.baseline(self.baseline_percentile)
+        return (latency.recent, baseline) if latency.recent > baseline * self.latency_tolerance else None
+
+    def record(self, node: str, started: float, seconds: float, overloaded: bool):
+        """
+        Feedback of a call started at the given monotonic time, made while holding a slot
+        """
+        with self._lock:
+            slowdown = None if overloaded else self._slowdown(node, seconds)
+            if overloaded or slowdown:
+                if started > self._last_decrease_at:
+                    self._decrease("failed call" if overloaded else
+                                   f"{node} averaging {slowdown[0]:.2f}s against a {slowdown[1]:.2f}s baseline")
+            elif self._in_flight >= self._limit or self._waiters:
+                # Grow only when the limit is what holds the calls back
+                self._growth += 1 / self._limit
+                if self._growth >= 1:
+                    self._growth = 0.0
+                    self._increase()
+
+    def _increase(self):
+        if self._limit >= self.max_limit:
+            return
+        self._limit += 1
+        self.increases += 1
+        ai_logger.info(f"[LLM Concurrency] Raised the {self.name} limit to {self._limit}")
+        while self._waiters and self._in_flight < self._limit:
+            self._in_flight += 1
+            self._hand_over(self._waiters.popleft())
+
+    def _decrease(self, reason: str):
+        self._growth = 0.0
+        self._last_decrease_at = time.monotonic()
+        limit = max(self.min_limit, int(self._limit * self.decrease_factor))
+        if limit < self._limit:
+            self._limit = limit
+            self.decreases += 1
+            ai_logger.warning(f"[LLM Concurrency] Lowered the {self.name} limit to {self._limit} after a {reason}")
+
+    def release(self):
+        """Release a slot; above a lowered limit it is dropped instead of handed over"""
+        with self._lock:
+            if self._waiters and self._in_flight <= self._limit:
+                self._hand_over(self._waiters.popleft())
+                return
+            self._in_flight -= 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'limit': self._limit,
+                'in_flight': self._in_flight,
+                'queue_depth': len(self._waiters),
+                'increases': self.increases,
+                'decreases': self.decreases,
+                'baseline_seconds': {
+                    node: round(latency.baseline(self.baseline_percentile), 3) for node, latency in self._latencies.items()
+                },
+                'recent_seconds': {node: round(latency.recent, 3) for node, latency in self._latencies.items()},
+            }
+
+
+def is_adaptive_concurrency_enabled() -> bool:
+    return getattr(settings, 'AI_SCORING_ADAPTIVE_CONCURRENCY', False)
+
+
+def get_max_process_llm_calls() -> int:
+    """Most LLM calls the process may have in flight"""
+    if is_adaptive_concurrency_enabled():
+        return getattr(settings, 'AI_SCORING_ADAPTIVE_MAX_LLM_CALLS', 32)
+    return getattr(settings, 'AI_SCORING_MAX_CONCURRENT_LLM_CALLS_PER_PROCESS', 8)
+
+
+_process_limiter = None
+_process_limiter_lock = threading.Lock()
+
+
+def get_process_limiter() -> LLMConcurrencyLimiter:
+    """
+    Return the process-wide limiter shared by every scoring run in this process
+    """
+    global _process_limiter
+    if _process_limiter is None:
+        with _process_limiter_lock:
+            if _process_limiter is None:
+                limit = getattr(settings, 'AI_SCORING_MAX_CONCURRENT_LLM_CALLS_PER_PROCESS', 8)
+                if is_adaptive_concurrency_enabled():
+                    # The fixed cap is the starting point the limit adapts from
+                    _process_limiter = AdaptiveConcurrencyLimiter(
+                        limit,
+                        min_limit=getattr(settings, 'AI_SCORING_ADAPTIVE_MIN_LLM_CALLS', 1),
+                        max_limit=get_max_process_llm_calls(),
+                        latency_tolerance=getattr(settings, 'AI_SCORING_ADAPTIVE_LATENCY_TOLERANCE', 2.0),
+                        decrease_factor=getattr(settings, 'AI_SCORING_ADAPTIVE_DECREASE_FACTOR', 0.75),
+                        min_samples=getattr(settings, 'AI_SCORING_ADAPTIVE_MIN_SAMPLES', 5),
+                        baseline_percentile=getattr(settings, 'AI_SCORING_ADAPTIVE_BASELINE_PERCENTILE', 25),
+                        name="process"
+                    )
+                else:
+                    _process_limiter = LLMConcurrencyLimiter(limit, name="process")
+    return _process_limiter
+
+
+def get_concurrency_stats() -> Optional[Dict[str, Any]]:
+    """
+    Current limit, in-flight calls and queue depth of the adaptive process limiter, if it is used
+    """
+    limiter = _process_limiter
+    return limiter.snapshot() if isinstance(limiter, AdaptiveConcurrencyLimiter) else None
+
+
+def create_run_limiter(limit: Optional[int] = None) -> LLMConcurrencyLimiter:
+    """
+    Create the limiter for a single scoring run. With adaptive concurrency a run may use every
+    process slot, so the process limiter alone decides how many calls the backend gets.
+    """
+    if limit is None:
+        if is_adaptive_concurrency_enabled():
+            limit = get_max_process_llm_calls()
+        else:
+            limit = getattr(settings, 'AI_SCORING_MAX_CONCURRENT_LLM_CALLS_PER_RUN', 4)
+    return LLMConcurrencyLimiter(limit, name="run")
+
+
+def _run_limiter_from_config(config) -> Optional[LLMConcurrencyLimiter]:
+    if not config:
+        return None
+    return config.get("configurable", {}).get("llm_run_limiter")
+
+
+@contextmanager
+def _feedback(limiter: LLMConcurrencyLimiter, node: str):
+    """Report the call's latency and outcome to an adaptive limiter"""
+    if not isinstance(limiter, AdaptiveConcurrencyLimiter):
+        yield
+        return
+    from .resilience import is_transient_error
+
+    started = time.monotonic()
+    try:
+        yield
+    except Exception as error:
+        # Errors the backend isn't to blame for (bad answers, parsing) say nothing about its load
+        if is_transient_error(error):
+            limiter.record(node, started, time.monotonic() - started, overloaded=True)
+        raise
+    limiter.record(node, started, time.monotonic() - started, overloaded=False)
+
+
+@contextmanager
+def llm_slot(config=None, node: str = "llm"):
+    """
+    Hold a run slot and a process slot for the duration of a blocking LLM call
+    """
+    run_limiter = _run_limiter_from_config(config)
+    process_limiter = get_process_limiter()
+    if run_limiter is not None:
+        run_limiter.acquire()
+    try:
+        process_limiter.acquire()
+        try:
+            with _feedback(process_limiter, node):
+                yield
+        finally:
+            process_limiter.release()
+    finally:
+        if run_limiter is not None:
+            run_limiter.release()
+
+
+@asynccontextmanager
+async def allm_slot(config=None, node: str = "llm"):
+    """
+    Hold a run slot and a process slot for the duration of an async LLM call
+    """
+    run_limiter = _run_limiter_from_config(config)
+    process_limiter = get_process_limiter()
+    if run_limiter is not None:
+        await run_limiter.acquire_async()
+    try:
+        await process_limiter.acquire_async()
+        try:
+            with _feedback(process_limiter, node):
+                yield
+        finally:
+            process_limiter.release()
+    finally:
+        if run_limiter is not None:
+            run_limiter.release()
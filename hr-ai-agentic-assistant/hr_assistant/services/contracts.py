@@ -6,6 +6,26 @@ from pydantic import BaseModel, Field
 from operator import add
 
 
+# Scoring modes selectable per run
+SCORING_MODE_MULTI_CALL = "multi_call"  # Separate scoring, categorization and justification calls
+SCORING_MODE_STRUCTURED = "structured"  # Single schema-constrained JSON call per applicant
+SCORING_MODE_SKILL_COVERAGE = "skill_coverage"  # No LLM: score is the share of required skills found in the resume
+SCORING_MODE_BATCHED = "batched"  # Several short resumes per schema-constrained JSON call
+VALID_SCORING_MODES = [SCORING_MODE_MULTI_CALL, SCORING_MODE_STRUCTURED, SCORING_MODE_SKILL_COVERAGE, SCORING_MODE_BATCHED]
+# Modes that run the supervisor graph and call the LLM
+LLM_SCORING_MODES = [SCORING_MODE_MULTI_CALL, SCORING_MODE_STRUCTURED, SCORING_MODE_BATCHED]
+
+# Prompt template versions per scoring mode - bump when a mode's prompts change so cached results are not reused
+PROMPT_TEMPLATE_VERSIONS = {
+    SCORING_MODE_MULTI_CALL: "4",
+    SCORING_MODE_STRUCTURED: "3",
+    SCORING_MODE_BATCHED: "1",
+}
+
+VALID_QUALITY_GRADES = ["A", "B", "C", "D", "F"]
+VALID_CATEGORIES = ["Senior", "Mid-Level", "Junior", "Mismatched"]
+
+
 class AIAnalysisResponse(BaseModel):
     """
     Data contract for AI analysis response
@@ -17,6 +37,49 @@ class AIAnalysisResponse(BaseModel):
     applicant_id: int = Field(description="Reference to the applicant being scored")
 
 
+def get_structured_analysis_schema(include_justification: bool = True) -> Dict[str, Any]:
+    """
+    JSON schema sent to the LLM for structured analysis.
+    Derived from AIAnalysisResponse so the returned JSON validates straight into it;
+    applicant_id is omitted because it is supplied by the worker, not the model, and
+    justification_summary is omitted when justifications are generated on demand.
+    """
+    omitted = {"applicant_id"} if include_justification else {"applicant_id", "justification_summary"}
+    schema = AIAnalysisResponse.model_json_schema()
+    for field in omitted:
+        schema["properties"].pop(field, None)
+    schema["required"] = [field for field in schema["required"] if field not in omitted]
+    schema["properties"]["quality_grade"]["enum"] = VALID_QUALITY_GRADES
+    schema["properties"]["categorization"]["enum"] = VALID_CATEGORIES
+    return schema
+
+
+def get_categorization_schema() -> Dict[str, Any]:
+    """
+    JSON schema sent to the LLM for the multi-call categorization: the category, constrained to VALID_CATEGORIES
+    """
+    return {
+        "type": "object",
+        "properties": {"categorization": {"type": "string", "enum": VALID_CATEGORIES}},
+        "required": ["categorization"],
+    }
+
+
+def get_batch_analysis_schema(include_justification: bool = True) -> Dict[str, Any]:
+    """
+    JSON schema sent to the LLM for a batch of applicants: a list of structured analyses,
+    each naming the applicant_id it belongs to so the results can be matched back
+    """
+    item_schema = get_structured_analysis_schema(include_justification)
+    item_schema["properties"] = {"applicant_id": {"type": "integer"}, **item_schema["properties"]}
+    item_schema["required"] = ["applicant_id"] + item_schema["required"]
+    return {
+        "type": "object",
+        "properties": {"analyses": {"type": "array", "items": item_schema}},
+        "required": ["analyses"],
+    }
+
+
 def merge_applicant_id_list(left: List[int], right: List[int]) -> List[int]:
     """Reducer function to merge applicant_id_list - keep the original list since it shouldn't change during processing"""
     # Return the original list (left) to avoid conflicts
@@ -40,28 +103,75 @@ def merge_status(left: str, right: str) -> str:
 
 def merge_total_count(left: int, right: int) -> int:
     """Reducer function for total_count - keep the left (original) value as it should remain constant"""
-    # The total count should remain constant during processing, so we return the left (original) value
-    return left
+    # The total count should remain constant during processing, so we return the left (original) value.
+    # LangGraph seeds int channels with 0, so fall back to the incoming value until one is set.
+    return left if left else right
 
 
-def merge_resume_texts(left: Dict[int, str], right: Dict[int, str]) -> Dict[int, str]:
-    """Reducer function to merge resume_texts - combine both dictionaries"""
+def _merge_applicant_dicts(left: Dict[int, str], right: Dict[int, str]) -> Dict[int, str]:
+    """Combine two per-applicant dictionaries, copying only when the update adds or changes entries"""
+    if not left:
+        return right
+    if not right or right.items() <= left.items():
+        return left
     # Merge the dictionaries, with right values taking precedence for duplicate keys
     merged = left.copy()
     merged.update(right)
     return merged
 
 
+def merge_resume_texts(left: Dict[int, str], right: Dict[int, str]) -> Dict[int, str]:
+    """Reducer function to merge resume_texts - combine both dictionaries"""
+    return _merge_applicant_dicts(left, right)
+
+
+def merge_content_hashes(left: Dict[int, str], right: Dict[int, str]) -> Dict[int, str]:
+    """Reducer function to merge content_hashes - combine both dictionaries"""
+    return _merge_applicant_dicts(left, right)
+
+
+def merge_skill_coverage(left: Dict[int, Dict[str, Any]], right: Dict[int, Dict[str, Any]]) -> Dict[int, Dict[str, Any]]:
+    """Reducer function to merge skill_coverage - combine both dictionaries"""
+    return _merge_applicant_dicts(left, right)
+
+
+def merge_resume_facts(left: Dict[int, Dict[str, Any]], right: Dict[int, Dict[str, Any]]) -> Dict[int, Dict[str, Any]]:
+    """Reducer function to merge resume_facts - combine both dictionaries"""
+    return _merge_applicant_dicts(left, right)
+
+
 def merge_job_requirements(left: str, right: str) -> str:
     """Reducer function for job_requirements - keep the left (original) value as it shouldn't change"""
-    # The job requirements should remain constant during processing, so we return the left (original) value
-    return left
+    # The job requirements should remain constant during processing, so we return the left (original) value.
+    # LangGraph seeds str channels with "", so fall back to the incoming value until one is set.
+    return left if left else right
+
+
+def merge_scoring_mode(left: str, right: str) -> str:
+    """Reducer function for scoring_mode - keep the left (original) value as the mode is fixed for a run"""
+    return left if left else right
+
+
+# Field values of a worker's analysis response before any node has filled it in
+INITIAL_ANALYSIS_VALUES = {
+    "overall_score": 0,
+    "quality_grade": "F",
+    "categorization": "Mismatched",
+    "justification_summary": "",
+}
 
 
 def merge_current_analysis_response(left: AIAnalysisResponse, right: AIAnalysisResponse) -> AIAnalysisResponse:
-    """Reducer function for current_analysis_response - prioritize the right (newer) analysis response"""
-    # Use the right (more recent) analysis response since it's more up-to-date
-    return right
+    """Reducer function for current_analysis_response - merge the fields filled in by parallel branches"""
+    if left is None or right is None or left is right or left.applicant_id != right.applicant_id:
+        return right if right is not None else left
+    # The scoring and categorization branches run in parallel, each filling in its own fields of a copy:
+    # take the fields the right response has set and keep the left's values for the others
+    merged = {
+        field: getattr(left, field) if getattr(right, field) == initial else getattr(right, field)
+        for field, initial in INITIAL_ANALYSIS_VALUES.items()
+    }
+    return AIAnalysisResponse(applicant_id=right.applicant_id, **merged)
 
 
 class GraphState(TypedDict):
@@ -77,4 +187,22 @@ class GraphState(TypedDict):
     total_count: Annotated[int, merge_total_count]
     resume_texts: Annotated[Dict[int, str], merge_resume_texts]  # Store resume texts by applicant ID
     job_requirements: Annotated[str, merge_job_requirements]  # The job requirements to compare against
-    current_analysis_response: Annotated[AIAnalysisResponse, merge_current_analysis_response] 
\ No newline at end of file
+    current_analysis_response: Annotated[AIAnalysisResponse, merge_current_analysis_response]
+    scoring_mode: Annotated[str, merge_scoring_mode]  # One of VALID_SCORING_MODES, selected per run
+    content_hashes: Annotated[Dict[int, str], merge_content_hashes]  # Resume content hashes by applicant ID, for the analysis cache
+    job_requirements_hash: Annotated[str, merge_job_requirements]  # Hash of the normalized job requirements, for the analysis cache
+    cache_hit: Annotated[bool, lambda x, y: x or y]  # Set by a worker whose result was served from the analysis cache
+    skill_coverage: Annotated[Dict[int, Dict[str, Any]], merge_skill_coverage]  # Required skills found/missing by applicant ID
+    resume_facts: Annotated[Dict[int, Dict[str, Any]], merge_resume_facts]  # Structured facts extracted at upload, by applicant ID
+    cached_ids: Annotated[List[int], add]  # Applicants of a batch worker served from the analysis cache
+    failed_ids: Annotated[List[int], add]  # Applicants whose analysis failed, kept out of the cache and not persisted
+
+
+class WorkerOutputState(TypedDict):
+    """
+    Part of a worker sub-graph's state returned to the supervisor: its result, error count and failed applicants.
+    Keeping the worker's copies of the run inputs out of the output avoids merging them back per worker.
+    """
+    results: Annotated[List[AIAnalysisResponse], add]
+    error_count: Annotated[int, lambda x, y: x + y]
+    failed_ids: Annotated[List[int], add]
@@ -0,0 +1,103 @@
+"""
+LLM calls of the worker nodes: per-node output token caps and streaming early termination.
+
+AI_SCORING_NODE_MAX_TOKENS caps how many tokens Ollama may generate for a node's call
+(num_predict). With AI_SCORING_STREAM_EARLY_STOP, calls that only need a few fields are streamed
+and parsed as the text arrives; once the node's fields are complete the stream is closed, which
+ends the generation on the Ollama server instead of waiting for the explanation models tend to
+add after the answer. A call with a format schema answers in JSON, so it only counts as complete
+once the text received so far parses as a JSON object.
+"""
+import json
+import logging
+import time
+from typing import Any, Callable, Dict, Optional
+
+from django.conf import settings
+
+ai_logger = logging.getLogger('ai_processing')
+
+# Sampling temperature of every scoring client; repeated in per-call options, which replace the client's
+LLM_TEMPERATURE = 0.1
+
+# Whether the streamed text so far holds every field the node needs
+CompletionCheck = Callable[[str], bool]
+
+
+def json_answer_complete(text: str) -> bool:
+    """Whether the text is a whole JSON object, however it is laid out"""
+    try:
+        return isinstance(json.loads(text), dict)
+    except ValueError:
+        return False
+
+
+def _completion_check(is_complete: Optional[CompletionCheck], kwargs: Dict[str, Any]) -> Optional[CompletionCheck]:
+    """The node's check, held back until a JSON answer is whole when the call has a format schema"""
+    if is_complete is None or kwargs.get("format") is None:
+        return is_complete
+    return lambda text: json_answer_complete(text) and is_complete(text)
+
+
+def is_early_stop_enabled() -> bool:
+    return getattr(settings, 'AI_SCORING_STREAM_EARLY_STOP', False)
+
+
+def get_node_max_tokens(node: str) -> Optional[int]:
+    return (getattr(settings, 'AI_SCORING_NODE_MAX_TOKENS', {}) or {}).get(node)
+
+
+def call_options(node: str) -> Dict[str, Any]:
+    """Keyword arguments of a node's LLM call: the node's output token cap, if any"""
+    max_tokens = get_node_max_tokens(node)
+    if not max_tokens:
+        return {}
+    return {"options": {"temperature": LLM_TEMPERATURE, "num_predict": max_tokens}}
+
+
+def complete(client, prompt: str, node: str, is_complete: CompletionCheck = None, **kwargs) -> str:
+    """
+    Text of a node's LLM call. With early stop and an is_complete check, the response is streamed
+    and the stream closed as soon as is_complete accepts the text received so far.
+    """
+    kwargs.update(call_options(node))
+    is_complete = _completion_check(is_complete, kwargs)
+    if is_complete is None or not is_early_stop_enabled():
+        return client.invoke(prompt, **kwargs).content
+
+    started = time.monotonic()
+    text = ""
+    stream = client.stream(prompt, **kwargs)
+    try:
+        for chunk in stream:
+            text += chunk.content
+            if is_complete(text):
+                ai_logger.info(f"[Generation] {node} stopped early after {len(text)} characters in {time.monotonic() - started:.2f}s")
+                break
+    finally:
+        # Closing the stream closes the HTTP response, so Ollama stops generating
+        stream.close()
+    return text
+
+
+async def acomplete(client, prompt: str, node: str, is_complete: CompletionCheck = None, **kwargs) -> str:
+    """
+    Async complete() using ainvoke / astream
+    """
+    kwargs.update(call_options(node))
+    is_complete = _completion_check(is_complete, kwargs)
+    if is_complete is None or not is_early_stop_enabled():
+        return (await client.ainvoke(prompt, **kwargs)).content
+
+    started = time.monotonic()
+    text = ""
+    stream = client.astream(prompt, **kwargs)
+    try:
+        async for chunk in stream:
+            text += chunk.content
+            if is_complete(text):
+                ai_logger.info(f"[Generation] {node} stopped early after {len(text)} characters in {time.monotonic() - started:.2f}s")
+                break
+    finally:
+        await stream.aclose()
+    return text
@@ -0,0 +1,76 @@
+"""
+Process-wide registry of compiled supervisor graphs.
+
+Compiling the supervisor and its worker sub-graph is the same work for every run with the same
+graph structure, so each structure is compiled once per process and the compiled graph is shared by
+every run. Only the async mode and the checkpointer change the structure: the scoring mode is
+routed at run time from the graph state, and the model and prompts are read by the nodes when they
+run, so runs with different models, scoring modes or prompt versions share one graph. A compiled
+graph holds no run state: each invocation gets its own channels, and the run's limiter, result
+writer and thread ID travel in the run config, so concurrent runs can invoke the same graph safely.
+"""
+import logging
+import threading
+from typing import Dict, NamedTuple, Optional
+
+from django.conf import settings
+
+from . import ai_analysis
+from .checkpointing import DjangoCheckpointSaver, is_checkpointing_enabled
+
+ai_logger = logging.getLogger('ai_processing')
+
+
+class GraphKey(NamedTuple):
+    """Graph structure a compiled graph was built for"""
+    async_mode: bool
+    checkpointed: bool
+
+
+_compiled_graphs: Dict[GraphKey, object] = {}
+_registry_lock = threading.Lock()
+
+
+def get_graph_key(async_mode: bool = None, checkpointed: bool = False) -> GraphKey:
+    if async_mode is None:
+        async_mode = getattr(settings, 'AI_SCORING_ASYNC', True)
+    return GraphKey(async_mode=async_mode, checkpointed=checkpointed)
+
+
+def get_supervisor_graph(async_mode: bool = None, checkpointed: bool = False):
+    """
+    Return the compiled supervisor graph for this graph structure, compiling it on first use.
+    A checkpointed graph carries a DjangoCheckpointSaver, available as graph.checkpointer.
+    """
+    key = get_graph_key(async_mode, checkpointed)
+    graph = _compiled_graphs.get(key)
+    if graph is None:
+        with _registry_lock:
+            graph = _compiled_graphs.get(key)
+            if graph is None:
+                ai_logger.info(f"[Graph Registry] Compiling supervisor graph for {key}")
+                checkpointer = DjangoCheckpointSaver() if checkpointed else None
+                graph = ai_analysis.create_supervisor_graph(async_mode=key.async_mode, checkpointer=checkpointer)
+                _compiled_graphs[key] = graph
+    return graph
+
+
+def warm_up(async_mode: bool = None, checkpointed: Optional[bool] = None) -> int:
+    """
+    Compile the graph a worker is going to use before it takes its first run.
+    Defaults to the configured async and checkpointing settings.
+    Returns the number of graphs in the registry.
+    """
+    if checkpointed is None:
+        checkpointed = is_checkpointing_enabled()
+    get_supervisor_graph(async_mode=async_mode, checkpointed=checkpointed)
+    ai_logger.info(f"[Graph Registry] Warm-up complete, {len(_compiled_graphs)} compiled graphs")
+    return len(_compiled_graphs)
+
+
+def clear_graph_registry():
+    """
+    Drop every compiled graph, e.g. after the pipeline code or settings changed
+    """
+    with _registry_lock:
+        _compiled_graphs.clear()
@@ -0,0 +1,106 @@
+"""
+On-demand justifications.
+
+The justification is the longest generation of an analysis and most applicants' are never read.
+With AI_SCORING_LAZY_JUSTIFICATION, batch scoring stores only the score, grade and category and
+marks the result as pending a justification. The justification is generated the first time the
+detailed analysis or the candidate report asks for it and stored on the applicant, so later
+requests read it from the database. The AI_SCORING_JUSTIFICATION_PREGENERATE_TOP_N best applicants
+of a run get theirs as soon as the run finishes.
+"""
+import logging
+from typing import Any, Dict, Iterable
+
+from django.conf import settings
+
+from jobs.models import Applicant
+from . import scoring_stack
+from .contracts import AIAnalysisResponse
+from .requirements_digest import ensure_requirements_digest, is_digest_enabled
+from .skill_coverage import SkillCoverageMatrix
+
+ai_logger = logging.getLogger('ai_processing')
+
+JUSTIFICATION_PENDING_KEY = 'justification_pending'
+
+
+def is_lazy_justification_enabled() -> bool:
+    return getattr(settings, 'AI_SCORING_LAZY_JUSTIFICATION', False)
+
+
+def is_justification_pending(applicant) -> bool:
+    """Whether the applicant's current result was stored without its justification"""
+    return bool((applicant.ai_analysis_result or {}).get(JUSTIFICATION_PENDING_KEY))
+
+
+def build_justification_state(applicant) -> Dict[str, Any]:
+    """
+    Worker state holding what the justification prompt needs, rebuilt from the stored applicant
+    """
+    job_listing = applicant.job_listing
+    resume_text = applicant.parsed_resume_text or ""
+    if is_digest_enabled():
+        job_requirements = ensure_requirements_digest(job_listing)
+    else:
+        job_requirements = job_listing.detailed_description or ""
+    skill_matrix = SkillCoverageMatrix(job_listing.required_skills, {applicant.id: resume_text})
+    return {
+        "applicant_id_list": [applicant.id],
+        "current_index": 1,  # As if data_retrieval_node had run
+        "resume_texts": {applicant.id: resume_text},
+        "job_requirements": job_requirements,
+        "current_analysis_response": AIAnalysisResponse(
+            overall_score=applicant.overall_score or 0,
+            quality_grade=applicant.quality_grade or "F",
+            categorization=applicant.categorization or "Mismatched",
+            justification_summary="",
+            applicant_id=applicant.id
+        ),
+        "skill_coverage": {applicant.id: skill_matrix.summary(applicant.id)},
+        "resume_facts": {applicant.id: applicant.resume_facts or {}},
+    }
+
+
+def ensure_justification(applicant) -> str:
+    """
+    Return the applicant's justification, generating and storing it first if it is pending
+    """
+    if not is_justification_pending(applicant):
+        return applicant.justification_summary
+
+    justification = scoring_stack.generate_justification(build_justification_state(applicant))
+    details = {key: value for key, value in applicant.ai_analysis_result.items() if key != JUSTIFICATION_PENDING_KEY}
+    applicant.justification_summary = justification
+    applicant.ai_analysis_result = details or None
+    # Only if it is still pending: a new scoring run may have replaced the result meanwhile
+    Applicant.objects.filter(
+        id=applicant.id, **{f'ai_analysis_result__{JUSTIFICATION_PENDING_KEY}': True}
+    ).update(justification_summary=justification, ai_analysis_result=applicant.ai_analysis_result)
+    ai_logger.info(f"[Lazy Justification] Generated justification for applicant {applicant.id}")
+    return justification
+
+
+def pregenerate_justifications(applicant_ids: Iterable[int], top_n: int = None) -> int:
+    """
+    Generate the pending justifications of the top_n best-scored applicants among applicant_ids.
+    Returns the number generated; failures are logged and left pending.
+    """
+    if top_n is None:
+        top_n = getattr(settings, 'AI_SCORING_JUSTIFICATION_PREGENERATE_TOP_N', 0)
+    if not top_n:
+        return 0
+
+    applicants = (
+        Applicant.objects.select_related('job_listing')
+        .filter(id__in=list(applicant_ids), **{f'ai_analysis_result__{JUSTIFICATION_PENDING_KEY}': True})
+        .order_by('-overall_score', 'id')[:top_n]
+    )
+    generated = 0
+    for applicant in applicants:
+        try:
+            ensure_justification(applicant)
+            generated += 1
+        except Exception as e:
+            ai_logger.error(f"[Lazy Justification] Error generating justification for applicant {applicant.id}: {str(e)}")
+    ai_logger.info(f"[Lazy Justification] Pre-generated {generated} justifications for the top {top_n} applicants")
+    return generated
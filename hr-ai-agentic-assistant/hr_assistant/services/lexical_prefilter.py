@@ -0,0 +1,167 @@
+"""
+Lexical pre-filter that triages applicants before LLM scoring.
+
+Ranks every applicant of a run with BM25 over their parsed resume text, using the job description
+and required skills as the query. Only the best-ranked applicants are sent to the supervisor graph;
+the rest get a provisional "Mismatched" result without any LLM call. The index is built once per
+run with an inverted index, so scoring all applicants is a single pass over the query terms' postings.
+"""
+import logging
+import math
+import re
+from collections import Counter, defaultdict
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional
+
+from django.conf import settings
+
+from .contracts import AIAnalysisResponse
+
+ai_logger = logging.getLogger('ai_processing')
+
+# Keeps technology names such as c++, c#, node.js and .net together
+TOKEN_PATTERN = re.compile(r"[a-z0-9.+#]*[a-z0-9+#]")
+
+STOP_WORDS = frozenset("""
+a an and are as at be by for from has have in is it its of on or our that the this to was we were
+will with you your they their who what which while within would should can could may must not
+""".split())
+
+# Required skills count this many times in the query, as they matter more than the description prose
+SKILL_QUERY_WEIGHT = 2
+
+
+def is_prefilter_enabled() -> bool:
+    return getattr(settings, 'AI_SCORING_PREFILTER_ENABLED', False)
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-cased terms of a text without stop words"""
+    if not text:
+        return []
+    tokens = (token.lstrip('.') for token in TOKEN_PATTERN.findall(text.lower()))
+    return [token for token in tokens if token and token not in STOP_WORDS]
+
+
+def build_job_query(job_description: str, required_skills: Iterable[str] = None) -> Counter:
+    """Query term weights for a job: description terms once, required skill terms SKILL_QUERY_WEIGHT times"""
+    query = Counter(set(tokenize(job_description)))
+    for skill in required_skills or []:
+        for term in set(tokenize(str(skill))):
+            query[term] += SKILL_QUERY_WEIGHT
+    return query
+
+
+class BM25Index:
+    """
+    Okapi BM25 index over the resumes of one scoring run
+    """
+
+    def __init__(self, documents: Dict[int, str], k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.doc_lengths: Dict[int, int] = {}
+        # term -> [(applicant_id, term frequency)]
+        self.postings: Dict[str, List[tuple]] = defaultdict(list)
+        for applicant_id, text in documents.items():
+            terms = tokenize(text)
+            self.doc_lengths[applicant_id] = len(terms)
+            for term, frequency in Counter(terms).items():
+                self.postings[term].append((applicant_id, frequency))
+        self.doc_count = len(self.doc_lengths)
+        self.avg_doc_length = (sum(self.doc_lengths.values()) / self.doc_count) if self.doc_count else 0.0
+
+    def idf(self, term: str) -> float:
+        doc_frequency = len(self.postings.get(term, ()))
+        return math.log(1 + (self.doc_count - doc_frequency + 0.5) / (doc_frequency + 0.5))
+
+    def score(self, query: Counter) -> Dict[int, float]:
+        """BM25 score of every indexed applicant for the weighted query terms"""
+        scores = dict.fromkeys(self.doc_lengths, 0.0)
+        if not self.avg_doc_length:
+            return scores
+        for term, weight in query.items():
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            idf = self.idf(term)
+            for applicant_id, frequency in postings:
+                length_norm = 1 - self.b + self.b * self.doc_lengths[applicant_id] / self.avg_doc_length
+                scores[applicant_id] += weight * idf * frequency * (self.k1 + 1) / (frequency + self.k1 * length_norm)
+        return scores
+
+
+class PrefilterResult(NamedTuple):
+    """Outcome of triaging a run's applicants"""
+    selected_ids: List[int]
+    # applicant_id -> (relevance relative to the best match, rank starting at 1)
+    screened_out: Dict[int, tuple]
+
+
+def prefilter_applicants(resume_texts: Dict[int, str], job_description: str, required_skills: Iterable[str] = None,
+                         top_k: Optional[int] = None, min_relevance: Optional[float] = None) -> PrefilterResult:
+    """
+    Keep the top_k applicants by BM25 relevance, dropping any whose relevance relative to the best
+    match is below min_relevance. Either limit may be None. selected_ids keep their input order.
+    """
+    if top_k is None:
+        top_k = getattr(settings, 'AI_SCORING_PREFILTER_TOP_K', 200)
+    if min_relevance is None:
+        min_relevance = getattr(settings, 'AI_SCORING_PREFILTER_MIN_RELEVANCE', None)
+
+    if (top_k is None or len(resume_texts) <= top_k) and min_relevance is None:
+        return PrefilterResult(selected_ids=list(resume_texts), screened_out={})
+
+    scores = BM25Index(resume_texts).score(build_job_query(job_description, required_skills))
+    best_score = max(scores.values(), default=0.0)
+    ranked = sorted(scores, key=lambda applicant_id: scores[applicant_id], reverse=True)
+
+    selected = set()
+    screened_out = {}
+    for rank, applicant_id in enumerate(ranked, start=1):
+        relevance = scores[applicant_id] / best_score if best_score else 0.0
+        within_top_k = top_k is None or rank <= top_k
+        above_cutoff = min_relevance is None or relevance >= min_relevance
+        if within_top_k and above_cutoff:
+            selected.add(applicant_id)
+        else:
+            screened_out[applicant_id] = (relevance, rank)
+
+    ai_logger.info(f"[Lexical Pre-filter] Selected {len(selected)} of {len(resume_texts)} applicants for AI analysis (top_k={top_k}, min_relevance={min_relevance})")
+    return PrefilterResult(
+        selected_ids=[applicant_id for applicant_id in resume_texts if applicant_id in selected],
+        screened_out=screened_out
+    )
+
+
+def build_provisional_result(applicant_id: int, relevance: float, rank: int, total: int) -> AIAnalysisResponse:
+    """
+    Result recorded for an applicant the pre-filter kept away from the LLM
+    """
+    return AIAnalysisResponse(
+        overall_score=0,
+        quality_grade="F",
+        categorization="Mismatched",
+        justification_summary=(
+            f"Provisional result: screened out by the lexical pre-filter before AI analysis "
+            f"(relevance {relevance:.2f} of the best match, rank {rank} of {total}). "
+            f"Score this applicant individually for a full analysis."
+        ),
+        applicant_id=applicant_id
+    )
+
+
+def build_provisional_details(relevance: float, rank: int) -> Dict[str, Any]:
+    """
+    Analysis details stored with a provisional result, see is_provisional_result
+    """
+    return {
+        'provisional': True,
+        'stage': 'lexical_prefilter',
+        'lexical_relevance': round(relevance, 4),
+        'lexical_rank': rank,
+    }
+
+
+def is_provisional_result(applicant) -> bool:
+    """Whether the applicant's current result comes from the pre-filter rather than the LLM"""
+    return bool((applicant.ai_analysis_result or {}).get('provisional'))
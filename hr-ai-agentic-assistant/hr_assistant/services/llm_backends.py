@@ -0,0 +1,229 @@
+"""
+LLM backends creating the chat clients the scoring nodes call.
+
+AI_SCORING_LLM_BACKEND selects the backend: 'ollama' (the default) talks to an Ollama server, 'pool'
+spreads the calls over the Ollama servers in AI_SCORING_OLLAMA_ENDPOINTS (see llm_pool), and
+'fake' answers in-process with deterministic outputs and simulated latency, so the whole scoring
+path (graph, cache, persistence, run status) can be exercised and load-tested without a model
+server. A dotted path to an LLMBackend subclass selects a custom backend.
+
+A client follows the LangChain chat model interface used by the nodes: invoke/ainvoke return a
+message and stream/astream yield message chunks, each with the text in .content. Calls accept
+format (a JSON schema the reply must follow, for structured output) and options (sampling options
+such as num_predict).
+"""
+import asyncio
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+from .contracts import VALID_CATEGORIES
+from .generation import LLM_TEMPERATURE
+from .llm_pool import PooledChatClient, get_endpoint_pool
+from .resilience import get_call_deadline
+from .rule_derivation import derive_quality_grade
+
+
+class LLMBackend(ABC):
+    """
+    Creates the chat client of a model; clients are created once per model and shared by all runs
+    """
+    name = None
+
+    @abstractmethod
+    def create_client(self, model: str):
+        """The chat client of the model"""
+
+
+class OllamaBackend(LLMBackend):
+    name = 'ollama'
+
+    def create_client(self, model: str, base_url: str = None):
+        # Imported on first use, like the rest of the scoring stack
+        from langchain_ollama import ChatOllama
+        kwargs = {}
+        if base_url is not None:
+            kwargs['base_url'] = base_url
+        deadline = get_call_deadline()
+        if deadline:
+            # Frees the connection of a stalled request; call_llm and acall_llm bound the call as a whole
+            kwargs['client_kwargs'] = {'timeout': deadline}
+        return ChatOllama(model=model, temperature=LLM_TEMPERATURE, **kwargs)
+
+
+class PoolBackend(LLMBackend):
+    name = 'pool'
+
+    def create_client(self, model: str) -> PooledChatClient:
+        pool = get_endpoint_pool()
+        clients = {endpoint.url: OllamaBackend().create_client(model, base_url=endpoint.url) for endpoint in pool.endpoints}
+        return PooledChatClient(model, pool, clients)
+
+
+# Default behaviour of the fake backend, overridden key by key by AI_SCORING_FAKE_LLM
+FAKE_LLM_DEFAULTS = {
+    'seed': 0,
+    'latency_ms': 50,  # Time to the first token
+    'latency_jitter_ms': 0,  # Uniform +/- jitter of the time to the first token
+    'ms_per_token': 0,  # Generation time of every further token (one token per word)
+    'score_mean': 65,
+    'score_stddev': 15,
+    'category_weights': {'Senior': 1, 'Mid-Level': 2, 'Junior': 1, 'Mismatched': 1},
+    'trailing_words': 0,  # Explanation words written after the answer, as chatty models do
+    'error_rate': 0.0,  # Share of calls failing with a ConnectionError
+    'capacity': 0,  # Concurrent calls served at full speed; beyond it every call slows down in proportion (0: unlimited)
+}
+
+APPLICANT_ID_PATTERN = re.compile(r"Applicant ID: (\d+)")
+
+
+class FakeChatClient:
+    """
+    In-process chat client with deterministic replies: the same prompt always gets the same
+    answer and latency for a given seed. The reply is shaped by what the prompt asks for.
+    """
+
+    def __init__(self, model: str, config: Dict[str, Any]):
+        self.model = model
+        self.config = config
+        self.outstanding = 0
+        self._lock = threading.Lock()
+
+    def _rng(self, prompt: str, salt: str = "") -> random.Random:
+        digest = hashlib.sha256(f"{self.config['seed']}|{self.model}|{salt}|{prompt}".encode('utf-8')).digest()
+        return random.Random(int.from_bytes(digest[:8], 'big'))
+
+    def _score(self, rng: random.Random) -> int:
+        return max(0, min(100, round(rng.gauss(self.config['score_mean'], self.config['score_stddev']))))
+
+    def _category(self, rng: random.Random) -> str:
+        weights = self.config['category_weights']
+        categories = [category for category in VALID_CATEGORIES if weights.get(category)]
+        return rng.choices(categories, weights=[weights[category] for category in categories])[0]
+
+    def _analysis(self, rng: random.Random, schema: Dict[str, Any]) -> Dict[str, Any]:
+        score = self._score(rng)
+        analysis = {
+            'overall_score': score,
+            'quality_grade': derive_quality_grade(score),
+            'categorization': self._category(rng),
+        }
+        if 'justification_summary' in schema.get('properties', {}):
+            analysis['justification_summary'] = f"Simulated analysis by the fake backend, score {score}."
+        # Only the fields the schema asks for, e.g. just the category of the categorization call
+        return {key: value for key, value in analysis.items() if key in schema.get('properties', analysis)}
+
+    def reply(self, prompt: str, format: Dict[str, Any] = None) -> str:
+        """Answer text for the prompt, following the JSON schema if one is given"""
+        rng = self._rng(prompt)
+        if format:
+            if 'analyses' in format.get('properties', {}):
+                item_schema = format['properties']['analyses']['items']
+                analyses = [
+                    {'applicant_id': int(applicant_id), **self._analysis(self._rng(prompt, applicant_id), item_schema)}
+                    for applicant_id in APPLICANT_ID_PATTERN.findall(prompt)
+                ]
+                return json.dumps({'analyses': analyses})
+            return json.dumps(self._analysis(rng, format))
+
+        if "Overall Score: [number]" in prompt:
+            score = self._score(rng)
+            text = f"Overall Score: {score}\nQuality Grade: {derive_quality_grade(score)}\n"
+        elif "category name" in prompt:
+            text = f"{self._category(rng)}\n"
+        else:
+            text = f"Simulated justification by the fake backend, {rng.randint(1, 9)} strengths noted."
+        if self.config['trailing_words']:
+            text += " ".join(["Explanation"] * self.config['trailing_words'])
+        return text
+
+    def _tokens(self, prompt: str, kwargs: Dict[str, Any]) -> List[str]:
+        """Reply split into word tokens, cut at the call's num_predict"""
+        rng = self._rng(prompt, 'failure')
+        if rng.random() < self.config['error_rate']:
+            raise ConnectionError(f"Fake backend: simulated failure of {self.model}")
+        tokens = re.findall(r"\S+\s*|\s+", self.reply(prompt, kwargs.get('format')))
+        num_predict = (kwargs.get('options') or {}).get('num_predict')
+        return tokens[:num_predict] if num_predict else tokens
+
+    def _first_token_delay(self, prompt: str) -> float:
+        jitter = self.config['latency_jitter_ms']
+        latency_ms = self.config['latency_ms'] + (self._rng(prompt, 'latency').uniform(-jitter, jitter) if jitter else 0)
+        return max(0.0, latency_ms) / 1000
+
+    def _generation_delay(self, token_count: int) -> float:
+        return self.config['ms_per_token'] * token_count / 1000
+
+    @contextmanager
+    def _serving(self):
+        """Count the call as outstanding; yields how much slower the overloaded server makes it"""
+        with self._lock:
+            self.outstanding += 1
+            capacity = self.config['capacity']
+            slowdown = max(1.0, self.outstanding / capacity) if capacity else 1.0
+        try:
+            yield slowdown
+        finally:
+            with self._lock:
+                self.outstanding -= 1
+
+    def invoke(self, prompt: str, **kwargs):
+        from langchain_core.messages import AIMessage
+        tokens = self._tokens(prompt, kwargs)
+        with self._serving() as slowdown:
+            time.sleep(slowdown * (self._first_token_delay(prompt) + self._generation_delay(max(0, len(tokens) - 1))))
+        return AIMessage(content="".join(tokens))
+
+    async def ainvoke(self, prompt: str, **kwargs):
+        from langchain_core.messages import AIMessage
+        tokens = self._tokens(prompt, kwargs)
+        with self._serving() as slowdown:
+            await asyncio.sleep(slowdown * (self._first_token_delay(prompt) + self._generation_delay(max(0, len(tokens) - 1))))
+        return AIMessage(content="".join(tokens))
+
+    def stream(self, prompt: str, **kwargs) -> Iterator[Any]:
+        from langchain_core.messages import AIMessageChunk
+        tokens = self._tokens(prompt, kwargs)
+        with self._serving() as slowdown:
+            time.sleep(slowdown * self._first_token_delay(prompt))
+            for index, token in enumerate(tokens):
+                if index:
+                    time.sleep(slowdown * self._generation_delay(1))
+                yield AIMessageChunk(content=token)
+
+    async def astream(self, prompt: str, **kwargs):
+        from langchain_core.messages import AIMessageChunk
+        tokens = self._tokens(prompt, kwargs)
+        with self._serving() as slowdown:
+            await asyncio.sleep(slowdown * self._first_token_delay(prompt))
+            for index, token in enumerate(tokens):
+                if index:
+                    await asyncio.sleep(slowdown * self._generation_delay(1))
+                yield AIMessageChunk(content=token)
+
+
+class FakeBackend(LLMBackend):
+    name = 'fake'
+
+    def create_client(self, model: str) -> FakeChatClient:
+        config = {**FAKE_LLM_DEFAULTS, **(getattr(settings, 'AI_SCORING_FAKE_LLM', {}) or {})}
+        return FakeChatClient(model, config)
+
+
+LLM_BACKENDS = {backend.name: backend for backend in (OllamaBackend, PoolBackend, FakeBackend)}
+
+
+def get_backend() -> LLMBackend:
+    """The backend selected by AI_SCORING_LLM_BACKEND: a registered name or a dotted path"""
+    name = getattr(settings, 'AI_SCORING_LLM_BACKEND', 'ollama')
+    backend_class = LLM_BACKENDS.get(name) or import_string(name)
+    return backend_class()
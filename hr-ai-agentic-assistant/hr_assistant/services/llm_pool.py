@@ -0,0 +1,373 @@
+"""
+Load-balanced pool of LLM endpoints used by the 'pool' LLM backend.
+
+AI_SCORING_OLLAMA_ENDPOINTS lists the Ollama servers. Every call goes to the healthy endpoint with
+the fewest outstanding requests, so throughput grows with the number of servers and a slow server
+is given less work. An endpoint failing AI_SCORING_POOL_EJECT_AFTER_FAILURES calls in a row is
+ejected for AI_SCORING_POOL_EJECT_SECONDS; afterwards it gets a trial call and is ejected again if
+that fails too. Only transient errors (connection errors, timeouts, 429 and 5xx answers) count as
+failures: a request the server rejects would fail on every endpoint.
+
+With AI_SCORING_POOL_HEDGE, an invoke still running after the model's recent p95 latency is
+duplicated on a second healthy endpoint and the first answer wins. The hedge takes a free process
+LLM slot, held until both calls have finished, so hedging never exceeds the concurrency limit; it
+is skipped when no slot is free. Streamed calls are routed but not hedged.
+"""
+import asyncio
+import itertools
+import logging
+import math
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Dict, List, Optional
+
+from django.conf import settings
+
+from .concurrency import get_max_process_llm_calls, get_process_limiter
+from .resilience import is_transient_error
+
+ai_logger = logging.getLogger('ai_processing')
+
+# Completed calls per model kept for the hedging percentile
+LATENCY_WINDOW = 200
+
+
+def get_endpoints() -> List[str]:
+    return list(getattr(settings, 'AI_SCORING_OLLAMA_ENDPOINTS', []) or [])
+
+
+def is_hedging_enabled() -> bool:
+    return getattr(settings, 'AI_SCORING_POOL_HEDGE', False)
+
+
+class PoolEndpoint:
+    """
+    Routing state of one endpoint, shared by the clients of every model
+    """
+
+    def __init__(self, url: str):
+        self.url = url
+        self.outstanding = 0
+        self.requests = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.ejections = 0
+        self.ejected_until = 0.0
+        self.last_dispatch = 0
+
+    def is_healthy(self, now: float) -> bool:
+        return self.ejected_until <= now
+
+    def snapshot(self, now: float) -> Dict[str, Any]:
+        return {
+            'url': self.url,
+            'healthy': self.is_healthy(now),
+            'outstanding': self.outstanding,
+            'requests': self.requests,
+            'failures': self.failures,
+            'ejections': self.ejections,
+        }
+
+
+class EndpointPool:
+    """
+    Least-outstanding-requests routing with health-based ejection
+    """
+
+    def __init__(self, urls: List[str]):
+        if not urls:
+            raise ValueError("The endpoint pool needs at least one endpoint")
+        self.endpoints = [PoolEndpoint(url) for url in urls]
+        self.hedged = 0
+        self.hedge_wins = 0
+        self._lock = threading.Lock()
+        self._dispatch_counter = itertools.count(1)
+
+    def acquire(self, exclude=(), healthy_only: bool = False) -> Optional[PoolEndpoint]:
+        """
+        Reserve the endpoint for the next call. Without a healthy endpoint, the one recovering first is
+        used, unless healthy_only is set (hedges), in which case None is returned.
+        """
+        with self._lock:
+            now = time.monotonic()
+            candidates = [endpoint for endpoint in self.endpoints if endpoint.url not in exclude]
+            healthy = [endpoint for endpoint in candidates if endpoint.is_healthy(now)]
+            if healthy:
+                # Ties go to the endpoint that waited longest for a call
+                endpoint = min(healthy, key=lambda e: (e.outstanding, e.last_dispatch))
+            elif candidates and not healthy_only:
+                endpoint = min(candidates, key=lambda e: e.ejected_until)
+            else:
+                return None
+            endpoint.outstanding += 1
+            endpoint.requests += 1
+            endpoint.last_dispatch = next(self._dispatch_counter)
+            return endpoint
+
+    def release(self, endpoint: PoolEndpoint, failed: bool = False):
+        """
+        Return a call's reservation, ejecting the endpoint after too many failures in a row
+        """
+        with self._lock:
+            endpoint.outstanding -= 1
+            if not failed:
+                endpoint.consecutive_failures = 0
+                endpoint.ejected_until = 0.0
+                return
+            endpoint.failures += 1
+            endpoint.consecutive_failures += 1
+            if endpoint.consecutive_failures >= getattr(settings, 'AI_SCORING_POOL_EJECT_AFTER_FAILURES', 3):
+                if endpoint.is_healthy(time.monotonic()):
+                    endpoint.ejections += 1
+                    ai_logger.warning(f"[LLM Pool] Ejecting {endpoint.url} after {endpoint.consecutive_failures} consecutive failures")
+                endpoint.ejected_until = time.monotonic() + getattr(settings, 'AI_SCORING_POOL_EJECT_SECONDS', 30)
+
+    def count_hedge(self, won: bool = None):
+        with self._lock:
+            if won is None:
+                self.hedged += 1
+            elif won:
+                self.hedge_wins += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            now = time.monotonic()
+            return {
+                'endpoints': [endpoint.snapshot(now) for endpoint in self.endpoints],
+                'hedged': self.hedged,
+                'hedge_wins': self.hedge_wins,
+            }
+
+
+class LatencyWindow:
+    """
+    Latencies of a model's most recent successful calls
+    """
+
+    def __init__(self, size: int = LATENCY_WINDOW):
+        self._samples = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float):
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, percent: float, min_samples: int = 1) -> Optional[float]:
+        with self._lock:
+            if len(self._samples) < max(1, min_samples):
+                return None
+            ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, math.ceil(len(ordered) * percent / 100) - 1)]
+
+
+_hedge_executor = None
+_hedge_executor_lock = threading.Lock()
+
+
+def get_hedge_executor() -> ThreadPoolExecutor:
+    """
+    Threads running the hedged invoke calls of the sync graph; each hedged call needs two
+    """
+    global _hedge_executor
+    if _hedge_executor is None:
+        with _hedge_executor_lock:
+            if _hedge_executor is None:
+                workers = 2 * get_max_process_llm_calls()
+                _hedge_executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="llm-hedge")
+    return _hedge_executor
+
+
+class HedgeSlot:
+    """
+    Process LLM slot taken by a hedge, released once both the primary and the hedged call are done
+    """
+
+    def __init__(self, limiter):
+        self.limiter = limiter
+        self.running = 2
+        self._lock = threading.Lock()
+
+    def call_done(self, _call=None):
+        with self._lock:
+            self.running -= 1
+            finished = self.running == 0
+        if finished:
+            self.limiter.release()
+
+
+def _endpoint_failed(error: BaseException) -> bool:
+    """Whether an error counts against the endpoint; cancelled hedges and rejected requests don't"""
+    return isinstance(error, Exception) and is_transient_error(error)
+
+
+class PooledChatClient:
+    """
+    Chat client of one model spreading its calls over the pool's endpoints
+    """
+
+    def __init__(self, model: str, pool: EndpointPool, clients: Dict[str, Any]):
+        self.model = model
+        self.pool = pool
+        self.clients = clients
+        self.latencies = LatencyWindow()
+
+    def _hedge_delay(self) -> Optional[float]:
+        """Seconds after which an invoke is hedged, or None when it is not"""
+        if not is_hedging_enabled() or len(self.pool.endpoints) < 2:
+            return None
+        return self.latencies.percentile(
+            getattr(settings, 'AI_SCORING_POOL_HEDGE_PERCENTILE', 95),
+            getattr(settings, 'AI_SCORING_POOL_HEDGE_MIN_SAMPLES', 20)
+        )
+
+    def _call(self, endpoint: PoolEndpoint, prompt: str, kwargs: Dict[str, Any]):
+        started = time.monotonic()
+        try:
+            response = self.clients[endpoint.url].invoke(prompt, **kwargs)
+        except BaseException as error:
+            self.pool.release(endpoint, failed=_endpoint_failed(error))
+            raise
+        self.pool.release(endpoint)
+        self.latencies.record(time.monotonic() - started)
+        return response
+
+    async def _acall(self, endpoint: PoolEndpoint, prompt: str, kwargs: Dict[str, Any]):
+        started = time.monotonic()
+        try:
+            response = await self.clients[endpoint.url].ainvoke(prompt, **kwargs)
+        except BaseException as error:
+            self.pool.release(endpoint, failed=_endpoint_failed(error))
+            raise
+        self.pool.release(endpoint)
+        self.latencies.record(time.monotonic() - started)
+        return response
+
+    def _hedge(self, primary: PoolEndpoint, hedge_after: float) -> Optional[tuple]:
+        """Endpoint and slot of the hedged call, or None without a free slot or healthy endpoint"""
+        limiter = get_process_limiter()
+        if not limiter.try_acquire():
+            ai_logger.info(f"[LLM Pool] {self.model} call on {primary.url} passed {hedge_after:.2f}s, no free LLM slot to hedge it")
+            return None
+        backup = self.pool.acquire(exclude={primary.url}, healthy_only=True)
+        if backup is None:
+            limiter.release()
+            return None
+        self.pool.count_hedge()
+        ai_logger.info(f"[LLM Pool] {self.model} call on {primary.url} passed {hedge_after:.2f}s, hedging on {backup.url}")
+        return backup, HedgeSlot(limiter)
+
+    def invoke(self, prompt: str, **kwargs):
+        hedge_after = self._hedge_delay()
+        primary = self.pool.acquire()
+        if hedge_after is None:
+            return self._call(primary, prompt, kwargs)
+
+        executor = get_hedge_executor()
+        pending = {executor.submit(self._call, primary, prompt, kwargs): primary}
+        done, _ = wait(pending, timeout=hedge_after)
+        if not done:
+            hedge = self._hedge(primary, hedge_after)
+            if hedge is not None:
+                backup, slot = hedge
+                pending[executor.submit(self._call, backup, prompt, kwargs)] = backup
+                for future in pending:
+                    future.add_done_callback(slot.call_done)
+
+        # The first answer wins; the other call finishes in the background, holding the hedge's slot
+        error = None
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                endpoint = pending.pop(future)
+                if future.exception() is None:
+                    if endpoint is not primary:
+                        self.pool.count_hedge(won=True)
+                    return future.result()
+                error = error or future.exception()
+        raise error
+
+    async def ainvoke(self, prompt: str, **kwargs):
+        hedge_after = self._hedge_delay()
+        primary = self.pool.acquire()
+        if hedge_after is None:
+            return await self._acall(primary, prompt, kwargs)
+
+        pending = {asyncio.ensure_future(self._acall(primary, prompt, kwargs)): primary}
+        try:
+            done, _ = await asyncio.wait(pending, timeout=hedge_after)
+            if not done:
+                hedge = self._hedge(primary, hedge_after)
+                if hedge is not None:
+                    backup, slot = hedge
+                    pending[asyncio.ensure_future(self._acall(backup, prompt, kwargs))] = backup
+                    for task in pending:
+                        task.add_done_callback(slot.call_done)
+
+            error = None
+            while pending:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    endpoint = pending.pop(task)
+                    if task.exception() is None:
+                        if endpoint is not primary:
+                            self.pool.count_hedge(won=True)
+                        return task.result()
+                    error = error or task.exception()
+            raise error
+        finally:
+            # The losing call is cancelled, which closes its connection
+            for task in pending:
+                task.cancel()
+
+    def stream(self, prompt: str, **kwargs):
+        endpoint = self.pool.acquire()
+        failed = False
+        try:
+            yield from self.clients[endpoint.url].stream(prompt, **kwargs)
+        except Exception as error:
+            failed = is_transient_error(error)
+            raise
+        finally:
+            self.pool.release(endpoint, failed=failed)
+
+    async def astream(self, prompt: str, **kwargs):
+        endpoint = self.pool.acquire()
+        stream = self.clients[endpoint.url].astream(prompt, **kwargs)
+        failed = False
+        try:
+            async for chunk in stream:
+                yield chunk
+        except Exception as error:
+            failed = is_transient_error(error)
+            raise
+        finally:
+            await stream.aclose()
+            self.pool.release(endpoint, failed=failed)
+
+
+_pools: Dict[tuple, EndpointPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_endpoint_pool(urls: List[str] = None) -> EndpointPool:
+    """
+    Return the process-wide pool of the configured endpoints, shared by the clients of every model
+    """
+    key = tuple(urls if urls is not None else get_endpoints())
+    pool = _pools.get(key)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(key)
+            if pool is None:
+                pool = _pools[key] = EndpointPool(list(key))
+    return pool
+
+
+def get_pool_stats() -> Optional[Dict[str, Any]]:
+    """
+    Routing, health and hedging counters of the configured pool, if it has been used in this process
+    """
+    pool = _pools.get(tuple(get_endpoints()))
+    return pool.snapshot() if pool is not None else None
@@ -43,10 +43,12 @@ class AIProcessingError(Exception):
     """
     Custom exception for AI processing errors
     """
-    def __init__(self, message: str, applicant_id: int = None, error_code: str = None):
+    def __init__(self, message: str, applicant_id: int = None, error_code: str = None,
+                 additional_data: Dict[str, Any] = None):
         self.message = message
         self.applicant_id = applicant_id
         self.error_code = error_code
+        self.additional_data = additional_data or {}
         super().__init__(self.message)
 
 
@@ -0,0 +1,86 @@
+"""
+Model selection for the LLM worker nodes, and the two-tier scoring cascade.
+
+Each LLM node can run on its own Ollama model (AI_SCORING_NODE_MODELS), falling back to the
+model of the run's tier. With the cascade enabled, a run first scores every applicant with the
+small triage model; only applicants whose triage score falls within AI_SCORING_CASCADE_BAND
+points of the shortlist cutoff are scored again by the large model, which then decides them.
+"""
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from django.conf import settings
+
+from .contracts import SCORING_MODE_BATCHED, SCORING_MODE_STRUCTURED
+
+# Tier that decided an applicant's result, recorded in Applicant.ai_analysis_result
+TIER_TRIAGE = "triage"
+TIER_ESCALATION = "escalation"
+
+# LLM-calling worker nodes of each scoring mode
+MULTI_CALL_LLM_NODES = ("scoring_grading", "categorization", "justification")
+STRUCTURED_LLM_NODES = ("structured_analysis",)
+# Batches fall back to structured calls for the applicants whose batched analysis was invalid
+BATCHED_LLM_NODES = ("batched_analysis", "structured_analysis")
+
+
+def is_cascade_enabled() -> bool:
+    return getattr(settings, 'AI_SCORING_CASCADE_ENABLED', False)
+
+
+def get_default_model() -> str:
+    return getattr(settings, 'AI_SCORING_MODEL', 'llama2')
+
+
+def get_tier_model(tier: Optional[str]) -> str:
+    """Model a tier uses for nodes without their own model; the large model unless triaging"""
+    if tier == TIER_TRIAGE:
+        return getattr(settings, 'AI_SCORING_CASCADE_TRIAGE_MODEL', 'llama3.2:1b')
+    return get_default_model()
+
+
+def resolve_node_models(scoring_mode: str, tier: Optional[str] = None) -> Dict[str, str]:
+    """
+    Model of every LLM node the scoring mode runs: the node's own model from
+    AI_SCORING_NODE_MODELS if configured, otherwise the tier's model
+    """
+    node_overrides = getattr(settings, 'AI_SCORING_NODE_MODELS', {}) or {}
+    if scoring_mode == SCORING_MODE_STRUCTURED:
+        nodes = STRUCTURED_LLM_NODES
+    elif scoring_mode == SCORING_MODE_BATCHED:
+        nodes = BATCHED_LLM_NODES
+    else:
+        nodes = MULTI_CALL_LLM_NODES
+    tier_model = get_tier_model(tier)
+    return {node: node_overrides.get(node) or tier_model for node in nodes}
+
+
+def model_signature(node_models: Optional[Dict[str, str]]) -> str:
+    """
+    Name of the model configuration for the analysis cache key: the model name when every node
+    uses the same one, so single-model runs keep their existing cache entries
+    """
+    if not node_models:
+        return get_default_model()
+    models = set(node_models.values())
+    if len(models) == 1:
+        return models.pop()
+    return ",".join(f"{node}={model}" for node, model in sorted(node_models.items()))
+
+
+def get_escalation_band() -> Tuple[int, int]:
+    """Inclusive range of triage scores that are re-scored by the large model"""
+    cutoff = getattr(settings, 'AI_SCORING_CASCADE_CUTOFF', 70)
+    band = getattr(settings, 'AI_SCORING_CASCADE_BAND', 10)
+    return max(0, cutoff - band), min(100, cutoff + band)
+
+
+def in_escalation_band(score: int, band: Optional[Iterable[int]]) -> bool:
+    if not band:
+        return False
+    low, high = band
+    return low <= score <= high
+
+
+def build_tier_details(tier: str, node_models: Dict[str, str]) -> Dict[str, Any]:
+    """Analysis details recording the tier and models that produced a cascade run's result"""
+    return {'stage': 'llm', 'model_tier': tier, 'models': dict(node_models)}
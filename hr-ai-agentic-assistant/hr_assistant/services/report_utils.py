@@ -5,12 +5,15 @@ Contains report filtering, sorting logic as specified in the implementation plan
 from django.db import models
 from jobs.models import Applicant
 from typing import List, Dict, Any, Optional
+from .skill_coverage import get_job_skill_matrix
 
 
 def get_candidates_for_job(job_id: int, 
                           sort_by: str = 'overall_score', 
                           sort_order: str = 'desc', 
-                          score_threshold: int = 0) -> List[Applicant]:
+                          score_threshold: int = 0,
+                          must_have_skills: Optional[List[str]] = None,
+                          min_years_experience: Optional[float] = None) -> List[Applicant]:
     """
     Retrieve and process candidates for a specific job with filtering and sorting.
     
@@ -19,6 +22,8 @@ def get_candidates_for_job(job_id: int,
         sort_by: Field to sort by ('overall_score', 'applicant_name', 'categorization', 'quality_grade')
         sort_order: Sort direction ('asc' or 'desc')
         score_threshold: Minimum score threshold for filtering (0-100 range)
+        must_have_skills: Required skills of the job that every candidate's resume must cover
+        min_years_experience: Minimum total years of experience from the candidate's structured resume facts
         
     Returns:
         List of Applicant objects filtered, sorted and limited to 500 as per spec
@@ -45,6 +50,18 @@ def get_candidates_for_job(job_id: int,
     # Filter based on score threshold
     if score_threshold > 0:
         candidates_list = [c for c in candidates_list if c.overall_score and c.overall_score >= score_threshold]
+
+    # Filter on skills using the job's cached applicants x skills matrix
+    if must_have_skills:
+        covering_ids = get_job_skill_matrix(job_id).applicants_with_all(must_have_skills)
+        candidates_list = [c for c in candidates_list if c.id in covering_ids]
+
+    # Filter on experience using the facts extracted at upload, without re-reading the resume text
+    if min_years_experience:
+        candidates_list = [
+            c for c in candidates_list
+            if ((c.resume_facts or {}).get('years_of_experience') or 0) >= min_years_experience
+        ]
     
     # Apply sorting in-memory (as per plan decision to handle SQLite constraints)
     reverse_sort = (sort_order == 'desc')
@@ -0,0 +1,167 @@
+"""
+Compact digest of a job's requirements, used in LLM prompts in place of the full description.
+
+Job descriptions are markdown documents of up to 50,000 characters, and every worker prompt used
+to embed the whole text. The digest keeps what the scoring prompts need: the role, the must-have
+skills, seniority signals and the requirement bullet points. It is derived deterministically from
+the title, description and required skills, computed when a JobListing is saved (or when a job
+saved before digests existed is first scored) and stored on the job together with a hash of its
+inputs, so it is rebuilt only when those change.
+"""
+import hashlib
+import logging
+import re
+from typing import Iterable, List
+
+from django.conf import settings
+
+from .analysis_cache import normalize_job_requirements
+
+ai_logger = logging.getLogger('ai_processing')
+
+# Bump when the digest format changes so stored digests are rebuilt
+DIGEST_VERSION = "1"
+
+# Headings whose bullet points describe what the candidate needs
+REQUIREMENT_HEADING_PATTERN = re.compile(
+    r"require|qualif|must|skill|experience|looking for|you have|you bring|about you|nice to have|bonus|preferred",
+    re.IGNORECASE
+)
+# Non-bullet lines worth keeping wherever they appear
+REQUIREMENT_LINE_PATTERN = re.compile(
+    r"\b(required|must|minimum|at least|\d+\+?\s*(?:-\s*\d+\s*)?years?|degree|certifi)", re.IGNORECASE
+)
+YEARS_PATTERN = re.compile(r"\b(\d{1,2})\s*\+?\s*(?:(?:-|to)\s*\d{1,2}\s*)?years?\b", re.IGNORECASE)
+SENIORITY_PATTERN = re.compile(
+    r"\b(intern(?:ship)?|entry[- ]level|junior|mid[- ]level|senior|lead|staff|principal|architect|head of|manager)\b",
+    re.IGNORECASE
+)
+BULLET_PATTERN = re.compile(r"^\s*(?:[-*+•]|\d+[.)])\s+")
+HEADING_PATTERN = re.compile(r"^\s*(?:#{1,6}\s+(.*)|\*\*(.+?)\*\*:?\s*$|([^.!?]{3,80}):\s*$)")
+INLINE_MARKUP_PATTERN = re.compile(r"(\*\*|__|`|\*|_(?=\w)|(?<=\w)_|\[|\]\([^)]*\))")
+
+MAX_REQUIREMENT_LINE_CHARS = 200
+
+
+def is_digest_enabled() -> bool:
+    return getattr(settings, 'AI_SCORING_REQUIREMENTS_DIGEST_ENABLED', True)
+
+
+def compute_digest_hash(title: str, detailed_description: str, required_skills: Iterable = None) -> str:
+    """
+    SHA256 of the digest inputs and version; identifies the digest and keys cached analyses made with it
+    """
+    normalized = normalize_job_requirements(detailed_description, required_skills)
+    source = f"digest:{DIGEST_VERSION}\n{' '.join((title or '').split())}\n{normalized}"
+    return hashlib.sha256(source.encode('utf-8')).hexdigest()
+
+
+def _strip_markup(line: str) -> str:
+    return " ".join(INLINE_MARKUP_PATTERN.sub("", line).split())
+
+
+def _extract_requirement_lines(detailed_description: str) -> List[str]:
+    """
+    Bullet points under requirement-like headings, plus lines stating hard requirements anywhere
+    """
+    lines = []
+    in_requirements = False
+    for raw_line in (detailed_description or "").splitlines():
+        if not raw_line.strip():
+            continue
+        heading = HEADING_PATTERN.match(raw_line)
+        if heading and not BULLET_PATTERN.match(raw_line):
+            heading_text = next(group for group in heading.groups() if group)
+            in_requirements = bool(REQUIREMENT_HEADING_PATTERN.search(heading_text))
+            continue
+        is_bullet = bool(BULLET_PATTERN.match(raw_line))
+        line = _strip_markup(BULLET_PATTERN.sub("", raw_line))
+        if not line:
+            continue
+        if (in_requirements and is_bullet) or REQUIREMENT_LINE_PATTERN.search(line):
+            line = line[:MAX_REQUIREMENT_LINE_CHARS]
+            if line not in lines:
+                lines.append(line)
+    return lines
+
+
+def _extract_seniority_signals(title: str, detailed_description: str) -> List[str]:
+    text = f"{title or ''}\n{detailed_description or ''}"
+    signals = []
+    for match in SENIORITY_PATTERN.finditer(text):
+        signal = match.group(1).lower().replace(" ", "-")
+        if signal not in signals:
+            signals.append(signal)
+    years = sorted({int(match.group(1)) for match in YEARS_PATTERN.finditer(text)})
+    if years:
+        signals.append(f"{years[0]}+ years of experience mentioned")
+    return signals
+
+
+def build_requirements_digest(title: str, detailed_description: str, required_skills: Iterable = None,
+                              max_chars: int = None) -> str:
+    """
+    Condensed requirements for the scoring prompts, at most max_chars long
+    """
+    if max_chars is None:
+        max_chars = getattr(settings, 'AI_SCORING_REQUIREMENTS_DIGEST_MAX_CHARS', 2000)
+
+    skills = [" ".join(str(skill).split()) for skill in (required_skills or []) if str(skill).strip()]
+    header = []
+    if title:
+        header.append(f"Role: {' '.join(title.split())}")
+    if skills:
+        header.append(f"Must-have skills: {', '.join(skills)}")
+    signals = _extract_seniority_signals(title, detailed_description)
+    if signals:
+        header.append(f"Seniority signals: {', '.join(signals)}")
+
+    requirement_lines = _extract_requirement_lines(detailed_description)
+    if not requirement_lines:
+        # No recognizable requirements: fall back to the start of the description as plain text
+        plain_text = _strip_markup(" ".join(
+            BULLET_PATTERN.sub("", line).lstrip("#").strip() for line in (detailed_description or "").splitlines()
+        ))
+        requirement_lines = [plain_text] if plain_text else []
+
+    digest = "\n".join(header)
+    if requirement_lines:
+        digest += "\nKey requirements:"
+        for line in requirement_lines:
+            entry = f"\n- {line}"
+            if len(digest) + len(entry) > max_chars:
+                remaining = max_chars - len(digest) - 4
+                if remaining > 40:
+                    digest += entry[:remaining + 3].rstrip() + "..."
+                break
+            digest += entry
+    return digest[:max_chars]
+
+
+def refresh_requirements_digest(job_listing) -> bool:
+    """
+    Recompute the job's digest fields if its title, description or skills changed; returns whether they did.
+    Does not save the job.
+    """
+    digest_hash = compute_digest_hash(job_listing.title, job_listing.detailed_description, job_listing.required_skills)
+    if job_listing.requirements_digest_hash == digest_hash and job_listing.requirements_digest:
+        return False
+    job_listing.requirements_digest = build_requirements_digest(
+        job_listing.title, job_listing.detailed_description, job_listing.required_skills
+    )
+    job_listing.requirements_digest_hash = digest_hash
+    return True
+
+
+def ensure_requirements_digest(job_listing) -> str:
+    """
+    Return the job's up-to-date digest, storing it first if the job was saved before digests existed
+    or was changed through a bulk update
+    """
+    if refresh_requirements_digest(job_listing):
+        type(job_listing).objects.filter(pk=job_listing.pk).update(
+            requirements_digest=job_listing.requirements_digest,
+            requirements_digest_hash=job_listing.requirements_digest_hash
+        )
+        ai_logger.info(f"Stored requirements digest for job {job_listing.pk}: {len(job_listing.requirements_digest)} chars from {len(job_listing.detailed_description or '')}")
+    return job_listing.requirements_digest
@@ -0,0 +1,308 @@
+"""
+Resilience of the LLM calls: per-call deadlines, jittered exponential retries of transient errors
+and a process-wide circuit breaker.
+
+With AI_SCORING_RESILIENCE_ENABLED, every LLM call of the worker nodes goes through call_llm or
+acall_llm. A transient failure (connection error, timeout, 429 or 5xx answer) is retried up to
+AI_SCORING_LLM_RETRY_ATTEMPTS times with full-jitter exponential backoff. Consecutive transient
+failures across all runs open the breaker: new calls then wait instead of failing, a single trial
+call is let through every AI_SCORING_BREAKER_RESET_SECONDS, and its success closes the breaker.
+A call that waited AI_SCORING_BREAKER_MAX_WAIT_SECONDS for the breaker raises LLMUnavailableError,
+which stops the run so its worker can queue it again and resume it from its checkpoint.
+
+The call deadline bounds the whole call, streamed or not. A blocking call runs on a deadline
+thread; one that overruns raises TimeoutError in its caller but can't be interrupted, so it
+keeps its LLM slots until it returns.
+"""
+import asyncio
+import contextvars
+import logging
+import random
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from django.conf import settings
+
+from .concurrency import allm_slot, get_max_process_llm_calls, llm_slot
+from .logging import AIProcessingError
+
+ai_logger = logging.getLogger('ai_processing')
+
+# How often callers waiting on a half-open breaker check whether the trial call succeeded
+PROBE_POLL_SECONDS = 0.5
+
+
+class LLMUnavailableError(AIProcessingError):
+    """
+    The LLM backend stayed unavailable for longer than the breaker wait
+    """
+
+    def __init__(self, message: str):
+        super().__init__(message, error_code="LLM_UNAVAILABLE")
+
+
+def is_resilience_enabled() -> bool:
+    return getattr(settings, 'AI_SCORING_RESILIENCE_ENABLED', False)
+
+
+def get_call_deadline() -> Optional[float]:
+    """Seconds an LLM call may take, or None without the resilience layer"""
+    if not is_resilience_enabled():
+        return None
+    return getattr(settings, 'AI_SCORING_LLM_CALL_DEADLINE_SECONDS', 120)
+
+
+def is_transient_error(error: Exception) -> bool:
+    """
+    Whether a failed call may succeed when repeated: connection errors, timeouts, and answers
+    saying the server is overloaded or broken
+    """
+    if isinstance(error, (ConnectionError, TimeoutError)):
+        return True
+    status_code = getattr(error, 'status_code', None)
+    if isinstance(status_code, int):
+        return status_code == 429 or status_code >= 500
+    try:
+        import httpx
+    except ImportError:
+        return False
+    return isinstance(error, httpx.TransportError)
+
+
+def backoff_delay(retry: int) -> float:
+    """Full-jitter delay before the given retry (1 for the first)"""
+    base = getattr(settings, 'AI_SCORING_LLM_RETRY_BASE_SECONDS', 0.5)
+    cap = getattr(settings, 'AI_SCORING_LLM_RETRY_MAX_SECONDS', 8)
+    return random.uniform(0, min(cap, base * 2 ** (retry - 1)))
+
+
+class CircuitBreaker:
+    """
+    Breaker shared by every LLM call of the process: closed, open after too many consecutive
+    transient failures, and half-open while a single trial call tests the backend
+    """
+    CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half_open'
+
+    def __init__(self, failure_threshold: int, reset_seconds: float):
+        if failure_threshold < 1:
+            raise ValueError("The failure threshold must be at least 1")
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opens = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def _admission_delay(self) -> Optional[float]:
+        """None when a call may start now, otherwise the seconds to wait before asking again"""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return None
+            if self.state == self.OPEN:
+                remaining = self._opened_at + self.reset_seconds - time.monotonic()
+                if remaining > 0:
+                    return remaining
+                # This caller makes the trial call; the others wait for its outcome
+                self.state = self.HALF_OPEN
+                ai_logger.info("[LLM Resilience] Circuit half-open, sending a trial call")
+                return None
+            return min(PROBE_POLL_SECONDS, self.reset_seconds)
+
+    def _wait_exceeded(self, node: str, waited: float) -> LLMUnavailableError:
+        return LLMUnavailableError(f"LLM backend unavailable: {node} call waited {waited:.0f}s for the circuit breaker to close")
+
+    def wait(self, node: str, max_wait: float):
+        """Block until a call may start; raises LLMUnavailableError after max_wait seconds"""
+        started = time.monotonic()
+        while (delay := self._admission_delay()) is not None:
+            waited = time.monotonic() - started
+            if waited >= max_wait:
+                raise self._wait_exceeded(node, waited)
+            time.sleep(min(delay, max_wait - waited))
+
+    async def await_admission(self, node: str, max_wait: float):
+        """Async wait()"""
+        started = time.monotonic()
+        while (delay := self._admission_delay()) is not None:
+            waited = time.monotonic() - started
+            if waited >= max_wait:
+                raise self._wait_exceeded(node, waited)
+            await asyncio.sleep(min(delay, max_wait - waited))
+
+    def record_success(self):
+        with self._lock:
+            if self.state != self.CLOSED:
+                ai_logger.info("[LLM Resilience] Circuit closed, the LLM backend answered again")
+            self.state = self.CLOSED
+            self.consecutive_failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self.consecutive_failures += 1
+            if self.state == self.HALF_OPEN or (
+                self.state == self.CLOSED and self.consecutive_failures >= self.failure_threshold
+            ):
+                if self.state == self.CLOSED:
+                    self.opens += 1
+                    ai_logger.warning(f"[LLM Resilience] Circuit opened after {self.consecutive_failures} consecutive failures, pausing LLM calls")
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+
+    def abandon_trial(self):
+        """A cancelled trial call leaves the breaker open, ready for the next trial"""
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                self.state = self.OPEN
+                self._opened_at = time.monotonic() - self.reset_seconds
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {'state': self.state, 'consecutive_failures': self.consecutive_failures, 'opens': self.opens}
+
+
+_circuit_breaker = None
+_circuit_breaker_lock = threading.Lock()
+
+
+def get_circuit_breaker() -> CircuitBreaker:
+    """
+    Return the process-wide breaker shared by every scoring run in this process
+    """
+    global _circuit_breaker
+    if _circuit_breaker is None:
+        with _circuit_breaker_lock:
+            if _circuit_breaker is None:
+                _circuit_breaker = CircuitBreaker(
+                    getattr(settings, 'AI_SCORING_BREAKER_FAILURE_THRESHOLD', 5),
+                    getattr(settings, 'AI_SCORING_BREAKER_RESET_SECONDS', 10)
+                )
+    return _circuit_breaker
+
+
+def get_breaker_stats() -> Optional[Dict[str, Any]]:
+    return get_circuit_breaker().snapshot() if is_resilience_enabled() else None
+
+
+def _retry_settings():
+    return (
+        max(1, getattr(settings, 'AI_SCORING_LLM_RETRY_ATTEMPTS', 3)),
+        getattr(settings, 'AI_SCORING_BREAKER_MAX_WAIT_SECONDS', 600)
+    )
+
+
+def _on_failure(breaker: CircuitBreaker, node: str, error: Exception, attempt: int, attempts: int) -> Optional[float]:
+    """
+    Record a failed attempt; returns the delay before retrying, or None when the error is final
+    """
+    if not is_transient_error(error):
+        # The backend answered, so it is healthy even though this call can't succeed
+        breaker.record_success()
+        return None
+    breaker.record_failure()
+    if attempt >= attempts:
+        ai_logger.error(f"[LLM Resilience] {node} call failed after {attempts} attempts: {str(error)}")
+        return None
+    delay = backoff_delay(attempt)
+    ai_logger.warning(f"[LLM Resilience] {node} call failed ({type(error).__name__}: {str(error)}), retry {attempt}/{attempts - 1} in {delay:.2f}s")
+    return delay
+
+
+_deadline_executor = None
+_deadline_executor_lock = threading.Lock()
+
+
+def get_deadline_executor() -> ThreadPoolExecutor:
+    """
+    Threads running the blocking LLM calls bounded by the call deadline; a call holds a process
+    slot while it runs, so twice the process limit leaves room for calls that overran
+    """
+    global _deadline_executor
+    if _deadline_executor is None:
+        with _deadline_executor_lock:
+            if _deadline_executor is None:
+                workers = 2 * get_max_process_llm_calls()
+                _deadline_executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="llm-deadline")
+    return _deadline_executor
+
+
+def _release_slot(slot, future: Future):
+    error = future.exception()
+    if error is None:
+        slot.__exit__(None, None, None)
+    else:
+        slot.__exit__(type(error), error, error.__traceback__)
+
+
+def _call_with_deadline(config, node: str, call: Callable[[], Any]):
+    """
+    Make a blocking call holding the run and process slots, raising TimeoutError once it has taken
+    longer than the call deadline. The slots are released when the call returns, even after that.
+    """
+    deadline = get_call_deadline()
+    slot = llm_slot(config, node)
+    slot.__enter__()
+    future = get_deadline_executor().submit(contextvars.copy_context().run, call)
+    future.add_done_callback(lambda done: _release_slot(slot, done))
+    try:
+        return future.result(timeout=deadline)
+    except TimeoutError:
+        if future.done():
+            raise
+        raise TimeoutError(f"{node} call exceeded the {deadline}s call deadline") from None
+
+
+def call_llm(config, node: str, call: Callable[[], Any]):
+    """
+    Make a blocking LLM call holding the run and process slots, with retries and the circuit breaker
+    when the resilience layer is enabled. Retries wait without holding a slot, and each attempt is
+    bounded by the call deadline.
+    """
+    if not is_resilience_enabled():
+        with llm_slot(config, node):
+            return call()
+
+    breaker = get_circuit_breaker()
+    attempts, max_wait = _retry_settings()
+    for attempt in range(1, attempts + 1):
+        breaker.wait(node, max_wait)
+        try:
+            result = _call_with_deadline(config, node, call)
+        except Exception as error:
+            delay = _on_failure(breaker, node, error, attempt, attempts)
+            if delay is None:
+                raise
+            time.sleep(delay)
+            continue
+        breaker.record_success()
+        return result
+
+
+async def acall_llm(config, node: str, call: Callable[[], Awaitable[Any]]):
+    """
+    Async call_llm(); the whole call, streamed or not, is bounded by the call deadline
+    """
+    if not is_resilience_enabled():
+        async with allm_slot(config, node):
+            return await call()
+
+    breaker = get_circuit_breaker()
+    attempts, max_wait = _retry_settings()
+    for attempt in range(1, attempts + 1):
+        await breaker.await_admission(node, max_wait)
+        try:
+            async with allm_slot(config, node):
+                result = await asyncio.wait_for(call(), get_call_deadline())
+        except asyncio.CancelledError:
+            breaker.abandon_trial()
+            raise
+        except Exception as error:
+            delay = _on_failure(breaker, node, error, attempt, attempts)
+            if delay is None:
+                raise
+            await asyncio.sleep(delay)
+            continue
+        breaker.record_success()
+        return result
@@ -0,0 +1,215 @@
+"""
+Incremental persistence of AI analysis results.
+
+Worker sub-graphs hand their result, or their failure, to the run's IncrementalResultWriter as soon
+as they finish. The writer commits buffered results every AI_SCORING_PERSIST_BATCH_SIZE results or
+once the oldest buffered result is AI_SCORING_PERSIST_INTERVAL_MS old, so progress survives a crash
+and the status and report endpoints show partial results during long runs.
+"""
+import logging
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import DatabaseError, transaction
+from django.utils import timezone
+
+from jobs.models import Applicant, ScoringRun
+from .contracts import AIAnalysisResponse
+from .logging import log_ai_processing_complete
+
+ai_logger = logging.getLogger('ai_processing')
+
+# Applicant columns written for every result
+RESULT_FIELDS = [
+    'overall_score', 'quality_grade', 'categorization', 'justification_summary',
+    'processing_status', 'analysis_status', 'analysis_timestamp', 'ai_analysis_result',
+]
+
+
+class IncrementalResultWriter:
+    """
+    Thread-safe buffer that commits worker results to the Applicant table in small batches
+    """
+
+    def __init__(self, scoring_run_id: int = None, batch_size: int = None, flush_interval_ms: int = None,
+                 chunk_size: int = None, lease=None):
+        self.scoring_run_id = scoring_run_id
+        # The worker's LeaseHeartbeat of a queued run; nothing is written once the lease is lost
+        self.lease = lease
+        self.batch_size = batch_size or getattr(settings, 'AI_SCORING_PERSIST_BATCH_SIZE', 10)
+        # Rows per bulk_update statement and transaction
+        self.chunk_size = chunk_size or getattr(settings, 'AI_SCORING_PERSIST_CHUNK_SIZE', 200)
+        if flush_interval_ms is None:
+            flush_interval_ms = getattr(settings, 'AI_SCORING_PERSIST_INTERVAL_MS', 500)
+        self.flush_interval = flush_interval_ms / 1000
+        self.persisted_count = 0
+        self.error_count = 0
+        self.failures: List[Dict[str, Any]] = []
+        self.flush_count = 0
+        # (result, analysis details) pairs
+        self._buffer: List[tuple] = []
+        # Applicants whose analysis failed, with the reason
+        self._failed_buffer: Dict[int, str] = {}
+        self._received_ids = set()
+        self._oldest_buffered_at: Optional[float] = None
+        self._buffer_lock = threading.Lock()
+        # SQLite allows one writer at a time, so batches are committed one after another
+        self._flush_lock = threading.Lock()
+
+    @property
+    def pending_count(self) -> int:
+        return len(self._buffer) + len(self._failed_buffer)
+
+    def has_result(self, applicant_id: int) -> bool:
+        """Whether a result for this applicant was handed to the writer"""
+        return applicant_id in self._received_ids
+
+    def add(self, result: AIAnalysisResponse, analysis_details: Dict[str, Any] = None):
+        """
+        Buffer a finished worker's result and commit the batch if it is full or old enough.
+        analysis_details is stored in Applicant.ai_analysis_result; None clears details left by an earlier run.
+        """
+        with self._buffer_lock:
+            self._buffer.append((result, analysis_details))
+            self._received_ids.add(result.applicant_id)
+            batch_due = self._buffered()
+        if batch_due:
+            self.flush()
+
+    def add_failure(self, applicant_id: int, error: str):
+        """
+        Buffer an applicant whose analysis failed. It is marked as an error with the next batch and
+        keeps the scores of its last successful analysis, so no placeholder score is written.
+        """
+        with self._buffer_lock:
+            self._failed_buffer[applicant_id] = error
+            self._received_ids.add(applicant_id)
+            batch_due = self._buffered()
+        if batch_due:
+            self.flush()
+
+    def _buffered(self) -> bool:
+        """Note the time of the first buffered entry; returns whether the batch is due. Called with the buffer lock held."""
+        if self._oldest_buffered_at is None:
+            self._oldest_buffered_at = time.monotonic()
+        return (
+            self.pending_count >= self.batch_size or
+            time.monotonic() - self._oldest_buffered_at >= self.flush_interval
+        )
+
+    def flush(self) -> int:
+        """
+        Commit every buffered result; returns the number of applicants written.
+        Raises LeaseLostError, writing nothing, if the run was taken over by another worker.
+        """
+        with self._flush_lock:
+            if self.lease is not None:
+                self.lease.check()
+            with self._buffer_lock:
+                batch, failed = self._buffer, self._failed_buffer
+                self._buffer, self._failed_buffer = [], {}
+                self._oldest_buffered_at = None
+            if not batch and not failed:
+                return 0
+
+            if failed:
+                self._write_failures(failed)
+            written = self._write_batch(batch) if batch else 0
+            self.flush_count += 1
+            self._update_run_progress()
+            ai_logger.info(f"[Result Persistence] Committed {written}/{len(batch)} results (total persisted: {self.persisted_count}, errors: {self.error_count})")
+            return written
+
+    def _record_failure(self, applicant_id: int, error: str):
+        ai_logger.error(f"[Result Persistence] Could not persist result for applicant {applicant_id}: {error}")
+        self.failures.append({'applicant_id': applicant_id, 'error': error})
+        self.error_count += 1
+
+    def _build_applicant(self, result: AIAnalysisResponse, analysis_details, analysis_timestamp) -> Applicant:
+        """
+        Unsaved Applicant carrying the result fields; raises ValidationError if a value doesn't fit its column
+        """
+        applicant = Applicant(
+            id=result.applicant_id,
+            overall_score=result.overall_score,
+            quality_grade=result.quality_grade,
+            categorization=result.categorization,
+            justification_summary=result.justification_summary,
+            processing_status='completed',
+            analysis_status='analyzed',
+            analysis_timestamp=analysis_timestamp,
+            ai_analysis_result=analysis_details
+        )
+        for field_name in RESULT_FIELDS:
+            field = Applicant._meta.get_field(field_name)
+            field.clean(getattr(applicant, field_name), applicant)
+        return applicant
+
+    def _write_failures(self, failed: Dict[int, str]):
+        """
+        Mark the applicants of failed analyses as errors; they count as run errors either way
+        """
+        self.failures.extend({'applicant_id': applicant_id, 'error': error} for applicant_id, error in failed.items())
+        self.error_count += len(failed)
+        ai_logger.warning(f"[Result Persistence] Marking {len(failed)} applicants with failed analyses as errors: {sorted(failed)}")
+        try:
+            with transaction.atomic():
+                Applicant.objects.filter(id__in=list(failed)).update(processing_status='error', analysis_status='error')
+        except DatabaseError as e:
+            ai_logger.error(f"[Result Persistence] Could not mark {len(failed)} failed applicants as errors: {str(e)}")
+
+    def _write_batch(self, batch: List[tuple]) -> int:
+        """
+        Write a batch with one existence query and chunked bulk_update calls, one transaction per chunk.
+        Rows that can't be written are reported in failures; they never trigger row-by-row saves.
+        """
+        now = timezone.now()
+        # A later result for the same applicant replaces an earlier one
+        results = {result.applicant_id: (result, analysis_details) for result, analysis_details in batch}
+
+        existing_ids = set(Applicant.objects.filter(id__in=list(results)).values_list('id', flat=True))
+        applicants = []
+        for applicant_id, (result, analysis_details) in results.items():
+            if applicant_id not in existing_ids:
+                self._record_failure(applicant_id, "Applicant not found")
+                continue
+            try:
+                applicants.append(self._build_applicant(result, analysis_details, now))
+            except ValidationError as e:
+                self._record_failure(applicant_id, "; ".join(e.messages))
+
+        written = []
+        for start in range(0, len(applicants), self.chunk_size):
+            chunk = applicants[start:start + self.chunk_size]
+            try:
+                with transaction.atomic():
+                    Applicant.objects.bulk_update(chunk, RESULT_FIELDS)
+                written.extend(chunk)
+            except DatabaseError as e:
+                for applicant in chunk:
+                    self._record_failure(applicant.id, str(e))
+
+        self.persisted_count += len(written)
+        for applicant in written:
+            log_ai_processing_complete(
+                applicant.id,
+                {
+                    'overall_score': applicant.overall_score,
+                    'quality_grade': applicant.quality_grade
+                }
+            )
+        return len(written)
+
+    def _update_run_progress(self):
+        if self.scoring_run_id is None:
+            return
+        try:
+            ScoringRun.objects.filter(id=self.scoring_run_id).update(
+                processed_count=self.persisted_count,
+                error_count=self.error_count
+            )
+        except Exception as e:
+            ai_logger.error(f"[Result Persistence] Error updating progress of scoring run {self.scoring_run_id}: {str(e)}")
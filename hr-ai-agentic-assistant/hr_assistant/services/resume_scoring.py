@@ -2,18 +2,42 @@
 Resume scoring service interface
 """
 from typing import List, Dict, Any
+from django.conf import settings
 from django.utils import timezone
+from django.db import IntegrityError, transaction
 from django.db.models import Q
-from hr_assistant.services.ai_analysis import create_supervisor_graph
-from hr_assistant.services.contracts import GraphState, AIAnalysisResponse
-from jobs.models import Applicant, JobListing
+from hr_assistant.services.analysis_cache import compute_job_requirements_hash, get_cache_stats
+from hr_assistant.services.categorization import get_categorization_stats
+from hr_assistant.services.concurrency import get_concurrency_stats
+from hr_assistant.services.llm_pool import get_pool_stats
+from hr_assistant.services.resilience import LLMUnavailableError, get_breaker_stats
+from hr_assistant.services.contracts import (
+    GraphState, AIAnalysisResponse, SCORING_MODE_MULTI_CALL, SCORING_MODE_SKILL_COVERAGE, VALID_SCORING_MODES
+)
+from hr_assistant.services import scoring_queue, scoring_stack
+from hr_assistant.services.result_persistence import IncrementalResultWriter
+from hr_assistant.services.skill_coverage import SkillCoverageMatrix, build_coverage_result
+from hr_assistant.services.rule_derivation import is_rule_derivation_enabled
+from hr_assistant.services.model_cascade import (
+    TIER_ESCALATION, TIER_TRIAGE, get_escalation_band, in_escalation_band, is_cascade_enabled, resolve_node_models
+)
+from hr_assistant.services.requirements_digest import ensure_requirements_digest, is_digest_enabled
+from hr_assistant.services.lazy_justification import (
+    ensure_justification, is_justification_pending, is_lazy_justification_enabled, pregenerate_justifications
+)
+from hr_assistant.services.lexical_prefilter import (
+    build_provisional_details, build_provisional_result, is_prefilter_enabled, is_provisional_result,
+    prefilter_applicants
+)
+from jobs.models import Applicant, JobListing, ScoringRun
+from jobs.services.resume_parser import ensure_resume_facts
 from datetime import timedelta
 from hr_assistant.services.logging import (
-    log_ai_processing_start, log_ai_processing_complete,
+    log_ai_processing_start,
     handle_ai_errors, AIProcessingError
 )
+import asyncio
 import traceback
-from django.db import transaction
 
 # Import logger for additional debugging
 import logging
@@ -26,15 +50,23 @@ class ResumeScoringService:
     """
 
     @staticmethod
-    @handle_ai_errors(context="initiate_scoring_process")
-    def initiate_scoring_process(job_id: int, applicant_ids: List[int] = None) -> Dict[str, Any]:
+    def _validate_scoring_request(job_id: int, applicant_ids: List[int] = None, scoring_mode: str = None):
         """
-        Initiate the scoring process for applicants against a job listing
+        Validate a scoring request and resolve the job listing, applicants queryset and scoring mode.
+        scoring_mode defaults to settings.AI_SCORING_MODE.
         """
         # Validate inputs
         if job_id <= 0:
             raise AIProcessingError("Invalid job_id provided", error_code="INVALID_JOB_ID")
 
+        if scoring_mode is None:
+            scoring_mode = getattr(settings, 'AI_SCORING_MODE', SCORING_MODE_MULTI_CALL)
+        if scoring_mode not in VALID_SCORING_MODES:
+            raise AIProcessingError(
+                f"Invalid scoring_mode '{scoring_mode}'. Must be one of: {', '.join(VALID_SCORING_MODES)}",
+                error_code="INVALID_SCORING_MODE"
+            )
+
         if applicant_ids is not None and not isinstance(applicant_ids, list):
             raise AIProcessingError("applicant_ids must be a list of integers", error_code="INVALID_APPLICANT_IDS")
 
@@ -68,6 +100,97 @@ class ResumeScoringService:
         if not applicants.exists():
             raise AIProcessingError("No applicants found for the specified job listing", error_code="NO_APPLICANTS")
 
+        return job_listing, applicants, scoring_mode
+
+    @staticmethod
+    @handle_ai_errors(context="enqueue_scoring_run")
+    def enqueue_scoring_run(job_id: int, applicant_ids: List[int] = None, scoring_mode: str = None) -> Dict[str, Any]:
+        """
+        Validate a scoring request and queue it for the score_worker management command
+        """
+        job_listing, applicants, scoring_mode = ResumeScoringService._validate_scoring_request(
+            job_id, applicant_ids, scoring_mode
+        )
+
+        applicant_count = applicants.count()
+        try:
+            # The check and the insert share one transaction, and the one-active-run constraint
+            # rejects a run queued by a concurrent request in between
+            with transaction.atomic():
+                active_run = scoring_queue.get_active_run(job_listing)
+                if active_run is None:
+                    run = scoring_queue.enqueue_run(job_listing, applicant_ids, scoring_mode, applicant_count)
+        except IntegrityError:
+            active_run = scoring_queue.get_active_run(job_listing)
+            if active_run is None:
+                raise
+
+        if active_run is not None:
+            raise AIProcessingError(
+                f"Scoring run {active_run.id} is already {active_run.status} for this job. Please wait for it to complete.",
+                error_code="PROCESS_LOCKED",
+                additional_data={'run_id': active_run.id}
+            )
+
+        return {
+            'status': 'queued',
+            'run_id': run.id,
+            'job_id': job_id,
+            'scoring_mode': scoring_mode,
+            'applicant_count': run.applicant_count,
+        }
+
+    @staticmethod
+    def execute_scoring_run(run: ScoringRun, worker_id: str, lease_seconds: int = None) -> Dict[str, Any]:
+        """
+        Execute a claimed scoring run while keeping its lease alive, then record the outcome on the run
+        """
+        ai_logger.info(f"Worker {worker_id} executing scoring run {run.id} for job {run.job_listing_id}")
+        with scoring_queue.LeaseHeartbeat(run.id, worker_id, lease_seconds) as heartbeat:
+            try:
+                result = ResumeScoringService.initiate_scoring_process(
+                    run.job_listing_id, run.applicant_ids, run.scoring_mode, scoring_run_id=run.id, lease=heartbeat
+                )
+                heartbeat.check()
+            except scoring_queue.LeaseLostError:
+                # The worker that took the run over owns its status and applicants now
+                ai_logger.warning(f"Worker {worker_id} abandoned scoring run {run.id} after losing its lease")
+                raise
+            except LLMUnavailableError as e:
+                # Queued again to resume once the backend is back, until the run is out of attempts
+                if not scoring_queue.requeue_run(run.id, worker_id, str(e)):
+                    scoring_queue.fail_run(run.id, worker_id, str(e))
+                raise
+            except Exception as e:
+                ai_logger.error(f"Scoring run {run.id} failed: {str(e)}")
+                scoring_queue.fail_run(run.id, worker_id, str(e))
+                raise
+
+        scoring_queue.complete_run(run.id, worker_id, result['processed_count'], result['error_count'])
+        ai_logger.info(f"Scoring run {run.id} completed. Processed: {result['processed_count']}, Errors: {result['error_count']}")
+        return result
+
+    @staticmethod
+    @handle_ai_errors(context="initiate_scoring_process")
+    def initiate_scoring_process(job_id: int, applicant_ids: List[int] = None, scoring_mode: str = None,
+                                 scoring_run_id: int = None, lease: scoring_queue.LeaseHeartbeat = None) -> Dict[str, Any]:
+        """
+        Run the scoring process for applicants against a job listing to completion.
+        scoring_mode selects the worker pipeline for this run and defaults to settings.AI_SCORING_MODE.
+        scoring_run_id is set when the run was claimed from the scoring queue, and lease is the
+        claiming worker's heartbeat; results are only written while the worker holds the lease.
+        """
+        job_listing, applicants, scoring_mode = ResumeScoringService._validate_scoring_request(
+            job_id, applicant_ids, scoring_mode
+        )
+
+        if scoring_run_id is not None:
+            # The queue allows one active run per job, so applicants left 'processing' belong to
+            # an earlier attempt of this run whose worker died; take them over
+            Applicant.objects.filter(job_listing=job_listing, processing_status='processing').update(
+                processing_status='pending'
+            )
+
         # Check if there's already a scoring process running
         # Check for applicants that have been in 'processing' status for too long (e.g., 1 minute for testing, should be longer in production)
         old_processing_applicants = Applicant.objects.filter(
@@ -103,11 +226,12 @@ class ResumeScoringService:
         applicants.update(processing_status='processing')
 
         # Log that we're starting processing
-        ai_logger.info(f"Starting resume scoring for job {job_id} with {applicants.count()} applicants")
+        ai_logger.info(f"Starting resume scoring for job {job_id} with {applicants.count()} applicants in '{scoring_mode}' mode")
 
         # Prepare initial state for the graph
         applicant_ids_list = [a.id for a in applicants]
         resume_texts_dict = {a.id: a.parsed_resume_text or "" for a in applicants}
+        content_hashes_dict = {a.id: a.content_hash for a in applicants}
 
         # Log resume text content for debugging
         for aid, resume_text in resume_texts_dict.items():
@@ -115,7 +239,48 @@ class ResumeScoringService:
                 ai_logger.warning(f"Applicant {aid} has empty or null parsed_resume_text")
             else:
                 ai_logger.info(f"Applicant {aid} has resume text of length {len(resume_text)}")
-        
+
+        # Structured facts are extracted at upload; only applicants parsed by an older parser version are re-extracted
+        resume_facts_dict = ensure_resume_facts(applicants)
+
+        # Workers stream their results to the database through this writer as they finish
+        result_writer = IncrementalResultWriter(scoring_run_id=scoring_run_id, lease=lease)
+
+        # Applicants x required skills matrix, built once for the run
+        skill_matrix = SkillCoverageMatrix(job_listing.required_skills, resume_texts_dict)
+
+        if scoring_mode == SCORING_MODE_SKILL_COVERAGE:
+            return ResumeScoringService._score_by_skill_coverage(
+                job_id, scoring_run_id, skill_matrix, resume_facts_dict, applicant_ids_list, result_writer
+            )
+
+        # Triage: only the applicants ranked best by the lexical pre-filter go to the LLM
+        screened_out = {}
+        if is_prefilter_enabled():
+            prefilter = prefilter_applicants(
+                resume_texts_dict, job_listing.detailed_description or "", job_listing.required_skills
+            )
+            screened_out = prefilter.screened_out
+            # A provisional result never replaces an earlier LLM analysis; those applicants keep it
+            analyzed_ids = {
+                a.id for a in applicants
+                if a.id in screened_out and a.analysis_status == 'analyzed' and not is_provisional_result(a)
+            }
+            if analyzed_ids:
+                ai_logger.info(f"Pre-filter kept the earlier analyses of {len(analyzed_ids)} screened-out applicants")
+                applicants.filter(id__in=analyzed_ids).update(processing_status='completed')
+            for aid, (relevance, rank) in screened_out.items():
+                if aid in analyzed_ids:
+                    continue
+                result_writer.add(
+                    build_provisional_result(aid, relevance, rank, len(resume_texts_dict)),
+                    analysis_details=build_provisional_details(relevance, rank)
+                )
+            result_writer.flush()
+            applicant_ids_list = prefilter.selected_ids
+            resume_texts_dict = {aid: resume_texts_dict[aid] for aid in applicant_ids_list}
+            content_hashes_dict = {aid: content_hashes_dict[aid] for aid in applicant_ids_list}
+
         initial_ai_analysis_response = AIAnalysisResponse(
                         overall_score=0,
                         quality_grade="F",
@@ -124,6 +289,14 @@ class ResumeScoringService:
                         applicant_id=0
                     )
 
+        # Prompts carry the job's compact digest; the pre-filter above still ranks on the full description
+        if is_digest_enabled():
+            job_requirements = ensure_requirements_digest(job_listing)
+            job_requirements_hash = job_listing.requirements_digest_hash
+        else:
+            job_requirements = job_listing.detailed_description or ""
+            job_requirements_hash = compute_job_requirements_hash(job_listing.detailed_description, job_listing.required_skills)
+
         initial_state = GraphState(
             applicant_id_list=applicant_ids_list,
             job_criteria=job_listing.required_skills,
@@ -131,10 +304,16 @@ class ResumeScoringService:
             status='processing',
             current_index=0,
             error_count=0,
-            total_count=len(applicants),
+            total_count=len(applicant_ids_list),
             resume_texts=resume_texts_dict,  # Use empty string if None
-            job_requirements = job_listing.detailed_description or "",
-            current_analysis_response = initial_ai_analysis_response
+            job_requirements = job_requirements,
+            current_analysis_response = initial_ai_analysis_response,
+            scoring_mode=scoring_mode,
+            content_hashes=content_hashes_dict,
+            job_requirements_hash=job_requirements_hash,
+            cache_hit=False,
+            skill_coverage={aid: skill_matrix.summary(aid) for aid in applicant_ids_list},
+            resume_facts={aid: resume_facts_dict[aid] for aid in applicant_ids_list}
         )
 
 
@@ -143,76 +322,201 @@ class ResumeScoringService:
         for applicant_id in initial_state['applicant_id_list']:
             log_ai_processing_start(applicant_id, job_id)
 
-        # Create and run the supervisor graph
-        ai_logger.info(f"About to create and invoke supervisor graph for {len(initial_state['applicant_id_list'])} applicants")
+        if is_cascade_enabled():
+            result = ResumeScoringService._run_cascade(
+                initial_state, scoring_mode, scoring_run_id, result_writer, applicants
+            )
+        else:
+            result = ResumeScoringService._run_supervisor_graph(
+                initial_state, scoring_mode, scoring_run_id, result_writer, applicants
+            )
+
+        ai_logger.info(f"Resume scoring completed. Processed: {result_writer.persisted_count}, Errors: {result_writer.error_count}")
+        if is_lazy_justification_enabled():
+            pregenerate_justifications(applicant_ids_list)
+        return ResumeScoringService._run_summary(
+            job_id, scoring_run_id, scoring_mode, len(applicants), result_writer, result,
+            llm_count=len(applicant_ids_list), screened_out_count=len(screened_out)
+        )
+
+    @staticmethod
+    def _run_summary(job_id: int, scoring_run_id: int, scoring_mode: str, applicant_count: int,
+                     result_writer: IncrementalResultWriter, result: Dict[str, Any],
+                     llm_count: int, screened_out_count: int) -> Dict[str, Any]:
+        return {
+            'status': 'success',
+            'job_id': job_id,
+            'scoring_run_id': scoring_run_id,
+            'scoring_mode': scoring_mode,
+            'applicant_count': applicant_count,
+            'processed_count': result_writer.persisted_count,
+            'error_count': result_writer.error_count,
+            'persistence_failures': result_writer.failures,
+            'prefilter': {
+                'llm_count': llm_count,
+                'screened_out_count': screened_out_count,
+            },
+            'cache_stats': get_cache_stats(),
+            'llm_pool': get_pool_stats(),
+            'circuit_breaker': get_breaker_stats(),
+            'categorization': get_categorization_stats(),
+            'llm_concurrency': get_concurrency_stats(),
+            'cascade': result.get('cascade'),
+            'results': result
+        }
+
+    @staticmethod
+    def _run_cascade(initial_state: GraphState, scoring_mode: str, scoring_run_id: int,
+                     result_writer: IncrementalResultWriter, applicants) -> Dict[str, Any]:
+        """
+        Score every applicant with the triage model, then re-score the borderline ones with the large model.
+        Triage results within the escalation band are not written, so the large model decides those applicants.
+        """
+        escalation_band = get_escalation_band()
+        triage = ResumeScoringService._run_supervisor_graph(
+            initial_state, scoring_mode, scoring_run_id, result_writer, applicants,
+            model_tier=TIER_TRIAGE, escalation_band=escalation_band
+        )
+        triage_results = triage.get('results', [])
+        borderline_ids = [r.applicant_id for r in triage_results if in_escalation_band(r.overall_score, escalation_band)]
+        ai_logger.info(f"[Model Cascade] Triage scored {len(triage_results)} applicants, escalating {len(borderline_ids)} with scores in {escalation_band}")
+
+        escalated_results = []
+        if borderline_ids:
+            escalation_state = {
+                **initial_state,
+                'applicant_id_list': borderline_ids,
+                'total_count': len(borderline_ids),
+                'results': [],
+                'resume_texts': {aid: initial_state['resume_texts'][aid] for aid in borderline_ids},
+                'content_hashes': {aid: initial_state['content_hashes'][aid] for aid in borderline_ids},
+                'skill_coverage': {aid: initial_state['skill_coverage'].get(aid, {}) for aid in borderline_ids},
+                'resume_facts': {aid: initial_state['resume_facts'].get(aid, {}) for aid in borderline_ids},
+            }
+            escalation = ResumeScoringService._run_supervisor_graph(
+                escalation_state, scoring_mode, scoring_run_id, result_writer, applicants,
+                model_tier=TIER_ESCALATION
+            )
+            escalated_results = escalation.get('results', [])
+
+        escalated_ids = set(borderline_ids)
+        return {
+            'status': 'completed',
+            'results': [r for r in triage_results if r.applicant_id not in escalated_ids] + escalated_results,
+            'cascade': {
+                'escalation_band': list(escalation_band),
+                'triage_decided': len(triage_results) - len(escalated_ids),
+                'escalated': len(escalated_ids),
+            },
+        }
+
+    @staticmethod
+    def _run_supervisor_graph(initial_state: GraphState, scoring_mode: str, scoring_run_id: int,
+                              result_writer: IncrementalResultWriter, applicants,
+                              model_tier: str = None, escalation_band=None) -> Dict[str, Any]:
+        """
+        Invoke the supervisor graph for a run, resuming from its checkpoint when a reclaimed run has one.
+        model_tier selects the cascade pass; each pass has its own checkpoint thread.
+        """
+        # Queued runs are checkpointed so a run reclaimed after its worker died resumes where it stopped
+        checkpointed = scoring_run_id is not None and scoring_stack.is_checkpointing_enabled()
+        # Async graphs overlap LLM calls on one event loop; the run config carries the per-run limiter
+        async_mode = getattr(settings, 'AI_SCORING_ASYNC', True)
+        # Compiled once per process and graph structure, then shared by every run whatever its scoring mode
+        graph = scoring_stack.get_supervisor_graph(async_mode=async_mode, checkpointed=checkpointed)
+        checkpointer = graph.checkpointer if checkpointed else None
+        thread_id = None
+        graph_input = initial_state
+        if checkpointer is not None:
+            thread_id = scoring_stack.get_thread_id(scoring_run_id)
+            if model_tier is not None:
+                thread_id = f"{thread_id}:{model_tier}"
+            if scoring_stack.has_checkpoint(checkpointer, thread_id):
+                ai_logger.info(f"Resuming scoring run {scoring_run_id} from its last checkpoint")
+                graph_input = None
+
+        # Run the supervisor graph
+        ai_logger.info(f"About to invoke supervisor graph for {len(initial_state['applicant_id_list'])} applicants")
         try:
-            graph = create_supervisor_graph()
-            ai_logger.info("Supervisor graph created successfully, about to invoke")
+            run_config = scoring_stack.build_run_config(
+                async_mode, result_writer=result_writer, thread_id=thread_id,
+                node_models=resolve_node_models(scoring_mode, model_tier), model_tier=model_tier,
+                escalation_band=escalation_band, lazy_justification=is_lazy_justification_enabled(),
+                rule_derivation=is_rule_derivation_enabled()
+            )
+            ai_logger.info("Supervisor graph ready, about to invoke")
             ai_logger.info(f"Compiled Graph: {graph}")
-            result = graph.invoke(input=initial_state)
+            # With a checkpointer, each node's progress is saved before the next node starts
+            durability = "sync" if checkpointer is not None else None
+            if async_mode:
+                result = asyncio.run(graph.ainvoke(input=graph_input, config=run_config, durability=durability))
+            else:
+                result = graph.invoke(input=graph_input, config=run_config, durability=durability)
             ai_logger.info(f"Graph invoke completed successfully, got {len(result.get('results', []))} results")
+        except scoring_queue.LeaseLostError:
+            # Another worker resumes the run from the checkpoint: leave its applicants and checkpoint alone
+            ai_logger.warning(f"Stopping scoring run {scoring_run_id}, its lease was taken over")
+            raise
+        except LLMUnavailableError:
+            # The run stops without blaming its applicants: unfinished ones go back to pending and the
+            # checkpoint is kept, so the next attempt of the run resumes where this one stopped
+            ai_logger.warning(f"LLM backend unavailable, pausing scoring run {scoring_run_id}")
+            result_writer.flush()
+            applicants.filter(processing_status='processing').update(processing_status='pending')
+            raise
         except Exception as graph_error:
             ai_logger.error(f"Error in graph invocation: {str(graph_error)}")
             ai_logger.error(f"Traceback: {traceback.format_exc()}")
-            # Update applicants status to error
-            applicants.update(processing_status='error')
+            # Keep the results that finished before the failure; only unfinished applicants are marked as errors
+            result_writer.flush()
+            applicants.filter(processing_status='processing').update(processing_status='error')
+            # The run is marked as failed and won't be resumed
+            if checkpointer is not None:
+                checkpointer.delete_thread(thread_id)
             raise graph_error
 
-        # Process results and update applicant status
-        ai_logger.info(f"Processing {len(result.get('results', []))} results from graph")
-        processed_count = 0
-        error_count = 0
-        for result_item in result.get('results', []):
-            try:
-                with transaction.atomic():
-                    applicant = Applicant.objects.select_for_update().get(id=result_item.applicant_id)
-                    applicant.overall_score = result_item.overall_score
-                    applicant.quality_grade = result_item.quality_grade
-                    applicant.categorization = result_item.categorization
-                    applicant.justification_summary = result_item.justification_summary
-                    applicant.processing_status = 'completed'
-                    applicant.analysis_status = 'analyzed'  # Update analysis status when completed
-                    applicant.analysis_timestamp = timezone.now()  # Add analysis timestamp
-                    applicant.save()
-
-                    # Log completion
-                    log_ai_processing_complete(
-                        result_item.applicant_id,
-                        {
-                            'overall_score': result_item.overall_score,
-                            'quality_grade': result_item.quality_grade
-                        }
-                    )
-                    processed_count += 1
-                    ai_logger.info(f"Successfully processed and saved results for applicant {result_item.applicant_id}")
-            except Applicant.DoesNotExist:
-                # Log error but continue processing other applicants
-                ai_logger.error(f"Applicant with ID {result_item.applicant_id} not found")
-                error_count += 1
-            except Exception as e:
-                # Log error for this specific applicant but continue processing others
-                ai_logger.error(f"Error updating applicant {result_item.applicant_id}: {str(e)}")
-                ai_logger.error(f"Traceback: {traceback.format_exc()}")
-                error_count += 1
+        if checkpointer is not None:
+            checkpointer.delete_thread(thread_id)
 
-        ai_logger.info(f"Resume scoring completed. Processed: {processed_count}, Errors: {error_count}")
+        return result
+
+    @staticmethod
+    def _score_by_skill_coverage(job_id: int, scoring_run_id: int, skill_matrix: SkillCoverageMatrix,
+                                 resume_facts: Dict[int, Dict[str, Any]], applicant_ids: List[int],
+                                 result_writer: IncrementalResultWriter) -> Dict[str, Any]:
+        """
+        Score a run without the LLM: each applicant's score is its coverage of the job's required skills,
+        and its category follows from its resume facts
+        """
+        results = []
+        for aid in applicant_ids:
+            log_ai_processing_start(aid, job_id)
+            result = build_coverage_result(skill_matrix, aid, resume_facts.get(aid))
+            result_writer.add(result, analysis_details={'stage': 'skill_coverage', **skill_matrix.summary(aid)})
+            results.append(result)
+        result_writer.flush()
+
+        ai_logger.info(f"Skill coverage scoring completed. Processed: {result_writer.persisted_count}, Errors: {result_writer.error_count}")
+        return ResumeScoringService._run_summary(
+            job_id, scoring_run_id, SCORING_MODE_SKILL_COVERAGE, len(applicant_ids), result_writer,
+            {'results': results, 'status': 'completed'}, llm_count=0, screened_out_count=0
+        )
 
-        return {
-            'status': 'success',
-            'job_id': job_id,
-            'applicant_count': len(applicants),
-            'processed_count': processed_count,
-            'error_count': error_count,
-            'results': result
-        }
-    
     @staticmethod
     @handle_ai_errors(context="get_scoring_status")
-    def get_scoring_status(job_id: int) -> Dict[str, Any]:
+    def get_scoring_status(job_id: int, run_id: int = None) -> Dict[str, Any]:
         """
-        Get the current status of the scoring process for a job listing
+        Get the current status of the scoring process for a job listing.
+        Reports on the given scoring run, or on the job's most recent run if run_id is not provided.
         """
         job_listing = JobListing.objects.get(id=job_id)
+
+        if run_id is not None:
+            run = ScoringRun.objects.filter(id=run_id, job_listing=job_listing).first()
+            if run is None:
+                raise AIProcessingError(f"Scoring run {run_id} not found for job {job_id}", error_code="RUN_NOT_FOUND")
+        else:
+            run = job_listing.scoring_runs.order_by('-created_date').first()
         
         # Get all applicants for this job
         all_applicants = Applicant.objects.filter(job_listing=job_listing)
@@ -234,9 +538,18 @@ class ResumeScoringService:
             overall_status = 'no_applicants'
         else:
             overall_status = 'pending'
+
+        # A queued or running run is not finished even if applicants still show earlier results
+        if run is not None and run.status == 'queued':
+            overall_status = 'queued'
+        elif run is not None and run.status == 'running':
+            overall_status = 'processing'
+        elif run is not None and run.status == 'error':
+            overall_status = 'error'
         
         return {
             'job_id': job_id,
+            'run': scoring_queue.serialize_run(run) if run is not None else None,
             'status': overall_status,
             'total_applicants': total_count,
             'completed_count': completed_count,
@@ -276,6 +589,9 @@ class ResumeScoringService:
                 'categorization': applicant.categorization,
                 'justification_summary': applicant.justification_summary,
                 'processing_status': applicant.processing_status,
+                'provisional': is_provisional_result(applicant),
+                'model_tier': (applicant.ai_analysis_result or {}).get('model_tier'),
+                'justification_pending': is_justification_pending(applicant),
                 'upload_date': applicant.upload_date.isoformat() if applicant.upload_date else None,
             })
         
@@ -294,8 +610,15 @@ class ResumeScoringService:
         """
         Get detailed analysis for a specific applicant
         """
-        applicant = Applicant.objects.get(id=applicant_id)
-        
+        applicant = Applicant.objects.select_related('job_listing').get(id=applicant_id)
+
+        # Results scored with on-demand justifications get theirs the first time they are viewed
+        if is_justification_pending(applicant):
+            try:
+                ensure_justification(applicant)
+            except Exception as e:
+                ai_logger.error(f"[Lazy Justification] Error generating justification for applicant {applicant_id}: {str(e)}")
+
         return {
             'applicant_id': applicant.id,
             'name': applicant.applicant_name,
@@ -305,6 +628,9 @@ class ResumeScoringService:
             'justification_summary': applicant.justification_summary,
             'detailed_analysis': applicant.justification_summary,
             'processing_status': applicant.processing_status,
+            'provisional': is_provisional_result(applicant),
+            'model_tier': (applicant.ai_analysis_result or {}).get('model_tier'),
+            'justification_pending': is_justification_pending(applicant),
             'upload_date': applicant.upload_date.isoformat() if applicant.upload_date else None,
         }
     
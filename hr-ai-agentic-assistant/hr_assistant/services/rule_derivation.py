@@ -0,0 +1,76 @@
+"""
+Rule-based quality grade and categorization for the multi-call scoring mode.
+
+With AI_SCORING_RULE_BASED_DERIVATION, the LLM only scores the applicant. The grade follows from
+the score through AI_SCORING_GRADE_BANDS, and the category from the resume facts extracted at
+upload (years of experience, job titles) and the applicant's required-skill coverage. This saves
+the categorization call of every applicant; results keep the
+AIAnalysisResponse contract.
+"""
+import re
+from typing import Any, Dict, Optional
+
+from django.conf import settings
+
+# Grade for a score when AI_SCORING_GRADE_BANDS is not set, highest band first
+DEFAULT_GRADE_BANDS = [(90, "A"), (75, "B"), (60, "C"), (40, "D"), (0, "F")]
+
+SENIOR_TITLE_PATTERN = re.compile(
+    r"\b(senior|sr\.?|lead|staff|principal|architect|head of|director|manager)\b", re.IGNORECASE
+)
+JUNIOR_TITLE_PATTERN = re.compile(
+    r"\b(junior|jr\.?|intern|trainee|graduate|apprentice|entry[- ]level)\b", re.IGNORECASE
+)
+
+
+def is_rule_derivation_enabled() -> bool:
+    return getattr(settings, 'AI_SCORING_RULE_BASED_DERIVATION', False)
+
+
+def derive_quality_grade(score: int) -> str:
+    """Grade of the first AI_SCORING_GRADE_BANDS (minimum score, grade) band the score reaches"""
+    bands = getattr(settings, 'AI_SCORING_GRADE_BANDS', None) or DEFAULT_GRADE_BANDS
+    for minimum, grade in sorted(bands, reverse=True):
+        if score >= minimum:
+            return grade
+    return "F"
+
+
+def _title_signal(titles) -> Optional[str]:
+    """'senior' or 'junior' from the most recent title carrying a seniority word"""
+    for title in titles or []:
+        if SENIOR_TITLE_PATTERN.search(title):
+            return 'senior'
+        if JUNIOR_TITLE_PATTERN.search(title):
+            return 'junior'
+    return None
+
+
+def derive_categorization(resume_facts: Optional[Dict[str, Any]],
+                          skill_coverage: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Category from the resume facts and the required-skill coverage summary:
+    - Mismatched when the job has required skills and too few of them are in the resume
+    - Senior from AI_SCORING_RULE_SENIOR_YEARS years, or a senior title with mid-level years
+    - Mid-Level from AI_SCORING_RULE_MID_LEVEL_YEARS years, unless the titles are junior
+    - Junior otherwise; without dated experience, the titles alone decide
+    """
+    senior_years = getattr(settings, 'AI_SCORING_RULE_SENIOR_YEARS', 7)
+    mid_level_years = getattr(settings, 'AI_SCORING_RULE_MID_LEVEL_YEARS', 3)
+    mismatch_below = getattr(settings, 'AI_SCORING_RULE_MISMATCH_COVERAGE_BELOW', 0.25)
+
+    if skill_coverage and (skill_coverage.get('matched_skills') or skill_coverage.get('missing_skills')):
+        if skill_coverage.get('skill_coverage', 0) < mismatch_below:
+            return "Mismatched"
+
+    facts = resume_facts or {}
+    years = facts.get('years_of_experience')
+    title_signal = _title_signal(facts.get('titles'))
+
+    if years is None:
+        return "Senior" if title_signal == 'senior' else "Junior"
+    if years >= senior_years or (title_signal == 'senior' and years >= mid_level_years):
+        return "Senior"
+    if years >= mid_level_years and title_signal != 'junior':
+        return "Mid-Level"
+    return "Junior"
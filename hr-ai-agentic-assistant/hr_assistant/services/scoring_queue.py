@@ -0,0 +1,234 @@
+"""
+Database-backed queue of AI scoring runs.
+
+The web process only enqueues ScoringRun rows; the score_worker management command claims
+them under a time-limited lease and executes them. A worker renews its lease while it works,
+so a run whose worker dies becomes claimable again once the lease lapses.
+"""
+import logging
+import threading
+from datetime import timedelta
+from typing import Any, Dict, List, Optional
+
+from django.conf import settings
+from django.db import DatabaseError, connection
+from django.db.models import Q
+from django.utils import timezone
+
+from jobs.models import JobListing, ScoringRun
+from .logging import AIProcessingError
+
+ai_logger = logging.getLogger('ai_processing')
+
+ACTIVE_RUN_STATUSES = ['queued', 'running']
+
+
+def get_lease_seconds() -> int:
+    return getattr(settings, 'AI_SCORING_RUN_LEASE_SECONDS', 300)
+
+
+def get_max_attempts() -> int:
+    return getattr(settings, 'AI_SCORING_RUN_MAX_ATTEMPTS', 3)
+
+
+def get_active_run(job_listing: JobListing) -> Optional[ScoringRun]:
+    """
+    Return the queued or running run for a job listing, if any
+    """
+    return ScoringRun.objects.filter(
+        job_listing=job_listing,
+        status__in=ACTIVE_RUN_STATUSES
+    ).order_by('-created_date').first()
+
+
+def enqueue_run(job_listing: JobListing, applicant_ids: Optional[List[int]], scoring_mode: str,
+                applicant_count: int) -> ScoringRun:
+    """
+    Add a scoring run to the queue
+    """
+    run = ScoringRun.objects.create(
+        job_listing=job_listing,
+        applicant_ids=applicant_ids,
+        scoring_mode=scoring_mode,
+        applicant_count=applicant_count,
+        status='queued'
+    )
+    ai_logger.info(f"[Scoring Queue] Queued run {run.id} for job {job_listing.id} with {applicant_count} applicants")
+    return run
+
+
+def _claimable(now) -> Q:
+    """Queued runs, and running runs whose worker let the lease lapse"""
+    return Q(status='queued') | Q(status='running', lease_expires_at__lt=now)
+
+
+def _fail_exhausted_runs(now):
+    """
+    Mark runs whose lease lapsed after the maximum number of attempts as failed
+    """
+    exhausted = ScoringRun.objects.filter(
+        status='running',
+        lease_expires_at__lt=now,
+        attempts__gte=get_max_attempts()
+    ).update(
+        status='error',
+        error_message='Run abandoned: worker lease expired after the maximum number of attempts',
+        lease_owner=None,
+        lease_expires_at=None,
+        finished_at=now
+    )
+    if exhausted:
+        ai_logger.warning(f"[Scoring Queue] Marked {exhausted} abandoned runs as failed")
+
+
+def claim_next_run(worker_id: str, lease_seconds: int = None) -> Optional[ScoringRun]:
+    """
+    Claim the oldest claimable run for this worker.
+    The claim is a conditional UPDATE on the run's attempt counter, so when two workers race
+    for the same run exactly one of them wins.
+    """
+    lease_seconds = lease_seconds or get_lease_seconds()
+    now = timezone.now()
+    _fail_exhausted_runs(now)
+
+    candidates = ScoringRun.objects.filter(_claimable(now)).order_by('created_date').values_list('id', 'attempts', 'started_at')[:10]
+    for run_id, attempts, started_at in candidates:
+        claimed = ScoringRun.objects.filter(_claimable(now), id=run_id, attempts=attempts).update(
+            status='running',
+            lease_owner=worker_id,
+            lease_expires_at=now + timedelta(seconds=lease_seconds),
+            attempts=attempts + 1,
+            started_at=started_at or now
+        )
+        if claimed:
+            ai_logger.info(f"[Scoring Queue] Worker {worker_id} claimed run {run_id} (attempt {attempts + 1})")
+            return ScoringRun.objects.get(id=run_id)
+    return None
+
+
+def renew_lease(run_id: int, worker_id: str, lease_seconds: int = None) -> bool:
+    """
+    Extend this worker's lease on a run; returns False if the lease was lost to another worker
+    """
+    lease_seconds = lease_seconds or get_lease_seconds()
+    return ScoringRun.objects.filter(id=run_id, lease_owner=worker_id, status='running').update(
+        lease_expires_at=timezone.now() + timedelta(seconds=lease_seconds)
+    ) == 1
+
+
+def complete_run(run_id: int, worker_id: str, processed_count: int, error_count: int) -> bool:
+    """
+    Mark a run as completed and release the lease
+    """
+    return ScoringRun.objects.filter(id=run_id, lease_owner=worker_id).update(
+        status='completed',
+        processed_count=processed_count,
+        error_count=error_count,
+        lease_owner=None,
+        lease_expires_at=None,
+        finished_at=timezone.now()
+    ) == 1
+
+
+def fail_run(run_id: int, worker_id: str, error_message: str) -> bool:
+    """
+    Mark a run as failed and release the lease
+    """
+    return ScoringRun.objects.filter(id=run_id, lease_owner=worker_id).update(
+        status='error',
+        error_message=error_message,
+        lease_owner=None,
+        lease_expires_at=None,
+        finished_at=timezone.now()
+    ) == 1
+
+
+def requeue_run(run_id: int, worker_id: str, error_message: str) -> bool:
+    """
+    Put a run back in the queue and release the lease, unless it has used its maximum number of attempts.
+    Its checkpoint is kept, so the next worker to claim it resumes where this one stopped.
+    """
+    requeued = ScoringRun.objects.filter(id=run_id, lease_owner=worker_id, attempts__lt=get_max_attempts()).update(
+        status='queued',
+        error_message=error_message,
+        lease_owner=None,
+        lease_expires_at=None
+    ) == 1
+    if requeued:
+        ai_logger.warning(f"[Scoring Queue] Queued run {run_id} again: {error_message}")
+    return requeued
+
+
+def serialize_run(run: ScoringRun) -> Dict[str, Any]:
+    """
+    Status payload for a scoring run
+    """
+    return {
+        'run_id': run.id,
+        'status': run.status,
+        'scoring_mode': run.scoring_mode,
+        'applicant_count': run.applicant_count,
+        'processed_count': run.processed_count,
+        'error_count': run.error_count,
+        'attempts': run.attempts,
+        'error_message': run.error_message,
+        'created_date': run.created_date.isoformat() if run.created_date else None,
+        'started_at': run.started_at.isoformat() if run.started_at else None,
+        'finished_at': run.finished_at.isoformat() if run.finished_at else None,
+    }
+
+
+class LeaseLostError(AIProcessingError):
+    """
+    Another worker took over the run; this worker must stop writing its results
+    """
+
+    def __init__(self, run_id: int, worker_id: str):
+        super().__init__(f"Worker {worker_id} lost the lease on scoring run {run_id}", error_code="LEASE_LOST")
+
+
+class LeaseHeartbeat:
+    """
+    Context manager that renews a run's lease from a background thread while the worker processes it.
+    Writers of the run call check() before writing, so a worker that lost its lease stops there.
+    """
+
+    def __init__(self, run_id: int, worker_id: str, lease_seconds: int = None):
+        self.run_id = run_id
+        self.worker_id = worker_id
+        self.lease_seconds = lease_seconds or get_lease_seconds()
+        self.lease_lost = False
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._beat, name=f"lease-heartbeat-{run_id}", daemon=True)
+
+    def _beat(self):
+        try:
+            while not self._stop.wait(self.lease_seconds / 3):
+                try:
+                    renewed = renew_lease(self.run_id, self.worker_id, self.lease_seconds)
+                except DatabaseError as e:
+                    # E.g. "database is locked": the lease still has time left, so try again next interval
+                    ai_logger.warning(f"[Scoring Queue] Could not renew the lease on run {self.run_id}, retrying: {str(e)}")
+                    connection.close()
+                    continue
+                if not renewed:
+                    self.lease_lost = True
+                    ai_logger.warning(f"[Scoring Queue] Worker {self.worker_id} lost the lease on run {self.run_id}")
+                    return
+        finally:
+            # The heartbeat thread has its own database connection
+            connection.close()
+
+    def check(self):
+        """Raise LeaseLostError once another worker has taken over the run"""
+        if self.lease_lost:
+            raise LeaseLostError(self.run_id, self.worker_id)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._stop.set()
+        self._thread.join()
+        return False
@@ -0,0 +1,52 @@
+"""
+Lazy entry point to the LangGraph scoring stack.
+
+Importing LangGraph, LangChain and the Ollama client takes most of a web process's startup time,
+yet most requests never score anything. Code outside the stack goes through these functions, which
+import ai_analysis, graph_registry and checkpointing on first call, so views, management commands
+and tests only pay for the stack when a run actually executes.
+"""
+from typing import Any, Dict
+
+
+def get_supervisor_graph(async_mode: bool = None, checkpointed: bool = False):
+    """Compiled supervisor graph for this graph structure, see graph_registry.get_supervisor_graph"""
+    from .graph_registry import get_supervisor_graph as _get_supervisor_graph
+    return _get_supervisor_graph(async_mode=async_mode, checkpointed=checkpointed)
+
+
+def build_run_config(async_mode: bool, run_concurrency: int = None,
+                     result_writer=None, thread_id: str = None, **cascade_options) -> Dict[str, Any]:
+    """LangGraph config for one scoring run, see ai_analysis.build_run_config"""
+    from .ai_analysis import build_run_config as _build_run_config
+    return _build_run_config(async_mode, run_concurrency=run_concurrency,
+                             result_writer=result_writer, thread_id=thread_id, **cascade_options)
+
+
+def is_checkpointing_enabled() -> bool:
+    from .checkpointing import is_checkpointing_enabled as _is_checkpointing_enabled
+    return _is_checkpointing_enabled()
+
+
+def get_thread_id(scoring_run_id: int) -> str:
+    """LangGraph thread holding the checkpoints of a scoring run"""
+    from .checkpointing import get_thread_id as _get_thread_id
+    return _get_thread_id(scoring_run_id)
+
+
+def has_checkpoint(checkpointer, thread_id: str) -> bool:
+    """Whether a run has a supervisor checkpoint to resume from"""
+    from .checkpointing import has_checkpoint as _has_checkpoint
+    return _has_checkpoint(checkpointer, thread_id)
+
+
+def generate_justification(state: Dict[str, Any]) -> str:
+    """One applicant's justification generated outside a scoring run, see ai_analysis.generate_justification"""
+    from .ai_analysis import generate_justification as _generate_justification
+    return _generate_justification(state)
+
+
+def warm_up(**kwargs) -> int:
+    """Import the stack and compile the scoring graph, see graph_registry.warm_up"""
+    from .graph_registry import warm_up as _warm_up
+    return _warm_up(**kwargs)
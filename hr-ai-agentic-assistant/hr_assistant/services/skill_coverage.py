@@ -0,0 +1,204 @@
+"""
+Deterministic coverage of a job's required skills by its applicants' resumes.
+
+Required skills and resume texts are normalized once into term sequences, then matched into an
+applicants x skills boolean matrix. Each applicant's row is stored as a bitmask, so coverage is a
+popcount and a "must have skills X and Y" filter is one mask comparison per applicant. The matrix
+feeds the LLM prompts, the non-LLM skill_coverage scoring mode and the candidate report filters.
+"""
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from django.conf import settings
+
+from jobs.models import Applicant, JobListing
+from .contracts import AIAnalysisResponse
+from .lexical_prefilter import TOKEN_PATTERN
+from .rule_derivation import derive_categorization, derive_quality_grade
+
+ai_logger = logging.getLogger('ai_processing')
+
+# Spellings treated as the same skill term
+SKILL_ALIASES = {
+    "js": "javascript",
+    "ts": "typescript",
+    "golang": "go",
+    "postgres": "postgresql",
+    "k8s": "kubernetes",
+    "py": "python",
+    "nodejs": "node.js",
+    "reactjs": "react",
+    "react.js": "react",
+    "ml": "machine learning",
+    "ai": "artificial intelligence",
+}
+
+# Number of cached job matrices used by the candidate report filters
+JOB_MATRIX_CACHE_SIZE = 32
+
+
+def normalize_terms(text: str) -> List[str]:
+    """Lower-cased terms of a text with aliases expanded; stop words are kept so skills like 'IT' survive"""
+    if not text:
+        return []
+    terms = []
+    for token in TOKEN_PATTERN.findall(text.lower()):
+        token = token.lstrip('.')
+        if token:
+            terms.extend(SKILL_ALIASES.get(token, token).split())
+    return terms
+
+
+def normalize_skills(required_skills: Iterable[Any]) -> Tuple[List[str], List[tuple]]:
+    """
+    Display names and term tuples of the required skills, dropping blanks and duplicates
+    """
+    names, term_tuples = [], []
+    for skill in required_skills or []:
+        terms = tuple(normalize_terms(str(skill)))
+        if terms and terms not in term_tuples:
+            names.append(str(skill).strip())
+            term_tuples.append(terms)
+    return names, term_tuples
+
+
+class SkillCoverageMatrix:
+    """
+    Applicants x required skills boolean matrix, one bitmask per applicant (bit i = skill i found)
+    """
+
+    def __init__(self, required_skills: Iterable[Any], resume_texts: Dict[int, str]):
+        self.skills, self._skill_terms = normalize_skills(required_skills)
+        self._skill_bits = {terms: 1 << index for index, terms in enumerate(self._skill_terms)}
+        self._ngram_sizes = sorted({len(terms) for terms in self._skill_terms})
+        self.rows: Dict[int, int] = {
+            applicant_id: self._match(resume_text) for applicant_id, resume_text in resume_texts.items()
+        }
+
+    def _match(self, resume_text: str) -> int:
+        terms = normalize_terms(resume_text)
+        mask = 0
+        for size in self._ngram_sizes:
+            for start in range(len(terms) - size + 1):
+                mask |= self._skill_bits.get(tuple(terms[start:start + size]), 0)
+        return mask
+
+    def skill_mask(self, skills: Iterable[Any]) -> Optional[int]:
+        """Bitmask of the given skills; None if one of them is not a required skill of this job"""
+        mask = 0
+        for skill in skills:
+            terms = tuple(normalize_terms(str(skill)))
+            if terms not in self._skill_bits:
+                return None
+            mask |= self._skill_bits[terms]
+        return mask
+
+    def matched_skills(self, applicant_id: int) -> List[str]:
+        mask = self.rows.get(applicant_id, 0)
+        return [skill for index, skill in enumerate(self.skills) if mask >> index & 1]
+
+    def missing_skills(self, applicant_id: int) -> List[str]:
+        mask = self.rows.get(applicant_id, 0)
+        return [skill for index, skill in enumerate(self.skills) if not mask >> index & 1]
+
+    def coverage(self, applicant_id: int) -> float:
+        """Share of required skills found in the resume; 1.0 when the job lists none"""
+        if not self.skills:
+            return 1.0
+        return bin(self.rows.get(applicant_id, 0)).count("1") / len(self.skills)
+
+    def coverage_scores(self) -> Dict[int, float]:
+        return {applicant_id: self.coverage(applicant_id) for applicant_id in self.rows}
+
+    def as_boolean_rows(self) -> Dict[int, List[bool]]:
+        return {
+            applicant_id: [bool(mask >> index & 1) for index in range(len(self.skills))]
+            for applicant_id, mask in self.rows.items()
+        }
+
+    def applicants_with_all(self, skills: Iterable[Any]) -> set:
+        """IDs of the applicants whose resume covers every given skill"""
+        mask = self.skill_mask(skills)
+        if mask is None:
+            return set()
+        return {applicant_id for applicant_id, row in self.rows.items() if row & mask == mask}
+
+    def summary(self, applicant_id: int) -> Dict[str, Any]:
+        """Per-applicant entry passed to the worker sub-graphs and stored with skill_coverage results"""
+        return {
+            'skill_coverage': round(self.coverage(applicant_id), 4),
+            'matched_skills': self.matched_skills(applicant_id),
+            'missing_skills': self.missing_skills(applicant_id),
+        }
+
+
+def format_skill_coverage(summary: Optional[Dict[str, Any]]) -> str:
+    """Prompt section describing which required skills were found in the resume"""
+    if not summary or not (summary.get('matched_skills') or summary.get('missing_skills')):
+        return ""
+    matched = ", ".join(summary.get('matched_skills') or []) or "none"
+    missing = ", ".join(summary.get('missing_skills') or []) or "none"
+    return (
+        f"Required skills found in the resume: {matched}\n"
+        f"    Required skills not found in the resume: {missing}\n"
+    )
+
+
+def build_coverage_result(matrix: SkillCoverageMatrix, applicant_id: int,
+                          resume_facts: Optional[Dict[str, Any]] = None) -> AIAnalysisResponse:
+    """
+    Result of the non-LLM skill_coverage scoring mode: the score is the share of required skills covered,
+    graded and categorized by the same rules as the rule-based derivation of the LLM modes
+    """
+    score = round(matrix.coverage(applicant_id) * 100)
+    mismatch_below = getattr(settings, 'AI_SCORING_SKILL_COVERAGE_MISMATCH_BELOW', 50)
+    matched = matrix.matched_skills(applicant_id)
+    missing = matrix.missing_skills(applicant_id)
+    if score < mismatch_below:
+        categorization = "Mismatched"
+    else:
+        categorization = derive_categorization(resume_facts, matrix.summary(applicant_id))
+    return AIAnalysisResponse(
+        overall_score=score,
+        quality_grade=derive_quality_grade(score),
+        categorization=categorization,
+        justification_summary=(
+            f"Skill coverage {score}%: covers {', '.join(matched) or 'none'} of the required skills"
+            + (f"; missing {', '.join(missing)}." if missing else ".")
+        ),
+        applicant_id=applicant_id
+    )
+
+
+_job_matrices: "OrderedDict[int, tuple]" = OrderedDict()
+_job_matrices_lock = threading.Lock()
+
+
+def get_job_skill_matrix(job_id: int) -> SkillCoverageMatrix:
+    """
+    Skill matrix over every applicant of a job, rebuilt only when the job's skills or applicants change
+    """
+    job_listing = JobListing.objects.get(id=job_id)
+    applicants = Applicant.objects.filter(job_listing_id=job_id)
+    fingerprint = (
+        tuple(str(skill) for skill in job_listing.required_skills or []),
+        tuple(applicants.order_by('id').values_list('id', 'content_hash')),
+    )
+    with _job_matrices_lock:
+        cached = _job_matrices.get(job_id)
+        if cached is not None and cached[0] == fingerprint:
+            _job_matrices.move_to_end(job_id)
+            return cached[1]
+
+    matrix = SkillCoverageMatrix(
+        job_listing.required_skills, dict(applicants.values_list('id', 'parsed_resume_text'))
+    )
+    ai_logger.info(f"[Skill Coverage] Built {len(matrix.rows)}x{len(matrix.skills)} skill matrix for job {job_id}")
+    with _job_matrices_lock:
+        _job_matrices[job_id] = (fingerprint, matrix)
+        _job_matrices.move_to_end(job_id)
+        while len(_job_matrices) > JOB_MATRIX_CACHE_SIZE:
+            _job_matrices.popitem(last=False)
+    return matrix
@@ -78,6 +78,16 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # Scoring runs write from several threads: take the write lock when a transaction starts
+        # and wait for it, rather than failing when a read transaction can't be upgraded
+        'OPTIONS': {
+            'transaction_mode': 'IMMEDIATE',
+            'timeout': 20,
+        },
+        # The default in-memory test database fails on the first lock conflict instead of waiting
+        'TEST': {
+            'NAME': BASE_DIR / 'test_db.sqlite3',
+        },
     }
 }
 
@@ -121,6 +131,107 @@ MEDIA_ROOT = BASE_DIR / 'media'
 FILE_UPLOAD_MAX_MEMORY_SIZE = 10 * 1024 * 1024  # 10MB
 DATA_UPLOAD_MAX_MEMORY_SIZE = 10 * 1024 * 1024  # 10MB
 
+# AI Resume Scoring Engine settings
+# Default worker pipeline: 'multi_call' (separate scoring/categorization/justification prompts),
+# 'structured' (one schema-constrained JSON call per applicant), 'batched' (several short resumes per
+# schema-constrained JSON call) or 'skill_coverage' (no LLM: score is the share of the job's required
+# skills found in the resume). Can be overridden per run.
+AI_SCORING_MODE = 'multi_call'
+AI_SCORING_SKILL_COVERAGE_MISMATCH_BELOW = 50  # skill_coverage mode categorizes applicants below this score as Mismatched
+# Ollama model used for scoring (part of the analysis cache key)
+AI_SCORING_MODEL = 'llama2'
+# Per-node models, e.g. {'categorization': 'tinyllama'}; nodes not listed use the model of the run's tier
+AI_SCORING_NODE_MODELS = {}
+# Model cascade: a small model scores every applicant, and only triage scores within
+# AI_SCORING_CASCADE_BAND points of AI_SCORING_CASCADE_CUTOFF are re-scored by AI_SCORING_MODEL
+AI_SCORING_CASCADE_ENABLED = False
+AI_SCORING_CASCADE_TRIAGE_MODEL = 'llama3.2:1b'
+AI_SCORING_CASCADE_CUTOFF = 70  # Shortlist cutoff score
+AI_SCORING_CASCADE_BAND = 10
+# Store only score, grade and category in batch runs; justifications are generated when first viewed
+AI_SCORING_LAZY_JUSTIFICATION = False
+# With lazy justifications, generate them right after the run for this many best-scored applicants
+AI_SCORING_JUSTIFICATION_PREGENERATE_TOP_N = 0
+# Multi-call runs derive the grade from the score and the category from resume facts instead of asking the LLM
+AI_SCORING_RULE_BASED_DERIVATION = False
+AI_SCORING_GRADE_BANDS = [(90, "A"), (75, "B"), (60, "C"), (40, "D"), (0, "F")]  # (minimum score, grade)
+AI_SCORING_RULE_SENIOR_YEARS = 7
+AI_SCORING_RULE_MID_LEVEL_YEARS = 3
+AI_SCORING_RULE_MISMATCH_COVERAGE_BELOW = 0.25  # Share of required skills found in the resume
+# Output token cap (num_predict) per LLM node; nodes not listed are uncapped
+AI_SCORING_NODE_MAX_TOKENS = {
+    'scoring_grading': 64,
+    'categorization': 32,  # Fits {"categorization": "Mismatched"} pretty-printed
+}
+# Stream the scoring and categorization calls and stop generating once their fields are parsed
+AI_SCORING_STREAM_EARLY_STOP = False
+# Batched mode: estimated resume tokens and resumes per prompt; longer resumes are scored on their own
+AI_SCORING_BATCH_TOKEN_BUDGET = 3000
+AI_SCORING_BATCH_MAX_SIZE = 8
+AI_SCORING_BATCH_MAX_RESUME_CHARS = 2048
+# Backend creating the LLM clients: 'ollama', 'fake' (deterministic, in-process) or a dotted LLMBackend path
+AI_SCORING_LLM_BACKEND = 'ollama'
+# Overrides of the fake backend's FAKE_LLM_DEFAULTS, e.g. {'latency_ms': 200, 'error_rate': 0.05}
+AI_SCORING_FAKE_LLM = {}
+# 'pool' backend: Ollama servers sharing the load, routed to the one with the fewest outstanding requests
+AI_SCORING_OLLAMA_ENDPOINTS = ['http://localhost:11434']
+# An endpoint failing this many calls in a row is ejected from routing for AI_SCORING_POOL_EJECT_SECONDS
+AI_SCORING_POOL_EJECT_AFTER_FAILURES = 3
+AI_SCORING_POOL_EJECT_SECONDS = 30
+# Duplicate a call on a second endpoint once it runs past the model's recent latency percentile
+AI_SCORING_POOL_HEDGE = False
+AI_SCORING_POOL_HEDGE_PERCENTILE = 95
+AI_SCORING_POOL_HEDGE_MIN_SAMPLES = 20
+# Deadlines, retries of transient errors and a circuit breaker around every LLM call
+AI_SCORING_RESILIENCE_ENABLED = False
+AI_SCORING_LLM_CALL_DEADLINE_SECONDS = 120
+# Attempts per call, with full-jitter exponential backoff between them
+AI_SCORING_LLM_RETRY_ATTEMPTS = 3
+AI_SCORING_LLM_RETRY_BASE_SECONDS = 0.5
+AI_SCORING_LLM_RETRY_MAX_SECONDS = 8
+# Consecutive transient failures opening the breaker, and seconds between trial calls while it is open
+AI_SCORING_BREAKER_FAILURE_THRESHOLD = 5
+AI_SCORING_BREAKER_RESET_SECONDS = 10
+# Seconds a call waits for the breaker before the run is paused and queued again
+AI_SCORING_BREAKER_MAX_WAIT_SECONDS = 600
+# Run the scoring graph through ainvoke so slow LLM calls overlap on one event loop
+AI_SCORING_ASYNC = True
+# Caps on in-flight LLM requests: per scoring run, and across all runs in this process
+AI_SCORING_MAX_CONCURRENT_LLM_CALLS_PER_RUN = 4
+AI_SCORING_MAX_CONCURRENT_LLM_CALLS_PER_PROCESS = 8
+# Tune the process cap from observed latency and errors (AIMD), starting from the cap above;
+# runs are then only bounded by the process limit
+AI_SCORING_ADAPTIVE_CONCURRENCY = False
+AI_SCORING_ADAPTIVE_MIN_LLM_CALLS = 1
+AI_SCORING_ADAPTIVE_MAX_LLM_CALLS = 32
+# A node whose moving average latency exceeds this many times its baseline counts as overloaded;
+# the baseline is this percentile of the node's last 100 calls
+AI_SCORING_ADAPTIVE_LATENCY_TOLERANCE = 2.0
+AI_SCORING_ADAPTIVE_BASELINE_PERCENTILE = 25
+# The limit is multiplied by this on overload, and grows by one per limit's worth of fast calls
+AI_SCORING_ADAPTIVE_DECREASE_FACTOR = 0.75
+# Calls per node before their latency is compared with the baseline
+AI_SCORING_ADAPTIVE_MIN_SAMPLES = 5
+# Persistent analysis cache keyed by resume hash, job requirements hash, prompt version and model
+AI_SCORING_CACHE_ENABLED = True
+AI_SCORING_CACHE_MAX_ENTRIES = 50000  # Least recently used entries are evicted beyond this
+# Background scoring queue processed by `manage.py score_worker`
+AI_SCORING_RUN_LEASE_SECONDS = 300  # A run whose worker stops renewing its lease for this long is reclaimed
+AI_SCORING_RUN_MAX_ATTEMPTS = 3
+AI_SCORING_WORKER_POLL_SECONDS = 5
+# Worker results are committed every N results or once the oldest buffered result is T milliseconds old
+AI_SCORING_PERSIST_BATCH_SIZE = 10
+AI_SCORING_PERSIST_INTERVAL_MS = 500
+AI_SCORING_PERSIST_CHUNK_SIZE = 200  # Rows per bulk_update statement and transaction
+AI_SCORING_CHECKPOINTS_ENABLED = True  # Checkpoint queued runs so a reclaimed run resumes where it stopped
+# Lexical pre-filter: only the best-ranked applicants of a run are scored by the LLM, the rest get a provisional "Mismatched" result
+AI_SCORING_PREFILTER_ENABLED = False
+AI_SCORING_PREFILTER_TOP_K = 200  # None sends every applicant that passes the relevance cutoff
+AI_SCORING_PREFILTER_MIN_RELEVANCE = None  # Minimum BM25 score relative to the best match (0-1), None disables the cutoff
+# Prompts use a compact digest of the job (requirements, seniority signals, must-have skills) instead of the full description
+AI_SCORING_REQUIREMENTS_DIGEST_ENABLED = True
+AI_SCORING_REQUIREMENTS_DIGEST_MAX_CHARS = 2000
+
 # Static files (CSS, JavaScript, Images)
 # https://docs.djangoproject.com/en/5.2/howto/static-files/
 
@@ -4,4 +4,5 @@ from .models import *
 # Register your models here.
 admin.site.register(JobListing)
 admin.site.register(Applicant)
-
+admin.site.register(AnalysisCacheEntry)
+admin.site.register(ScoringRun)
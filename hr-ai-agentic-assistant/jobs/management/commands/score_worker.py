@@ -0,0 +1,90 @@
+"""
+Background worker that processes queued AI scoring runs
+"""
+import logging
+import os
+import socket
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from hr_assistant.services import scoring_queue, scoring_stack
+from hr_assistant.services.resilience import LLMUnavailableError
+from hr_assistant.services.resume_scoring import ResumeScoringService
+
+ai_logger = logging.getLogger('ai_processing')
+
+
+class Command(BaseCommand):
+    help = 'Claim queued resume scoring runs and execute them outside the web process'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Process at most one queued run and exit'
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=None,
+            help='Seconds to wait between queue polls when no run is queued'
+        )
+        parser.add_argument(
+            '--lease-seconds',
+            type=int,
+            default=None,
+            help='Lease duration for claimed runs; renewed while the run is processed'
+        )
+        parser.add_argument(
+            '--worker-id',
+            default=None,
+            help='Identifier recorded as the lease owner (defaults to hostname:pid)'
+        )
+        parser.add_argument(
+            '--skip-warm-up',
+            action='store_true',
+            help='Compile scoring graphs on first use instead of at startup'
+        )
+
+    def handle(self, *args, **options):
+        worker_id = options['worker_id'] or f"{socket.gethostname()}:{os.getpid()}"
+        poll_interval = options['poll_interval']
+        if poll_interval is None:
+            poll_interval = getattr(settings, 'AI_SCORING_WORKER_POLL_SECONDS', 5)
+        lease_seconds = options['lease_seconds'] or scoring_queue.get_lease_seconds()
+
+        if not options['skip_warm_up']:
+            # Compile the scoring graph now so the first claimed run doesn't pay for it
+            graph_count = scoring_stack.warm_up()
+            ai_logger.info(f"Scoring worker {worker_id} compiled {graph_count} scoring graphs")
+
+        self.stdout.write(f"Scoring worker {worker_id} started")
+        ai_logger.info(f"Scoring worker {worker_id} started (poll interval {poll_interval}s, lease {lease_seconds}s)")
+
+        try:
+            while True:
+                run = scoring_queue.claim_next_run(worker_id, lease_seconds)
+                if run is not None:
+                    try:
+                        ResumeScoringService.execute_scoring_run(run, worker_id, lease_seconds)
+                        self.stdout.write(f"Scoring run {run.id} completed")
+                    except LLMUnavailableError as e:
+                        # The run was queued again, or failed if it was out of attempts
+                        self.stderr.write(f"Scoring run {run.id} paused: {str(e)}")
+                    except scoring_queue.LeaseLostError as e:
+                        # Another worker took the run over and finishes it
+                        self.stderr.write(f"Scoring run {run.id} abandoned: {str(e)}")
+                    except Exception as e:
+                        # The run has been marked as failed; keep serving the queue
+                        self.stderr.write(f"Scoring run {run.id} failed: {str(e)}")
+                elif options['once']:
+                    self.stdout.write("No queued scoring runs")
+
+                if options['once']:
+                    break
+                if run is None:
+                    time.sleep(poll_interval)
+        except KeyboardInterrupt:
+            self.stdout.write(f"Scoring worker {worker_id} stopped")
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-17 07:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0008_remove_applicant_jobs_applic_is_shor_dc4032_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AnalysisCacheEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('cache_key', models.CharField(help_text='SHA256 of content hash, job requirements hash, prompt version and model name', max_length=64, unique=True)),
+                ('content_hash', models.CharField(help_text='SHA256 hash of the resume file content', max_length=64)),
+                ('job_requirements_hash', models.CharField(help_text='SHA256 hash of the normalized job requirements', max_length=64)),
+                ('prompt_version', models.CharField(help_text='Version of the prompt templates that produced the result', max_length=50)),
+                ('model_name', models.CharField(help_text='LLM model that produced the result', max_length=100)),
+                ('result', models.JSONField(help_text='AIAnalysisResponse fields (without applicant_id)')),
+                ('hit_count', models.PositiveIntegerField(default=0, help_text='Number of times this entry was served from the cache')),
+                ('created_date', models.DateTimeField(auto_now_add=True)),
+                ('last_accessed', models.DateTimeField(help_text='Last time the entry was stored or served, used for LRU eviction')),
+            ],
+            options={
+                'verbose_name': 'Analysis Cache Entry',
+                'verbose_name_plural': 'Analysis Cache Entries',
+                'indexes': [models.Index(fields=['last_accessed'], name='jobs_analys_last_ac_1226a9_idx')],
+            },
+        ),
+    ]
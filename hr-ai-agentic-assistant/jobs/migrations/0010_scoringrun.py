@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-17 07:27
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0009_analysiscacheentry'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScoringRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('applicant_ids', models.JSONField(blank=True, help_text='Applicant IDs selected for scoring, or null for all applicants of the job', null=True)),
+                ('scoring_mode', models.CharField(help_text='Worker pipeline used for this run', max_length=20)),
+                ('status', models.CharField(choices=[('queued', 'Queued'), ('running', 'Running'), ('completed', 'Completed'), ('error', 'Error')], default='queued', help_text='Current status of the scoring run', max_length=20)),
+                ('lease_owner', models.CharField(blank=True, help_text='Identifier of the worker currently holding the run', max_length=255, null=True)),
+                ('lease_expires_at', models.DateTimeField(blank=True, help_text="When the worker's claim lapses and another worker may take over the run", null=True)),
+                ('attempts', models.PositiveIntegerField(default=0, help_text='Number of times the run has been claimed')),
+                ('applicant_count', models.PositiveIntegerField(default=0, help_text='Number of applicants selected when the run was queued')),
+                ('processed_count', models.PositiveIntegerField(default=0)),
+                ('error_count', models.PositiveIntegerField(default=0)),
+                ('error_message', models.TextField(blank=True, help_text='Reason the run failed', null=True)),
+                ('created_date', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('job_listing', models.ForeignKey(help_text='The job listing whose applicants are scored', on_delete=django.db.models.deletion.CASCADE, related_name='scoring_runs', to='jobs.joblisting')),
+            ],
+            options={
+                'verbose_name': 'Scoring Run',
+                'verbose_name_plural': 'Scoring Runs',
+                'indexes': [models.Index(fields=['status', 'lease_expires_at'], name='jobs_scorin_status_3fc45a_idx'), models.Index(fields=['job_listing', 'status'], name='jobs_scorin_job_lis_27242b_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 5.2.18 on 2026-10-17 07:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0010_scoringrun'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GraphCheckpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('thread_id', models.CharField(help_text='LangGraph thread, one per scoring run', max_length=255)),
+                ('checkpoint_ns', models.CharField(blank=True, default='', help_text='Empty for the supervisor graph, the worker task path for sub-graphs', max_length=255)),
+                ('checkpoint_id', models.CharField(max_length=64)),
+                ('parent_checkpoint_id', models.CharField(blank=True, max_length=64, null=True)),
+                ('checkpoint_type', models.CharField(max_length=50)),
+                ('checkpoint', models.BinaryField(help_text='Serialized checkpoint including channel values')),
+                ('metadata_type', models.CharField(max_length=50)),
+                ('metadata', models.BinaryField()),
+                ('created_date', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Graph Checkpoint',
+                'verbose_name_plural': 'Graph Checkpoints',
+                'constraints': [models.UniqueConstraint(fields=('thread_id', 'checkpoint_ns', 'checkpoint_id'), name='unique_graph_checkpoint')],
+            },
+        ),
+        migrations.CreateModel(
+            name='GraphCheckpointWrite',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('thread_id', models.CharField(max_length=255)),
+                ('checkpoint_ns', models.CharField(blank=True, default='', max_length=255)),
+                ('checkpoint_id', models.CharField(max_length=64)),
+                ('task_id', models.CharField(max_length=64)),
+                ('task_path', models.CharField(blank=True, default='', max_length=255)),
+                ('idx', models.IntegerField(help_text="Position of the write within the task's writes")),
+                ('channel', models.CharField(max_length=255)),
+                ('value_type', models.CharField(max_length=50)),
+                ('value', models.BinaryField()),
+            ],
+            options={
+                'verbose_name': 'Graph Checkpoint Write',
+                'verbose_name_plural': 'Graph Checkpoint Writes',
+                'constraints': [models.UniqueConstraint(fields=('thread_id', 'checkpoint_ns', 'checkpoint_id', 'task_id', 'idx'), name='unique_graph_checkpoint_write')],
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-17 08:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0011_graphcheckpoint'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='joblisting',
+            name='requirements_digest',
+            field=models.TextField(blank=True, default='', help_text='Condensed requirements, seniority signals and must-have skills used in AI scoring prompts'),
+        ),
+        migrations.AddField(
+            model_name='joblisting',
+            name='requirements_digest_hash',
+            field=models.CharField(blank=True, default='', help_text='SHA256 of the title, description and skills the requirements digest was built from', max_length=64),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 08:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0012_joblisting_requirements_digest'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='applicant',
+            name='resume_facts',
+            field=models.JSONField(blank=True, help_text='Structured facts extracted from the parsed resume text (sections, years of experience, titles, skills, education) with the parser version', null=True),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-17 09:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0013_applicant_resume_facts'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='scoringrun',
+            constraint=models.UniqueConstraint(condition=models.Q(('status__in', ['queued', 'running'])), fields=('job_listing',), name='one_active_scoring_run_per_job'),
+        ),
+    ]
@@ -24,6 +24,17 @@ class JobListing(models.Model):
         default=False,
         help_text="Boolean flag indicating if this is the active listing"
     )
+    requirements_digest = models.TextField(
+        blank=True,
+        default='',
+        help_text="Condensed requirements, seniority signals and must-have skills used in AI scoring prompts"
+    )
+    requirements_digest_hash = models.CharField(
+        max_length=64,
+        blank=True,
+        default='',
+        help_text="SHA256 of the title, description and skills the requirements digest was built from"
+    )
     created_date = models.DateTimeField(auto_now_add=True)
     modified_date = models.DateTimeField(auto_now=True)
 
@@ -59,7 +70,12 @@ class JobListing(models.Model):
         elif self.is_active:
             # Ensure only one listing is active at a time (T007, T007a)
             JobListing.objects.filter(is_active=True).exclude(pk=self.pk).update(is_active=False)
-        
+
+        # Keep the prompt digest in step with the requirements it summarizes
+        from hr_assistant.services.requirements_digest import refresh_requirements_digest
+        if refresh_requirements_digest(self) and kwargs.get('update_fields') is not None:
+            kwargs['update_fields'] = {*kwargs['update_fields'], 'requirements_digest', 'requirements_digest_hash'}
+
         super().save(*args, **kwargs)
 
     def get_rendered_description(self):
@@ -182,6 +198,11 @@ class Applicant(models.Model):
         blank=True,
         help_text="Parsed text content from resume file"
     )
+    resume_facts = models.JSONField(
+        null=True,
+        blank=True,
+        help_text="Structured facts extracted from the parsed resume text (sections, years of experience, titles, skills, education) with the parser version"
+    )
     ai_analysis_result = models.JSONField(
         null=True,
         blank=True,
@@ -244,3 +265,197 @@ class Applicant(models.Model):
             models.Index(fields=['overall_score']),
             models.Index(fields=['job_listing', 'processing_status']),
         ]
+
+
+class AnalysisCacheEntry(models.Model):
+    """
+    Cached AI analysis result, content-addressed by resume, job requirements, prompt version and model.
+    """
+    cache_key = models.CharField(
+        max_length=64,  # SHA256 hash is 64 hex characters
+        unique=True,
+        help_text="SHA256 of content hash, job requirements hash, prompt version and model name"
+    )
+    content_hash = models.CharField(
+        max_length=64,
+        help_text="SHA256 hash of the resume file content"
+    )
+    job_requirements_hash = models.CharField(
+        max_length=64,
+        help_text="SHA256 hash of the normalized job requirements"
+    )
+    prompt_version = models.CharField(
+        max_length=50,
+        help_text="Version of the prompt templates that produced the result"
+    )
+    model_name = models.CharField(
+        max_length=100,
+        help_text="LLM model that produced the result"
+    )
+    result = models.JSONField(
+        help_text="AIAnalysisResponse fields (without applicant_id)"
+    )
+    hit_count = models.PositiveIntegerField(
+        default=0,
+        help_text="Number of times this entry was served from the cache"
+    )
+    created_date = models.DateTimeField(auto_now_add=True)
+    last_accessed = models.DateTimeField(
+        help_text="Last time the entry was stored or served, used for LRU eviction"
+    )
+
+    def __str__(self):
+        return f"{self.cache_key[:12]} ({self.model_name}, {self.prompt_version})"
+
+    class Meta:
+        verbose_name = "Analysis Cache Entry"
+        verbose_name_plural = "Analysis Cache Entries"
+        indexes = [
+            models.Index(fields=['last_accessed']),
+        ]
+
+
+class ScoringRun(models.Model):
+    """
+    A queued AI scoring run for a job listing, processed by the score_worker management command.
+    Workers claim runs with a time-limited lease so a run abandoned by a dead worker is picked up again.
+    """
+    job_listing = models.ForeignKey(
+        JobListing,
+        on_delete=models.CASCADE,
+        related_name='scoring_runs',
+        help_text="The job listing whose applicants are scored"
+    )
+    applicant_ids = models.JSONField(
+        null=True,
+        blank=True,
+        help_text="Applicant IDs selected for scoring, or null for all applicants of the job"
+    )
+    scoring_mode = models.CharField(
+        max_length=20,
+        help_text="Worker pipeline used for this run"
+    )
+    status = models.CharField(
+        max_length=20,
+        default='queued',
+        choices=[
+            ('queued', 'Queued'),
+            ('running', 'Running'),
+            ('completed', 'Completed'),
+            ('error', 'Error')
+        ],
+        help_text="Current status of the scoring run"
+    )
+    lease_owner = models.CharField(
+        max_length=255,
+        null=True,
+        blank=True,
+        help_text="Identifier of the worker currently holding the run"
+    )
+    lease_expires_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="When the worker's claim lapses and another worker may take over the run"
+    )
+    attempts = models.PositiveIntegerField(
+        default=0,
+        help_text="Number of times the run has been claimed"
+    )
+    applicant_count = models.PositiveIntegerField(
+        default=0,
+        help_text="Number of applicants selected when the run was queued"
+    )
+    processed_count = models.PositiveIntegerField(default=0)
+    error_count = models.PositiveIntegerField(default=0)
+    error_message = models.TextField(
+        null=True,
+        blank=True,
+        help_text="Reason the run failed"
+    )
+    created_date = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"Scoring run {self.pk} for {self.job_listing} ({self.status})"
+
+    class Meta:
+        verbose_name = "Scoring Run"
+        verbose_name_plural = "Scoring Runs"
+        indexes = [
+            models.Index(fields=['status', 'lease_expires_at']),
+            models.Index(fields=['job_listing', 'status']),
+        ]
+        constraints = [
+            # At most one queued or running run per job, so two workers never score the same applicants
+            models.UniqueConstraint(
+                fields=['job_listing'],
+                condition=models.Q(status__in=['queued', 'running']),
+                name='one_active_scoring_run_per_job'
+            ),
+        ]
+
+
+class GraphCheckpoint(models.Model):
+    """
+    LangGraph checkpoint of a scoring run, used to resume the run after its worker dies.
+    The checkpoint namespace separates the supervisor graph from each applicant's worker sub-graph.
+    """
+    thread_id = models.CharField(
+        max_length=255,
+        help_text="LangGraph thread, one per scoring run"
+    )
+    checkpoint_ns = models.CharField(
+        max_length=255,
+        default='',
+        blank=True,
+        help_text="Empty for the supervisor graph, the worker task path for sub-graphs"
+    )
+    checkpoint_id = models.CharField(max_length=64)
+    parent_checkpoint_id = models.CharField(max_length=64, null=True, blank=True)
+    checkpoint_type = models.CharField(max_length=50)
+    checkpoint = models.BinaryField(help_text="Serialized checkpoint including channel values")
+    metadata_type = models.CharField(max_length=50)
+    metadata = models.BinaryField()
+    created_date = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.thread_id} [{self.checkpoint_ns}] {self.checkpoint_id}"
+
+    class Meta:
+        verbose_name = "Graph Checkpoint"
+        verbose_name_plural = "Graph Checkpoints"
+        constraints = [
+            models.UniqueConstraint(
+                fields=['thread_id', 'checkpoint_ns', 'checkpoint_id'],
+                name='unique_graph_checkpoint'
+            ),
+        ]
+
+
+class GraphCheckpointWrite(models.Model):
+    """
+    Pending write of a graph task, recorded as soon as the task (e.g. one worker node) finishes
+    """
+    thread_id = models.CharField(max_length=255)
+    checkpoint_ns = models.CharField(max_length=255, default='', blank=True)
+    checkpoint_id = models.CharField(max_length=64)
+    task_id = models.CharField(max_length=64)
+    task_path = models.CharField(max_length=255, default='', blank=True)
+    idx = models.IntegerField(help_text="Position of the write within the task's writes")
+    channel = models.CharField(max_length=255)
+    value_type = models.CharField(max_length=50)
+    value = models.BinaryField()
+
+    def __str__(self):
+        return f"{self.thread_id} [{self.checkpoint_ns}] {self.checkpoint_id} {self.task_id}:{self.idx}"
+
+    class Meta:
+        verbose_name = "Graph Checkpoint Write"
+        verbose_name_plural = "Graph Checkpoint Writes"
+        constraints = [
+            models.UniqueConstraint(
+                fields=['thread_id', 'checkpoint_ns', 'checkpoint_id', 'task_id', 'idx'],
+                name='unique_graph_checkpoint_write'
+            ),
+        ]
@@ -1,12 +1,15 @@
 """
 Resume parsing and text extraction service
 """
+import datetime
 import os
+import re
 from django.conf import settings
 from django.core.files.storage import default_storage
 import PyPDF2
 import docx
 import tempfile
+from jobs.models import Applicant
 
 
 def extract_text_from_pdf(file_path):
@@ -68,16 +71,17 @@ def parse_resume_text(resume_file):
 
 def store_parsed_resume_text(applicant, resume_text):
     """
-    Store the parsed resume text in the applicant record
+    Store the parsed resume text and the facts extracted from it in the applicant record
     """
     # Update the applicant's parsed resume text field
     applicant.parsed_resume_text = resume_text
+    applicant.resume_facts = extract_resume_facts(resume_text)
     applicant.save()
 
 
 def process_resume_upload(resume_file, applicant):
     """
-    Process a resume upload: parse text and store it
+    Process a resume upload: parse text and store it with its structured facts
     """
     # Parse the resume text
     parsed_text = parse_resume_text(resume_file)
@@ -85,4 +89,238 @@ def process_resume_upload(resume_file, applicant):
     # Store the parsed text in the applicant record
     store_parsed_resume_text(applicant, parsed_text)
     
-    return parsed_text
\ No newline at end of file
+    return parsed_text
+
+# Structured resume facts
+# Bump when extract_resume_facts changes so stored facts are re-extracted
+RESUME_FACTS_VERSION = 1
+
+# Canonical section name -> headings that start it
+SECTION_HEADINGS = {
+    'summary': ('summary', 'profile', 'objective', 'about me', 'professional summary'),
+    'experience': ('experience', 'work experience', 'professional experience', 'employment', 'employment history',
+                   'work history', 'career history'),
+    'education': ('education', 'academic background', 'education and training'),
+    'skills': ('skills', 'technical skills', 'core competencies', 'competencies', 'technologies', 'tech stack'),
+    'projects': ('projects', 'personal projects'),
+    'certifications': ('certifications', 'certificates', 'licenses', 'licenses and certifications'),
+    'languages': ('languages',),
+}
+HEADING_TO_SECTION = {heading: section for section, headings in SECTION_HEADINGS.items() for heading in headings}
+
+MONTHS = {month: index for index, month in enumerate(
+    ('jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec'), start=1
+)}
+_DATE = r"(?:(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?\s+|(\d{1,2})/)?((?:19|20)\d{2})"
+DATE_RANGE_PATTERN = re.compile(
+    _DATE + r"\s*(?:-|–|—|to|until)\s*(?:" + _DATE + r"|(present|current|now|today))", re.IGNORECASE
+)
+CLAIMED_YEARS_PATTERN = re.compile(
+    r"(\d{1,2})\+?\s*years?\s+(?:of\s+)?(?:professional\s+|industry\s+|work\s+|hands-on\s+)?experience", re.IGNORECASE
+)
+TITLE_PATTERN = re.compile(
+    r"\b(engineer|developer|programmer|architect|manager|director|analyst|scientist|designer|consultant|"
+    r"administrator|specialist|intern|lead|head|officer|technician|researcher|coordinator|accountant|"
+    r"teacher|nurse|chef|recruiter)s?\b", re.IGNORECASE
+)
+TITLE_SEPARATOR_PATTERN = re.compile(r"\s+(?:at|@)\s+|\s*[|,–—(]\s*|\s+-\s+")
+DEGREE_PATTERN = re.compile(
+    r"\b(bachelor|master|ph\.?d|doctorate|b\.?sc|m\.?sc|b\.?a|m\.?a|b\.?eng|m\.?eng|mba|associate|diploma|degree)\b",
+    re.IGNORECASE
+)
+SKILL_SEPARATOR_PATTERN = re.compile(r"[,;|•·]|\s{2,}|\s+/\s+")
+LIST_MARKER_PATTERN = re.compile(r"^\s*(?:[-*+•▪●]|\d+[.)])\s*")
+
+MAX_TITLES = 10
+MAX_SKILLS = 50
+MAX_EDUCATION_ENTRIES = 5
+MAX_FACT_CHARS = 150
+
+
+def _section_heading(line):
+    """
+    Canonical section name if the line is a section heading, else None
+    """
+    heading = re.sub(r"[#*_:=\-]+", " ", line).strip().lower()
+    heading = " ".join(heading.replace("&", "and").split())
+    if not heading or len(heading) > 40:
+        return None
+    return HEADING_TO_SECTION.get(heading)
+
+
+def split_resume_sections(resume_text):
+    """
+    Split resume text into {section name: lines}; lines before the first recognized heading go under 'header'
+    """
+    sections = {'header': []}
+    current = 'header'
+    for raw_line in (resume_text or "").splitlines():
+        line = raw_line.strip()
+        if not line:
+            continue
+        section = _section_heading(line)
+        if section:
+            current = section
+            sections.setdefault(current, [])
+            continue
+        sections[current].append(line)
+    return sections
+
+
+def _month_index(year, month_name, month_number, end=False):
+    """Months since year 0 for a parsed date; a bare year counts from January, or to December as an end date"""
+    if month_name:
+        month = MONTHS[month_name.lower()[:3]]
+    elif month_number and 1 <= int(month_number) <= 12:
+        month = int(month_number)
+    else:
+        month = 12 if end else 1
+    return int(year) * 12 + month - 1
+
+
+def _years_from_date_ranges(lines, today=None):
+    """
+    Total years covered by the date ranges in the lines, counting overlapping periods once
+    """
+    today = today or datetime.date.today()
+    periods = []
+    for line in lines:
+        for match in DATE_RANGE_PATTERN.finditer(line):
+            start_month, start_number, start_year, end_month, end_number, end_year, ongoing = match.groups()
+            start = _month_index(start_year, start_month, start_number)
+            if ongoing:
+                end = today.year * 12 + today.month - 1
+            else:
+                end = _month_index(end_year, end_month, end_number, end=True)
+            if end >= start:
+                periods.append((start, end + 1))
+    if not periods:
+        return None
+
+    total_months = 0
+    current_start, current_end = None, None
+    for start, end in sorted(periods):
+        if current_end is None or start > current_end:
+            if current_end is not None:
+                total_months += current_end - current_start
+            current_start, current_end = start, end
+        else:
+            current_end = max(current_end, end)
+    total_months += current_end - current_start
+    return round(total_months / 12, 1)
+
+
+def _extract_titles(lines):
+    titles = []
+    for line in lines:
+        if len(line) > 100:
+            continue
+        line = LIST_MARKER_PATTERN.sub("", DATE_RANGE_PATTERN.sub("", line))
+        for part in TITLE_SEPARATOR_PATTERN.split(line):
+            part = part.strip(" .:")
+            if part and len(part.split()) <= 6 and TITLE_PATTERN.search(part):
+                if part.lower() not in {title.lower() for title in titles}:
+                    titles.append(part)
+                break
+        if len(titles) >= MAX_TITLES:
+            break
+    return titles
+
+
+def _extract_skills(lines):
+    skills = []
+    seen = set()
+    for line in lines:
+        line = LIST_MARKER_PATTERN.sub("", line)
+        # Drop labels such as "Languages: Python, Go"
+        if ":" in line:
+            line = line.split(":", 1)[1]
+        for item in SKILL_SEPARATOR_PATTERN.split(line):
+            item = item.strip(" .()")
+            if item and len(item) <= 40 and len(item.split()) <= 4 and item.lower() not in seen:
+                seen.add(item.lower())
+                skills.append(item)
+                if len(skills) >= MAX_SKILLS:
+                    return skills
+    return skills
+
+
+def _extract_education(lines):
+    education = []
+    for line in lines:
+        if DEGREE_PATTERN.search(line):
+            entry = LIST_MARKER_PATTERN.sub("", line)[:MAX_FACT_CHARS]
+            if entry not in education:
+                education.append(entry)
+            if len(education) >= MAX_EDUCATION_ENTRIES:
+                break
+    return education
+
+
+def extract_resume_facts(resume_text, today=None):
+    """
+    Extract compact structured facts from parsed resume text: the sections present, total years of
+    experience, job titles, listed skills and education. Rule-based, so the result only depends on
+    the text and RESUME_FACTS_VERSION.
+    """
+    sections = split_resume_sections(resume_text)
+    all_lines = [line for lines in sections.values() for line in lines]
+    experience_lines = sections.get('experience') or all_lines
+
+    years_of_experience = _years_from_date_ranges(experience_lines, today=today)
+    if years_of_experience is None:
+        # No dated positions: fall back to the candidate's own claim, e.g. "7+ years of experience"
+        claimed = [int(match.group(1)) for match in CLAIMED_YEARS_PATTERN.finditer(resume_text or "")]
+        years_of_experience = float(max(claimed)) if claimed else None
+
+    return {
+        'parser_version': RESUME_FACTS_VERSION,
+        'sections': [section for section in sections if section != 'header'],
+        'years_of_experience': years_of_experience,
+        'titles': _extract_titles(experience_lines),
+        'skills': _extract_skills(sections.get('skills', [])),
+        'education': _extract_education(sections.get('education') or all_lines),
+    }
+
+
+def has_current_facts(applicant):
+    """
+    Whether the applicant's stored facts were extracted by the current parser version
+    """
+    facts = applicant.resume_facts or {}
+    return facts.get('parser_version') == RESUME_FACTS_VERSION
+
+
+def ensure_resume_facts(applicants):
+    """
+    Return {applicant id: facts} for the applicants, extracting and storing facts that are missing
+    or were extracted by an older parser version
+    """
+    stale = []
+    for applicant in applicants:
+        if not has_current_facts(applicant):
+            applicant.resume_facts = extract_resume_facts(applicant.parsed_resume_text)
+            stale.append(applicant)
+    if stale:
+        Applicant.objects.bulk_update(stale, ['resume_facts'], batch_size=200)
+    return {applicant.id: applicant.resume_facts for applicant in applicants}
+
+
+def format_resume_facts(facts):
+    """
+    Prompt lines summarizing the facts; empty when nothing was extracted
+    """
+    if not facts:
+        return ""
+    lines = []
+    if facts.get('years_of_experience') is not None:
+        lines.append(f"Total years of experience: {facts['years_of_experience']:g}")
+    if facts.get('titles'):
+        lines.append(f"Job titles held: {'; '.join(facts['titles'])}")
+    if facts.get('education'):
+        lines.append(f"Education: {'; '.join(facts['education'])}")
+    if facts.get('skills'):
+        lines.append(f"Listed skills: {', '.join(facts['skills'])}")
+    if not lines:
+        return ""
+    return "Resume facts:\n" + "".join(f"    - {line}\n" for line in lines)
@@ -2,6 +2,8 @@
 let currentSortBy = 'overall_score';
 let currentSortOrder = 'desc';
 let currentScoreThreshold = 0;
+let currentMustHave = '';
+let currentMinYears = '';
 let currentJobId = null;
 let candidateData = [];
 
@@ -53,6 +55,14 @@ async function loadCandidateData() {
             'score_threshold': currentScoreThreshold
         });
         
+        if (currentMustHave) {
+            params.append('must_have', currentMustHave);
+        }
+
+        if (currentMinYears) {
+            params.append('min_years', currentMinYears);
+        }
+
         // If we have a job ID, add it to the query
         if (currentJobId) {
             params.append('job_id', currentJobId);
@@ -114,7 +124,11 @@ function renderCandidateTable() {
                 </td>
                 <td class="px-6 py-4 text-sm text-gray-500">
                     <div class="justification-container" data-full-text="${candidate.justification_summary || ''}">
-                        <span class="truncated-text">${truncatedJustification || 'N/A'}</span>
+                        <span class="truncated-text">${candidate.justification_pending ? 'Not generated yet' : (truncatedJustification || 'N/A')}</span>
+                        ${candidate.justification_pending
+                          ? `<button class="text-blue-600 hover:text-blue-900 ml-2 generate-btn"
+                             data-candidate-id="${candidate.id}">Generate</button>`
+                          : ''}
                         ${candidate.justification_summary && candidate.justification_summary.length > 150 
                           ? `<button class="text-blue-600 hover:text-blue-900 ml-2 expand-btn" 
                              data-candidate-id="${candidate.id}">Show more</button>` 
@@ -147,6 +161,37 @@ function renderCandidateTable() {
         });
     });
     
+    // Justifications scored on demand are generated by the detailed analysis endpoint
+    document.querySelectorAll('.generate-btn').forEach(button => {
+        button.addEventListener('click', function() {
+            const container = this.closest('.justification-container');
+            const truncatedText = container.querySelector('.truncated-text');
+            this.disabled = true;
+            this.textContent = 'Generating...';
+
+            fetch(`/jobs/api/applicants/${this.dataset.candidateId}/detailed-analysis/`)
+                .then(response => response.json())
+                .then(data => {
+                    if (data.error || data.justification_pending) {
+                        throw new Error(data.error || 'Justification not available');
+                    }
+                    const candidate = candidateData.find(c => c.id === parseInt(this.dataset.candidateId));
+                    if (candidate) {
+                        candidate.justification_summary = data.justification_summary;
+                        candidate.justification_pending = false;
+                    }
+                    container.dataset.fullText = data.justification_summary || '';
+                    truncatedText.textContent = data.justification_summary || 'N/A';
+                    this.remove();
+                })
+                .catch(error => {
+                    console.error('Error generating justification:', error);
+                    this.disabled = false;
+                    this.textContent = 'Retry';
+                });
+        });
+    });
+
     // Update sort indicators
     updateSortIndicators();
 }
@@ -164,6 +209,10 @@ function applyFilter() {
     }
     
     currentScoreThreshold = newThreshold;
+    const mustHaveInput = document.getElementById('must_have');
+    currentMustHave = mustHaveInput ? mustHaveInput.value.trim() : '';
+    const minYearsInput = document.getElementById('min_years');
+    currentMinYears = minYearsInput ? minYearsInput.value.trim() : '';
     loadCandidateData(); // Reload with new filter
 }
 
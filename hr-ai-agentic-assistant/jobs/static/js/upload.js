@@ -322,8 +322,8 @@ async function initiateAIScoring(jobListingId) {
 
         // Check if the response indicates the operation was accepted
         if (result.status === 'accepted') {
-            // Start monitoring the scoring progress
-            monitorScoringProgress(jobListingId);
+            // Start monitoring the progress of the queued scoring run
+            monitorScoringProgress(jobListingId, result.run_id);
         } else {
             throw new Error(`Unexpected response status: ${result.status}`);
         }
@@ -335,7 +335,7 @@ async function initiateAIScoring(jobListingId) {
 
 
 // Function to monitor scoring progress
-async function monitorScoringProgress(jobListingId) {
+async function monitorScoringProgress(jobListingId, runId) {
     const progressBar = document.getElementById('scoring-progress-bar');
     const statusMessage = document.getElementById('scoring-status-message');
     const detailsDiv = document.getElementById('scoring-details');
@@ -349,7 +349,8 @@ async function monitorScoringProgress(jobListingId) {
 
         try {
             // Call the scoring status endpoint
-            const response = await fetch(`/jobs/api/job-listings/${jobListingId}/scoring-status/`);
+            const statusUrl = `/jobs/api/job-listings/${jobListingId}/scoring-status/` + (runId ? `?run_id=${runId}` : '');
+            const response = await fetch(statusUrl);
             
             if (!response.ok) {
                 console.error('Error getting scoring status:', response.status);
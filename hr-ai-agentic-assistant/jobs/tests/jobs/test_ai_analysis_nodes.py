@@ -0,0 +1,187 @@
+"""
+Unit tests for AI analysis worker nodes
+"""
+from django.test import TestCase
+from unittest.mock import patch, MagicMock, AsyncMock
+import asyncio
+import json
+from hr_assistant.services import ai_analysis
+from hr_assistant.services.contracts import (
+    AIAnalysisResponse, SCORING_MODE_MULTI_CALL, SCORING_MODE_STRUCTURED
+)
+
+
+def make_worker_state(applicant_id=1, scoring_mode=SCORING_MODE_STRUCTURED):
+    """Build a single-applicant worker state as dispatched by the supervisor"""
+    return {
+        "applicant_id_list": [applicant_id],
+        "job_criteria": [],
+        "results": [],
+        "status": "processing",
+        "current_index": 1,  # data_retrieval_node has already run
+        "error_count": 0,
+        "total_count": 1,
+        "resume_texts": {applicant_id: "Senior Python developer with 8 years of Django"},
+        "job_requirements": "Python, Django",
+        "current_analysis_response": AIAnalysisResponse(
+            overall_score=0, quality_grade="F", categorization="Mismatched",
+            justification_summary="", applicant_id=applicant_id
+        ),
+        "scoring_mode": scoring_mode,
+    }
+
+
+class TestStructuredAnalysisNode(TestCase):
+    @patch('hr_assistant.services.ai_analysis.llm')
+    def test_single_call_returns_validated_response(self, mock_llm):
+        """Test one schema-constrained call produces the full AIAnalysisResponse"""
+        mock_llm.invoke.return_value = MagicMock(content=json.dumps({
+            "overall_score": 88,
+            "quality_grade": "A",
+            "categorization": "Senior",
+            "justification_summary": "Extensive Django experience"
+        }))
+
+        result = ai_analysis.structured_analysis_node(make_worker_state(applicant_id=7))
+
+        self.assertEqual(mock_llm.invoke.call_count, 1)
+        self.assertIn("format", mock_llm.invoke.call_args.kwargs)
+        analysis = result["results"][0]
+        self.assertEqual(analysis.applicant_id, 7)
+        self.assertEqual(analysis.overall_score, 88)
+        self.assertEqual(analysis.categorization, "Senior")
+
+    @patch('hr_assistant.services.ai_analysis.llm')
+    def test_invalid_json_falls_back_to_error_result(self, mock_llm):
+        """Test output that fails validation yields the default error result"""
+        mock_llm.invoke.return_value = MagicMock(content='{"overall_score": 250}')
+
+        result = ai_analysis.structured_analysis_node(make_worker_state(applicant_id=7))
+
+        analysis = result["results"][0]
+        self.assertEqual(analysis.overall_score, 0)
+        self.assertEqual(analysis.quality_grade, "F")
+        self.assertTrue(analysis.justification_summary.startswith("Error processing"))
+
+
+class TestScoringModeRouting(TestCase):
+    def test_structured_mode_routes_to_single_call(self):
+        self.assertEqual(
+            ai_analysis.route_by_scoring_mode(make_worker_state(scoring_mode=SCORING_MODE_STRUCTURED)),
+            "structured_analysis"
+        )
+
+    def test_multi_call_mode_fans_out_scoring_and_categorization(self):
+        self.assertEqual(
+            ai_analysis.route_by_scoring_mode(make_worker_state(scoring_mode=SCORING_MODE_MULTI_CALL)),
+            ["scoring_grading", "categorization"]
+        )
+
+
+class TestAsyncWorkerNodes(TestCase):
+    @patch('hr_assistant.services.ai_analysis.llm')
+    def test_async_scoring_node_uses_ainvoke(self, mock_llm):
+        """Test the async scoring node awaits ainvoke and parses score and grade"""
+        mock_llm.ainvoke = AsyncMock(return_value=MagicMock(content="Overall Score: 77\nQuality Grade: B"))
+
+        result = asyncio.run(ai_analysis.ascoring_grading_node(make_worker_state(scoring_mode=SCORING_MODE_MULTI_CALL)))
+
+        mock_llm.ainvoke.assert_awaited_once()
+        mock_llm.invoke.assert_not_called()
+        self.assertEqual(result["current_analysis_response"].overall_score, 77)
+        self.assertEqual(result["current_analysis_response"].quality_grade, "B")
+
+    @patch('hr_assistant.services.ai_analysis.llm')
+    def test_async_categorization_normalizes_without_reprompt(self, mock_llm):
+        """Test the async categorization node maps a synonym locally instead of asking again"""
+        mock_llm.ainvoke = AsyncMock(return_value=MagicMock(content='{"categorization": "Expert"}'))
+
+        result = asyncio.run(ai_analysis.acategorization_node(make_worker_state(scoring_mode=SCORING_MODE_MULTI_CALL)))
+
+        mock_llm.ainvoke.assert_awaited_once()
+        self.assertEqual(result["current_analysis_response"].categorization, "Senior")
+
+
+class TestSupervisorDispatch(TestCase):
+    @patch('hr_assistant.services.ai_analysis.llm')
+    def test_each_worker_receives_only_its_own_resume(self, mock_llm):
+        mock_llm.invoke.return_value = MagicMock(content=json.dumps({
+            "overall_score": 70,
+            "quality_grade": "C",
+            "categorization": "Junior",
+            "justification_summary": "Some relevant experience"
+        }))
+        resume_texts = {aid: f"Resume {aid}" for aid in range(1, 6)}
+        state = {
+            **make_worker_state(),
+            "applicant_id_list": list(resume_texts),
+            "current_index": 0,
+            "total_count": len(resume_texts),
+            "resume_texts": resume_texts,
+        }
+        dispatched = []
+
+        def record_worker_state(worker_state):
+            dispatched.append(dict(worker_state["resume_texts"]))
+            return {"current_index": worker_state.get("current_index", 0) + 1}
+
+        with patch('hr_assistant.services.ai_analysis.data_retrieval_node', side_effect=record_worker_state), \
+                self.settings(AI_SCORING_CACHE_ENABLED=False):
+            graph = ai_analysis.create_supervisor_graph(async_mode=False)
+            result = graph.invoke(state, config=ai_analysis.build_run_config(False))
+
+        self.assertEqual(sorted(dispatched, key=lambda texts: list(texts)), [{aid: text} for aid, text in resume_texts.items()])
+        self.assertEqual(len(result["results"]), 5)
+        # Workers return only their results, so the supervisor keeps the original resume texts
+        self.assertIs(result["resume_texts"], resume_texts)
+
+
+class TestParallelWorkerBranches(TestCase):
+    @patch('hr_assistant.services.ai_analysis.llm')
+    def test_scoring_and_categorization_overlap_and_join_before_justification(self, mock_llm):
+        in_flight = {"current": 0, "max": 0}
+        seen_by_justification = []
+
+        async def fake_ainvoke(prompt, **kwargs):
+            if "Provide a brief justification" in prompt:
+                seen_by_justification.append(prompt)
+                return MagicMock(content="Strong Django background")
+            in_flight["current"] += 1
+            in_flight["max"] = max(in_flight["max"], in_flight["current"])
+            await asyncio.sleep(0.01)
+            in_flight["current"] -= 1
+            if "categorize the candidate" in prompt:
+                return MagicMock(content="Senior")
+            return MagicMock(content="Overall Score: 85\nQuality Grade: A")
+
+        mock_llm.ainvoke = AsyncMock(side_effect=fake_ainvoke)
+        state = {**make_worker_state(scoring_mode=SCORING_MODE_MULTI_CALL), "current_index": 0}
+
+        with self.settings(AI_SCORING_CACHE_ENABLED=False):
+            graph = ai_analysis.create_worker_graph(async_mode=True)
+            result = asyncio.run(graph.ainvoke(state, config=ai_analysis.build_run_config(True)))
+
+        self.assertEqual(in_flight["max"], 2)
+        self.assertIn("Overall Score: 85", seen_by_justification[0])
+        self.assertIn("Categorization: Senior", seen_by_justification[0])
+        analysis = result["results"][0]
+        self.assertEqual(
+            (analysis.overall_score, analysis.quality_grade, analysis.categorization, analysis.justification_summary),
+            (85, "A", "Senior", "Strong Django background")
+        )
+
+
+class TestJustificationResult(TestCase):
+    def test_justification_does_not_change_the_response_held_by_the_state(self):
+        state = make_worker_state()
+        held = state["current_analysis_response"]
+
+        result = ai_analysis._justification_complete(state, 1, "Strong Django background")
+
+        self.assertEqual(result["results"][0].justification_summary, "Strong Django background")
+        self.assertIsNot(result["results"][0], held)
+        self.assertEqual(held.justification_summary, "")
+
+        without_applicant = ai_analysis._justification_without_applicant(state)["results"][0]
+        self.assertIsNot(without_applicant, held)
+        self.assertEqual(held.justification_summary, "")
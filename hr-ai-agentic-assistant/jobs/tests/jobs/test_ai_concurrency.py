@@ -0,0 +1,257 @@
+"""
+Unit and integration tests for bounded LLM concurrency in the scoring graph
+"""
+import asyncio
+import threading
+import time
+import json
+from django.test import TestCase, TransactionTestCase, override_settings
+from unittest.mock import patch, MagicMock
+from jobs.models import JobListing, Applicant
+from hr_assistant.services import concurrency
+from hr_assistant.services.concurrency import (
+    AdaptiveConcurrencyLimiter, LLMConcurrencyLimiter, allm_slot, get_concurrency_stats, llm_slot
+)
+from hr_assistant.services.llm_backends import FAKE_LLM_DEFAULTS, FakeChatClient
+from hr_assistant.services.resume_scoring import ResumeScoringService
+
+
+class TestLLMConcurrencyLimiter(TestCase):
+    def test_async_acquire_caps_in_flight(self):
+        """Test coroutines on one event loop never exceed the limit"""
+        limiter = LLMConcurrencyLimiter(3)
+        peak = {"current": 0, "max": 0}
+
+        async def call():
+            await limiter.acquire_async()
+            try:
+                peak["current"] += 1
+                peak["max"] = max(peak["max"], peak["current"])
+                await asyncio.sleep(0.01)
+                peak["current"] -= 1
+            finally:
+                limiter.release()
+
+        async def run_all():
+            await asyncio.gather(*(call() for _ in range(20)))
+
+        asyncio.run(run_all())
+        self.assertEqual(peak["max"], 3)
+        self.assertEqual(limiter.in_flight, 0)
+
+    def test_thread_acquire_caps_in_flight(self):
+        """Test blocking callers in threads never exceed the limit"""
+        limiter = LLMConcurrencyLimiter(2)
+        lock = threading.Lock()
+        peak = {"current": 0, "max": 0}
+
+        def call():
+            limiter.acquire()
+            try:
+                with lock:
+                    peak["current"] += 1
+                    peak["max"] = max(peak["max"], peak["current"])
+                time.sleep(0.01)
+                with lock:
+                    peak["current"] -= 1
+            finally:
+                limiter.release()
+
+        threads = [threading.Thread(target=call) for _ in range(10)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(peak["max"], 2)
+        self.assertEqual(limiter.in_flight, 0)
+
+    def test_cancelled_waiter_does_not_leak_slot(self):
+        """Test a waiter cancelled while queued gives up its place without consuming a slot"""
+        limiter = LLMConcurrencyLimiter(1)
+
+        async def scenario():
+            await limiter.acquire_async()
+            waiter = asyncio.ensure_future(limiter.acquire_async())
+            await asyncio.sleep(0)
+            waiter.cancel()
+            await asyncio.gather(waiter, return_exceptions=True)
+            limiter.release()
+
+        asyncio.run(scenario())
+        self.assertEqual(limiter.in_flight, 0)
+        self.assertEqual(limiter.queue_depth, 0)
+
+    def test_invalid_limit(self):
+        with self.assertRaises(ValueError):
+            LLMConcurrencyLimiter(0)
+
+
+class TestAdaptiveConcurrencyLimiter(TestCase):
+    def saturated(self, limit, **kwargs):
+        limiter = AdaptiveConcurrencyLimiter(limit, min_samples=1, **kwargs)
+        for _ in range(limit):
+            limiter.acquire()
+        return limiter
+
+    def test_limit_grows_while_saturated_and_fast(self):
+        limiter = self.saturated(2, max_limit=3)
+        waiter = threading.Thread(target=limiter.acquire)
+        waiter.start()
+        time.sleep(0.05)
+
+        for _ in range(2):
+            limiter.record("scoring", time.monotonic(), 0.1, overloaded=False)
+        waiter.join(1)
+
+        self.assertFalse(waiter.is_alive())
+        self.assertEqual((limiter.limit, limiter.in_flight, limiter.queue_depth), (3, 3, 0))
+        for _ in range(10):
+            limiter.record("scoring", time.monotonic(), 0.1, overloaded=False)
+        self.assertEqual(limiter.limit, 3)
+
+    def test_limit_does_not_grow_without_demand(self):
+        limiter = AdaptiveConcurrencyLimiter(4, min_samples=1)
+        limiter.acquire()
+        for _ in range(20):
+            limiter.record("scoring", time.monotonic(), 0.1, overloaded=False)
+        self.assertEqual(limiter.limit, 4)
+
+    def test_overload_lowers_the_limit_once_per_burst(self):
+        limiter = self.saturated(8)
+        started = time.monotonic()
+
+        for _ in range(8):
+            limiter.record("scoring", started, 0.1, overloaded=True)
+        self.assertEqual(limiter.limit, 6)
+
+        # A call started after the decrease can lower it again, down to the minimum
+        for _ in range(10):
+            limiter.record("scoring", time.monotonic(), 0.1, overloaded=True)
+        self.assertEqual((limiter.limit, limiter.snapshot()['decreases']), (1, 5))
+
+    def test_sustained_slowdown_against_the_node_baseline_lowers_the_limit(self):
+        limiter = self.saturated(4, max_limit=4, latency_tolerance=2.0)
+        for _ in range(5):
+            limiter.record("justification", time.monotonic(), 1.0, overloaded=False)
+            limiter.record("categorization", time.monotonic(), 0.1, overloaded=False)
+        # One long answer is not overload, nor is being slower than another node's calls
+        limiter.record("justification", time.monotonic(), 3.0, overloaded=False)
+        self.assertEqual(limiter.limit, 4)
+
+        limiter.record("categorization", time.monotonic(), 0.5, overloaded=False)
+        limiter.record("categorization", time.monotonic(), 0.5, overloaded=False)
+        self.assertEqual(limiter.limit, 3)
+        self.assertEqual(limiter.snapshot()['baseline_seconds'], {"justification": 1.0, "categorization": 0.1})
+
+    def test_slots_above_a_lowered_limit_are_not_handed_over(self):
+        limiter = self.saturated(4, decrease_factor=0.5)
+        waiter = threading.Thread(target=limiter.acquire)
+        waiter.start()
+        time.sleep(0.05)
+        limiter.record("scoring", time.monotonic(), 0.1, overloaded=True)
+
+        limiter.release()
+        limiter.release()
+        self.assertEqual((limiter.in_flight, limiter.queue_depth), (2, 1))
+        limiter.release()
+        waiter.join(1)
+        self.assertFalse(waiter.is_alive())
+        self.assertEqual((limiter.limit, limiter.in_flight), (2, 2))
+
+
+@override_settings(AI_SCORING_ADAPTIVE_CONCURRENCY=True, AI_SCORING_MAX_CONCURRENT_LLM_CALLS_PER_PROCESS=4,
+                   AI_SCORING_ADAPTIVE_MAX_LLM_CALLS=16)
+class TestAdaptiveProcessLimiter(TestCase):
+    def setUp(self):
+        patcher = patch.object(concurrency, '_process_limiter', None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_llm_calls_feed_the_process_limiter(self):
+        with llm_slot(None, "scoring_grading"):
+            pass
+        with self.assertRaises(ValueError), llm_slot(None, "scoring_grading"):
+            raise ValueError("unparseable answer")
+        self.assertEqual(get_concurrency_stats()['decreases'], 0)
+
+        with self.assertRaises(ConnectionError), llm_slot(None, "scoring_grading"):
+            raise ConnectionError("Ollama is overloaded")
+
+        stats = get_concurrency_stats()
+        self.assertEqual((stats['limit'], stats['in_flight'], stats['queue_depth'], stats['decreases']), (3, 0, 0, 1))
+        self.assertEqual(list(stats['baseline_seconds']), ['scoring_grading'])
+
+    def test_jittered_latency_without_load_does_not_lower_the_limit(self):
+        # Latencies from 40 to 160 ms regardless of load: the spread of answer lengths, not overload
+        client = FakeChatClient('llama2', {**FAKE_LLM_DEFAULTS, 'latency_ms': 100, 'latency_jitter_ms': 60, 'capacity': 0})
+
+        async def call(index):
+            async with allm_slot(None, "scoring_grading"):
+                await client.ainvoke(f"Resume {index}")
+
+        async def run_all():
+            await asyncio.gather(*(call(index) for index in range(120)))
+
+        asyncio.run(run_all())
+
+        stats = get_concurrency_stats()
+        self.assertEqual(stats['decreases'], 0)
+        self.assertGreater(stats['limit'], 4)
+
+    def test_runs_are_bounded_by_the_process_limit_only(self):
+        self.assertEqual(concurrency.create_run_limiter().limit, 16)
+
+    @override_settings(AI_SCORING_ADAPTIVE_CONCURRENCY=False)
+    def test_fixed_limiter_reports_no_adaptive_stats(self):
+        concurrency.get_process_limiter()
+        self.assertIsNone(get_concurrency_stats())
+
+
+@override_settings(AI_SCORING_ASYNC=True, AI_SCORING_MAX_CONCURRENT_LLM_CALLS_PER_RUN=2)
+class TestAsyncScoringRun(TransactionTestCase):
+    def setUp(self):
+        self.job = JobListing.objects.create(
+            title="Software Engineer",
+            detailed_description="We need a skilled Python engineer",
+            required_skills=["Python"],
+            is_active=True
+        )
+        for i in range(6):
+            Applicant.objects.create(
+                applicant_name="Jane Doe",
+                resume_file=f"resume_{i}.pdf",
+                content_hash=f"async_hash_{i}",
+                file_size=2048,
+                file_format="PDF",
+                job_listing=self.job,
+                parsed_resume_text="Python developer"
+            )
+
+    @patch('hr_assistant.services.ai_analysis.llm')
+    def test_async_run_overlaps_calls_within_run_limit(self, mock_llm):
+        """Test the async graph scores every applicant with at most the per-run number of calls in flight"""
+        peak = {"current": 0, "max": 0}
+
+        async def fake_ainvoke(prompt, **kwargs):
+            peak["current"] += 1
+            peak["max"] = max(peak["max"], peak["current"])
+            await asyncio.sleep(0.01)
+            peak["current"] -= 1
+            return MagicMock(content=json.dumps({
+                "overall_score": 64,
+                "quality_grade": "C",
+                "categorization": "Junior",
+                "justification_summary": "Some Python experience"
+            }))
+
+        mock_llm.ainvoke.side_effect = fake_ainvoke
+
+        result = ResumeScoringService.initiate_scoring_process(self.job.id, scoring_mode="structured")
+
+        self.assertEqual(result['processed_count'], 6)
+        self.assertEqual(peak["max"], 2)
+        mock_llm.invoke.assert_not_called()
+        self.assertEqual(
+            Applicant.objects.filter(job_listing=self.job, processing_status='completed', overall_score=64).count(),
+            6
+        )
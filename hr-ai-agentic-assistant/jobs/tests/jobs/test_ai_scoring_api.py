@@ -66,6 +66,21 @@ class TestScoringAPIContract(TestCase):
             self.assertIsInstance(response_data['applicant_count'], int)
             self.assertIsInstance(response_data['tracking_id'], str)
     
+    def test_score_resumes_rejects_unknown_scoring_mode(self):
+        url = reverse('score_resumes', kwargs={'job_id': self.job.id})
+        response = self.client.post(url, data=json.dumps({'scoring_mode': 'telepathy'}), content_type='application/json')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(json.loads(response.content)['error_code'], 'INVALID_SCORING_MODE')
+
+    def test_score_resumes_rejects_malformed_applicant_ids(self):
+        url = reverse('score_resumes', kwargs={'job_id': self.job.id})
+        for applicant_ids in ("1,2", [self.applicant.id, "two"], [-1]):
+            response = self.client.post(url, data=json.dumps({'applicant_ids': applicant_ids}), content_type='application/json')
+
+            self.assertEqual(response.status_code, 400, applicant_ids)
+            self.assertEqual(json.loads(response.content)['error_code'], 'INVALID_APPLICANT_IDS')
+
     def test_scoring_status_endpoint_contract(self):
         """Test the contract for the scoring-status endpoint"""
         url = reverse('scoring_status', kwargs={'job_id': self.job.id})
@@ -0,0 +1,115 @@
+"""
+Unit and integration tests for the content-addressed analysis cache
+"""
+import json
+from django.test import TestCase, TransactionTestCase, override_settings
+from unittest.mock import patch, MagicMock
+from jobs.models import JobListing, Applicant, AnalysisCacheEntry
+from hr_assistant.services import analysis_cache
+from hr_assistant.services.contracts import AIAnalysisResponse
+from hr_assistant.services.resume_scoring import ResumeScoringService
+
+
+def make_response(applicant_id=1, score=80):
+    return AIAnalysisResponse(
+        overall_score=score,
+        quality_grade="B",
+        categorization="Mid-Level",
+        justification_summary="Good match",
+        applicant_id=applicant_id
+    )
+
+
+class TestCacheKeys(TestCase):
+    def test_job_hash_ignores_whitespace_and_skill_order(self):
+        first = analysis_cache.compute_job_requirements_hash("Python  developer\n needed", ["Django", "Python"])
+        second = analysis_cache.compute_job_requirements_hash("Python developer needed", ["python", "Django "])
+        self.assertEqual(first, second)
+
+    def test_job_hash_changes_with_description(self):
+        first = analysis_cache.compute_job_requirements_hash("Python developer", [])
+        second = analysis_cache.compute_job_requirements_hash("Java developer", [])
+        self.assertNotEqual(first, second)
+
+    def test_key_depends_on_every_component(self):
+        base = analysis_cache.build_cache_key("resume", "job", "multi_call:1", "llama2")
+        self.assertNotEqual(base, analysis_cache.build_cache_key("resume2", "job", "multi_call:1", "llama2"))
+        self.assertNotEqual(base, analysis_cache.build_cache_key("resume", "job2", "multi_call:1", "llama2"))
+        self.assertNotEqual(base, analysis_cache.build_cache_key("resume", "job", "structured:1", "llama2"))
+        self.assertNotEqual(base, analysis_cache.build_cache_key("resume", "job", "multi_call:1", "mistral"))
+
+
+class TestCacheStorage(TestCase):
+    def setUp(self):
+        analysis_cache.cache_stats.reset()
+
+    def test_miss_then_hit(self):
+        self.assertIsNone(analysis_cache.lookup("key1", applicant_id=5))
+        analysis_cache.store("key1", "resume", "job", "multi_call:1", "llama2", make_response(applicant_id=1))
+
+        cached = analysis_cache.lookup("key1", applicant_id=5)
+
+        self.assertEqual(cached.overall_score, 80)
+        self.assertEqual(cached.applicant_id, 5)  # Rebound to the requesting applicant
+        self.assertEqual(AnalysisCacheEntry.objects.get(cache_key="key1").hit_count, 1)
+        stats = analysis_cache.get_cache_stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['entries']), (1, 1, 1))
+
+    @override_settings(AI_SCORING_CACHE_MAX_ENTRIES=2)
+    def test_least_recently_used_entries_are_evicted(self):
+        for key in ["a", "b"]:
+            analysis_cache.store(key, "resume", "job", "multi_call:1", "llama2", make_response())
+        analysis_cache.lookup("a", applicant_id=1)  # "b" is now the least recently used
+        analysis_cache.store("c", "resume", "job", "multi_call:1", "llama2", make_response())
+
+        self.assertEqual(
+            set(AnalysisCacheEntry.objects.values_list('cache_key', flat=True)),
+            {"a", "c"}
+        )
+        self.assertEqual(analysis_cache.get_cache_stats()['evictions'], 1)
+
+
+@override_settings(AI_SCORING_ASYNC=False)
+class TestCachedScoringRun(TransactionTestCase):
+    def setUp(self):
+        self.job = JobListing.objects.create(
+            title="Software Engineer",
+            detailed_description="We need a skilled Python engineer",
+            required_skills=["Python"],
+            is_active=True
+        )
+        for i in range(3):
+            Applicant.objects.create(
+                applicant_name="Jane Doe",
+                resume_file=f"resume_{i}.pdf",
+                content_hash=f"cache_hash_{i}",
+                file_size=2048,
+                file_format="PDF",
+                job_listing=self.job,
+                parsed_resume_text="Python developer"
+            )
+
+    @patch('hr_assistant.services.ai_analysis.llm')
+    def test_rescoring_unchanged_job_makes_no_llm_calls(self, mock_llm):
+        mock_llm.invoke.return_value = MagicMock(content=json.dumps({
+            "overall_score": 71,
+            "quality_grade": "C",
+            "categorization": "Junior",
+            "justification_summary": "Some Python experience"
+        }))
+
+        ResumeScoringService.initiate_scoring_process(self.job.id, scoring_mode="structured")
+        self.assertEqual(mock_llm.invoke.call_count, 3)
+
+        result = ResumeScoringService.initiate_scoring_process(self.job.id, scoring_mode="structured")
+        self.assertEqual(mock_llm.invoke.call_count, 3)
+        self.assertEqual(result['processed_count'], 3)
+        self.assertEqual(Applicant.objects.filter(overall_score=71, processing_status='completed').count(), 3)
+
+    @patch('hr_assistant.services.ai_analysis.llm')
+    def test_failed_analysis_is_not_cached(self, mock_llm):
+        mock_llm.invoke.side_effect = ConnectionError("Ollama is down")
+
+        ResumeScoringService.initiate_scoring_process(self.job.id, scoring_mode="structured")
+
+        self.assertEqual(AnalysisCacheEntry.objects.count(), 0)
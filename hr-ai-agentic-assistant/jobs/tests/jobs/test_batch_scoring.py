@@ -0,0 +1,121 @@
+"""
+Tests for the batched scoring mode packing several resumes into one LLM prompt
+"""
+import asyncio
+import json
+from django.test import SimpleTestCase, TransactionTestCase, override_settings
+from unittest.mock import AsyncMock, MagicMock, patch
+from jobs.models import JobListing, Applicant
+from hr_assistant.services import ai_analysis
+from hr_assistant.services.batch_scoring import pack_batches
+from hr_assistant.services.contracts import SCORING_MODE_BATCHED
+from hr_assistant.services.resume_scoring import ResumeScoringService
+
+
+def analysis(applicant_id, score):
+    return {
+        "applicant_id": applicant_id, "overall_score": score, "quality_grade": "B",
+        "categorization": "Mid-Level", "justification_summary": f"Batch scored {score}"
+    }
+
+
+def structured_reply(score):
+    return MagicMock(content=json.dumps({
+        "overall_score": score, "quality_grade": "C", "categorization": "Junior", "justification_summary": "Single call"
+    }))
+
+
+class TestPackBatches(SimpleTestCase):
+    def test_packs_in_order_within_budget_and_size(self):
+        texts = {1: "a" * 400, 2: "b" * 400, 3: "c" * 400, 4: "d" * 400, 5: "e" * 5000}
+
+        # Each short resume is estimated at 101 + 80 framing tokens
+        self.assertEqual(pack_batches([1, 2, 3, 4], texts, token_budget=400, max_size=8), [[1, 2], [3, 4]])
+        self.assertEqual(pack_batches([1, 2, 3, 4], texts, token_budget=4000, max_size=3), [[1, 2, 3], [4]])
+        # Long resumes get a batch of their own
+        self.assertEqual(
+            pack_batches([1, 5, 2], texts, token_budget=4000, max_size=8, max_resume_chars=2048), [[5], [1, 2]]
+        )
+
+
+@override_settings(AI_SCORING_ASYNC=False, AI_SCORING_CACHE_ENABLED=True)
+class TestBatchedRun(TransactionTestCase):
+    def setUp(self):
+        self.job = JobListing.objects.create(
+            title="Engineer", detailed_description="Backend engineer", required_skills=["Python"], is_active=True
+        )
+        self.ids = [
+            Applicant.objects.create(
+                applicant_name=name, resume_file=f"{name}.pdf", content_hash=f"batch_hash_{name}",
+                file_size=2048, file_format="PDF", job_listing=self.job, parsed_resume_text=f"{name} knows Python"
+            ).id
+            for name in ("Alpha", "Bravo", "Charlie")
+        ]
+
+    def _scores(self):
+        return {a.id: a.overall_score for a in Applicant.objects.filter(id__in=self.ids)}
+
+    @patch('hr_assistant.services.ai_analysis.llm')
+    def test_one_call_scores_the_batch_and_fills_the_cache(self, mock_llm):
+        mock_llm.invoke.return_value = MagicMock(content=json.dumps({
+            "analyses": [analysis(aid, 60 + i) for i, aid in enumerate(reversed(self.ids))]
+        }))
+
+        ResumeScoringService.initiate_scoring_process(self.job.id, scoring_mode=SCORING_MODE_BATCHED)
+
+        self.assertEqual(mock_llm.invoke.call_count, 1)
+        prompt = mock_llm.invoke.call_args.args[0]
+        self.assertEqual(prompt.count("Job Requirements:"), 1)
+        for aid in self.ids:
+            self.assertIn(f"Applicant ID: {aid}", prompt)
+        self.assertIn("analyses", mock_llm.invoke.call_args.kwargs["format"]["properties"])
+        self.assertEqual(self._scores(), {self.ids[2]: 60, self.ids[1]: 61, self.ids[0]: 62})
+
+        # A second run is served from the cache
+        ResumeScoringService.initiate_scoring_process(self.job.id, scoring_mode=SCORING_MODE_BATCHED)
+        self.assertEqual(mock_llm.invoke.call_count, 1)
+
+    @patch('hr_assistant.services.ai_analysis.llm')
+    def test_applicants_without_a_valid_item_fall_back_to_single_calls(self, mock_llm):
+        def reply(prompt, **kwargs):
+            if "Analyze each of the following" in prompt:
+                # One applicant missing, one with an out-of-range score
+                return MagicMock(content=json.dumps({"analyses": [analysis(self.ids[0], 80), analysis(self.ids[1], 250)]}))
+            return structured_reply(45)
+        mock_llm.invoke.side_effect = reply
+
+        ResumeScoringService.initiate_scoring_process(self.job.id, scoring_mode=SCORING_MODE_BATCHED)
+
+        self.assertEqual(mock_llm.invoke.call_count, 3)
+        self.assertEqual(self._scores(), {self.ids[0]: 80, self.ids[1]: 45, self.ids[2]: 45})
+
+    @patch('hr_assistant.services.ai_analysis.llm')
+    def test_unparseable_batch_output_falls_back_for_everyone(self, mock_llm):
+        mock_llm.invoke.side_effect = lambda prompt, **kwargs: (
+            MagicMock(content="Sure! Here are the analyses:") if "Analyze each of the following" in prompt
+            else structured_reply(50)
+        )
+
+        result = ResumeScoringService.initiate_scoring_process(self.job.id, scoring_mode=SCORING_MODE_BATCHED)
+
+        self.assertEqual(mock_llm.invoke.call_count, 4)
+        self.assertEqual(set(self._scores().values()), {50})
+        self.assertEqual(result['error_count'], 0)
+
+
+class TestAsyncBatchedNode(SimpleTestCase):
+    @patch('hr_assistant.services.ai_analysis.llm')
+    def test_duplicate_items_fall_back_concurrently(self, mock_llm):
+        async def reply(prompt, **kwargs):
+            if "Analyze each of the following" in prompt:
+                return MagicMock(content=json.dumps({"analyses": [analysis(1, 70), analysis(2, 75), analysis(2, 20)]}))
+            return structured_reply(33)
+        mock_llm.ainvoke = AsyncMock(side_effect=reply)
+        state = ai_analysis._worker_state({
+            "resume_texts": {1: "one", 2: "two"}, "scoring_mode": SCORING_MODE_BATCHED, "job_requirements": "Python"
+        }, [1, 2])
+
+        update = asyncio.run(ai_analysis.abatched_analysis_node(state))
+
+        self.assertEqual({r.applicant_id: r.overall_score for r in update["results"]}, {1: 70, 2: 33})
+        self.assertEqual((update["error_count"], update["failed_ids"]), (0, []))
@@ -0,0 +1,77 @@
+"""
+Tests for the schema-constrained categorization call and the local normalization of its answer
+"""
+from django.test import SimpleTestCase
+from unittest.mock import MagicMock, patch
+from hr_assistant.services import ai_analysis, categorization
+from hr_assistant.services.categorization import (
+    OUTCOME_EXACT, OUTCOME_NORMALIZED, OUTCOME_UNRECOGNIZED, CategorizationStats, normalize_category
+)
+from hr_assistant.services.contracts import SCORING_MODE_MULTI_CALL, VALID_CATEGORIES, get_categorization_schema
+from jobs.tests.jobs.test_ai_analysis_nodes import make_worker_state
+
+
+class TestNormalizeCategory(SimpleTestCase):
+    def test_exact_answers(self):
+        for category in VALID_CATEGORIES:
+            self.assertEqual(normalize_category(f'{{"categorization": "{category}"}}'), (category, OUTCOME_EXACT))
+            self.assertEqual(normalize_category(f"{category}\n"), (category, OUTCOME_EXACT))
+
+    def test_case_punctuation_and_synonyms_are_normalized(self):
+        cases = {
+            "senior.": "Senior",
+            "**Mid level**": "Mid-Level",
+            '"Entry-level"': "Junior",
+            "Category: Junior": "Junior",
+            '{"categorization": "expert"}': "Senior",
+            "Not a fit for this role": "Mismatched",
+        }
+        for answer, category in cases.items():
+            self.assertEqual(normalize_category(answer), (category, OUTCOME_NORMALIZED), answer)
+
+    def test_ambiguous_or_empty_answers_are_unrecognized(self):
+        for answer in ("", "Somewhere between junior and senior", '{"categorization": "Great"}', "{not json"):
+            self.assertEqual(normalize_category(answer), (None, OUTCOME_UNRECOGNIZED), answer)
+
+    def test_stats_report_the_normalization_rate(self):
+        stats = CategorizationStats()
+        for outcome in (OUTCOME_EXACT, OUTCOME_EXACT, OUTCOME_NORMALIZED, OUTCOME_UNRECOGNIZED):
+            stats.increment(outcome)
+
+        self.assertEqual(stats.snapshot(), {'exact': 2, 'normalized': 1, 'unrecognized': 1, 'normalization_rate': 0.5})
+
+
+class TestCategorizationNode(SimpleTestCase):
+    def setUp(self):
+        patcher = patch.object(categorization, 'categorization_stats', CategorizationStats())
+        self.stats = patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = patch.object(ai_analysis, 'categorization_stats', self.stats)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @patch('hr_assistant.services.ai_analysis.llm')
+    def test_call_is_constrained_to_the_category_enum(self, mock_llm):
+        mock_llm.invoke.return_value = MagicMock(content='{"categorization": "Senior"}')
+
+        result = ai_analysis.categorization_node(make_worker_state(scoring_mode=SCORING_MODE_MULTI_CALL))
+
+        mock_llm.invoke.assert_called_once()
+        self.assertEqual(mock_llm.invoke.call_args.kwargs['format'], get_categorization_schema())
+        self.assertEqual(result["current_analysis_response"].categorization, "Senior")
+        self.assertEqual(self.stats.snapshot()['exact'], 1)
+
+    @patch('hr_assistant.services.ai_analysis.llm')
+    def test_unrecognized_answer_falls_back_to_rules_without_a_second_call(self, mock_llm):
+        mock_llm.invoke.return_value = MagicMock(content="I cannot decide")
+        state = make_worker_state(scoring_mode=SCORING_MODE_MULTI_CALL)
+        state["resume_facts"] = {1: {"years_of_experience": 8, "job_titles": ["Senior Python Developer"]}}
+
+        with patch.object(ai_analysis, 'derive_categorization', return_value="Senior") as derive:
+            result = ai_analysis.categorization_node(state)
+
+        mock_llm.invoke.assert_called_once()
+        derive.assert_called_once_with(state["resume_facts"][1], None)
+        self.assertEqual(result["current_analysis_response"].categorization, "Senior")
+        self.assertNotIn("error_count", result)
+        self.assertEqual(self.stats.snapshot()['unrecognized'], 1)
@@ -0,0 +1,127 @@
+"""
+Tests for resumable scoring runs backed by graph checkpoints
+"""
+from django.test import TransactionTestCase, override_settings
+from unittest.mock import patch, MagicMock, AsyncMock
+from jobs.models import JobListing, Applicant, ScoringRun, GraphCheckpoint, GraphCheckpointWrite
+from hr_assistant.services.checkpointing import DjangoCheckpointSaver, get_thread_id, has_checkpoint
+from hr_assistant.services.resume_scoring import ResumeScoringService
+
+
+class WorkerDied(BaseException):
+    """Simulates the worker process dying in the middle of an LLM call"""
+
+
+class ResumableRunTestMixin:
+    def setUp(self):
+        self.job = JobListing.objects.create(
+            title="Software Engineer",
+            detailed_description="We need a skilled Python engineer",
+            required_skills=["Python"],
+            is_active=True
+        )
+        self.applicants = [
+            Applicant.objects.create(
+                applicant_name="Jane Doe",
+                resume_file=f"resume_{i}.pdf",
+                content_hash=f"checkpoint_hash_{i}",
+                file_size=2048,
+                file_format="PDF",
+                job_listing=self.job,
+                parsed_resume_text=f"Resume of candidate number {i}"
+            )
+            for i in range(3)
+        ]
+        self.run = ScoringRun.objects.create(
+            job_listing=self.job,
+            scoring_mode="multi_call",
+            applicant_count=3,
+            status='running'
+        )
+        self.calls = []
+        self.crash_on = None
+
+    def fake_invoke(self, prompt, **kwargs):
+        candidate = next(i for i in range(3) if f"candidate number {i}" in prompt)
+        if "Analyze the following resume" in prompt:
+            node = "scoring_grading"
+        elif "categorize the candidate" in prompt:
+            node = "categorization"
+        else:
+            node = "justification"
+
+        if self.crash_on == (node, candidate):
+            raise WorkerDied()
+        self.calls.append((node, candidate))
+        return MagicMock(content={
+            "scoring_grading": "Overall Score: 77\nQuality Grade: B",
+            "categorization": "Senior",
+            "justification": f"Strong candidate {candidate}",
+        }[node])
+
+    def crash_and_resume(self, mock_llm):
+        """Crash the run during applicant 1's justification, then resume it; returns the calls of both attempts"""
+        mock_llm.invoke.side_effect = self.fake_invoke
+        mock_llm.ainvoke = AsyncMock(side_effect=self.fake_invoke)
+        self.crash_on = ("justification", 1)
+
+        with self.assertRaises(WorkerDied):
+            ResumeScoringService.initiate_scoring_process(self.job.id, scoring_run_id=self.run.id)
+        self.assertTrue(has_checkpoint(DjangoCheckpointSaver(), get_thread_id(self.run.id)))
+        first_attempt_calls = self.calls
+
+        # Another worker reclaims the run
+        self.calls = []
+        self.crash_on = None
+        result = ResumeScoringService.initiate_scoring_process(self.job.id, scoring_run_id=self.run.id)
+
+        self.assertEqual(result['processed_count'], 3)
+        self.assertEqual(Applicant.objects.filter(overall_score=77, processing_status='completed').count(), 3)
+        self.assertEqual(Applicant.objects.get(id=self.applicants[1].id).justification_summary, "Strong candidate 1")
+        # Checkpoints of a finished run are removed
+        self.assertFalse(GraphCheckpoint.objects.exists())
+        self.assertFalse(GraphCheckpointWrite.objects.exists())
+        return first_attempt_calls, self.calls
+
+
+@override_settings(
+    AI_SCORING_ASYNC=False,
+    AI_SCORING_CACHE_ENABLED=False,
+    AI_SCORING_PERSIST_BATCH_SIZE=1,
+    AI_SCORING_MAX_CONCURRENT_LLM_CALLS_PER_RUN=1
+)
+class TestResumableScoringRun(ResumableRunTestMixin, TransactionTestCase):
+    @patch('hr_assistant.services.ai_analysis.llm')
+    def test_resumed_run_skips_finished_applicants_and_finished_nodes(self, mock_llm):
+        first_attempt_calls, resumed_calls = self.crash_and_resume(mock_llm)
+
+        # Only the node calls that hadn't completed are made again
+        all_calls = {(node, i) for node in ("scoring_grading", "categorization", "justification") for i in range(3)}
+        self.assertIn(("justification", 1), resumed_calls)
+        self.assertEqual(sorted(resumed_calls), sorted(all_calls - set(first_attempt_calls)))
+
+    @patch('hr_assistant.services.ai_analysis.llm')
+    def test_runs_outside_the_queue_are_not_checkpointed(self, mock_llm):
+        mock_llm.invoke.side_effect = self.fake_invoke
+        self.crash_on = ("justification", 1)
+
+        with self.assertRaises(WorkerDied):
+            ResumeScoringService.initiate_scoring_process(self.job.id)
+
+        self.assertFalse(GraphCheckpoint.objects.exists())
+
+
+@override_settings(
+    AI_SCORING_ASYNC=True,
+    AI_SCORING_CACHE_ENABLED=False,
+    AI_SCORING_PERSIST_BATCH_SIZE=1
+)
+class TestResumableAsyncScoringRun(ResumableRunTestMixin, TransactionTestCase):
+    @patch('hr_assistant.services.ai_analysis.llm')
+    def test_resumed_run_skips_finished_applicants_and_finished_nodes(self, mock_llm):
+        first_attempt_calls, resumed_calls = self.crash_and_resume(mock_llm)
+
+        # Sibling workers are cancelled when one fails, but the crashed applicant resumes at justification
+        self.assertIn(("justification", 1), resumed_calls)
+        self.assertNotIn(("scoring_grading", 1), resumed_calls)
+        self.assertNotIn(("categorization", 1), resumed_calls)
@@ -0,0 +1,112 @@
+"""
+Tests for per-node output token caps and streaming early termination of LLM calls
+"""
+import asyncio
+from django.test import SimpleTestCase, override_settings
+from unittest.mock import MagicMock, patch
+from langchain_ollama import ChatOllama
+from hr_assistant.services import ai_analysis
+from hr_assistant.services.contracts import SCORING_MODE_MULTI_CALL
+from hr_assistant.services.generation import complete
+from .test_ai_analysis_nodes import make_worker_state
+
+
+class StreamingClient:
+    """Client streaming a reply chunk by chunk, recording how far the consumer read"""
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.sent = 0
+        self.closed = False
+        self.kwargs = None
+
+    def stream(self, prompt, **kwargs):
+        self.kwargs = kwargs
+        try:
+            for chunk in self.chunks:
+                self.sent += 1
+                yield MagicMock(content=chunk)
+        finally:
+            self.closed = True
+
+    async def astream(self, prompt, **kwargs):
+        self.kwargs = kwargs
+        try:
+            for chunk in self.chunks:
+                self.sent += 1
+                yield MagicMock(content=chunk)
+        finally:
+            self.closed = True
+
+
+SCORING_CHUNKS = ["Overall Score: 8", "5\nQuality", " Grade: B", "\n", "The candidate"] + [" rambles on"] * 50
+
+
+@override_settings(AI_SCORING_STREAM_EARLY_STOP=True, AI_SCORING_NODE_MAX_TOKENS={'scoring_grading': 64})
+class TestStreamingEarlyStop(SimpleTestCase):
+    def test_scoring_stops_once_score_and_grade_lines_are_in(self):
+        client = StreamingClient(SCORING_CHUNKS)
+
+        with patch.object(ai_analysis, 'get_llm', return_value=client):
+            result = ai_analysis.scoring_grading_node(make_worker_state())
+
+        analysis = result["current_analysis_response"]
+        self.assertEqual((analysis.overall_score, analysis.quality_grade), (85, "B"))
+        self.assertEqual(client.sent, 4)
+        self.assertTrue(client.closed)
+        self.assertEqual(client.kwargs, {"options": {"temperature": 0.1, "num_predict": 64}})
+
+    def test_rule_derived_grade_only_waits_for_the_score(self):
+        client = StreamingClient(SCORING_CHUNKS)
+        config = ai_analysis.build_run_config(False, rule_derivation=True)
+
+        with patch.object(ai_analysis, 'get_llm', return_value=client):
+            result = ai_analysis.scoring_grading_node(make_worker_state(), config)
+
+        self.assertEqual(client.sent, 2)
+        self.assertEqual(result["current_analysis_response"].overall_score, 85)
+
+    def test_async_categorization_stops_once_the_json_answer_parses(self):
+        # Pretty-printed JSON token by token: no first line is an answer on its own
+        tokens = ["{", "\n", "  \"", "categor", "ization", "\":", " \"", "Sen", "ior", "\"", "\n", "}"]
+        client = StreamingClient(tokens + ["\n", "Because"] + [" of reasons"] * 20)
+        state = make_worker_state(scoring_mode=SCORING_MODE_MULTI_CALL)
+
+        with patch.object(ai_analysis, 'get_llm', return_value=client):
+            result = asyncio.run(ai_analysis.acategorization_node(state))
+
+        self.assertEqual(result["current_analysis_response"].categorization, "Senior")
+        self.assertEqual(client.sent, len(tokens))
+        self.assertTrue(client.closed)
+
+    def test_unfinished_json_is_read_to_the_end(self):
+        client = StreamingClient(['{"categorization"', ': "Sen'])
+
+        with patch.object(ai_analysis, 'get_llm', return_value=client):
+            ai_analysis.categorization_node(make_worker_state(scoring_mode=SCORING_MODE_MULTI_CALL))
+
+        self.assertEqual(client.sent, 2)
+
+    def test_reply_without_the_fields_is_read_to_the_end(self):
+        client = StreamingClient(["I cannot ", "score this resume."])
+
+        with patch.object(ai_analysis, 'get_llm', return_value=client):
+            result = ai_analysis.scoring_grading_node(make_worker_state())
+
+        self.assertEqual(client.sent, 2)
+        self.assertEqual(result["current_analysis_response"].overall_score, 0)
+
+
+class TestNodeTokenCaps(SimpleTestCase):
+    @override_settings(AI_SCORING_NODE_MAX_TOKENS={'categorization': 16})
+    def test_cap_reaches_the_ollama_request(self):
+        client = ChatOllama(model='llama2', temperature=0.1)
+        reply = {"model": "llama2", "created_at": "2024-01-01T00:00:00Z", "done": True, "done_reason": "stop",
+                 "message": {"role": "assistant", "content": "Senior"}}
+
+        with patch.object(client, '_client') as ollama_client:
+            ollama_client.chat.return_value = iter([reply])
+            self.assertEqual(complete(client, "Categorize", "categorization"), "Senior")
+
+        options = ollama_client.chat.call_args.kwargs["options"]
+        self.assertEqual((options["num_predict"], options["temperature"]), (16, 0.1))
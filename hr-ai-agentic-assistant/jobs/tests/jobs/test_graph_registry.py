@@ -0,0 +1,115 @@
+"""
+Tests for the process-wide registry of compiled supervisor graphs
+"""
+import json
+import threading
+from io import StringIO
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from unittest.mock import patch, MagicMock
+from jobs.models import JobListing, Applicant
+from hr_assistant.services import ai_analysis, contracts, graph_registry
+from hr_assistant.services.contracts import SCORING_MODE_STRUCTURED
+from hr_assistant.services.resume_scoring import ResumeScoringService
+
+
+class GraphRegistryTestMixin:
+    def setUp(self):
+        graph_registry.clear_graph_registry()
+        self.addCleanup(graph_registry.clear_graph_registry)
+        compile_patcher = patch.object(
+            graph_registry.ai_analysis, 'create_supervisor_graph', wraps=ai_analysis.create_supervisor_graph
+        )
+        self.mock_compile = compile_patcher.start()
+        self.addCleanup(compile_patcher.stop)
+
+
+class TestGraphRegistry(GraphRegistryTestMixin, TestCase):
+    def test_graph_is_compiled_once_per_structure(self):
+        first = graph_registry.get_supervisor_graph(async_mode=False)
+        second = graph_registry.get_supervisor_graph(async_mode=False)
+
+        self.assertIs(first, second)
+        self.assertEqual(self.mock_compile.call_count, 1)
+
+    def test_structures_get_their_own_graph(self):
+        sync = graph_registry.get_supervisor_graph(async_mode=False)
+        async_graph = graph_registry.get_supervisor_graph(async_mode=True)
+        checkpointed = graph_registry.get_supervisor_graph(async_mode=False, checkpointed=True)
+
+        self.assertEqual(len({id(sync), id(async_graph), id(checkpointed)}), 3)
+        self.assertIsNone(sync.checkpointer)
+        self.assertIsNotNone(checkpointed.checkpointer)
+
+    def test_model_and_prompt_changes_share_the_graph(self):
+        graph = graph_registry.get_supervisor_graph(async_mode=False)
+        with override_settings(AI_SCORING_MODEL='other-model'), \
+                patch.dict(contracts.PROMPT_TEMPLATE_VERSIONS, {SCORING_MODE_STRUCTURED: '99'}):
+            self.assertIs(graph_registry.get_supervisor_graph(async_mode=False), graph)
+
+        self.assertEqual(self.mock_compile.call_count, 1)
+
+    def test_concurrent_first_use_compiles_once(self):
+        barrier = threading.Barrier(8)
+        graphs = []
+
+        def get_graph():
+            barrier.wait()
+            graphs.append(graph_registry.get_supervisor_graph(async_mode=True))
+
+        threads = [threading.Thread(target=get_graph) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(self.mock_compile.call_count, 1)
+        self.assertEqual(len({id(graph) for graph in graphs}), 1)
+
+    def test_warm_up_compiles_the_configured_graph(self):
+        graph_count = graph_registry.warm_up(async_mode=False, checkpointed=False)
+
+        self.assertEqual(graph_count, 1)
+        graph_registry.get_supervisor_graph(async_mode=False)
+        self.assertEqual(self.mock_compile.call_count, 1)
+
+    def test_score_worker_warms_up_at_startup(self):
+        call_command('score_worker', '--once', stdout=StringIO())
+
+        self.assertEqual(self.mock_compile.call_count, 1)
+
+
+@override_settings(AI_SCORING_ASYNC=False, AI_SCORING_CACHE_ENABLED=False)
+class TestScoringRunsShareCompiledGraph(GraphRegistryTestMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.job = JobListing.objects.create(
+            title="Software Engineer",
+            detailed_description="We need a skilled Python engineer",
+            required_skills=["Python"],
+            is_active=True
+        )
+        Applicant.objects.create(
+            applicant_name="Jane Doe",
+            resume_file="resume.pdf",
+            content_hash="registry_hash",
+            file_size=2048,
+            file_format="PDF",
+            job_listing=self.job,
+            parsed_resume_text="Python developer"
+        )
+
+    @patch('hr_assistant.services.ai_analysis.llm')
+    def test_consecutive_runs_reuse_the_graph(self, mock_llm):
+        mock_llm.invoke.return_value = MagicMock(content=json.dumps({
+            "overall_score": 77,
+            "quality_grade": "B",
+            "categorization": "Mid-Level",
+            "justification_summary": "Solid Python background"
+        }))
+
+        for _ in range(2):
+            result = ResumeScoringService.initiate_scoring_process(self.job.id, scoring_mode="structured")
+            self.assertEqual(result['processed_count'], 1)
+
+        self.assertEqual(self.mock_compile.call_count, 1)
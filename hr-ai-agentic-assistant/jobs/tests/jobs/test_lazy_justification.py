@@ -0,0 +1,107 @@
+"""
+Tests for on-demand justification generation
+"""
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from unittest.mock import MagicMock, patch
+from jobs.models import JobListing, Applicant
+from hr_assistant.services import ai_analysis
+from hr_assistant.services.contracts import get_structured_analysis_schema
+from hr_assistant.services.lazy_justification import (
+    JUSTIFICATION_PENDING_KEY, is_justification_pending, pregenerate_justifications
+)
+from hr_assistant.services.resume_scoring import ResumeScoringService
+from .test_ai_analysis_nodes import make_worker_state
+
+
+def multi_call_reply(prompt, **kwargs):
+    if "Provide a brief justification" in prompt:
+        return MagicMock(content="Strong Django background")
+    if "categorize the candidate" in prompt:
+        return MagicMock(content="Senior")
+    return MagicMock(content="Overall Score: 85\nQuality Grade: A")
+
+
+class TestLazyStructuredPrompt(SimpleTestCase):
+    def test_lazy_schema_and_prompt_omit_justification(self):
+        state = make_worker_state(applicant_id=1)
+
+        _, eager_prompt = ai_analysis._prepare_structured_analysis(state)
+        _, lazy_prompt = ai_analysis._prepare_structured_analysis(state, lazy_justification=True)
+
+        self.assertIn("justification_summary", eager_prompt)
+        self.assertNotIn("justification_summary", lazy_prompt)
+        self.assertNotIn("justification_summary", get_structured_analysis_schema(False)["properties"])
+        self.assertIn("justification_summary", get_structured_analysis_schema()["properties"])
+
+
+@override_settings(AI_SCORING_ASYNC=False, AI_SCORING_LAZY_JUSTIFICATION=True, AI_SCORING_CACHE_ENABLED=False)
+class TestLazyJustificationRun(TransactionTestCase):
+    def setUp(self):
+        self.job = JobListing.objects.create(
+            title="Engineer", detailed_description="Backend engineer", required_skills=["Django"], is_active=True
+        )
+        self.applicant = Applicant.objects.create(
+            applicant_name="Jane", resume_file="jane.pdf", content_hash="lazy_hash_1",
+            file_size=2048, file_format="PDF", job_listing=self.job, parsed_resume_text="Django developer"
+        )
+
+    @patch('hr_assistant.services.ai_analysis.llm')
+    def test_run_defers_justification_until_viewed(self, mock_llm):
+        mock_llm.invoke.side_effect = multi_call_reply
+
+        ResumeScoringService.initiate_scoring_process(self.job.id, scoring_mode="multi_call")
+
+        prompts = [c.args[0] for c in mock_llm.invoke.call_args_list]
+        self.assertFalse(any("Provide a brief justification" in p for p in prompts))
+        applicant = Applicant.objects.get(id=self.applicant.id)
+        self.assertEqual((applicant.overall_score, applicant.categorization), (85, "Senior"))
+        self.assertEqual(applicant.justification_summary, "")
+        self.assertTrue(is_justification_pending(applicant))
+
+        # First view generates and stores it, later views read it back
+        first = ResumeScoringService.get_detailed_analysis(self.applicant.id)
+        second = ResumeScoringService.get_detailed_analysis(self.applicant.id)
+
+        self.assertEqual(first['justification_summary'], "Strong Django background")
+        self.assertEqual(second['justification_summary'], "Strong Django background")
+        self.assertFalse(second['justification_pending'])
+        justification_prompts = [c.args[0] for c in mock_llm.invoke.call_args_list if "Provide a brief justification" in c.args[0]]
+        self.assertEqual(len(justification_prompts), 1)
+        self.assertIn("Overall Score: 85", justification_prompts[0])
+        self.assertIn("Categorization: Senior", justification_prompts[0])
+        self.assertIsNone(Applicant.objects.get(id=self.applicant.id).ai_analysis_result)
+
+    @override_settings(AI_SCORING_JUSTIFICATION_PREGENERATE_TOP_N=1)
+    @patch('hr_assistant.services.ai_analysis.llm')
+    def test_top_applicants_are_pregenerated_after_the_run(self, mock_llm):
+        mock_llm.invoke.side_effect = multi_call_reply
+
+        ResumeScoringService.initiate_scoring_process(self.job.id, scoring_mode="multi_call")
+
+        applicant = Applicant.objects.get(id=self.applicant.id)
+        self.assertEqual(applicant.justification_summary, "Strong Django background")
+        self.assertFalse(is_justification_pending(applicant))
+
+
+class TestPregenerateJustifications(TestCase):
+    def setUp(self):
+        job = JobListing.objects.create(
+            title="Engineer", detailed_description="Backend engineer", required_skills=[], is_active=True
+        )
+        self.applicants = [
+            Applicant.objects.create(
+                applicant_name=f"Applicant {score}", resume_file=f"{score}.pdf", content_hash=f"pregen_hash_{score}",
+                file_size=2048, file_format="PDF", job_listing=job, parsed_resume_text="resume",
+                overall_score=score, quality_grade="B", categorization="Mid-Level",
+                ai_analysis_result={JUSTIFICATION_PENDING_KEY: True}
+            )
+            for score in (40, 90, 70)
+        ]
+
+    @patch('hr_assistant.services.scoring_stack.generate_justification', return_value="Generated")
+    def test_only_the_best_scored_pending_applicants(self, mock_generate):
+        generated = pregenerate_justifications([a.id for a in self.applicants], top_n=2)
+
+        self.assertEqual(generated, 2)
+        summaries = {a.overall_score: a.justification_summary for a in Applicant.objects.all()}
+        self.assertEqual(summaries, {90: "Generated", 70: "Generated", 40: None})
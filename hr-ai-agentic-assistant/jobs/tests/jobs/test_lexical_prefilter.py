@@ -0,0 +1,151 @@
+"""
+Tests for the lexical pre-filter that triages applicants before LLM scoring
+"""
+import json
+from django.conf import settings
+from django.test import SimpleTestCase, TestCase, override_settings
+from unittest.mock import patch, MagicMock
+from jobs.models import JobListing, Applicant
+from hr_assistant.services.lexical_prefilter import (
+    BM25Index, build_job_query, is_prefilter_enabled, prefilter_applicants, tokenize
+)
+from hr_assistant.services.resume_scoring import ResumeScoringService
+
+JOB_DESCRIPTION = "Backend engineer building Django REST APIs in Python with PostgreSQL"
+
+RESUMES = {
+    1: "Senior Python developer. Built Django REST APIs backed by PostgreSQL for eight years.",
+    2: "Python scripting for data analysis, some Django tutorials.",
+    3: "Pastry chef with ten years of experience in French bakeries.",
+    4: "Retail store manager, customer service and inventory.",
+}
+
+
+class TestPrefilterSetting(SimpleTestCase):
+    def test_prefilter_is_off_unless_enabled(self):
+        with self.settings():
+            del settings.AI_SCORING_PREFILTER_ENABLED
+            self.assertFalse(is_prefilter_enabled())
+
+
+class TestBM25Ranking(SimpleTestCase):
+    def test_tokenize_keeps_technology_names(self):
+        self.assertEqual(tokenize("C++, C# and Node.js for the .NET team."), ["c++", "c#", "node.js", "net", "team"])
+
+    def test_relevant_resumes_rank_first(self):
+        scores = BM25Index(RESUMES).score(build_job_query(JOB_DESCRIPTION, ["Python", "Django"]))
+
+        self.assertGreater(scores[1], scores[2])
+        self.assertGreater(scores[2], scores[3])
+        self.assertEqual((scores[3], scores[4]), (0.0, 0.0))
+
+    def test_top_k_keeps_best_matches_in_input_order(self):
+        result = prefilter_applicants(RESUMES, JOB_DESCRIPTION, ["Python"], top_k=2)
+
+        self.assertEqual(result.selected_ids, [1, 2])
+        self.assertEqual(sorted(result.screened_out), [3, 4])
+
+    @override_settings(AI_SCORING_PREFILTER_TOP_K=None)
+    def test_relevance_cutoff(self):
+        result = prefilter_applicants(RESUMES, JOB_DESCRIPTION, ["Python"], min_relevance=0.9)
+
+        self.assertEqual(result.selected_ids, [1])
+        relevance, rank = result.screened_out[2]
+        self.assertLess(relevance, 0.9)
+        self.assertEqual(rank, 2)
+
+    def test_small_runs_are_not_filtered(self):
+        result = prefilter_applicants(RESUMES, JOB_DESCRIPTION, top_k=10)
+
+        self.assertEqual((result.selected_ids, result.screened_out), ([1, 2, 3, 4], {}))
+
+
+@override_settings(AI_SCORING_ASYNC=False, AI_SCORING_CACHE_ENABLED=False, AI_SCORING_PREFILTER_ENABLED=True,
+                   AI_SCORING_PREFILTER_TOP_K=2)
+class TestPrefilterInScoringRun(TestCase):
+    def setUp(self):
+        self.job = JobListing.objects.create(
+            title="Backend Engineer",
+            detailed_description=JOB_DESCRIPTION,
+            required_skills=["Python", "Django"],
+            is_active=True
+        )
+        self.applicants = {
+            key: Applicant.objects.create(
+                applicant_name=f"Applicant {key}",
+                resume_file=f"resume_{key}.pdf",
+                content_hash=f"prefilter_hash_{key}",
+                file_size=2048,
+                file_format="PDF",
+                job_listing=self.job,
+                parsed_resume_text=text
+            )
+            for key, text in RESUMES.items()
+        }
+
+    @patch('hr_assistant.services.ai_analysis.llm')
+    def test_only_top_applicants_reach_the_llm(self, mock_llm):
+        prompts = []
+
+        def invoke(prompt, **kwargs):
+            prompts.append(prompt)
+            return MagicMock(content=json.dumps({
+                "overall_score": 80,
+                "quality_grade": "B",
+                "categorization": "Senior",
+                "justification_summary": "Strong backend background"
+            }))
+
+        mock_llm.invoke.side_effect = invoke
+
+        result = ResumeScoringService.initiate_scoring_process(self.job.id, scoring_mode="structured")
+
+        self.assertEqual(len(prompts), 2)
+        self.assertEqual(result['prefilter'], {'llm_count': 2, 'screened_out_count': 2})
+        self.assertEqual(result['processed_count'], 4)
+
+        chef = Applicant.objects.get(id=self.applicants[3].id)
+        self.assertEqual((chef.processing_status, chef.categorization, chef.overall_score), ('completed', 'Mismatched', 0))
+        self.assertTrue(chef.ai_analysis_result['provisional'])
+        self.assertTrue(ResumeScoringService.get_detailed_analysis(chef.id)['provisional'])
+
+        senior = Applicant.objects.get(id=self.applicants[1].id)
+        self.assertEqual(senior.overall_score, 80)
+        self.assertFalse(ResumeScoringService.get_detailed_analysis(senior.id)['provisional'])
+
+    @patch('hr_assistant.services.ai_analysis.llm')
+    def test_screened_out_applicant_scored_individually_reaches_the_llm(self, mock_llm):
+        mock_llm.invoke.return_value = MagicMock(content=json.dumps({
+            "overall_score": 12,
+            "quality_grade": "F",
+            "categorization": "Mismatched",
+            "justification_summary": "No engineering background"
+        }))
+        Applicant.objects.filter(id=self.applicants[3].id).update(ai_analysis_result={'provisional': True})
+
+        ResumeScoringService.initiate_scoring_process(self.job.id, [self.applicants[3].id], scoring_mode="structured")
+
+        chef = Applicant.objects.get(id=self.applicants[3].id)
+        self.assertEqual(chef.overall_score, 12)
+        self.assertIsNone(chef.ai_analysis_result)
+
+    @patch('hr_assistant.services.ai_analysis.llm')
+    def test_screened_out_applicant_keeps_its_earlier_llm_analysis(self, mock_llm):
+        mock_llm.invoke.return_value = MagicMock(content=json.dumps({
+            "overall_score": 80,
+            "quality_grade": "B",
+            "categorization": "Senior",
+            "justification_summary": "Strong backend background"
+        }))
+        Applicant.objects.filter(id=self.applicants[3].id).update(
+            overall_score=35, quality_grade='D', categorization='Junior', justification_summary="Earlier analysis",
+            analysis_status='analyzed', processing_status='completed'
+        )
+
+        result = ResumeScoringService.initiate_scoring_process(self.job.id, scoring_mode="structured")
+
+        self.assertEqual(result['prefilter'], {'llm_count': 2, 'screened_out_count': 2})
+        chef = Applicant.objects.get(id=self.applicants[3].id)
+        self.assertEqual((chef.overall_score, chef.categorization, chef.processing_status), (35, 'Junior', 'completed'))
+        self.assertFalse(ResumeScoringService.get_detailed_analysis(chef.id)['provisional'])
+        self.assertEqual(Applicant.objects.get(id=self.applicants[4].id).overall_score, 0)
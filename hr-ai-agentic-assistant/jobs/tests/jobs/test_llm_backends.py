@@ -0,0 +1,112 @@
+"""
+Tests for the pluggable LLM backends and the deterministic fake backend
+"""
+import json
+from django.test import SimpleTestCase, TransactionTestCase, override_settings
+from unittest.mock import patch
+from jobs.models import JobListing, Applicant
+from hr_assistant.services import ai_analysis
+from hr_assistant.services.contracts import (
+    AIAnalysisResponse, VALID_CATEGORIES, get_batch_analysis_schema, get_structured_analysis_schema
+)
+from hr_assistant.services.llm_backends import (
+    FAKE_LLM_DEFAULTS, FakeBackend, FakeChatClient, LLMBackend, OllamaBackend, get_backend
+)
+from hr_assistant.services.resume_scoring import ResumeScoringService
+from .test_ai_analysis_nodes import make_worker_state
+
+NO_LATENCY = {**FAKE_LLM_DEFAULTS, 'latency_ms': 0}
+
+
+class IncompleteBackend(LLMBackend):
+    name = 'incomplete'
+
+
+class TestBackendSelection(SimpleTestCase):
+    def test_registered_names_and_dotted_paths(self):
+        self.assertIsInstance(get_backend(), OllamaBackend)
+        with self.settings(AI_SCORING_LLM_BACKEND='fake'):
+            self.assertIsInstance(get_backend(), FakeBackend)
+        with self.settings(AI_SCORING_LLM_BACKEND='hr_assistant.services.llm_backends.FakeBackend'):
+            self.assertIsInstance(get_backend(), FakeBackend)
+
+    @override_settings(AI_SCORING_LLM_BACKEND='jobs.tests.jobs.test_llm_backends.IncompleteBackend')
+    def test_backend_without_create_client_fails_when_selected(self):
+        with self.assertRaises(TypeError):
+            get_backend()
+
+    @override_settings(AI_SCORING_LLM_BACKEND='fake', AI_SCORING_FAKE_LLM={'seed': 7})
+    def test_get_llm_creates_clients_with_the_backend(self):
+        with patch.object(ai_analysis, 'llm', None), patch.dict(ai_analysis._llm_clients, clear=True):
+            client = ai_analysis.get_llm('tinyllama')
+
+        self.assertIsInstance(client, FakeChatClient)
+        self.assertEqual((client.model, client.config['seed'], client.config['latency_ms']), ('tinyllama', 7, 50))
+
+
+class TestFakeChatClient(SimpleTestCase):
+    def setUp(self):
+        self.client = FakeChatClient('llama2', NO_LATENCY)
+
+    def test_replies_are_deterministic_per_prompt_and_seed(self):
+        prompt = ai_analysis._prepare_scoring_grading(make_worker_state())[1]
+
+        first = self.client.invoke(prompt).content
+        self.assertEqual(self.client.invoke(prompt).content, first)
+        self.assertRegex(first, r"^Overall Score: \d+\nQuality Grade: [ABCDF]\n$")
+        other_seed = FakeChatClient('llama2', {**NO_LATENCY, 'seed': 1})
+        self.assertNotEqual({other_seed.reply(f"{prompt}{i}") for i in range(5)}, {first})
+
+    def test_structured_and_batched_replies_follow_the_schema(self):
+        structured = json.loads(self.client.invoke("Analyze", format=get_structured_analysis_schema()).content)
+        AIAnalysisResponse.model_validate({**structured, 'applicant_id': 1})
+
+        lazy = json.loads(self.client.invoke("Analyze", format=get_structured_analysis_schema(False)).content)
+        self.assertNotIn('justification_summary', lazy)
+
+        batch = json.loads(self.client.invoke(
+            "Applicant ID: 4\nResume: a\nApplicant ID: 9\nResume: b", format=get_batch_analysis_schema()
+        ).content)
+        self.assertEqual([item['applicant_id'] for item in batch['analyses']], [4, 9])
+
+    def test_streaming_respects_the_token_cap(self):
+        client = FakeChatClient('llama2', {**NO_LATENCY, 'trailing_words': 30})
+        prompt = "Categorize as one of: Senior, Mid-Level, Junior, or Mismatched\nRespond with only the category name."
+
+        full = "".join(chunk.content for chunk in client.stream(prompt))
+        capped = "".join(chunk.content for chunk in client.stream(prompt, options={'num_predict': 1}))
+
+        self.assertIn(capped.strip(), VALID_CATEGORIES)
+        self.assertTrue(full.startswith(capped))
+        self.assertEqual(full.count("Explanation"), 30)
+
+    def test_error_rate_fails_calls(self):
+        client = FakeChatClient('llama2', {**NO_LATENCY, 'error_rate': 1.0})
+
+        with self.assertRaises(ConnectionError):
+            client.invoke("Anything")
+
+
+@override_settings(
+    AI_SCORING_ASYNC=False, AI_SCORING_CACHE_ENABLED=False, AI_SCORING_LLM_BACKEND='fake',
+    AI_SCORING_FAKE_LLM={'latency_ms': 0}
+)
+class TestRunOnFakeBackend(TransactionTestCase):
+    def test_full_multi_call_run_without_a_model_server(self):
+        job = JobListing.objects.create(
+            title="Engineer", detailed_description="Backend engineer", required_skills=["Python"], is_active=True
+        )
+        for index in range(3):
+            Applicant.objects.create(
+                applicant_name=f"Applicant {index}", resume_file=f"{index}.pdf", content_hash=f"fake_hash_{index}",
+                file_size=2048, file_format="PDF", job_listing=job, parsed_resume_text=f"Python developer {index}"
+            )
+
+        with patch.object(ai_analysis, 'llm', None), patch.dict(ai_analysis._llm_clients, clear=True):
+            result = ResumeScoringService.initiate_scoring_process(job.id, scoring_mode="multi_call")
+
+        self.assertEqual((result['processed_count'], result['error_count']), (3, 0))
+        for applicant in Applicant.objects.filter(job_listing=job):
+            self.assertEqual(applicant.processing_status, 'completed')
+            self.assertIn(applicant.categorization, VALID_CATEGORIES)
+            self.assertTrue(applicant.justification_summary.startswith("Simulated justification"))
@@ -0,0 +1,218 @@
+"""
+Tests for the load-balanced LLM endpoint pool, against local stand-in Ollama servers
+"""
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from django.test import SimpleTestCase, TransactionTestCase, override_settings
+from unittest.mock import patch
+from jobs.models import JobListing, Applicant
+from hr_assistant.services import ai_analysis, concurrency
+from hr_assistant.services.concurrency import LLMConcurrencyLimiter
+from hr_assistant.services.llm_backends import FAKE_LLM_DEFAULTS, FakeChatClient, get_backend
+from hr_assistant.services.llm_pool import EndpointPool
+from hr_assistant.services.resume_scoring import ResumeScoringService
+
+
+class StandInOllama:
+    """
+    Minimal Ollama server answering /api/chat, with a fixed reply or the fake backend's reply to the prompt
+    """
+
+    def __init__(self, reply: str = None, delay: float = 0.0, status: int = 200):
+        self.reply, self.delay, self.status = reply, delay, status
+        self.requests = 0
+        self.fake = FakeChatClient('stand-in', {**FAKE_LLM_DEFAULTS, 'latency_ms': 0})
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+                stand_in.requests += 1
+                time.sleep(stand_in.delay)
+                if stand_in.status != 200:
+                    self._send(stand_in.status, json.dumps({"error": "model runner has crashed"}))
+                    return
+                content = stand_in.reply
+                if content is None:
+                    content = stand_in.fake.reply(body['messages'][-1]['content'], body.get('format'))
+                message = {"model": body['model'], "created_at": "2026-01-01T00:00:00Z",
+                           "message": {"role": "assistant", "content": content}, "done": True, "done_reason": "stop"}
+                self._send(200, json.dumps(message) + "\n", 'application/x-ndjson')
+
+            def _send(self, status, text, content_type='application/json'):
+                try:
+                    self.send_response(status)
+                    self.send_header('Content-Type', content_type)
+                    self.send_header('Content-Length', str(len(text.encode())))
+                    self.end_headers()
+                    self.wfile.write(text.encode())
+                except (BrokenPipeError, ConnectionResetError):
+                    pass  # The client hung up on a hedged call it no longer needs
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class StandInTestMixin:
+    def start_servers(self, *servers):
+        for server in servers:
+            self.addCleanup(server.stop)
+        return servers
+
+    def pooled_client(self, *servers, **setting_overrides):
+        overrides = {'AI_SCORING_LLM_BACKEND': 'pool', 'AI_SCORING_OLLAMA_ENDPOINTS': [s.url for s in servers]}
+        overrides.update(setting_overrides)
+        settings_override = override_settings(**overrides)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        return get_backend().create_client('llama2')
+
+
+class TestEndpointRouting(SimpleTestCase):
+    def test_least_outstanding_endpoint_is_chosen(self):
+        pool = EndpointPool(['a', 'b', 'c'])
+
+        first, second, third = pool.acquire(), pool.acquire(), pool.acquire()
+        self.assertEqual([e.url for e in (first, second, third)], ['a', 'b', 'c'])
+        pool.release(second)
+        self.assertEqual(pool.acquire().url, 'b')
+        pool.release(first)
+        pool.release(third)
+        # Equally loaded endpoints take turns
+        self.assertEqual([pool.acquire().url, pool.acquire().url], ['a', 'c'])
+        self.assertEqual(pool.acquire(exclude={'b'}).url, 'a')
+
+
+class TestEndpointHealth(StandInTestMixin, SimpleTestCase):
+    def test_failing_endpoint_is_ejected_then_tried_again(self):
+        good, bad = self.start_servers(StandInOllama(reply="ok"), StandInOllama(status=500))
+        client = self.pooled_client(good, bad, AI_SCORING_POOL_EJECT_AFTER_FAILURES=2)
+
+        failures = 0
+        for _ in range(8):
+            try:
+                self.assertEqual(client.invoke("Hello").content, "ok")
+            except Exception:
+                failures += 1
+
+        self.assertEqual((failures, bad.requests, good.requests), (2, 2, 6))
+        stats = client.pool.snapshot()['endpoints']
+        self.assertEqual((stats[1]['healthy'], stats[1]['ejections'], stats[0]['outstanding']), (False, 1, 0))
+
+        # Once the ejection expires the endpoint gets a trial call, and is ejected again when it fails
+        client.pool.endpoints[1].ejected_until = time.monotonic() - 1
+        with self.assertRaises(Exception):
+            client.invoke("Hello")
+        self.assertEqual((bad.requests, client.pool.snapshot()['endpoints'][1]['ejections']), (3, 2))
+
+    def test_rejected_requests_do_not_eject_the_endpoint(self):
+        rejecting, other = self.start_servers(StandInOllama(status=400), StandInOllama(reply="ok"))
+        client = self.pooled_client(rejecting, other, AI_SCORING_POOL_EJECT_AFTER_FAILURES=1)
+
+        for _ in range(4):
+            try:
+                client.invoke("Hello")
+            except Exception:
+                pass
+
+        self.assertEqual((rejecting.requests, other.requests), (2, 2))
+        stats = client.pool.snapshot()['endpoints'][0]
+        self.assertEqual((stats['healthy'], stats['failures'], stats['ejections']), (True, 0, 0))
+
+
+class TestHedging(StandInTestMixin, SimpleTestCase):
+    def setUp(self):
+        self.limiter = LLMConcurrencyLimiter(2, name="process")
+        patcher = patch.object(concurrency, '_process_limiter', self.limiter)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def hedged_client(self, delay=2.0):
+        slow, fast = self.start_servers(StandInOllama(reply="slow", delay=delay), StandInOllama(reply="fast"))
+        client = self.pooled_client(slow, fast, AI_SCORING_POOL_HEDGE=True, AI_SCORING_POOL_HEDGE_MIN_SAMPLES=5)
+        for _ in range(5):
+            client.latencies.record(0.05)
+        return client, slow, fast
+
+    def test_slow_call_is_hedged_and_the_first_answer_wins(self):
+        client, slow, fast = self.hedged_client()
+
+        started = time.monotonic()
+        self.assertEqual(client.invoke("Hello").content, "fast")
+
+        self.assertLess(time.monotonic() - started, 1.5)
+        self.assertEqual((slow.requests, fast.requests), (1, 1))
+        self.assertEqual({k: v for k, v in client.pool.snapshot().items() if k != 'endpoints'}, {'hedged': 1, 'hedge_wins': 1})
+
+    def test_losing_call_keeps_the_hedge_slot_until_it_finishes(self):
+        client, slow, fast = self.hedged_client(delay=0.5)
+
+        with concurrency.llm_slot():
+            self.assertEqual(client.invoke("Hello").content, "fast")
+            # The caller's slot and the hedge's slot, held by the slow call still running
+            self.assertEqual(self.limiter.in_flight, 2)
+        self.assertEqual(self.limiter.in_flight, 1)
+
+        deadline = time.monotonic() + 3
+        while self.limiter.in_flight and time.monotonic() < deadline:
+            time.sleep(0.02)
+        self.assertEqual((self.limiter.in_flight, slow.requests), (0, 1))
+
+    def test_no_hedging_without_a_free_slot(self):
+        client, slow, fast = self.hedged_client(delay=0.5)
+
+        with concurrency.llm_slot(), concurrency.llm_slot():
+            self.assertEqual(client.invoke("Hello").content, "slow")
+
+        self.assertEqual((client.pool.hedged, fast.requests, self.limiter.in_flight), (0, 0, 0))
+
+    def test_async_hedge_cancels_the_losing_call(self):
+        client, slow, fast = self.hedged_client()
+
+        self.assertEqual(asyncio.run(client.ainvoke("Hello")).content, "fast")
+
+        self.assertEqual([e['outstanding'] for e in client.pool.snapshot()['endpoints']], [0, 0])
+        self.assertEqual(client.pool.snapshot()['endpoints'][0]['failures'], 0)
+        self.assertEqual(self.limiter.in_flight, 0)
+
+    def test_no_hedging_without_enough_latency_samples(self):
+        fast, other = self.start_servers(StandInOllama(reply="fast"), StandInOllama(reply="other"))
+        client = self.pooled_client(fast, other, AI_SCORING_POOL_HEDGE=True)
+
+        self.assertEqual(client.invoke("Hello").content, "fast")
+        self.assertEqual((client.pool.hedged, other.requests), (0, 0))
+
+
+@override_settings(AI_SCORING_ASYNC=False, AI_SCORING_CACHE_ENABLED=False)
+class TestRunOnEndpointPool(StandInTestMixin, TransactionTestCase):
+    def test_structured_run_is_spread_over_the_endpoints(self):
+        servers = self.start_servers(StandInOllama(delay=0.05), StandInOllama(delay=0.05))
+        self.pooled_client(*servers)
+        job = JobListing.objects.create(
+            title="Engineer", detailed_description="Backend engineer", required_skills=["Python"], is_active=True
+        )
+        for index in range(4):
+            Applicant.objects.create(
+                applicant_name=f"Applicant {index}", resume_file=f"{index}.pdf", content_hash=f"pool_hash_{index}",
+                file_size=2048, file_format="PDF", job_listing=job, parsed_resume_text=f"Python developer {index}"
+            )
+
+        with patch.object(ai_analysis, 'llm', None), patch.dict(ai_analysis._llm_clients, clear=True):
+            result = ResumeScoringService.initiate_scoring_process(job.id, scoring_mode="structured")
+
+        self.assertEqual((result['processed_count'], result['error_count']), (4, 0))
+        self.assertEqual(sum(server.requests for server in servers), 4)
+        self.assertTrue(all(server.requests for server in servers))
+        self.assertEqual([e['requests'] for e in result['llm_pool']['endpoints']], [s.requests for s in servers])
@@ -0,0 +1,92 @@
+"""
+Tests for per-node model selection and the triage/escalation model cascade
+"""
+import json
+from django.test import SimpleTestCase, TransactionTestCase, override_settings
+from unittest.mock import MagicMock, patch
+from jobs.models import JobListing, Applicant, AnalysisCacheEntry
+from hr_assistant.services import ai_analysis
+from hr_assistant.services.model_cascade import model_signature, resolve_node_models
+from hr_assistant.services.resume_scoring import ResumeScoringService
+
+# Triage score of each resume; the large model gives every applicant it sees 55
+TRIAGE_SCORES = {"Alpha": 95, "Bravo": 72, "Charlie": 20}
+
+
+def structured_reply(score):
+    return MagicMock(content=json.dumps({
+        "overall_score": score,
+        "quality_grade": "B",
+        "categorization": "Mid-Level",
+        "justification_summary": f"Scored {score}"
+    }))
+
+
+class TestNodeModels(SimpleTestCase):
+    @override_settings(AI_SCORING_MODEL='llama2', AI_SCORING_NODE_MODELS={'categorization': 'tinyllama'},
+                       AI_SCORING_CASCADE_TRIAGE_MODEL='phi3')
+    def test_node_models_by_tier(self):
+        self.assertEqual(resolve_node_models("multi_call"), {
+            'scoring_grading': 'llama2', 'categorization': 'tinyllama', 'justification': 'llama2'
+        })
+        self.assertEqual(resolve_node_models("structured", "triage"), {'structured_analysis': 'phi3'})
+
+    @override_settings(AI_SCORING_MODEL='llama2')
+    def test_single_model_signature_is_the_model_name(self):
+        self.assertEqual(model_signature({'scoring_grading': 'llama2', 'justification': 'llama2'}), 'llama2')
+        self.assertEqual(
+            model_signature({'scoring_grading': 'llama2', 'categorization': 'tinyllama'}),
+            'categorization=tinyllama,scoring_grading=llama2'
+        )
+
+    @patch('langchain_ollama.ChatOllama')
+    def test_one_client_per_model(self, mock_chat_ollama):
+        with patch.dict(ai_analysis._llm_clients, clear=True):
+            first = ai_analysis.get_llm('tinyllama')
+            self.assertIs(ai_analysis.get_llm('tinyllama'), first)
+            mock_chat_ollama.assert_called_once_with(model='tinyllama', temperature=0.1)
+
+
+@override_settings(
+    AI_SCORING_ASYNC=False, AI_SCORING_CASCADE_ENABLED=True, AI_SCORING_CASCADE_TRIAGE_MODEL='tiny',
+    AI_SCORING_CASCADE_CUTOFF=70, AI_SCORING_CASCADE_BAND=10, AI_SCORING_MODEL='llama2'
+)
+class TestCascadeRun(TransactionTestCase):
+    def setUp(self):
+        self.job = JobListing.objects.create(
+            title="Engineer", detailed_description="Backend engineer", required_skills=["Python"], is_active=True
+        )
+        self.applicants = {
+            name: Applicant.objects.create(
+                applicant_name=name, resume_file=f"{name}.pdf", content_hash=f"cascade_hash_{name}",
+                file_size=2048, file_format="PDF", job_listing=self.job, parsed_resume_text=f"{name} resume"
+            )
+            for name in TRIAGE_SCORES
+        }
+        self.small = MagicMock()
+        self.small.invoke.side_effect = lambda prompt, **kwargs: structured_reply(
+            next(score for name, score in TRIAGE_SCORES.items() if f"{name} resume" in prompt)
+        )
+
+    @patch('hr_assistant.services.ai_analysis.llm')
+    def test_only_borderline_applicants_reach_the_large_model(self, mock_llm):
+        mock_llm.invoke.return_value = structured_reply(55)
+
+        with patch.dict(ai_analysis._llm_clients, {'tiny': self.small}):
+            result = ResumeScoringService.initiate_scoring_process(self.job.id, scoring_mode="structured")
+
+        self.assertEqual(self.small.invoke.call_count, 3)
+        self.assertEqual(mock_llm.invoke.call_count, 1)
+        self.assertIn("Bravo resume", mock_llm.invoke.call_args.args[0])
+        self.assertEqual(result['cascade'], {'escalation_band': [60, 80], 'triage_decided': 2, 'escalated': 1})
+        self.assertEqual(result['processed_count'], 3)
+
+        scores = {name: Applicant.objects.get(id=a.id) for name, a in self.applicants.items()}
+        self.assertEqual({name: a.overall_score for name, a in scores.items()}, {"Alpha": 95, "Bravo": 55, "Charlie": 20})
+        self.assertEqual(scores["Alpha"].ai_analysis_result['model_tier'], 'triage')
+        self.assertEqual(scores["Bravo"].ai_analysis_result['models'], {'structured_analysis': 'llama2'})
+        self.assertEqual(ResumeScoringService.get_detailed_analysis(scores["Bravo"].id)['model_tier'], 'escalation')
+        # Each tier's results are cached under its own model
+        self.assertEqual(
+            sorted(AnalysisCacheEntry.objects.values_list('model_name', flat=True)), ['llama2', 'tiny', 'tiny', 'tiny']
+        )
@@ -0,0 +1,109 @@
+"""
+Tests for the job requirements digest used in scoring prompts
+"""
+from django.test import SimpleTestCase, TestCase, override_settings
+from unittest.mock import patch
+from jobs.models import JobListing, Applicant
+from hr_assistant.services.requirements_digest import build_requirements_digest, ensure_requirements_digest
+from hr_assistant.services.resume_scoring import ResumeScoringService
+
+DESCRIPTION = """# Senior Backend Engineer
+
+## About us
+We are a fast-growing logistics company with offices in three countries and a relaxed culture.
+Our engineering team ships several times a day and values **ownership** above everything else.
+
+## Requirements
+- 5+ years of professional **Python** experience
+- Experience designing REST APIs with [Django](https://www.djangoproject.com/)
+- Familiarity with PostgreSQL query tuning
+
+## Benefits
+- Free lunch on Fridays
+- A degree is not required
+"""
+
+SKILLS = ["Python", "Django", "PostgreSQL"]
+
+
+class TestBuildRequirementsDigest(SimpleTestCase):
+    def test_digest_keeps_requirements_and_drops_prose(self):
+        digest = build_requirements_digest("Senior Backend Engineer", DESCRIPTION, SKILLS)
+
+        self.assertIn("Role: Senior Backend Engineer", digest)
+        self.assertIn("Must-have skills: Python, Django, PostgreSQL", digest)
+        self.assertIn("Seniority signals: senior, 5+ years of experience mentioned", digest)
+        self.assertIn("- 5+ years of professional Python experience", digest)
+        self.assertIn("- Experience designing REST APIs with Django", digest)
+        # Hard-requirement lines outside requirement sections are kept, other bullets and prose are not
+        self.assertIn("- A degree is not required", digest)
+        self.assertNotIn("Free lunch", digest)
+        self.assertNotIn("logistics company", digest)
+        self.assertLess(len(digest), len(DESCRIPTION))
+
+    def test_digest_is_capped(self):
+        description = "## Requirements\n" + "\n".join(f"- Requirement number {i} for this role" for i in range(200))
+
+        digest = build_requirements_digest("Engineer", description, SKILLS, max_chars=300)
+
+        self.assertLessEqual(len(digest), 300)
+        self.assertIn("- Requirement number 0 for this role", digest)
+
+    def test_description_without_requirements_falls_back_to_text(self):
+        digest = build_requirements_digest("Chef", "Cook tasty food for our guests.", [])
+
+        self.assertEqual(digest, "Role: Chef\nKey requirements:\n- Cook tasty food for our guests.")
+
+
+class TestJobListingDigest(TestCase):
+    def setUp(self):
+        self.job = JobListing.objects.create(
+            title="Senior Backend Engineer", detailed_description=DESCRIPTION, required_skills=SKILLS, is_active=True
+        )
+
+    def test_digest_is_stored_on_save_and_rebuilt_when_requirements_change(self):
+        self.job.refresh_from_db()
+        self.assertIn("Must-have skills: Python, Django, PostgreSQL", self.job.requirements_digest)
+        first_hash = self.job.requirements_digest_hash
+        self.assertEqual(len(first_hash), 64)
+
+        self.job.is_active = True
+        self.job.save()
+        self.assertEqual(self.job.requirements_digest_hash, first_hash)
+
+        self.job.required_skills = SKILLS + ["Kubernetes"]
+        self.job.save(update_fields=['required_skills'])
+        self.job.refresh_from_db()
+        self.assertNotEqual(self.job.requirements_digest_hash, first_hash)
+        self.assertIn("Kubernetes", self.job.requirements_digest)
+
+    def test_missing_digest_is_built_on_first_scoring(self):
+        JobListing.objects.filter(pk=self.job.pk).update(requirements_digest='', requirements_digest_hash='')
+        job = JobListing.objects.get(pk=self.job.pk)
+
+        digest = ensure_requirements_digest(job)
+
+        self.assertIn("Role: Senior Backend Engineer", digest)
+        self.assertEqual(JobListing.objects.get(pk=self.job.pk).requirements_digest, digest)
+
+    def _initial_state_of_run(self):
+        Applicant.objects.create(
+            applicant_name="Applicant", resume_file="resume.pdf", content_hash="digest_hash_1",
+            file_size=2048, file_format="PDF", job_listing=self.job, parsed_resume_text="Python and Django"
+        )
+        with patch.object(ResumeScoringService, '_run_supervisor_graph', return_value={'results': []}) as mock_run:
+            ResumeScoringService.initiate_scoring_process(self.job.id)
+        return mock_run.call_args.args[0]
+
+    def test_prompts_receive_digest(self):
+        state = self._initial_state_of_run()
+
+        self.job.refresh_from_db()
+        self.assertEqual(state['job_requirements'], self.job.requirements_digest)
+        self.assertEqual(state['job_requirements_hash'], self.job.requirements_digest_hash)
+
+    @override_settings(AI_SCORING_REQUIREMENTS_DIGEST_ENABLED=False)
+    def test_full_description_when_digest_disabled(self):
+        state = self._initial_state_of_run()
+
+        self.assertEqual(state['job_requirements'], DESCRIPTION)
@@ -0,0 +1,218 @@
+"""
+Tests for the retries, deadlines and circuit breaker around LLM calls, and for how failed analyses are recorded
+"""
+import asyncio
+import time
+from django.test import SimpleTestCase, TransactionTestCase, override_settings
+from unittest.mock import MagicMock, patch
+from jobs.models import JobListing, Applicant, ScoringRun
+from hr_assistant.services import concurrency, resilience, scoring_queue
+from hr_assistant.services.concurrency import LLMConcurrencyLimiter
+from hr_assistant.services.llm_backends import FAKE_LLM_DEFAULTS, FakeChatClient
+from hr_assistant.services.resilience import CircuitBreaker, LLMUnavailableError, acall_llm, call_llm, is_transient_error
+from hr_assistant.services.resume_scoring import ResumeScoringService
+
+RESILIENT = dict(
+    AI_SCORING_RESILIENCE_ENABLED=True, AI_SCORING_LLM_RETRY_BASE_SECONDS=0, AI_SCORING_LLM_RETRY_ATTEMPTS=3,
+    AI_SCORING_BREAKER_FAILURE_THRESHOLD=5, AI_SCORING_BREAKER_RESET_SECONDS=0.1,
+)
+
+
+class StatusError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+def flaky(failures, error=ConnectionError("connection refused"), result="ok"):
+    """A call failing the given number of times before it succeeds"""
+    calls = []
+
+    def call():
+        calls.append(time.monotonic())
+        if len(calls) <= failures:
+            raise error
+        return result
+    return call, calls
+
+
+@override_settings(**RESILIENT)
+class TestRetries(SimpleTestCase):
+    def setUp(self):
+        patcher = patch.object(resilience, '_circuit_breaker', None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_transient_errors(self):
+        for error in (ConnectionError(), TimeoutError(), StatusError(503), StatusError(429)):
+            self.assertTrue(is_transient_error(error), error)
+        for error in (StatusError(400), ValueError("bad json"), KeyError("x")):
+            self.assertFalse(is_transient_error(error), error)
+
+    def test_transient_failures_are_retried(self):
+        call, calls = flaky(2)
+
+        self.assertEqual(call_llm(None, "scoring_grading", call), "ok")
+        self.assertEqual(len(calls), 3)
+        self.assertEqual(resilience.get_circuit_breaker().snapshot()['consecutive_failures'], 0)
+
+    def test_retries_are_bounded_and_other_errors_are_not_retried(self):
+        call, calls = flaky(5)
+        with self.assertRaises(ConnectionError):
+            call_llm(None, "scoring_grading", call)
+        self.assertEqual(len(calls), 3)
+
+        call, calls = flaky(1, error=StatusError(400))
+        with self.assertRaises(StatusError):
+            call_llm(None, "scoring_grading", call)
+        self.assertEqual(len(calls), 1)
+
+    @override_settings(AI_SCORING_LLM_CALL_DEADLINE_SECONDS=0.05, AI_SCORING_LLM_RETRY_ATTEMPTS=2)
+    def test_async_calls_are_bounded_by_the_deadline(self):
+        attempts = []
+
+        async def hung_call():
+            attempts.append(1)
+            await asyncio.sleep(5)
+
+        started = time.monotonic()
+        with self.assertRaises(TimeoutError):
+            asyncio.run(acall_llm(None, "categorization", hung_call))
+        self.assertLess(time.monotonic() - started, 1)
+        self.assertEqual(len(attempts), 2)
+
+    @override_settings(AI_SCORING_LLM_CALL_DEADLINE_SECONDS=0.1, AI_SCORING_LLM_RETRY_ATTEMPTS=2)
+    def test_sync_calls_are_bounded_by_the_deadline(self):
+        limiter = LLMConcurrencyLimiter(4, name="process")
+        patcher = patch.object(concurrency, '_process_limiter', limiter)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        # Streams its tokens without ever pausing long enough for a network read timeout
+        client = FakeChatClient('llama2', {**FAKE_LLM_DEFAULTS, 'latency_ms': 20, 'ms_per_token': 50, 'trailing_words': 10})
+
+        started = time.monotonic()
+        with self.assertRaises(TimeoutError):
+            call_llm(None, "justification", lambda: "".join(chunk.content for chunk in client.stream("Write a justification")))
+        self.assertLess(time.monotonic() - started, 1)
+        self.assertEqual(resilience.get_circuit_breaker().snapshot()['consecutive_failures'], 2)
+
+        # The calls that overran keep their slots until they return
+        self.assertEqual(limiter.in_flight, 2)
+        deadline = time.monotonic() + 30
+        while limiter.in_flight and time.monotonic() < deadline:
+            time.sleep(0.05)
+        self.assertEqual(limiter.in_flight, 0)
+
+    @override_settings(AI_SCORING_RESILIENCE_ENABLED=False)
+    def test_disabled_layer_makes_a_single_attempt(self):
+        call, calls = flaky(1)
+        with self.assertRaises(ConnectionError):
+            call_llm(None, "scoring_grading", call)
+        self.assertEqual(len(calls), 1)
+
+
+class TestCircuitBreaker(SimpleTestCase):
+    def test_opens_then_closes_after_a_successful_trial(self):
+        breaker = CircuitBreaker(failure_threshold=2, reset_seconds=0.1)
+        breaker.record_failure()
+        breaker.wait("scoring_grading", max_wait=1)
+        breaker.record_failure()
+        self.assertEqual((breaker.state, breaker.opens), (CircuitBreaker.OPEN, 1))
+
+        started = time.monotonic()
+        breaker.wait("scoring_grading", max_wait=1)
+        self.assertGreaterEqual(time.monotonic() - started, 0.09)
+        self.assertEqual(breaker.state, CircuitBreaker.HALF_OPEN)
+
+        # Other callers wait for the trial call's outcome
+        with self.assertRaises(LLMUnavailableError):
+            breaker.wait("categorization", max_wait=0.05)
+        breaker.record_success()
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+
+    def test_failed_trial_reopens(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_seconds=0.05)
+        breaker.record_failure()
+        breaker.wait("scoring_grading", max_wait=1)
+
+        breaker.record_failure()
+
+        self.assertEqual((breaker.state, breaker.opens), (CircuitBreaker.OPEN, 1))
+        with self.assertRaises(LLMUnavailableError):
+            breaker.wait("scoring_grading", max_wait=0.01)
+
+
+class FailedAnalysisTestMixin:
+    def setUp(self):
+        self.job = JobListing.objects.create(
+            title="Engineer", detailed_description="Backend engineer", required_skills=["Python"], is_active=True
+        )
+        self.applicants = [
+            Applicant.objects.create(
+                applicant_name=f"Candidate {i}", resume_file=f"{i}.pdf", content_hash=f"resilience_hash_{i}",
+                file_size=2048, file_format="PDF", job_listing=self.job, parsed_resume_text=f"Candidate number {i}"
+            )
+            for i in range(3)
+        ]
+
+    def reply(self, prompt, **kwargs):
+        if "categorize the candidate" in prompt:
+            return MagicMock(content="Senior")
+        if "Analyze the following resume" in prompt:
+            return MagicMock(content="Overall Score: 77\nQuality Grade: B")
+        return MagicMock(content="Strong candidate")
+
+
+@override_settings(AI_SCORING_ASYNC=False, AI_SCORING_CACHE_ENABLED=False)
+class TestFailedAnalysis(FailedAnalysisTestMixin, TransactionTestCase):
+    @patch('hr_assistant.services.ai_analysis.llm')
+    def test_failed_applicant_is_marked_as_error_without_a_placeholder_score(self, mock_llm):
+        Applicant.objects.filter(id=self.applicants[1].id).update(overall_score=64, quality_grade='C')
+
+        def reply(prompt, **kwargs):
+            if "Candidate number 1" in prompt and "Analyze the following resume" in prompt:
+                raise ConnectionError("Ollama is down")
+            return self.reply(prompt)
+        mock_llm.invoke.side_effect = reply
+
+        result = ResumeScoringService.initiate_scoring_process(self.job.id, scoring_mode="multi_call")
+
+        self.assertEqual((result['processed_count'], result['error_count']), (2, 1))
+        failed = Applicant.objects.get(id=self.applicants[1].id)
+        self.assertEqual((failed.processing_status, failed.overall_score, failed.quality_grade), ('error', 64, 'C'))
+        self.assertEqual(Applicant.objects.filter(overall_score=77, processing_status='completed').count(), 2)
+        # No justification is requested for the failed applicant
+        self.assertFalse(any("Candidate number 1" in c.args[0] and "Explain" in c.args[0] for c in mock_llm.invoke.call_args_list))
+
+
+@override_settings(AI_SCORING_ASYNC=False, AI_SCORING_CACHE_ENABLED=False, AI_SCORING_LLM_RETRY_ATTEMPTS=2,
+                   AI_SCORING_BREAKER_FAILURE_THRESHOLD=1, AI_SCORING_BREAKER_RESET_SECONDS=30,
+                   AI_SCORING_BREAKER_MAX_WAIT_SECONDS=0.2, AI_SCORING_RESILIENCE_ENABLED=True,
+                   AI_SCORING_LLM_RETRY_BASE_SECONDS=0)
+class TestBackendOutage(FailedAnalysisTestMixin, TransactionTestCase):
+    @patch('hr_assistant.services.ai_analysis.llm')
+    def test_run_is_queued_again_and_resumes_when_the_backend_is_back(self, mock_llm):
+        mock_llm.invoke.side_effect = ConnectionError("Ollama is down")
+        queued = ResumeScoringService.enqueue_scoring_run(self.job.id, scoring_mode="multi_call")
+
+        with patch.object(resilience, '_circuit_breaker', None):
+            run = scoring_queue.claim_next_run("worker-a")
+            with self.assertRaises(LLMUnavailableError):
+                ResumeScoringService.execute_scoring_run(run, "worker-a")
+
+            run = ScoringRun.objects.get(id=queued['run_id'])
+            self.assertEqual((run.status, run.lease_owner), ('queued', None))
+            self.assertIn("unavailable", run.error_message)
+            self.assertEqual(set(Applicant.objects.values_list('processing_status', flat=True)), {'pending'})
+            self.assertFalse(Applicant.objects.filter(overall_score=0).exists())
+            self.assertEqual(resilience.get_circuit_breaker().snapshot()['opens'], 1)
+
+            # The backend recovers and the breaker's trial call succeeds
+            mock_llm.invoke.side_effect = self.reply
+            resilience._circuit_breaker = None
+            run = scoring_queue.claim_next_run("worker-b")
+            result = ResumeScoringService.execute_scoring_run(run, "worker-b")
+
+        self.assertEqual((run.attempts, result['processed_count'], result['error_count']), (2, 3, 0))
+        self.assertEqual(ScoringRun.objects.get(id=run.id).status, 'completed')
+        self.assertEqual(Applicant.objects.filter(overall_score=77, processing_status='completed').count(), 3)
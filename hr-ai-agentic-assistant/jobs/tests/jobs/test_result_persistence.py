@@ -0,0 +1,158 @@
+"""
+Tests for incremental persistence of worker results
+"""
+import json
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from unittest.mock import patch, MagicMock
+from jobs.models import JobListing, Applicant, ScoringRun
+from hr_assistant.services.contracts import AIAnalysisResponse
+from hr_assistant.services.result_persistence import IncrementalResultWriter
+from hr_assistant.services.resume_scoring import ResumeScoringService
+
+
+def make_response(applicant_id, score=75):
+    return AIAnalysisResponse(
+        overall_score=score,
+        quality_grade="B",
+        categorization="Mid-Level",
+        justification_summary="Good match",
+        applicant_id=applicant_id
+    )
+
+
+def create_job_with_applicants(count, hash_prefix="persist_hash"):
+    job = JobListing.objects.create(
+        title="Software Engineer",
+        detailed_description="We need a skilled Python engineer",
+        required_skills=["Python"],
+        is_active=True
+    )
+    applicants = [
+        Applicant.objects.create(
+            applicant_name="Jane Doe",
+            resume_file=f"resume_{i}.pdf",
+            content_hash=f"{hash_prefix}_{i}",
+            file_size=2048,
+            file_format="PDF",
+            job_listing=job,
+            parsed_resume_text="Python developer"
+        )
+        for i in range(count)
+    ]
+    return job, applicants
+
+
+class TestIncrementalResultWriter(TestCase):
+    def setUp(self):
+        self.job, self.applicants = create_job_with_applicants(3)
+
+    def test_results_are_committed_when_batch_is_full(self):
+        writer = IncrementalResultWriter(batch_size=2, flush_interval_ms=60000)
+
+        writer.add(make_response(self.applicants[0].id))
+        self.assertEqual(Applicant.objects.filter(processing_status='completed').count(), 0)
+
+        writer.add(make_response(self.applicants[1].id))
+        self.assertEqual(Applicant.objects.filter(processing_status='completed').count(), 2)
+        self.assertEqual(writer.flush_count, 1)
+
+        writer.add(make_response(self.applicants[2].id))
+        self.assertEqual(writer.pending_count, 1)
+        writer.flush()
+        self.assertEqual(writer.persisted_count, 3)
+        applicant = Applicant.objects.get(id=self.applicants[2].id)
+        self.assertEqual((applicant.overall_score, applicant.analysis_status), (75, 'analyzed'))
+
+    def test_results_are_committed_once_interval_elapses(self):
+        writer = IncrementalResultWriter(batch_size=100, flush_interval_ms=0)
+
+        writer.add(make_response(self.applicants[0].id))
+
+        self.assertEqual(writer.pending_count, 0)
+        self.assertEqual(Applicant.objects.get(id=self.applicants[0].id).processing_status, 'completed')
+
+    def test_missing_applicant_counts_as_error_and_updates_run(self):
+        run = ScoringRun.objects.create(job_listing=self.job, scoring_mode="structured", applicant_count=2)
+        writer = IncrementalResultWriter(scoring_run_id=run.id, batch_size=2)
+
+        writer.add(make_response(self.applicants[0].id))
+        writer.add(make_response(999999))
+
+        run.refresh_from_db()
+        self.assertEqual((writer.persisted_count, writer.error_count), (1, 1))
+        self.assertEqual((run.processed_count, run.error_count), (1, 1))
+
+    def test_invalid_row_is_reported_while_the_rest_are_written(self):
+        writer = IncrementalResultWriter(batch_size=100)
+        invalid = make_response(self.applicants[1].id).model_copy(update={"quality_grade": "B+"})
+
+        writer.add(make_response(self.applicants[0].id))
+        writer.add(invalid)
+        writer.add(make_response(self.applicants[2].id))
+        written = writer.flush()
+
+        self.assertEqual(written, 2)
+        self.assertEqual([failure['applicant_id'] for failure in writer.failures], [self.applicants[1].id])
+        self.assertEqual(Applicant.objects.get(id=self.applicants[1].id).processing_status, 'pending')
+        self.assertEqual(Applicant.objects.filter(processing_status='completed').count(), 2)
+
+    def test_batch_query_count_does_not_grow_with_batch_size(self):
+        _, more_applicants = create_job_with_applicants(20, hash_prefix="persist_bulk_hash")
+
+        def queries_for(applicants):
+            writer = IncrementalResultWriter(batch_size=100, chunk_size=100)
+            for applicant in applicants:
+                writer.add(make_response(applicant.id))
+            with CaptureQueriesContext(connection) as ctx:
+                writer.flush()
+            self.assertEqual(writer.persisted_count, len(applicants))
+            return len(ctx.captured_queries)
+
+        self.assertEqual(queries_for(self.applicants[:2]), queries_for(more_applicants))
+
+    def test_batch_is_written_in_chunks(self):
+        writer = IncrementalResultWriter(batch_size=100, chunk_size=2)
+        for applicant in self.applicants:
+            writer.add(make_response(applicant.id))
+
+        with patch.object(Applicant.objects, 'bulk_update', wraps=Applicant.objects.bulk_update) as bulk_update:
+            writer.flush()
+
+        self.assertEqual([len(call.args[0]) for call in bulk_update.call_args_list], [2, 1])
+        self.assertEqual(writer.persisted_count, 3)
+
+
+@override_settings(
+    AI_SCORING_ASYNC=False,
+    AI_SCORING_CACHE_ENABLED=False,
+    AI_SCORING_PERSIST_BATCH_SIZE=1,
+    AI_SCORING_MAX_CONCURRENT_LLM_CALLS_PER_RUN=1
+)
+class TestIncrementalPersistenceDuringRun(TransactionTestCase):
+    def setUp(self):
+        self.job, self.applicants = create_job_with_applicants(3)
+
+    @patch('hr_assistant.services.ai_analysis.llm')
+    def test_progress_is_visible_while_run_is_in_flight(self, mock_llm):
+        completed_at_each_call = []
+
+        def invoke(prompt, **kwargs):
+            completed_at_each_call.append(
+                ResumeScoringService.get_scoring_status(self.job.id)['completed_count']
+            )
+            return MagicMock(content=json.dumps({
+                "overall_score": 64,
+                "quality_grade": "C",
+                "categorization": "Junior",
+                "justification_summary": "Some Python experience"
+            }))
+
+        mock_llm.invoke.side_effect = invoke
+
+        result = ResumeScoringService.initiate_scoring_process(self.job.id, scoring_mode="structured")
+
+        self.assertEqual(completed_at_each_call, [0, 1, 2])
+        self.assertEqual(result['processed_count'], 3)
+        self.assertEqual(Applicant.objects.filter(overall_score=64, processing_status='completed').count(), 3)
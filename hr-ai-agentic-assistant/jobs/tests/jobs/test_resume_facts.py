@@ -0,0 +1,115 @@
+"""
+Tests for the structured resume facts extracted at upload
+"""
+import datetime
+import json
+from django.test import SimpleTestCase, TestCase, Client
+from django.urls import reverse
+from unittest.mock import patch
+from jobs.models import JobListing, Applicant
+from jobs.services.resume_parser import (
+    RESUME_FACTS_VERSION, extract_resume_facts, format_resume_facts, store_parsed_resume_text
+)
+from hr_assistant.services import ai_analysis
+from hr_assistant.services.resume_scoring import ResumeScoringService
+from .test_ai_analysis_nodes import make_worker_state
+
+RESUME = """Jane Doe
+jane@example.com
+
+SUMMARY
+Backend engineer with 7+ years of experience.
+
+Professional Experience
+Senior Software Engineer at Acme Corp | Jan 2019 - Present
+- Built Django services
+Software Developer, Initech (2015 - 2018)
+Backend Developer — Globex — Mar 2017 to Dec 2019
+
+Education
+B.Sc. in Computer Science, University of Somewhere, 2011 - 2015
+
+Technical Skills
+Languages: Python, Go, JavaScript
+Frameworks: Django / Flask, React
+"""
+
+
+class TestExtractResumeFacts(SimpleTestCase):
+    def test_facts_from_sectioned_resume(self):
+        facts = extract_resume_facts(RESUME, today=datetime.date(2024, 6, 1))
+
+        self.assertEqual(facts['parser_version'], RESUME_FACTS_VERSION)
+        self.assertEqual(facts['sections'], ['summary', 'experience', 'education', 'skills'])
+        # Jan 2015 - Jun 2024 with overlapping positions counted once
+        self.assertEqual(facts['years_of_experience'], 9.5)
+        self.assertEqual(facts['titles'], ['Senior Software Engineer', 'Software Developer', 'Backend Developer'])
+        self.assertEqual(facts['skills'], ['Python', 'Go', 'JavaScript', 'Django', 'Flask', 'React'])
+        self.assertEqual(facts['education'], ['B.Sc. in Computer Science, University of Somewhere, 2011 - 2015'])
+
+    def test_claimed_years_without_dated_positions(self):
+        facts = extract_resume_facts("Python developer with 6 years of professional experience.")
+
+        self.assertEqual(facts['years_of_experience'], 6.0)
+        self.assertEqual(facts['sections'], [])
+
+    def test_empty_text(self):
+        facts = extract_resume_facts(None)
+
+        self.assertIsNone(facts['years_of_experience'])
+        self.assertEqual(format_resume_facts(facts), "")
+
+
+class TestResumeFactsStorageAndUse(TestCase):
+    def setUp(self):
+        self.job = JobListing.objects.create(
+            title="Backend Engineer", detailed_description="Python backend role",
+            required_skills=["Python"], is_active=True
+        )
+        self.applicant = Applicant.objects.create(
+            applicant_name="Jane Doe", resume_file="resume.pdf", content_hash="facts_hash_1",
+            file_size=2048, file_format="PDF", job_listing=self.job
+        )
+
+    def test_facts_are_stored_with_parsed_text(self):
+        store_parsed_resume_text(self.applicant, RESUME)
+
+        self.applicant.refresh_from_db()
+        self.assertEqual(self.applicant.resume_facts['parser_version'], RESUME_FACTS_VERSION)
+        self.assertIn('Python', self.applicant.resume_facts['skills'])
+
+    def test_scoring_run_extracts_missing_facts_once(self):
+        Applicant.objects.filter(id=self.applicant.id).update(parsed_resume_text=RESUME, resume_facts=None)
+
+        with patch.object(ResumeScoringService, '_run_supervisor_graph', return_value={'results': []}) as mock_run:
+            ResumeScoringService.initiate_scoring_process(self.job.id)
+
+        state = mock_run.call_args.args[0]
+        stored = Applicant.objects.get(id=self.applicant.id).resume_facts
+        self.assertEqual(state['resume_facts'], {self.applicant.id: stored})
+        self.assertEqual(stored['titles'][0], 'Senior Software Engineer')
+
+    def test_categorization_prompt_uses_facts_instead_of_text(self):
+        state = make_worker_state(applicant_id=1)
+        state["resume_facts"] = {1: {'years_of_experience': 8, 'titles': ['Senior Python Developer']}}
+
+        _, prompt = ai_analysis._prepare_categorization(state)
+        _, structured_prompt = ai_analysis._prepare_structured_analysis(state)
+
+        self.assertIn("Total years of experience: 8", prompt)
+        self.assertNotIn("Senior Python developer with 8 years of Django", prompt)
+        self.assertIn("Job titles held: Senior Python Developer", structured_prompt)
+        self.assertIn("Senior Python developer with 8 years of Django", structured_prompt)
+
+    def test_report_filters_on_years_of_experience(self):
+        Applicant.objects.filter(id=self.applicant.id).update(
+            analysis_status='analyzed', overall_score=70, resume_facts={'years_of_experience': 4.5}
+        )
+        url = reverse('candidate_report_api')
+
+        data = json.loads(Client().get(url, {'job_id': self.job.id, 'min_years': '4'}).content)
+        self.assertEqual([c['years_of_experience'] for c in data['candidates']], [4.5])
+
+        data = json.loads(Client().get(url, {'job_id': self.job.id, 'min_years': '5'}).content)
+        self.assertEqual(data['candidates'], [])
+        self.assertEqual(data['min_years'], 5.0)
@@ -0,0 +1,70 @@
+"""
+Tests for the rule-based grade and categorization derivation
+"""
+from django.test import SimpleTestCase, TransactionTestCase, override_settings
+from unittest.mock import MagicMock, patch
+from jobs.models import JobListing, Applicant
+from hr_assistant.services.rule_derivation import derive_categorization, derive_quality_grade
+from hr_assistant.services.resume_scoring import ResumeScoringService
+
+
+class TestDerivationRules(SimpleTestCase):
+    def test_grade_bands(self):
+        self.assertEqual([derive_quality_grade(s) for s in (95, 75, 74, 40, 12)], ["A", "B", "C", "D", "F"])
+
+        with self.settings(AI_SCORING_GRADE_BANDS=[(0, "F"), (50, "A")]):
+            self.assertEqual((derive_quality_grade(50), derive_quality_grade(49)), ("A", "F"))
+
+    def test_category_from_years_and_titles(self):
+        cases = [
+            ({'years_of_experience': 9.5, 'titles': ['Software Developer']}, "Senior"),
+            ({'years_of_experience': 4, 'titles': ['Lead Engineer']}, "Senior"),
+            ({'years_of_experience': 4, 'titles': ['Backend Developer']}, "Mid-Level"),
+            ({'years_of_experience': 4, 'titles': ['Junior Developer']}, "Junior"),
+            ({'years_of_experience': 1, 'titles': ['Senior Developer']}, "Junior"),
+            ({'titles': ['Principal Architect']}, "Senior"),
+            (None, "Junior"),
+        ]
+        for facts, expected in cases:
+            self.assertEqual(derive_categorization(facts), expected, facts)
+
+    def test_low_skill_coverage_is_mismatched(self):
+        facts = {'years_of_experience': 10}
+        coverage = {'skill_coverage': 0.2, 'matched_skills': ['Python'], 'missing_skills': ['Go', 'Rust', 'C', 'Java']}
+
+        self.assertEqual(derive_categorization(facts, coverage), "Mismatched")
+        # A job without required skills gives no coverage signal
+        self.assertEqual(derive_categorization(facts, {'skill_coverage': 0.0, 'matched_skills': [], 'missing_skills': []}), "Senior")
+
+
+@override_settings(AI_SCORING_ASYNC=False, AI_SCORING_RULE_BASED_DERIVATION=True, AI_SCORING_CACHE_ENABLED=False)
+class TestRuleDerivationRun(TransactionTestCase):
+    def setUp(self):
+        self.job = JobListing.objects.create(
+            title="Engineer", detailed_description="Backend engineer", required_skills=["Django"], is_active=True
+        )
+        self.applicant = Applicant.objects.create(
+            applicant_name="Jane", resume_file="jane.pdf", content_hash="rules_hash_1",
+            file_size=2048, file_format="PDF", job_listing=self.job, parsed_resume_text="Django developer",
+            resume_facts={'parser_version': 1, 'years_of_experience': 5, 'titles': ['Backend Developer']}
+        )
+
+    @patch('hr_assistant.services.ai_analysis.llm')
+    def test_only_scoring_and_justification_call_the_llm(self, mock_llm):
+        def reply(prompt, **kwargs):
+            if "Provide a brief justification" in prompt:
+                return MagicMock(content="Solid Django experience")
+            return MagicMock(content="Overall Score: 78\nQuality Grade: A")
+        mock_llm.invoke.side_effect = reply
+
+        ResumeScoringService.initiate_scoring_process(self.job.id, scoring_mode="multi_call")
+
+        prompts = [c.args[0] for c in mock_llm.invoke.call_args_list]
+        self.assertEqual(len(prompts), 2)
+        self.assertFalse(any("categorize the candidate" in p for p in prompts))
+        self.assertIn("Categorization: Mid-Level", prompts[-1])
+        applicant = Applicant.objects.get(id=self.applicant.id)
+        self.assertEqual(
+            (applicant.overall_score, applicant.quality_grade, applicant.categorization),
+            (78, "B", "Mid-Level")
+        )
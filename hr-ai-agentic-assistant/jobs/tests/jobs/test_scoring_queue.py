@@ -0,0 +1,232 @@
+"""
+Tests for the background scoring queue and the score_worker management command
+"""
+import json
+import threading
+import time
+from datetime import timedelta
+from io import StringIO
+from django.core.management import call_command
+from django.db import OperationalError
+from django.test import TestCase, TransactionTestCase, Client, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from unittest.mock import patch, MagicMock
+from jobs.models import JobListing, Applicant, ScoringRun
+from hr_assistant.services import scoring_queue
+from hr_assistant.services.contracts import AIAnalysisResponse
+from hr_assistant.services.logging import AIProcessingError
+from hr_assistant.services.result_persistence import IncrementalResultWriter
+from hr_assistant.services.resume_scoring import ResumeScoringService
+
+
+def create_job_with_applicants(count=2):
+    job = JobListing.objects.create(
+        title="Software Engineer",
+        detailed_description="We need a skilled Python engineer",
+        required_skills=["Python"],
+        is_active=True
+    )
+    for i in range(count):
+        Applicant.objects.create(
+            applicant_name="Jane Doe",
+            resume_file=f"resume_{i}.pdf",
+            content_hash=f"queue_hash_{i}",
+            file_size=2048,
+            file_format="PDF",
+            job_listing=job,
+            parsed_resume_text="Python developer"
+        )
+    return job
+
+
+class TestScoringQueue(TestCase):
+    def setUp(self):
+        self.job = create_job_with_applicants()
+        self.client = Client()
+
+    @patch('hr_assistant.services.scoring_stack.get_supervisor_graph')
+    def test_score_resumes_view_queues_run_without_scoring(self, mock_get_graph):
+        url = reverse('score_resumes', kwargs={'job_id': self.job.id})
+        response = self.client.post(url, data=json.dumps({}), content_type='application/json')
+
+        self.assertEqual(response.status_code, 202)
+        data = json.loads(response.content)
+        run = ScoringRun.objects.get(id=data['run_id'])
+        self.assertEqual(run.status, 'queued')
+        self.assertEqual(run.applicant_count, 2)
+        self.assertEqual(data['tracking_id'], f"scoring_run_{run.id}")
+        mock_get_graph.assert_not_called()
+
+    def test_second_enqueue_is_rejected_while_run_is_active(self):
+        first = ResumeScoringService.enqueue_scoring_run(self.job.id)
+
+        with self.assertRaises(AIProcessingError) as ctx:
+            ResumeScoringService.enqueue_scoring_run(self.job.id)
+
+        self.assertEqual(ctx.exception.error_code, 'PROCESS_LOCKED')
+        self.assertEqual(ctx.exception.additional_data['run_id'], first['run_id'])
+
+        url = reverse('score_resumes', kwargs={'job_id': self.job.id})
+        response = self.client.post(url, data=json.dumps({}), content_type='application/json')
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(json.loads(response.content)['run_id'], first['run_id'])
+
+    def test_racing_enqueues_queue_exactly_one_run(self):
+        first = ResumeScoringService.enqueue_scoring_run(self.job.id)
+
+        # The second request checked before the first one's run was committed
+        with patch.object(scoring_queue, 'get_active_run', side_effect=[None, ScoringRun.objects.get(id=first['run_id'])]):
+            with self.assertRaises(AIProcessingError) as ctx:
+                ResumeScoringService.enqueue_scoring_run(self.job.id)
+
+        self.assertEqual(ctx.exception.error_code, 'PROCESS_LOCKED')
+        self.assertEqual(ctx.exception.additional_data['run_id'], first['run_id'])
+        self.assertEqual(ScoringRun.objects.filter(job_listing=self.job).count(), 1)
+
+    def test_only_one_worker_claims_a_run(self):
+        run_id = ResumeScoringService.enqueue_scoring_run(self.job.id)['run_id']
+
+        claimed = scoring_queue.claim_next_run("worker-a", lease_seconds=60)
+
+        self.assertEqual(claimed.id, run_id)
+        self.assertEqual(claimed.lease_owner, "worker-a")
+        self.assertEqual(claimed.attempts, 1)
+        self.assertIsNone(scoring_queue.claim_next_run("worker-b", lease_seconds=60))
+
+    def test_run_with_expired_lease_is_reclaimed(self):
+        ResumeScoringService.enqueue_scoring_run(self.job.id)
+        run = scoring_queue.claim_next_run("worker-a", lease_seconds=60)
+        ScoringRun.objects.filter(id=run.id).update(lease_expires_at=timezone.now() - timedelta(seconds=1))
+
+        reclaimed = scoring_queue.claim_next_run("worker-b", lease_seconds=60)
+
+        self.assertEqual(reclaimed.id, run.id)
+        self.assertEqual(reclaimed.lease_owner, "worker-b")
+        self.assertEqual(reclaimed.attempts, 2)
+        self.assertFalse(scoring_queue.renew_lease(run.id, "worker-a"))
+
+    @override_settings(AI_SCORING_RUN_MAX_ATTEMPTS=1)
+    def test_run_is_failed_after_max_attempts(self):
+        ResumeScoringService.enqueue_scoring_run(self.job.id)
+        run = scoring_queue.claim_next_run("worker-a", lease_seconds=60)
+        ScoringRun.objects.filter(id=run.id).update(lease_expires_at=timezone.now() - timedelta(seconds=1))
+
+        self.assertIsNone(scoring_queue.claim_next_run("worker-b", lease_seconds=60))
+        run.refresh_from_db()
+        self.assertEqual(run.status, 'error')
+
+    def test_status_reports_queued_run(self):
+        run_id = ResumeScoringService.enqueue_scoring_run(self.job.id)['run_id']
+
+        url = reverse('scoring_status', kwargs={'job_id': self.job.id})
+        response = self.client.get(url, {'run_id': run_id})
+
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.content)
+        self.assertEqual(data['status'], 'queued')
+        self.assertEqual(data['run']['run_id'], run_id)
+
+    def test_status_for_unknown_run_is_not_found(self):
+        url = reverse('scoring_status', kwargs={'job_id': self.job.id})
+        response = self.client.get(url, {'run_id': 9999})
+
+        self.assertEqual(response.status_code, 404)
+
+
+class TestLeaseHeartbeat(TestCase):
+    def setUp(self):
+        self.job = create_job_with_applicants()
+
+    def test_database_errors_do_not_stop_the_heartbeat(self):
+        renewals = []
+
+        def renew(run_id, worker_id, lease_seconds):
+            renewals.append(time.monotonic())
+            if len(renewals) == 1:
+                raise OperationalError("database is locked")
+            return True
+
+        with patch.object(scoring_queue, 'renew_lease', side_effect=renew):
+            with scoring_queue.LeaseHeartbeat(1, "worker-a", lease_seconds=0.03) as heartbeat:
+                time.sleep(0.15)
+                self.assertTrue(heartbeat._thread.is_alive())
+
+        self.assertGreaterEqual(len(renewals), 3)
+        self.assertFalse(heartbeat.lease_lost)
+        heartbeat.check()
+
+    def test_writer_stops_once_the_lease_is_lost(self):
+        applicant = Applicant.objects.filter(job_listing=self.job).first()
+        heartbeat = scoring_queue.LeaseHeartbeat(1, "worker-a", lease_seconds=60)
+        writer = IncrementalResultWriter(scoring_run_id=1, batch_size=10, lease=heartbeat)
+        writer.add(AIAnalysisResponse(overall_score=90, quality_grade="A", categorization="Senior",
+                                      justification_summary="Great", applicant_id=applicant.id))
+
+        heartbeat.lease_lost = True
+        with self.assertRaises(scoring_queue.LeaseLostError):
+            writer.flush()
+
+        applicant.refresh_from_db()
+        self.assertIsNone(applicant.overall_score)
+        self.assertEqual(writer.persisted_count, 0)
+
+
+@override_settings(AI_SCORING_ASYNC=False, AI_SCORING_CACHE_ENABLED=False)
+class TestLeaseTakeover(TransactionTestCase):
+    def setUp(self):
+        self.job = create_job_with_applicants()
+
+    @patch('hr_assistant.services.ai_analysis.llm')
+    def test_run_is_abandoned_when_another_worker_takes_it_over(self, mock_llm):
+        run_id = ResumeScoringService.enqueue_scoring_run(self.job.id, scoring_mode="structured")['run_id']
+        run = scoring_queue.claim_next_run("worker-a", lease_seconds=60)
+        taken_over = threading.Event()
+
+        def reply(prompt, **kwargs):
+            # The lease lapsed while the LLM was slow, and worker-b claimed the run
+            if not taken_over.is_set():
+                ScoringRun.objects.filter(id=run_id).update(lease_owner="worker-b")
+                taken_over.set()
+                time.sleep(0.5)
+            return MagicMock(content=json.dumps({
+                "overall_score": 82, "quality_grade": "B", "categorization": "Mid-Level",
+                "justification_summary": "Solid Python background"
+            }))
+        mock_llm.invoke.side_effect = reply
+
+        with self.assertRaises(scoring_queue.LeaseLostError):
+            ResumeScoringService.execute_scoring_run(run, "worker-a", lease_seconds=0.3)
+
+        run.refresh_from_db()
+        self.assertEqual((run.status, run.lease_owner, run.processed_count), ('running', "worker-b", 0))
+        self.assertFalse(Applicant.objects.filter(overall_score=82).exists())
+
+
+@override_settings(AI_SCORING_ASYNC=False)
+class TestScoreWorkerCommand(TransactionTestCase):
+    def setUp(self):
+        self.job = create_job_with_applicants()
+
+    @patch('hr_assistant.services.ai_analysis.llm')
+    def test_worker_processes_queued_run(self, mock_llm):
+        mock_llm.invoke.return_value = MagicMock(content=json.dumps({
+            "overall_score": 82,
+            "quality_grade": "B",
+            "categorization": "Mid-Level",
+            "justification_summary": "Solid Python background"
+        }))
+        run_id = ResumeScoringService.enqueue_scoring_run(self.job.id, scoring_mode="structured")['run_id']
+
+        call_command('score_worker', '--once', '--worker-id', 'test-worker', stdout=StringIO())
+
+        run = ScoringRun.objects.get(id=run_id)
+        self.assertEqual(run.status, 'completed')
+        self.assertEqual(run.processed_count, 2)
+        self.assertIsNone(run.lease_owner)
+        self.assertEqual(Applicant.objects.filter(overall_score=82, processing_status='completed').count(), 2)
+
+    def test_worker_exits_when_queue_is_empty(self):
+        out = StringIO()
+        call_command('score_worker', '--once', stdout=out)
+        self.assertIn("No queued scoring runs", out.getvalue())
@@ -0,0 +1,35 @@
+"""
+Tests for lazy loading of the scoring stack
+"""
+import os
+import subprocess
+import sys
+from django.conf import settings
+from django.test import SimpleTestCase
+from unittest.mock import patch
+from hr_assistant.services import ai_analysis
+
+
+class TestLazyScoringStack(SimpleTestCase):
+    def test_web_process_does_not_import_scoring_stack(self):
+        script = (
+            "import os, sys\n"
+            "os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'hr_assistant.settings')\n"
+            "import django\n"
+            "django.setup()\n"
+            "import hr_assistant.urls, jobs.views\n"
+            "print(sorted({name.split('.')[0] for name in sys.modules if name.startswith(('langgraph', 'langchain'))}))\n"
+        )
+        completed = subprocess.run(
+            [sys.executable, '-c', script], cwd=settings.BASE_DIR, env=dict(os.environ),
+            capture_output=True, text=True, check=True
+        )
+        self.assertEqual(completed.stdout.strip(), "[]")
+
+    def test_llm_client_is_created_once_on_first_use(self):
+        with patch.object(ai_analysis, 'llm', None), patch('langchain_ollama.ChatOllama') as mock_chat_ollama:
+            first = ai_analysis.get_llm()
+            second = ai_analysis.get_llm()
+
+        self.assertIs(first, second)
+        mock_chat_ollama.assert_called_once()
@@ -0,0 +1,147 @@
+"""
+Tests for the required-skill coverage engine
+"""
+import json
+from django.test import SimpleTestCase, TestCase, Client, override_settings
+from django.urls import reverse
+from unittest.mock import patch
+from jobs.models import JobListing, Applicant
+from hr_assistant.services import ai_analysis
+from hr_assistant.services.skill_coverage import SkillCoverageMatrix, build_coverage_result, get_job_skill_matrix
+from hr_assistant.services.resume_scoring import ResumeScoringService
+from .test_ai_analysis_nodes import make_worker_state
+
+REQUIRED_SKILLS = ["Python", "Django", "PostgreSQL", "Machine Learning", "JavaScript"]
+
+RESUMES = {
+    1: "Python and Django developer. Tuned Postgres queries, built ML pipelines and a JS front end.",
+    2: "Django REST services in Python.",
+    3: "Pastry chef.",
+}
+
+
+class TestSkillCoverageMatrix(SimpleTestCase):
+    def setUp(self):
+        self.matrix = SkillCoverageMatrix(REQUIRED_SKILLS, RESUMES)
+
+    def test_matrix_matches_aliases_and_multi_word_skills(self):
+        self.assertEqual(self.matrix.as_boolean_rows(), {
+            1: [True, True, True, True, True],
+            2: [True, True, False, False, False],
+            3: [False, False, False, False, False],
+        })
+
+    def test_coverage_and_missing_skills(self):
+        self.assertEqual(self.matrix.coverage_scores(), {1: 1.0, 2: 0.4, 3: 0.0})
+        self.assertEqual(self.matrix.missing_skills(2), ["PostgreSQL", "Machine Learning", "JavaScript"])
+
+    def test_must_have_filter(self):
+        self.assertEqual(self.matrix.applicants_with_all(["python", "DJANGO"]), {1, 2})
+        self.assertEqual(self.matrix.applicants_with_all(["Postgres"]), {1})
+        # Skills the job doesn't require are not in the matrix
+        self.assertEqual(self.matrix.applicants_with_all(["Rust"]), set())
+
+    def test_duplicate_and_blank_skills_are_dropped(self):
+        matrix = SkillCoverageMatrix(["Python", "python", " ", "Postgres", "PostgreSQL"], RESUMES)
+
+        self.assertEqual(matrix.skills, ["Python", "Postgres"])
+
+
+class TestSkillCoverageInPrompts(TestCase):
+    def test_structured_prompt_lists_found_and_missing_skills(self):
+        state = make_worker_state()
+        state["skill_coverage"] = {1: {"skill_coverage": 0.5, "matched_skills": ["Python"], "missing_skills": ["Go"]}}
+
+        _, prompt = ai_analysis._prepare_structured_analysis(state)
+
+        self.assertIn("Required skills found in the resume: Python", prompt)
+        self.assertIn("Required skills not found in the resume: Go", prompt)
+
+
+class TestCoverageResult(SimpleTestCase):
+    def setUp(self):
+        self.matrix = SkillCoverageMatrix(REQUIRED_SKILLS, RESUMES)
+
+    def test_category_follows_the_resume_facts(self):
+        cases = [
+            ({'years_of_experience': 9, 'titles': ['Backend Developer']}, "Senior"),
+            ({'years_of_experience': 4, 'titles': ['Backend Developer']}, "Mid-Level"),
+            ({'years_of_experience': 1, 'titles': ['Junior Developer']}, "Junior"),
+        ]
+        for facts, category in cases:
+            self.assertEqual(build_coverage_result(self.matrix, 1, facts).categorization, category, facts)
+
+        # A clear skill gap is a mismatch whatever the experience
+        result = build_coverage_result(self.matrix, 2, {'years_of_experience': 12, 'titles': []})
+        self.assertEqual((result.overall_score, result.categorization), (40, "Mismatched"))
+
+    @override_settings(AI_SCORING_GRADE_BANDS=[(95, "A"), (0, "C")])
+    def test_grade_follows_the_configured_bands(self):
+        self.assertEqual(build_coverage_result(self.matrix, 1).quality_grade, "A")
+        self.assertEqual(build_coverage_result(self.matrix, 2).quality_grade, "C")
+
+
+class SkillCoverageJobMixin:
+    def setUp(self):
+        self.job = JobListing.objects.create(
+            title="Backend Engineer",
+            detailed_description="Backend engineer",
+            required_skills=REQUIRED_SKILLS,
+            is_active=True
+        )
+        self.applicants = {
+            key: Applicant.objects.create(
+                applicant_name=f"Applicant {key}",
+                resume_file=f"resume_{key}.pdf",
+                content_hash=f"skills_hash_{key}",
+                file_size=2048,
+                file_format="PDF",
+                job_listing=self.job,
+                parsed_resume_text=text
+            )
+            for key, text in RESUMES.items()
+        }
+
+
+class TestSkillCoverageScoringMode(SkillCoverageJobMixin, TestCase):
+    @patch('hr_assistant.services.ai_analysis.llm')
+    def test_run_scores_without_llm(self, mock_llm):
+        result = ResumeScoringService.initiate_scoring_process(self.job.id, scoring_mode="skill_coverage")
+
+        mock_llm.invoke.assert_not_called()
+        self.assertEqual(result['processed_count'], 3)
+        full, partial, chef = (Applicant.objects.get(id=self.applicants[key].id) for key in (1, 2, 3))
+        self.assertEqual((full.overall_score, full.quality_grade, full.processing_status), (100, "A", "completed"))
+        # No dated experience or seniority titles in the resume
+        self.assertEqual(full.categorization, "Junior")
+        self.assertEqual((partial.overall_score, partial.quality_grade, partial.categorization), (40, "D", "Mismatched"))
+        self.assertEqual(partial.ai_analysis_result['missing_skills'], ["PostgreSQL", "Machine Learning", "JavaScript"])
+        self.assertEqual(chef.overall_score, 0)
+
+
+class TestMustHaveReportFilter(SkillCoverageJobMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        Applicant.objects.filter(job_listing=self.job).update(analysis_status='analyzed', overall_score=50)
+
+    def test_api_filters_candidates_on_skills(self):
+        response = Client().get(reverse('candidate_report_api'), {'job_id': self.job.id, 'must_have': 'Python, Django'})
+
+        data = json.loads(response.content)
+        self.assertEqual({c['id'] for c in data['candidates']}, {self.applicants[1].id, self.applicants[2].id})
+        self.assertEqual(data['must_have'], ['Python', 'Django'])
+
+        response = Client().get(reverse('candidate_report_api'), {'job_id': self.job.id, 'must_have': ['Python', 'JavaScript']})
+        self.assertEqual([c['id'] for c in json.loads(response.content)['candidates']], [self.applicants[1].id])
+
+    def test_job_matrix_is_cached_until_applicants_change(self):
+        first = get_job_skill_matrix(self.job.id)
+        self.assertIs(get_job_skill_matrix(self.job.id), first)
+
+        Applicant.objects.create(
+            applicant_name="Applicant 4", resume_file="resume_4.pdf", content_hash="skills_hash_4",
+            file_size=2048, file_format="PDF", job_listing=self.job, parsed_resume_text="JavaScript"
+        )
+        rebuilt = get_job_skill_matrix(self.job.id)
+        self.assertIsNot(rebuilt, first)
+        self.assertEqual(len(rebuilt.rows), 4)
@@ -8,6 +8,7 @@ from django.conf import settings
 from django.views.decorators.csrf import csrf_exempt
 from django.utils.decorators import method_decorator
 from hr_assistant.services.resume_scoring import ResumeScoringService
+from hr_assistant.services.logging import AIProcessingError
 from django.db.models import Q
 from django.core.files.storage import default_storage
 import os
@@ -305,21 +306,24 @@ class ScoreResumesView(View):
             # Parse the request body
             data = json.loads(request.body)
             applicant_ids = data.get('applicant_ids', None)
+            scoring_mode = data.get('scoring_mode', None)
 
-            ai_logger.info(f"Request data: job_id={job_id}, applicant_ids={applicant_ids}")
+            ai_logger.info(f"Request data: job_id={job_id}, applicant_ids={applicant_ids}, scoring_mode={scoring_mode}")
 
-            # Use the resume scoring service to initiate the process
-            result = ResumeScoringService.initiate_scoring_process(job_id, applicant_ids)
+            # Queue the run; the score_worker management command processes it in the background
+            result = ResumeScoringService.enqueue_scoring_run(job_id, applicant_ids, scoring_mode)
 
-            ai_logger.info(f"ResumeScoringService returned successfully: {result}")
+            ai_logger.info(f"ResumeScoringService queued scoring run: {result}")
 
             # Return success response
             response_data = {
                 'status': 'accepted',
-                'message': 'Resume scoring process initiated',
+                'message': 'Resume scoring run queued',
                 'job_id': job_id,
+                'run_id': result['run_id'],
+                'scoring_mode': result['scoring_mode'],
                 'applicant_count': result['applicant_count'],
-                'tracking_id': f'score_job_{job_id}_{result["applicant_count"]}'
+                'tracking_id': f'scoring_run_{result["run_id"]}'
             }
 
             ai_logger.info(f"Returning response: {response_data}")
@@ -328,6 +332,15 @@ class ScoreResumesView(View):
         except JobListing.DoesNotExist:
             ai_logger.error(f'Job listing not found for ID: {job_id}')
             return JsonResponse({'error': 'Job listing not found'}, status=404)
+        except AIProcessingError as e:
+            if e.error_code == 'PROCESS_LOCKED':
+                ai_logger.warning(f'Scoring run already active for job {job_id}')
+                return JsonResponse({'error': e.message, 'run_id': e.additional_data.get('run_id')}, status=409)
+            if e.error_code in ('INVALID_SCORING_MODE', 'INVALID_APPLICANT_IDS'):
+                ai_logger.warning(f'Invalid scoring request for job {job_id}: {e.message}')
+                return JsonResponse({'error': e.message, 'error_code': e.error_code}, status=400)
+            ai_logger.error(f'Error processing request for job {job_id}: {str(e)}')
+            return JsonResponse({'error': f'Error processing request: {str(e)}'}, status=500)
         except Exception as e:
             ai_logger.error(f'Error processing request for job {job_id}: {str(e)}')
             import traceback
@@ -342,13 +355,23 @@ class ScoringStatusView(View):
     """
     def get(self, request, job_id):
         try:
+            # Optionally track a specific scoring run returned by the score-resumes endpoint
+            run_id = request.GET.get('run_id')
+            run_id = int(run_id) if run_id else None
+
             # Use the resume scoring service to get the status
-            result = ResumeScoringService.get_scoring_status(job_id)
+            result = ResumeScoringService.get_scoring_status(job_id, run_id)
 
             return JsonResponse(result)
 
         except JobListing.DoesNotExist:
             return JsonResponse({'error': 'Job listing not found'}, status=404)
+        except ValueError:
+            return JsonResponse({'error': 'Invalid run_id'}, status=400)
+        except AIProcessingError as e:
+            if e.error_code == 'RUN_NOT_FOUND':
+                return JsonResponse({'error': e.message}, status=404)
+            return JsonResponse({'error': f'Error checking status: {str(e)}'}, status=500)
         except Exception as e:
             return JsonResponse({'error': f'Error checking status: {str(e)}'}, status=500)
 
@@ -410,9 +433,31 @@ class DetailedAnalysisView(View):
 
 
 from hr_assistant.services.report_utils import get_candidates_for_job
+from hr_assistant.services.lazy_justification import is_justification_pending
 import json
 
 
+def parse_must_have_skills(request):
+    """
+    Skills from repeated or comma-separated must_have query parameters
+    """
+    skills = []
+    for value in request.GET.getlist('must_have'):
+        skills.extend(skill.strip() for skill in value.split(',') if skill.strip())
+    return skills
+
+
+def parse_min_years_experience(request):
+    """
+    Minimum years of experience from the min_years query parameter, None if absent or invalid
+    """
+    try:
+        min_years = float(request.GET.get('min_years', ''))
+    except ValueError:
+        return None
+    return min_years if 0 < min_years <= 60 else None
+
+
 class CandidateReportView(View):
     """
     Django Class-Based View for the candidate report page.
@@ -453,12 +498,17 @@ class CandidateReportView(View):
         if not (0 <= score_threshold <= 100):
             score_threshold = 0
 
+        must_have_skills = parse_must_have_skills(request)
+        min_years_experience = parse_min_years_experience(request)
+
         # Get candidates using the report utility function
         candidates = get_candidates_for_job(
             job_id=job_id,
             sort_by=sort_by,
             sort_order=sort_order,
-            score_threshold=score_threshold
+            score_threshold=score_threshold,
+            must_have_skills=must_have_skills,
+            min_years_experience=min_years_experience
         )
 
         # Prepare candidate data for the template
@@ -471,6 +521,8 @@ class CandidateReportView(View):
                 'categorization': candidate.categorization,
                 'quality_grade': candidate.quality_grade,
                 'justification_summary': candidate.justification_summary or '',
+                'years_of_experience': (candidate.resume_facts or {}).get('years_of_experience'),
+                'justification_pending': is_justification_pending(candidate),
             }
             candidate_data.append(candidate_dict)
 
@@ -489,6 +541,8 @@ class CandidateReportView(View):
             'sort_by': sort_by,
             'sort_order': sort_order,
             'score_threshold': score_threshold,
+            'must_have': must_have_skills,
+            'min_years': min_years_experience,
         }
 
         return render(request, self.template_name, context)
@@ -543,16 +597,23 @@ class CandidateReportAPIView(View):
             if not (0 <= score_threshold <= 100):
                 score_threshold = 0
 
+            must_have_skills = parse_must_have_skills(request)
+            min_years_experience = parse_min_years_experience(request)
+
             # Get candidates using the report utility function
             candidates = get_candidates_for_job(
                 job_id=job_id,
                 sort_by=sort_by,
                 sort_order=sort_order,
-                score_threshold=score_threshold
+                score_threshold=score_threshold,
+                must_have_skills=must_have_skills,
+                min_years_experience=min_years_experience
             )
         else:
             # If no job_id (None), return empty list
             candidates = []
+            must_have_skills = []
+            min_years_experience = None
             sort_by = 'overall_score'
             sort_order = 'desc'
             score_threshold = 0
@@ -567,6 +628,8 @@ class CandidateReportAPIView(View):
                 'categorization': candidate.categorization,
                 'quality_grade': candidate.quality_grade,
                 'justification_summary': candidate.justification_summary or '',
+                'years_of_experience': (candidate.resume_facts or {}).get('years_of_experience'),
+                'justification_pending': is_justification_pending(candidate),
             }
             candidate_data.append(candidate_dict)
 
@@ -588,4 +651,6 @@ class CandidateReportAPIView(View):
             'sort_by': sort_by,
             'sort_order': sort_order,
             'score_threshold': score_threshold,
+            'must_have': must_have_skills,
+            'min_years': min_years_experience,
         })
\ No newline at end of file